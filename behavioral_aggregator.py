@@ -13,6 +13,7 @@ import pandas as pd
 from typing import Dict, List, Optional
 from collections import Counter
 from behavioral_engine import PRODUCT_STEPS, FailureReason
+from dropsim_outcome_matrix import get_outcome_matrix
 from typing import Optional
 
 
@@ -28,17 +29,8 @@ def format_failure_mode_report(df: pd.DataFrame, product_steps: Optional[Dict] =
     # Use custom product steps if provided
     steps_to_use = product_steps if product_steps else PRODUCT_STEPS
     
-    # Collect all failures
-    step_failures = {step: {'count': 0, 'reasons': Counter()} for step in steps_to_use.keys()}
-    
-    for _, row in df.iterrows():
-        trajectories = row.get('trajectories', [])
-        for traj in trajectories:
-            exit_step = traj.get('exit_step', 'Unknown')
-            if exit_step != 'Completed' and exit_step in step_failures:
-                step_failures[exit_step]['count'] += 1
-                if traj.get('failure_reason'):
-                    step_failures[exit_step]['reasons'][traj['failure_reason']] += 1
+    # Failures and reasons per step, from the outcome matrix
+    step_failures = get_outcome_matrix(df, list(steps_to_use.keys())).failures_by_step()
     
     # Build report
     lines = []
@@ -49,12 +41,10 @@ def format_failure_mode_report(df: pd.DataFrame, product_steps: Optional[Dict] =
     lines.append("")
     
     for step_name in steps_to_use.keys():
-        failures = step_failures[step_name]
-        failure_count = failures['count']
+        failure_count, reasons = step_failures[step_name]
         failure_rate = (failure_count / total_variants * 100) if total_variants > 0 else 0
         
         # Primary and secondary costs
-        reasons = failures['reasons']
         if reasons:
             primary = reasons.most_common(1)[0]
             secondary = reasons.most_common(2)[1] if len(reasons) > 1 else None
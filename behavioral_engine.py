@@ -18,6 +18,8 @@ from dataclasses import dataclass, field
 from enum import Enum
 from collections import Counter
 
+from dropsim_outcome_matrix import OutcomeMatrix, attach_outcome_matrix, get_outcome_matrix
+
 
 # ============================================================================
 # ENUMS & CONSTANTS
@@ -474,28 +476,15 @@ def compute_reassurance_yield(
     return (reassurance_signal + authority_signal) * (1 - control_need)
 
 
-def compute_transition_cost(
-    current_step: Dict,
-    previous_step: Optional[Dict],
-    priors: Dict,
-    state: InternalState
-) -> Dict[str, float]:
+def is_commitment_gate(current_step: Dict, previous_step: Optional[Dict]) -> bool:
     """
-    Compute transition costs when moving between steps.
+    Detect a commitment gate between two consecutive steps.
     
-    Key insight: Moving from a passive step (landing page) to an active step 
-    (quiz start) requires commitment, which adds cognitive/effort/risk costs.
-    
-    Returns dict with transition_cost_breakdown.
+    Depends only on the step definitions, so callers that advance many
+    trajectories through the same step pair can evaluate it once.
     """
     if previous_step is None:
-        # First step, no transition cost
-        return {
-            'transition_cognitive_cost': 0.0,
-            'transition_effort_cost': 0.0,
-            'transition_risk_cost': 0.0,
-            'transition_total_cost': 0.0
-        }
+        return False
     
     # Detect commitment gate: moving from passive (landing) to active (quiz/input)
     # Also check if previous step is a landing page with CTA (commitment gate)
@@ -518,10 +507,25 @@ def compute_transition_cost(
         'question' in str(current_step.get('name', '')).lower()
     )
     
-    is_commitment_gate = (prev_is_passive and current_is_active) or prev_is_commitment_gate
+    return (prev_is_passive and current_is_active) or prev_is_commitment_gate
+
+
+def compute_transition_cost(
+    current_step: Dict,
+    previous_step: Optional[Dict],
+    priors: Dict,
+    state: InternalState
+) -> Dict[str, float]:
+    """
+    Compute transition costs when moving between steps.
+    
+    Key insight: Moving from a passive step (landing page) to an active step 
+    (quiz start) requires commitment, which adds cognitive/effort/risk costs.
     
-    if not is_commitment_gate:
-        # No significant transition cost
+    Returns dict with transition_cost_breakdown.
+    """
+    if not is_commitment_gate(current_step, previous_step):
+        # First step or no significant transition cost
         return {
             'transition_cognitive_cost': 0.0,
             'transition_effort_cost': 0.0,
@@ -864,6 +868,9 @@ def run_behavioral_simulation(
     # Merge results
     results_df = pd.DataFrame(all_results)
     final_df = pd.concat([df.reset_index(drop=True), results_df], axis=1)
+    attach_outcome_matrix(final_df, OutcomeMatrix.from_trajectories(
+        [r['trajectories'] for r in all_results], list((product_steps or PRODUCT_STEPS).keys())
+    ))
     
     if verbose:
         print(f"\n✅ Behavioral simulation complete!")
@@ -885,37 +892,18 @@ def aggregate_failure_modes(df: pd.DataFrame, product_steps: Optional[Dict] = No
     """
     steps_to_use = product_steps if product_steps else PRODUCT_STEPS
     
-    step_failures = {}
-    
-    for step_name in steps_to_use.keys():
-        step_failures[step_name] = {
-            'total_failures': 0,
-            'failure_reasons': Counter(),
-            'personas': []
-        }
-    
-    # Collect failures from all trajectories
-    for _, row in df.iterrows():
-        trajectories = row.get('trajectories', [])
-        for traj in trajectories:
-            if traj['exit_step'] != 'Completed':
-                step = traj['exit_step']
-                if step in step_failures:
-                    step_failures[step]['total_failures'] += 1
-                    if traj['failure_reason']:
-                        step_failures[step]['failure_reasons'][traj['failure_reason']] += 1
-                    step_failures[step]['personas'].append(row.name)
+    # Failures and reasons per step, from the outcome matrix
+    step_failures = get_outcome_matrix(df, list(steps_to_use.keys())).failures_by_step()
     
     # Build summary table
     summary = []
     total_trajectories = len(df) * len(STATE_VARIANTS)
     
-    for step_name in PRODUCT_STEPS.keys():
-        failures = step_failures[step_name]
-        failure_rate = failures['total_failures'] / total_trajectories * 100
+    for step_name in steps_to_use.keys():
+        total_failures, reasons = step_failures[step_name]
+        failure_rate = total_failures / total_trajectories * 100
         
         # Primary and secondary reasons
-        reasons = failures['failure_reasons']
         if reasons:
             primary = reasons.most_common(1)[0]
             secondary = reasons.most_common(2)[1] if len(reasons) > 1 else None
@@ -926,7 +914,7 @@ def aggregate_failure_modes(df: pd.DataFrame, product_steps: Optional[Dict] = No
         summary.append({
             'Step': step_name,
             'Failure Rate %': round(failure_rate, 1),
-            'Total Failures': failures['total_failures'],
+            'Total Failures': total_failures,
             'Primary Reason': primary[0] if primary[0] else 'None',
             'Primary Count': primary[1],
             'Secondary Reason': secondary[0] if secondary else 'None',
@@ -0,0 +1,766 @@
+"""
+behavioral_engine_batch.py - Vectorized Batch Engine for Intent-Aware Simulation
+
+Runs the same behavioral + intent model as behavioral_engine_intent_aware, but
+holds every (persona, variant) trajectory as one row of NumPy arrays and
+advances all live trajectories one step at a time with masked updates.
+
+The scalar path pays Python overhead per persona × variant × step; here the
+per-step work is a handful of array operations over all live rows, so large
+runs (100k+ personas) finish in minutes instead of hours.
+
+Scope:
+- Produces the same result DataFrame columns as run_intent_aware_simulation,
+  including the 'trajectories' column (journey, exit step, failure reason,
+  intent mismatches, final state).
+- Decision traces and Shapley attribution are NOT captured; every trajectory
+  carries an empty 'decision_traces' list. Use the scalar engine when the
+  decision graph / ledger is needed.
+
+Random streams:
+- rng_mode="legacy" (default) replays the scalar engine's per-trajectory
+  np.random.seed(variant_seed) stream, so exit steps and failure reasons match
+  the scalar path trajectory-for-trajectory for a fixed seed.
+- rng_mode="generator" draws all noise/sampling values from one
+  np.random.Generator. Aggregate distributions match; individual trajectories
+  do not.
+"""
+
+import numpy as np
+import pandas as pd
+from typing import Dict, List, Tuple, Optional
+from dataclasses import dataclass
+
+from behavioral_engine import (
+    STATE_VARIANTS,
+    FailureReason,
+    is_commitment_gate
+)
+from behavioral_engine_improved import (
+    EngineParameters,
+    DEFAULT_ENGINE_PARAMETERS
+)
+from behavioral_engine_intent_aware import (
+    INTENT_AWARE_VARIANTS,
+    summarize_persona_trajectories,
+    candidate_intent_frames,
+    compile_step_intent_table,
+    CAPTURE_LEVELS,
+    TRACE_CAPTURE_LEVELS
+)
+from dropsim_intent_model import (
+    IntentFrame,
+    infer_intent_distribution,
+    compute_intent_alignment_score,
+    DEFAULT_INTENT_PENALTY_WEIGHT
+)
+from dropsim_prior_cache import get_prior_cache
+from dropsim_outcome_matrix import OutcomeMatrix, attach_outcome_matrix
+
+STATE_FIELDS = ['cognitive_energy', 'perceived_risk', 'perceived_effort', 'perceived_value', 'perceived_control']
+COST_FIELDS = [
+    'cognitive_cost', 'effort_cost', 'risk_cost', 'value_yield', 'reassurance_yield',
+    'value_decay', 'total_cost', 'transition_cognitive_cost', 'transition_effort_cost',
+    'transition_risk_cost', 'transition_total_cost'
+]
+
+# Failure reason codes, in the tie-break order used by identify_failure_reason_improved
+FAILURE_REASON_CODES = [
+    FailureReason.SYSTEM2_FATIGUE,
+    FailureReason.LOW_ABILITY,
+    FailureReason.LOSS_AVERSION,
+    FailureReason.TEMPORAL_DISCOUNTING,
+    FailureReason.MULTI_FACTOR
+]
+_MULTI_FACTOR_CODE = FAILURE_REASON_CODES.index(FailureReason.MULTI_FACTOR)
+
+# Same names as behavioral_engine_intent_aware.RNG_MODES
+RNG_MODES = ("legacy", "generator")
+
+
+# ============================================================================
+# BATCH STATE
+# ============================================================================
+
+@dataclass
+class BatchState:
+    """Internal state for many trajectories (one array row per trajectory)."""
+    cognitive_energy: np.ndarray
+    perceived_risk: np.ndarray
+    perceived_effort: np.ndarray
+    perceived_value: np.ndarray
+    perceived_control: np.ndarray
+
+    def clamp(self, priors: Dict[str, np.ndarray]):
+        """Clamp all values to valid ranges (mirrors InternalState.clamp)."""
+        self.cognitive_energy = np.maximum(0.0, np.minimum(priors['CC'], self.cognitive_energy))
+        self.perceived_risk = np.maximum(0.0, np.minimum(3.0, self.perceived_risk))
+        self.perceived_effort = np.maximum(0.0, np.minimum(3.0, self.perceived_effort))
+        self.perceived_value = np.maximum(0.0, np.minimum(3.0, self.perceived_value))
+        self.perceived_control = np.maximum(0.0, np.minimum(2.0, self.perceived_control))
+
+    def take(self, rows: np.ndarray) -> 'BatchState':
+        """Select a subset of trajectories."""
+        return BatchState(*(getattr(self, f)[rows] for f in STATE_FIELDS))
+
+    def put(self, rows: np.ndarray, other: 'BatchState'):
+        """Write a subset of trajectories back in place."""
+        for f in STATE_FIELDS:
+            getattr(self, f)[rows] = getattr(other, f)
+
+
+def initialize_batch_state(variant_names: List[str], priors: Dict[str, np.ndarray]) -> BatchState:
+    """Initialize state for each trajectory from its variant definition."""
+    def variant_column(key):
+        return np.array([STATE_VARIANTS[v][key] for v in variant_names], dtype=float)
+
+    state = BatchState(
+        cognitive_energy=priors['CC'] * variant_column('cognitive_energy_mult'),
+        perceived_risk=variant_column('perceived_risk'),
+        perceived_effort=variant_column('perceived_effort'),
+        perceived_value=variant_column('perceived_value') * priors['MS'],
+        perceived_control=variant_column('perceived_control') * priors['TB']
+    )
+    state.clamp(priors)
+    return state
+
+
+# ============================================================================
+# MASKED STATE UPDATE (mirrors update_state_improved)
+# ============================================================================
+
+def update_state_batch(
+    state: BatchState,
+    step: Dict,
+    priors: Dict[str, np.ndarray],
+    step_index: int,
+    total_steps: int,
+    previous_step: Optional[Dict] = None
+) -> Tuple[BatchState, Dict[str, np.ndarray]]:
+    """
+    Vectorized update_state_improved.
+
+    Every branch of the scalar version becomes a masked update, and the
+    arithmetic keeps the scalar operation order so results are identical.
+    """
+    zeros = np.zeros_like(state.cognitive_energy)
+
+    # Transition costs (commitment gate depends only on the step pair)
+    if is_commitment_gate(step, previous_step):
+        transition_cognitive = 0.25 * (1 - state.cognitive_energy) * (1 + priors['FR'])
+        transition_effort = 0.30 * (1 - priors['ET'])
+        transition_risk = 0.35 * priors['LAM'] * (1 - state.perceived_control)
+    else:
+        transition_cognitive = zeros
+        transition_effort = zeros
+        transition_risk = zeros
+    transition_total = transition_cognitive + transition_effort + transition_risk
+
+    # Cognitive cost with value override (compute_cognitive_cost_improved)
+    value_override = state.perceived_value
+    base_cost = step['cognitive_demand'] * (1 + priors['FR'] * 0.3)
+    energy_penalty = np.sqrt(np.maximum(0, 1 - state.cognitive_energy)) * 0.3
+    value_reduction = value_override * 0.5
+    value_reduction = np.where(value_override > 0.5, value_reduction + (value_override - 0.5) * 0.4, value_reduction)
+    cognitive_cost = base_cost * (1 + energy_penalty) - value_reduction
+    cognitive_cost = np.maximum(0, np.minimum(cognitive_cost, 0.6))
+
+    effort_cost = step['effort_demand'] * (1 - priors['ET'])
+    risk_cost = step['risk_signal'] * priors['LAM'] * (1 + step['irreversibility'])
+
+    # Less harsh temporal discounting with progressive discount factor
+    base_value_yield = step['explicit_value'] * np.exp(-priors['DR'] * step['delay_to_value'])
+    progress = step_index / total_steps if total_steps > 0 else 0
+    discount_factor = 1.0 - (progress * 0.3)
+    value_yield = base_value_yield * (1.0 + discount_factor * 0.5)
+    min_value_floor = step['explicit_value'] * 0.2
+    value_yield = np.maximum(value_yield, min_value_floor)
+
+    reassurance_yield = (step['reassurance_signal'] + step['authority_signal']) * (1 - priors['CN'])
+
+    total_cognitive_cost = cognitive_cost + transition_cognitive
+    total_effort_cost = effort_cost + transition_effort
+    total_risk_cost = risk_cost + transition_risk
+
+    # Cognitive energy with recovery (update_cognitive_energy_with_recovery)
+    progress = (step_index + 1) / total_steps if total_steps > 0 else 0
+    new_energy = state.cognitive_energy - total_cognitive_cost
+    new_energy = np.where(value_yield > 0.05, new_energy + value_yield * 0.25, new_energy)
+    if progress > 0.2:
+        new_energy = new_energy + progress * 0.15
+    new_energy = np.where(reassurance_yield > 0.1, new_energy + reassurance_yield * 0.20, new_energy)
+    new_energy = np.maximum(0.05, new_energy)
+    new_energy = np.minimum(priors['CC'], new_energy)
+
+    # Progressive value amplification (compute_progressive_value_amplification)
+    base_perceived_value = state.perceived_value + value_yield
+    if total_steps <= 0:
+        amplified_value = base_perceived_value
+    else:
+        amp_progress = step_index / total_steps
+        proximity_multiplier = 1.0 + (amp_progress * 1.0)
+        sunk_cost_multiplier = 1.0 + (amp_progress * 0.5)
+        motivation_factor = 1.0 + (priors['MS'] * 0.3)
+        momentum_boost = 1.0
+        if amp_progress > 0.2:
+            momentum_boost = 1.0 + ((amp_progress - 0.2) * 0.4)
+        total_multiplier = proximity_multiplier * sunk_cost_multiplier * motivation_factor * momentum_boost
+        amplified_value = np.minimum(3.0, base_perceived_value * total_multiplier)
+
+    new_state = BatchState(
+        cognitive_energy=new_energy,
+        perceived_risk=np.minimum(3.0, state.perceived_risk + total_risk_cost),
+        perceived_effort=np.minimum(3.0, state.perceived_effort + total_effort_cost),
+        perceived_value=np.minimum(3.0, amplified_value),
+        perceived_control=np.minimum(2.0, state.perceived_control + reassurance_yield)
+    )
+    new_state.clamp(priors)
+
+    costs = {
+        'cognitive_cost': total_cognitive_cost,
+        'effort_cost': total_effort_cost,
+        'risk_cost': total_risk_cost,
+        'value_yield': value_yield,
+        'reassurance_yield': reassurance_yield,
+        'value_decay': np.where(value_yield < 0, -value_yield, 0.0),
+        'total_cost': total_cognitive_cost + total_effort_cost + total_risk_cost,
+        'transition_cognitive_cost': transition_cognitive,
+        'transition_effort_cost': transition_effort,
+        'transition_risk_cost': transition_risk,
+        'transition_total_cost': transition_total
+    }
+
+    return new_state, costs
+
+
+# ============================================================================
+# MASKED CONTINUATION PROBABILITY
+# ============================================================================
+
+def continuation_prob_batch(
+    state: BatchState,
+    priors: Dict[str, np.ndarray],
+    step_index: int,
+    total_steps: int,
+    modifiers: Dict[str, np.ndarray],
+    parameters: Optional[EngineParameters] = None
+) -> np.ndarray:
+    """Vectorized should_continue_probabilistic."""
+    if parameters is None:
+        parameters = DEFAULT_ENGINE_PARAMETERS
+
+    left = (state.perceived_value * priors['MS']) + state.perceived_control
+    right = state.perceived_risk + state.perceived_effort
+    base_advantage = left - right
+
+    value_override = np.where(state.perceived_value > 0.7, state.perceived_value * 0.3, 0.0)
+
+    progress = step_index / total_steps if total_steps > 0 else 0
+    commitment_boost = progress * 0.8
+    if progress > 0.2:
+        commitment_boost += (progress - 0.2) * 0.5
+
+    adjusted_advantage = base_advantage + value_override + commitment_boost
+
+    steepness = 1.2
+    base_prob = 1 / (1 + np.exp(-steepness * adjusted_advantage))
+    base_prob = base_prob + progress * 0.20
+
+    adjusted_prob = base_prob * modifiers['base_persistence']
+
+    value_bonus = (state.perceived_value - 0.6) * 0.2 * modifiers['value_sensitivity'] * parameters.value_sensitivity
+    adjusted_prob = np.where(state.perceived_value > 0.6, adjusted_prob + value_bonus, adjusted_prob)
+
+    fatigue_penalty = (0.3 - state.cognitive_energy) * 0.15
+    fatigue_penalty = fatigue_penalty * (2.0 - modifiers['fatigue_resilience'])
+    adjusted_prob = np.where(state.cognitive_energy < 0.3, adjusted_prob - fatigue_penalty, adjusted_prob)
+
+    BASE_COMPLETION_PROB = parameters.base_completion_rate
+    adjusted_prob = np.maximum(BASE_COMPLETION_PROB, adjusted_prob)
+
+    persistence_bonus = parameters.persistence_bonus_start + parameters.persistence_bonus_rate * progress
+    adjusted_prob = adjusted_prob + persistence_bonus
+    adjusted_prob = np.minimum(adjusted_prob, 0.95)
+
+    return np.clip(adjusted_prob, 0.05, 0.95)
+
+
+def intent_conditioned_prob_batch(
+    base_prob: np.ndarray,
+    intent_frame: IntentFrame,
+    step: Dict,
+    step_index: int,
+    total_steps: int,
+    intent_penalty_weight: float = DEFAULT_INTENT_PENALTY_WEIGHT,
+    alignment: Optional[float] = None
+) -> np.ndarray:
+    """
+    Vectorized compute_intent_conditioned_continuation_prob for rows sharing
+    one intent frame. Only base_prob varies per row; every branch condition
+    depends on (step, intent) and is evaluated once.
+    """
+    MIN_PROB = 0.05
+    MAX_PROB = 0.95
+    MAX_TOTAL_PENALTY = 0.45
+    MIN_COMPLETION_PROB = 0.40
+
+    if alignment is None:
+        alignment = compute_intent_alignment_score(step, intent_frame, step_index, total_steps)
+
+    adjusted_prob = base_prob
+    total_penalty = np.zeros_like(base_prob)
+    penalties = []  # Same insertion order as the scalar diagnostic dict
+
+    if step_index < 2:
+        penalties.append(np.zeros_like(base_prob))
+    else:
+        alignment_deficit = 1.0 - alignment
+        intent_penalty_raw = alignment_deficit * 0.10
+        intent_penalty_scale = intent_penalty_weight / DEFAULT_INTENT_PENALTY_WEIGHT
+        intent_penalty_factor = 1.0 - (intent_penalty_raw * 0.25 * intent_penalty_scale)
+        progress_factor = step_index / total_steps if total_steps > 0 else 0
+        penalty_dampening = 1.0 - (0.4 * progress_factor)
+        intent_penalty_factor = 1.0 - ((1.0 - intent_penalty_factor) * penalty_dampening)
+
+        adjusted_prob = adjusted_prob * intent_penalty_factor
+        intent_penalty_amount = base_prob * (1.0 - intent_penalty_factor)
+        total_penalty = total_penalty + intent_penalty_amount
+        penalties.append(-intent_penalty_amount)
+
+        if alignment >= 0.8:
+            adjusted_prob = adjusted_prob + (alignment - 0.8) * 0.15
+
+    intent_specific_factor = 1.0
+
+    if intent_frame.intent_id == "quick_decision":
+        if step.get('delay_to_value', 5) > 3:
+            delay_penalty_factor = 1.0 - (0.15 * 0.5)
+            intent_specific_factor *= delay_penalty_factor
+            delay_penalty_amount = adjusted_prob * (1.0 - delay_penalty_factor)
+            total_penalty = total_penalty + delay_penalty_amount
+            penalties.append(-delay_penalty_amount)
+    elif intent_frame.intent_id in ["compare_credit_cards", "compare_options"]:
+        if not step.get('comparison_available', False) and step_index > 2:
+            comparison_penalty_factor = 1.0 - (0.08 * 0.4)
+            intent_specific_factor *= comparison_penalty_factor
+            comparison_penalty_amount = adjusted_prob * (1.0 - comparison_penalty_factor)
+            total_penalty = total_penalty + comparison_penalty_amount
+            penalties.append(-comparison_penalty_amount)
+    elif intent_frame.intent_id == "learn_basics":
+        if step.get('cognitive_demand', 0) > 0.5 and step.get('explicit_value', 0) > 0.3:
+            adjusted_prob = adjusted_prob + 0.05
+
+    adjusted_prob = adjusted_prob * intent_specific_factor
+
+    # Cap maximum total penalty contribution (rows over the cap only)
+    capped = total_penalty > MAX_TOTAL_PENALTY
+    if capped.any():
+        penalty_scale = MAX_TOTAL_PENALTY / np.where(capped, total_penalty, 1.0)
+        capped_sum = 0
+        for penalty in penalties:
+            capped_sum = capped_sum + penalty * penalty_scale
+        adjusted_prob = np.where(capped, base_prob + capped_sum, adjusted_prob)
+
+    adjusted_prob = np.clip(adjusted_prob, MIN_PROB, MAX_PROB)
+    return np.maximum(adjusted_prob, MIN_COMPLETION_PROB)
+
+
+# ============================================================================
+# FAILURE REASONS
+# ============================================================================
+
+def failure_reason_codes_batch(costs: Dict[str, np.ndarray], state: BatchState) -> np.ndarray:
+    """
+    Vectorized identify_failure_reason_improved.
+
+    Returns indices into FAILURE_REASON_CODES.
+    """
+    cognitive_cost = np.where(state.cognitive_energy < 0.1, costs['cognitive_cost'] * 1.2, costs['cognitive_cost'])
+    effort_cost = np.where(state.perceived_effort > 1.5, costs['effort_cost'] * 1.2, costs['effort_cost'])
+    risk_cost = np.where(state.perceived_risk > 1.5, costs['risk_cost'] * 1.2, costs['risk_cost'])
+    value_decay = np.abs(costs['value_decay'])
+
+    adjusted_total = cognitive_cost + effort_cost + risk_cost + value_decay
+    safe_total = np.where(adjusted_total == 0, 1.0, adjusted_total)
+    pcts = np.stack([
+        cognitive_cost / safe_total,
+        effort_cost / safe_total,
+        risk_cost / safe_total,
+        value_decay / safe_total
+    ])
+    max_pct = pcts.max(axis=0)
+
+    # argmax returns the first maximum, matching the scalar if/elif order
+    codes = np.argmax(pcts == max_pct, axis=0)
+    codes = np.where(max_pct >= 0.3, codes, _MULTI_FACTOR_CODE)
+    codes = np.where((costs['total_cost'] == 0) | (adjusted_total == 0), _MULTI_FACTOR_CODE, codes)
+    return codes
+
+
+# ============================================================================
+# RANDOM STREAMS
+# ============================================================================
+
+def _draw_random_streams(
+    seeds: np.ndarray,
+    total_steps: int,
+    intent_probs: Optional[List[float]],
+    rng_mode: str,
+    seed: int
+) -> Tuple[Optional[np.ndarray], np.ndarray, np.ndarray]:
+    """
+    Draw intent choices, personality noise and sampling uniforms.
+
+    Returns (intent_choice_or_None, noise[T, S], uniforms[T, S]).
+    """
+    n_traj = len(seeds)
+
+    if rng_mode == "generator":
+        rng = np.random.default_rng(seed)
+        choices = rng.choice(len(intent_probs), size=n_traj, p=intent_probs) if intent_probs else None
+        noise = rng.normal(0, 0.08, size=(n_traj, total_steps))
+        uniforms = rng.random((n_traj, total_steps))
+        return choices, noise, uniforms
+
+    # Legacy: replay np.random.seed(variant_seed) followed by the scalar
+    # engine's draw order (choice, then normal/random per step). Draws past a
+    # trajectory's exit step are never read.
+    choices = np.empty(n_traj, dtype=int) if intent_probs else None
+    noise = np.empty((n_traj, total_steps))
+    uniforms = np.empty((n_traj, total_steps))
+    for t, trajectory_seed in enumerate(seeds):
+        rs = np.random.RandomState(trajectory_seed)
+        if intent_probs:
+            choices[t] = rs.choice(len(intent_probs), p=intent_probs)
+        for k in range(total_steps):
+            noise[t, k] = rs.normal(0, 0.08)
+            uniforms[t, k] = rs.random_sample()
+    return choices, noise, uniforms
+
+
+# ============================================================================
+# POPULATION ARRAYS
+# ============================================================================
+
+def compile_population_batch(
+    df: pd.DataFrame,
+    n_variants: int = len(INTENT_AWARE_VARIANTS)
+) -> Tuple[Dict[str, np.ndarray], Dict[str, np.ndarray]]:
+    """
+    Compile priors and archetype modifiers once per persona, repeated per variant.
+
+    Personas already in the prior cache (dropsim_prior_cache) are not
+    recompiled. Returns (priors, modifiers) with one array row per
+    (persona, variant) trajectory, persona-major.
+    """
+    persona_priors, persona_modifiers = get_prior_cache().compile(df).columns()
+    priors = {k: np.repeat(v, n_variants) for k, v in persona_priors.items()}
+    modifiers = {k: np.repeat(v, n_variants) for k, v in persona_modifiers.items()}
+    return priors, modifiers
+
+
+def continuation_table_batch(
+    df: pd.DataFrame,
+    product_steps: Dict,
+    intent_frames: Optional[List[IntentFrame]] = None,
+    parameters: Optional[EngineParameters] = None
+) -> np.ndarray:
+    """
+    Continuation probability (before personality noise) of every trajectory
+    at every step, as if it reached that step.
+
+    A trajectory's state never depends on the random draws - dropping only
+    ends it - so this table plus the draws fully determines every outcome.
+
+    Args:
+        intent_frames: Candidate intents; None gives the improved engine's
+            probability (no intent conditioning)
+
+    Returns:
+        (n_intents, n_trajectories, n_steps) array, n_intents = 1 when
+        intent_frames is None; trajectories persona-major, variants in
+        INTENT_AWARE_VARIANTS order
+    """
+    if parameters is None:
+        parameters = DEFAULT_ENGINE_PARAMETERS
+
+    priors, modifiers = compile_population_batch(df)
+    step_items = list(product_steps.items())
+    total_steps = len(step_items)
+    n_traj = len(df) * len(INTENT_AWARE_VARIANTS)
+    frames = intent_frames if intent_frames is not None else [None]
+    table = np.empty((len(frames), n_traj, total_steps))
+    step_table = compile_step_intent_table(product_steps, intent_frames) if intent_frames is not None else None
+
+    state = initialize_batch_state(INTENT_AWARE_VARIANTS * len(df), priors)
+    previous_step = None
+    for step_index, (_, step_def) in enumerate(step_items):
+        state, _ = update_state_batch(state, step_def, priors, step_index, total_steps, previous_step)
+        base_prob = continuation_prob_batch(state, priors, step_index, total_steps, modifiers, parameters)
+        for intent_idx, frame in enumerate(frames):
+            table[intent_idx, :, step_index] = base_prob if frame is None else intent_conditioned_prob_batch(
+                base_prob, frame, step_def, step_index, total_steps,
+                intent_penalty_weight=parameters.intent_penalty_weight,
+                alignment=step_table.alignment[intent_idx, step_index]
+            )
+        previous_step = step_def
+
+    return table
+
+
+# ============================================================================
+# BATCH SIMULATION
+# ============================================================================
+
+def _resolve_intent_distribution(product_steps: Dict) -> Dict[str, float]:
+    """Infer the intent distribution from the entry step (as the scalar engine does)."""
+    first_step = list(product_steps.values())[0]
+    intent_result = infer_intent_distribution(
+        entry_page_text=first_step.get('description', ''),
+        cta_phrasing=first_step.get('cta_phrasing', ''),
+        product_type='fintech',
+        persona_attributes={'intent': 'medium', 'urgency': 'medium'},
+        product_steps=product_steps
+    )
+    return intent_result['intent_distribution']
+
+
+def run_intent_aware_simulation_batch(
+    df: pd.DataFrame,
+    product_steps: Dict,
+    intent_distribution: Optional[Dict[str, float]] = None,
+    fixed_intent: Optional[IntentFrame] = None,
+    verbose: bool = True,
+    seed: int = 42,
+    rng_mode: str = "legacy",
+    parameters: Optional[EngineParameters] = None,
+    capture: str = "full"
+) -> pd.DataFrame:
+    """
+    Vectorized drop-in for run_intent_aware_simulation.
+
+    Args:
+        df: Personas DataFrame (with derived feature columns)
+        product_steps: Product step definitions
+        intent_distribution: Optional pre-computed intent distribution
+        fixed_intent: If provided, use this intent for all trajectories
+        verbose: Print progress
+        seed: Random seed
+        rng_mode: "legacy" (trajectory-identical to the scalar engine) or
+            "generator" (single Generator, distribution-identical)
+        parameters: Calibrated engine constants (defaults if None)
+        capture: As for run_intent_aware_simulation; this engine records no
+            decision traces, so 'traces' and 'full' both build journeys
+
+    Returns:
+        DataFrame with the same columns as run_intent_aware_simulation
+    """
+    if rng_mode not in RNG_MODES:
+        raise ValueError(f"Unknown rng_mode: {rng_mode} (expected one of {RNG_MODES})")
+    if capture not in CAPTURE_LEVELS:
+        raise ValueError(f"Unknown capture level '{capture}'. Expected one of {CAPTURE_LEVELS}")
+    record_summary = capture != "metrics"
+    record_journey = capture in TRACE_CAPTURE_LEVELS
+    if parameters is None:
+        parameters = DEFAULT_ENGINE_PARAMETERS
+
+    # Candidate intents (one frame per intent index)
+    if fixed_intent is not None:
+        intent_probs = None
+    else:
+        if intent_distribution is None:
+            intent_distribution = _resolve_intent_distribution(product_steps)
+        intent_probs = list(intent_distribution.values())
+    intent_frames = candidate_intent_frames(intent_distribution, fixed_intent)
+
+    step_items = list(product_steps.items())
+    total_steps = len(step_items)
+    n_personas = len(df)
+    n_variants = len(INTENT_AWARE_VARIANTS)
+    n_traj = n_personas * n_variants
+
+    if verbose:
+        print("🧠 Running Intent-Aware Behavioral Simulation (batch engine)")
+        print(f"   Personas: {n_personas}")
+        print(f"   Trajectories: {n_traj}")
+        print(f"   Product Steps: {total_steps}")
+        print(f"   Seed: {seed} (rng_mode={rng_mode})")
+
+    # Compile priors and modifiers once per persona, then repeat per variant
+    priors, modifiers = compile_population_batch(df, n_variants)
+    variant_names = INTENT_AWARE_VARIANTS * n_personas
+
+    # Per-trajectory seeds exactly as the scalar engine derives them
+    persona_labels = list(df.index)
+    seeds = np.array([
+        seed + idx * 10000 + variant_idx * 1000
+        for idx in persona_labels
+        for variant_idx in range(n_variants)
+    ])
+    intent_choice, noise, uniforms = _draw_random_streams(
+        seeds, total_steps, intent_probs, rng_mode, seed
+    )
+    if intent_choice is None:
+        intent_choice = np.zeros(n_traj, dtype=int)
+
+    # (intent, step) alignment and mismatch analysis, compiled once per run
+    step_table = compile_step_intent_table(product_steps, intent_frames)
+
+    # Per-step records (filled only for rows that entered the step)
+    state_history = {f: np.zeros((n_traj, total_steps)) for f in STATE_FIELDS}
+    cost_history = {f: np.zeros((n_traj, total_steps)) for f in COST_FIELDS}
+    prob_history = np.zeros((n_traj, total_steps))
+
+    state = initialize_batch_state(variant_names, priors)
+    alive = np.ones(n_traj, dtype=bool)
+    exit_index = np.full(n_traj, -1)
+    reason_code = np.full(n_traj, -1)
+    previous_step = None
+
+    for step_index, (step_name, step_def) in enumerate(step_items):
+        rows = np.flatnonzero(alive)
+        if rows.size == 0:
+            break
+
+        live_priors = {k: v[rows] for k, v in priors.items()}
+        live_modifiers = {k: v[rows] for k, v in modifiers.items()}
+        live_state, costs = update_state_batch(
+            state.take(rows), step_def, live_priors, step_index, total_steps, previous_step
+        )
+
+        base_prob = continuation_prob_batch(
+            live_state, live_priors, step_index, total_steps, live_modifiers, parameters
+        )
+        continuation_prob = np.empty_like(base_prob)
+        live_intents = intent_choice[rows]
+        for intent_idx, frame in enumerate(intent_frames):
+            mask = live_intents == intent_idx
+            if mask.any():
+                continuation_prob[mask] = intent_conditioned_prob_batch(
+                    base_prob[mask], frame, step_def, step_index, total_steps,
+                    intent_penalty_weight=parameters.intent_penalty_weight,
+                    alignment=step_table.alignment[intent_idx, step_index]
+                )
+
+        final_prob = np.clip(continuation_prob + noise[rows, step_index], 0.05, 0.95)
+        final_prob = np.clip(final_prob, 0.35, 0.95)
+        dropped = ~(uniforms[rows, step_index] < final_prob)
+
+        state.put(rows, live_state)
+        for f in STATE_FIELDS:
+            state_history[f][rows, step_index] = getattr(live_state, f)
+        for f in COST_FIELDS:
+            cost_history[f][rows, step_index] = costs[f]
+        prob_history[rows, step_index] = final_prob
+
+        if dropped.any():
+            drop_rows = rows[dropped]
+            exit_index[drop_rows] = step_index
+            alive[drop_rows] = False
+            reason_code[drop_rows] = failure_reason_codes_batch(
+                {f: costs[f][dropped] for f in COST_FIELDS}, live_state.take(dropped)
+            )
+
+        previous_step = step_def
+
+    if verbose:
+        print(f"   Advanced {n_traj} trajectories through {total_steps} steps")
+
+    # Build trajectory dicts and per-persona rows
+    step_names = [name for name, _ in step_items]
+    intent_dicts = [frame.to_dict() for frame in intent_frames]
+    alignment_rows = step_table.alignment.tolist()
+    mismatch_rows = step_table.is_mismatch.tolist()
+    mismatch_score_rows = step_table.mismatch_score.tolist()
+    # Nested lists index far faster than per-element ndarray access
+    if record_journey:
+        state_rows = {f: state_history[f].tolist() for f in STATE_FIELDS}
+        cost_rows = {f: cost_history[f].tolist() for f in COST_FIELDS}
+        prob_rows = prob_history.tolist()
+    final_rows = {f: getattr(state, f).tolist() for f in STATE_FIELDS}
+    exit_list = exit_index.tolist()
+    intent_list = intent_choice.tolist()
+    reason_list = reason_code.tolist()
+    all_results = []
+
+    for p, label in enumerate(persona_labels):
+        trajectories = []
+        for v, variant_name in enumerate(INTENT_AWARE_VARIANTS):
+            t = p * n_variants + v
+            intent_idx = intent_list[t]
+            frame = intent_frames[intent_idx]
+            exit_k = exit_list[t]
+            n_visited = total_steps if exit_k < 0 else exit_k + 1
+
+            journey = []
+            intent_mismatches = []
+            for k in (range(n_visited) if record_journey else ()):
+                costs = {f: cost_rows[f][t][k] for f in COST_FIELDS}
+                costs['is_commitment_gate'] = costs['transition_total_cost'] > 0
+                journey.append({
+                    'step': step_names[k],
+                    **{f: state_rows[f][t][k] for f in STATE_FIELDS},
+                    'costs': costs,
+                    'intent_alignment': alignment_rows[intent_idx][k],
+                    'intent_id': frame.intent_id,
+                    'continuation_probability': prob_rows[t][k],
+                    'continue': "True"
+                })
+                if mismatch_rows[intent_idx][k]:
+                    intent_mismatches.append(step_table.mismatch_record(intent_idx, k))
+
+            failure_reason = None
+            if exit_k < 0:
+                exit_step = "Completed"
+            else:
+                exit_step = step_names[exit_k]
+                if record_journey:
+                    journey[-1]['continue'] = "False"
+            if exit_k >= 0 and record_summary:
+                is_mismatch = mismatch_rows[intent_idx][exit_k]
+                mismatch_score = mismatch_score_rows[intent_idx][exit_k]
+                mismatch_type = step_table.mismatch_types[intent_idx][exit_k]
+                behavioral_reason = FAILURE_REASON_CODES[reason_list[t]].value
+                if fixed_intent is not None:
+                    if is_mismatch and mismatch_score > 0.5:
+                        failure_reason = f"Step blocked comparison goal: {mismatch_type}"
+                    else:
+                        failure_reason = behavioral_reason
+                else:
+                    if is_mismatch and mismatch_score > 0.4:
+                        failure_reason = f"Intent mismatch: {mismatch_type}"
+                    else:
+                        failure_reason = behavioral_reason
+
+            trajectory = {
+                'variant': variant_name,
+                'intent_id': frame.intent_id,
+                'exit_step': exit_step,
+                'failure_reason': failure_reason,
+                'completed': exit_step == "Completed",
+                'steps_entered': n_visited,
+                'persona_id': f"{label}_{variant_name}"
+            }
+            if record_summary:
+                trajectory['intent_frame'] = dict(intent_dicts[intent_idx])
+                trajectory['final_state'] = {f: final_rows[f][t] for f in STATE_FIELDS}
+            if record_journey:
+                trajectory['journey'] = journey
+                trajectory['intent_mismatches'] = intent_mismatches
+                trajectory['decision_traces'] = []
+            trajectories.append(trajectory)
+
+        all_results.append(summarize_persona_trajectories(trajectories))
+
+    results_df = pd.DataFrame(all_results)
+    final_df = pd.concat([df.reset_index(drop=True), results_df], axis=1)
+    attach_outcome_matrix(final_df, OutcomeMatrix.from_trajectories(
+        [result['trajectories'] for result in all_results], step_names
+    ))
+
+    if verbose:
+        print(f"\n✅ Intent-aware batch simulation complete!")
+        print(f"   Avg completion rate: {results_df['completion_rate'].mean():.1%}")
+        print(f"   Total intent mismatches: {results_df['intent_mismatch_count'].sum():,}")
+
+    return final_df
@@ -20,8 +20,11 @@ from dataclasses import dataclass
 from enum import Enum
 from collections import Counter
 
+from dropsim_outcome_matrix import OutcomeMatrix, attach_outcome_matrix
+
 # Import original functions we'll reuse
 from behavioral_engine import (
+    PRODUCT_STEPS,
     FailureReason,
     STATE_VARIANTS,
     normalize_persona_inputs,
@@ -180,6 +183,52 @@ def compute_archetype_modifiers(priors: Dict, persona_inputs: Dict) -> Dict:
     return modifiers
 
 
+# ============================================================================
+# ENGINE PARAMETERS
+# ============================================================================
+
+@dataclass(frozen=True)
+class EngineParameters:
+    """
+    Calibratable constants of the continuation model.
+    
+    Passed explicitly down the call chain (never patched into the module),
+    so simulations with different parameter sets can run side by side in
+    one process or across a process pool. Defaults are the values the
+    engine has always used.
+    """
+    base_completion_rate: float = 0.60  # Floor on the continuation probability
+    persistence_bonus_start: float = 0.18  # Persistence bonus at step 0
+    persistence_bonus_rate: float = 0.22  # Extra persistence bonus per unit of progress
+    value_sensitivity: float = 1.0  # Multiplier on the high-value bonus
+    intent_penalty_weight: float = 0.025  # Max intent-mismatch reduction per step
+    
+    @classmethod
+    def from_dict(cls, parameters: Optional[Dict[str, float]]) -> 'EngineParameters':
+        """
+        Build from a calibration parameter dict (e.g. {'BASE_COMPLETION_RATE': 0.5}).
+        
+        Keys are matched case-insensitively; keys the engine does not use
+        (e.g. ENTRY_PROBABILITY_SCALE) are ignored, missing keys keep their
+        defaults.
+        """
+        if not parameters:
+            return cls()
+        values = {key.lower(): value for key, value in parameters.items()}
+        return cls(**{
+            name: float(values[name])
+            for name in cls.__dataclass_fields__
+            if name in values
+        })
+    
+    def to_dict(self) -> Dict[str, float]:
+        """Calibration-style dict (upper-case parameter names)."""
+        return {name.upper(): getattr(self, name) for name in self.__dataclass_fields__}
+
+
+DEFAULT_ENGINE_PARAMETERS = EngineParameters()
+
+
 # ============================================================================
 # PROBABILISTIC CONTINUATION DECISION
 # ============================================================================
@@ -189,7 +238,8 @@ def should_continue_probabilistic(
     priors: Dict,
     step_index: int,
     total_steps: int,
-    modifiers: Optional[Dict] = None
+    modifiers: Optional[Dict] = None,
+    parameters: Optional[EngineParameters] = None
 ) -> float:
     """
     Compute continuation probability (0 to 1), not binary decision.
@@ -200,10 +250,14 @@ def should_continue_probabilistic(
     - Commitment effect (sunk cost increases persistence)
     - Individual variance (bounded randomness)
     - Minimum persistence (prevents total collapse)
+    
+    parameters: Calibrated constants (DEFAULT_ENGINE_PARAMETERS if None)
     """
     if modifiers is None:
         modifiers = {'base_persistence': 1.0, 'value_sensitivity': 1.0, 
                      'fatigue_resilience': 1.0, 'risk_tolerance_mult': 1.0}
+    if parameters is None:
+        parameters = DEFAULT_ENGINE_PARAMETERS
     
     # Base decision strength (current model)
     left = (state.perceived_value * priors['MS']) + state.perceived_control
@@ -253,7 +307,7 @@ def should_continue_probabilistic(
     
     # Value sensitivity: High value has more impact for value-sensitive users
     if state.perceived_value > 0.6:
-        value_bonus = (state.perceived_value - 0.6) * 0.2 * modifiers['value_sensitivity']
+        value_bonus = (state.perceived_value - 0.6) * 0.2 * modifiers['value_sensitivity'] * parameters.value_sensitivity
         adjusted_prob += value_bonus
     
     # Fatigue resilience: Fatigue has less impact for resilient users
@@ -265,12 +319,12 @@ def should_continue_probabilistic(
     # 6. BASE COMPLETION BIAS: Users are more persistent than assumed
     # This reflects real-world stickiness
     # Maximum aggressive increase to prevent collapse
-    BASE_COMPLETION_PROB = 0.60  # Increased to 0.60 (60% base)
+    BASE_COMPLETION_PROB = parameters.base_completion_rate  # 0.60 by default (60% base)
     adjusted_prob = max(BASE_COMPLETION_PROB, adjusted_prob)
     
     # 7. PERSISTENCE BIAS: People continue even when unsure
     # Human stickiness increases with progress
-    persistence_bonus = 0.18 + 0.22 * progress  # 18% at start, up to 40% at end
+    persistence_bonus = parameters.persistence_bonus_start + parameters.persistence_bonus_rate * progress  # 18% at start, up to 40% at end (defaults)
     adjusted_prob += persistence_bonus
     
     # Ensure we don't exceed 95% (cap)
@@ -350,7 +404,8 @@ def should_continue_improved(
     step_index: int,
     total_steps: int,
     modifiers: Optional[Dict] = None,
-    seed: Optional[int] = None
+    seed: Optional[int] = None,
+    parameters: Optional[EngineParameters] = None
 ) -> bool:
     """
     Probabilistic decision: sample from continuation probability.
@@ -360,7 +415,7 @@ def should_continue_improved(
     if seed is not None:
         np.random.seed(seed)
     
-    prob = should_continue_probabilistic(state, priors, step_index, total_steps, modifiers)
+    prob = should_continue_probabilistic(state, priors, step_index, total_steps, modifiers, parameters=parameters)
     
     # Add individual variance (bounded randomness)
     personality_noise = np.random.normal(0, 0.15)  # ±15% variance
@@ -565,7 +620,8 @@ def simulate_persona_trajectories_improved(
     derived: Dict,
     variant_names: Optional[List[str]] = None,
     product_steps: Optional[Dict] = None,
-    seed: Optional[int] = None
+    seed: Optional[int] = None,
+    parameters: Optional[EngineParameters] = None
 ) -> List[Dict]:
     """
     Simulate one persona across multiple state variants with improved model.
@@ -576,6 +632,8 @@ def simulate_persona_trajectories_improved(
     - Value override for fatigue
     - Commitment effect
     - Heterogeneous behavior
+    
+    parameters: Calibrated constants (defaults if None)
     """
     if variant_names is None:
         variant_names = list(STATE_VARIANTS.keys())
@@ -593,7 +651,6 @@ def simulate_persona_trajectories_improved(
     modifiers = compute_archetype_modifiers(priors, inputs)
     
     # Use custom product steps if provided, else default
-    from behavioral_engine import PRODUCT_STEPS
     steps_to_use = product_steps if product_steps else PRODUCT_STEPS
     
     # Simulate each variant
@@ -634,7 +691,8 @@ def simulate_persona_trajectories_improved(
             
             # IMPROVED: Probabilistic continuation decision
             if not should_continue_improved(
-                state, priors, step_index, total_steps, modifiers, seed=variant_seed
+                state, priors, step_index, total_steps, modifiers, seed=variant_seed,
+                parameters=parameters
             ):
                 exit_step = step_name
                 failure_reason = identify_failure_reason_improved(costs, state)
@@ -678,7 +736,8 @@ def run_behavioral_simulation_improved(
     df: pd.DataFrame,
     verbose: bool = True,
     product_steps: Optional[Dict] = None,
-    seed: int = 42
+    seed: int = 42,
+    parameters: Optional[EngineParameters] = None
 ) -> pd.DataFrame:
     """
     Run improved behavioral simulation on all personas.
@@ -688,6 +747,8 @@ def run_behavioral_simulation_improved(
     - Energy recovery
     - Value override
     - Heterogeneous behavior
+    
+    parameters: Calibrated constants (EngineParameters); defaults if None
     """
     if verbose:
         print("🧠 Running Improved Behavioral Simulation")
@@ -715,7 +776,8 @@ def run_behavioral_simulation_improved(
         # Simulate trajectories (IMPROVED)
         persona_seed = seed + idx * 10000  # Unique seed per persona
         trajectories = simulate_persona_trajectories_improved(
-            row, derived, product_steps=product_steps, seed=persona_seed
+            row, derived, product_steps=product_steps, seed=persona_seed,
+            parameters=parameters
         )
         
         # Aggregate across variants for this persona
@@ -765,6 +827,9 @@ def run_behavioral_simulation_improved(
     # Merge results
     results_df = pd.DataFrame(all_results)
     final_df = pd.concat([df.reset_index(drop=True), results_df], axis=1)
+    attach_outcome_matrix(final_df, OutcomeMatrix.from_trajectories(
+        [r['trajectories'] for r in all_results], list((product_steps or PRODUCT_STEPS).keys())
+    ))
     
     if verbose:
         print(f"\n✅ Improved behavioral simulation complete!")
@@ -10,6 +10,8 @@ import pandas as pd
 from typing import Dict, List, Tuple, Optional
 from collections import Counter
 import json
+import warnings
+from dataclasses import dataclass
 from datetime import datetime
 
 # Import improved behavioral engine
@@ -19,8 +21,14 @@ from behavioral_engine_improved import (
     should_continue_probabilistic,
     update_state_improved,
     InternalState,
-    FailureReason
+    FailureReason,
+    EngineParameters,
+    DEFAULT_ENGINE_PARAMETERS,
+    initialize_state,
+    identify_failure_reason_improved
 )
+from dropsim_prior_cache import compile_persona_priors, get_prior_cache
+from dropsim_outcome_matrix import OutcomeMatrix, OutcomeMatrixBuilder, attach_outcome_matrix
 
 # Import intent modeling
 from dropsim_intent_model import (
@@ -33,11 +41,220 @@ from dropsim_intent_model import (
     CREDIGO_GLOBAL_INTENT
 )
 
+# Decision traces and attribution (imported once here, not per step)
+from decision_graph.decision_trace import create_decision_trace, DecisionOutcome
+from decision_attribution import shap_attributor
+
+
+# State variants simulated for every persona (order fixes the per-variant seeds)
+INTENT_AWARE_VARIANTS = [
+    'fresh_motivated', 'tired_commuter', 'distrustful_arrival',
+    'browsing_casually', 'urgent_need', 'price_sensitive',
+    'tech_savvy_optimistic'
+]
+
+# Per-trajectory random streams (see trajectory_rng)
+RNG_MODES = ("legacy", "generator")
+
+# What each trajectory records, lightest first:
+# - metrics: exit step and steps entered (completion / drop-off counters)
+# - summary: + failure reason, intent frame and final state
+# - traces: + per-step journey, intent mismatches and decision traces
+# - full: + Shapley attribution on every decision trace
+CAPTURE_LEVELS = ("metrics", "summary", "traces", "full")
+TRACE_CAPTURE_LEVELS = ("traces", "full")
+
+# Derived feature columns passed through to normalize_persona_inputs
+DERIVED_FEATURE_COLUMNS = [
+    'urban_rural', 'regional_cluster',
+    'digital_literacy_score', 'aspirational_score',
+    'english_score', 'openness_score',
+    'trust_score', 'status_quo_score',
+    'debt_aversion_score', 'cc_relevance_score',
+    'generation_bucket'
+]
+
+
+# ============================================================================
+# STEP / INTENT TABLE
+# ============================================================================
+
+# Step attributes compiled into StepIntentTable.demands (missing = 0.0)
+STEP_DEMAND_FIELDS = [
+    'cognitive_demand', 'effort_demand', 'risk_signal', 'irreversibility',
+    'explicit_value', 'reassurance_signal', 'delay_to_value'
+]
+
+# Compiled tables kept per process (oldest evicted first)
+STEP_TABLE_CACHE_SIZE = 32
+_STEP_TABLE_CACHE: Dict[str, 'StepIntentTable'] = {}
+
+
+@dataclass(frozen=True)
+class StepIntentTable:
+    """
+    Everything the intent-aware engine derives from (step, intent) alone.
+    
+    Alignment, mismatch verdicts and attribution step forces depend only on
+    the step definition, the intent frame and the step's position, so they
+    are compiled once per run (compile_step_intent_table) and every
+    trajectory indexes into the table instead of recomputing them.
+    
+    Per-intent arrays are (n_intents, n_steps), row i = intent_ids[i],
+    column k = step_names[k]; per-step arrays are (n_steps,). Arrays are
+    read-only.
+    """
+    step_names: Tuple[str, ...]
+    intent_ids: Tuple[str, ...]
+    demands: Dict[str, np.ndarray]  # STEP_DEMAND_FIELDS -> (n_steps,)
+    intent_signals: np.ndarray  # step's intent_signals entry, NaN if the step has none
+    alignment: np.ndarray  # compute_intent_alignment_score
+    is_mismatch: np.ndarray  # identify_intent_mismatch verdicts (bool)
+    mismatch_score: np.ndarray
+    mismatch_types: Tuple[Tuple[Optional[str], ...], ...]
+    explanations: Tuple[Tuple[str, ...], ...]
+    step_forces: Tuple[Dict[str, float], ...]  # Attribution step forces per step
+    key: str  # Content hash of (product_steps, intent frames)
+    
+    def intent_index(self, intent_id: str) -> int:
+        """Row of intent_id in the per-intent arrays."""
+        try:
+            return self.intent_ids.index(intent_id)
+        except ValueError:
+            raise ValueError(f"Step table was not compiled for intent '{intent_id}'") from None
+    
+    def mismatch_record(self, intent_index: int, step_index: int) -> Dict:
+        """Entry for a trajectory's 'intent_mismatches' list."""
+        return {
+            'step': self.step_names[step_index],
+            'mismatch_score': self.mismatch_score[intent_index, step_index],
+            'violated_intent': self.intent_ids[intent_index],
+            'mismatch_type': self.mismatch_types[intent_index][step_index],
+            'explanation': self.explanations[intent_index][step_index]
+        }
+
+
+def candidate_intent_frames(
+    intent_distribution: Optional[Dict[str, float]] = None,
+    fixed_intent: Optional[IntentFrame] = None
+) -> List[IntentFrame]:
+    """Intent frames a run can sample: the fixed intent, or every intent in the distribution."""
+    if fixed_intent is not None:
+        return [fixed_intent]
+    if intent_distribution is not None:
+        return [CANONICAL_INTENTS[intent_id] for intent_id in intent_distribution]
+    raise ValueError("Either fixed_intent or intent_distribution must be provided")
+
+
+def _read_only(values, dtype=float) -> np.ndarray:
+    array = np.array(values, dtype=dtype)
+    array.flags.writeable = False
+    return array
+
+
+def compile_step_intent_table(
+    product_steps: Dict,
+    intent_frames: List[IntentFrame]
+) -> StepIntentTable:
+    """
+    Compile product_steps × intent_frames into a StepIntentTable.
+    
+    Memoized per process on the content of the steps and frames, so
+    repeated runs over the same steps (calibration iterations, counterfactual
+    replays) reuse one table, while edited steps get a fresh one.
+    """
+    from dropsim_result_cache import canonical_hash
+    key = canonical_hash('step_intent_table', product_steps, [frame.to_dict() for frame in intent_frames])
+    table = _STEP_TABLE_CACHE.get(key)
+    if table is not None:
+        return table
+    
+    step_items = list(product_steps.items())
+    total_steps = len(step_items)
+    analyses = [
+        [identify_intent_mismatch(step_def, frame, k, total_steps, "System 2 fatigue")
+         for k, (_, step_def) in enumerate(step_items)]
+        for frame in intent_frames
+    ]
+    
+    table = StepIntentTable(
+        step_names=tuple(name for name, _ in step_items),
+        intent_ids=tuple(frame.intent_id for frame in intent_frames),
+        demands={
+            field: _read_only([step_def.get(field, 0.0) for _, step_def in step_items])
+            for field in STEP_DEMAND_FIELDS
+        },
+        intent_signals=_read_only([
+            [step_def['intent_signals'].get(frame.intent_id, 0.5) if 'intent_signals' in step_def else np.nan
+             for _, step_def in step_items]
+            for frame in intent_frames
+        ]),
+        alignment=_read_only([[a['alignment_score'] for a in row] for row in analyses]),
+        is_mismatch=_read_only([[a['is_intent_mismatch'] for a in row] for row in analyses], dtype=bool),
+        mismatch_score=_read_only([[a['mismatch_score'] for a in row] for row in analyses]),
+        mismatch_types=tuple(tuple(a['mismatch_type'] for a in row) for row in analyses),
+        explanations=tuple(tuple(a['explanation'] for a in row) for row in analyses),
+        step_forces=tuple(
+            {
+                'step_effort': step_def.get('effort_demand', 0.0),
+                'step_risk': step_def.get('risk_signal', 0.0),
+                'step_value': step_def.get('explicit_value', 0.0),
+                'step_trust': step_def.get('reassurance_signal', 0.0)
+            }
+            for _, step_def in step_items
+        ),
+        key=key
+    )
+    
+    while len(_STEP_TABLE_CACHE) >= STEP_TABLE_CACHE_SIZE:
+        _STEP_TABLE_CACHE.pop(next(iter(_STEP_TABLE_CACHE)))
+    _STEP_TABLE_CACHE[key] = table
+    return table
+
 
 # ============================================================================
 # INTENT-AWARE SIMULATION
 # ============================================================================
 
+def trajectory_rng(seed: int, persona_index: int, variant_index: int, rng_mode: str = "legacy"):
+    """
+    Independent random stream for one (persona, variant) trajectory.
+    
+    No global numpy state is touched, so trajectories can run in any order
+    or process and still draw the same numbers.
+    
+    Args:
+        seed: Run seed
+        persona_index: Persona's DataFrame index label
+        variant_index: Position in INTENT_AWARE_VARIANTS
+        rng_mode: "legacy" - RandomState seeded with
+            seed + persona_index * 10000 + variant_index * 1000, the seeds
+            this engine has always used (results unchanged);
+            "generator" - np.random.Generator seeded from the
+            (seed, persona_index, variant_index) tuple, free of the
+            collisions the seed arithmetic allows
+    """
+    if rng_mode == "legacy":
+        return np.random.RandomState(seed + persona_index * 10000 + variant_index * 1000)
+    if rng_mode == "generator":
+        return np.random.default_rng([seed, persona_index, variant_index])
+    raise ValueError(f"Unknown rng_mode '{rng_mode}'. Expected one of {RNG_MODES}")
+
+
+def resolve_policy_version() -> str:
+    """
+    Current policy version for stamping decision traces (enforced policy versioning).
+    
+    Resolve once per run; the registry lookup is memoized per process.
+    """
+    try:
+        from policy_registry.get_current_policy import get_current_policy_version
+        return get_current_policy_version()
+    except:
+        # Fallback to default if policy registry not available
+        return "v1.0"
+
+
 def simulate_persona_trajectory_intent_aware(
     row: pd.Series,
     derived: Dict,
@@ -45,7 +262,13 @@ def simulate_persona_trajectory_intent_aware(
     product_steps: Dict,
     intent_distribution: Optional[Dict[str, float]] = None,
     fixed_intent: Optional[IntentFrame] = None,
-    seed: Optional[int] = None
+    seed: Optional[int] = None,
+    policy_version: Optional[str] = None,
+    rng=None,
+    parameters: Optional[EngineParameters] = None,
+    step_table: Optional[StepIntentTable] = None,
+    persona_priors: Optional[Tuple[Dict, Dict]] = None,
+    capture: str = "full"
 ) -> Dict:
     """
     Simulate one persona trajectory with intent awareness.
@@ -59,9 +282,33 @@ def simulate_persona_trajectory_intent_aware(
     Args:
         fixed_intent: If provided, use this intent for all users (no sampling)
         intent_distribution: If fixed_intent is None, sample from this distribution
+        policy_version: Policy version stamped on every decision trace
+            (resolved from the policy registry if not provided)
+        rng: Random stream for this trajectory (see trajectory_rng). If not
+            given, a RandomState seeded with `seed`, or the global numpy
+            stream when seed is None as well.
+        parameters: Calibrated engine constants (defaults if None)
+        step_table: Compiled step/intent table for product_steps and the
+            candidate intents (compiled here, memoized, if not given)
+        persona_priors: (priors, modifiers) compiled for this persona, e.g.
+            PersonaPriors.row(); compiled from row and derived if not given
+        capture: What the trajectory records (see CAPTURE_LEVELS); lighter
+            levels skip the bookkeeping entirely but draw the same random
+            numbers, so exits are identical at every level
     """
-    if seed is not None:
-        np.random.seed(seed)
+    if capture not in CAPTURE_LEVELS:
+        raise ValueError(f"Unknown capture level '{capture}'. Expected one of {CAPTURE_LEVELS}")
+    record_summary = capture != "metrics"
+    record_traces = capture in TRACE_CAPTURE_LEVELS
+    record_attribution = capture == "full"
+    
+    if rng is None:
+        rng = np.random.RandomState(seed) if seed is not None else np.random
+    if parameters is None:
+        parameters = DEFAULT_ENGINE_PARAMETERS
+    
+    if policy_version is None and record_traces:
+        policy_version = resolve_policy_version()
     
     # Use fixed intent if provided, otherwise sample from distribution
     if fixed_intent is not None:
@@ -72,22 +319,25 @@ def simulate_persona_trajectory_intent_aware(
         # Probabilistic intent sampling (for products with variable intents)
         intent_ids = list(intent_distribution.keys())
         intent_probs = list(intent_distribution.values())
-        sampled_intent_id = np.random.choice(intent_ids, p=intent_probs)
+        sampled_intent_id = rng.choice(intent_ids, p=intent_probs)
         intent_frame = CANONICAL_INTENTS[sampled_intent_id]
     else:
         raise ValueError("Either fixed_intent or intent_distribution must be provided")
     
-    # Run base simulation (reuse improved engine)
-    from behavioral_engine_improved import (
-        normalize_persona_inputs,
-        compile_latent_priors,
-        initialize_state,
-        compute_archetype_modifiers
-    )
+    if step_table is None:
+        step_table = compile_step_intent_table(
+            product_steps, candidate_intent_frames(intent_distribution, fixed_intent)
+        )
+    intent_index = step_table.intent_index(sampled_intent_id)
+    alignments = step_table.alignment[intent_index]
+    mismatches = step_table.is_mismatch[intent_index]
+    mismatch_scores = step_table.mismatch_score[intent_index]
+    mismatch_types = step_table.mismatch_types[intent_index]
     
-    inputs = normalize_persona_inputs(row, derived)
-    priors = compile_latent_priors(inputs)
-    modifiers = compute_archetype_modifiers(priors, inputs)
+    # Run base simulation (reuse improved engine)
+    if persona_priors is None:
+        persona_priors = compile_persona_priors(row, derived)
+    priors, modifiers = persona_priors
     
     state = initialize_state(variant_name, priors)
     journey = []
@@ -95,6 +345,7 @@ def simulate_persona_trajectory_intent_aware(
     failure_reason = None
     intent_mismatches = []
     decision_traces = []  # NEW: Decision traces for this trajectory
+    attribution_requests = []  # One per decision trace, attributed after the loop
     
     total_steps = len(product_steps)
     previous_step = None
@@ -108,21 +359,25 @@ def simulate_persona_trajectory_intent_aware(
             state, step_def, priors, step_index, total_steps, previous_step=previous_step
         )
         
-        # Compute intent alignment
-        alignment = compute_intent_alignment_score(step_def, intent_frame, step_index, total_steps)
+        # Intent alignment and mismatch verdict (precompiled per step and intent)
+        alignment = alignments[step_index]
+        is_mismatch = mismatches[step_index]
+        mismatch_score = mismatch_scores[step_index]
         
         # Compute base continuation probability (from improved engine)
         base_prob = should_continue_probabilistic(
-            state, priors, step_index, total_steps, modifiers
+            state, priors, step_index, total_steps, modifiers, parameters=parameters
         )
         
         # Adjust for intent alignment (FIXED: bounded additive scoring)
         continuation_prob, prob_diagnostic = compute_intent_conditioned_continuation_prob(
-            base_prob, intent_frame, step_def, step_index, total_steps, state
+            base_prob, intent_frame, step_def, step_index, total_steps, state,
+            intent_penalty_weight=parameters.intent_penalty_weight,
+            alignment=alignment
         )
         
         # Add individual variance (reduced noise)
-        personality_noise = np.random.normal(0, 0.08)  # Reduced noise
+        personality_noise = rng.normal(0, 0.08)  # Reduced noise
         final_prob = np.clip(continuation_prob + personality_noise, 0.05, 0.95)
         
         # RULE 5: Enforce hard probability bounds (final check)
@@ -130,194 +385,157 @@ def simulate_persona_trajectory_intent_aware(
         MIN_FINAL_PROB = 0.35  # 35% absolute minimum (maximum aggressive increase)
         final_prob = np.clip(final_prob, MIN_FINAL_PROB, 0.95)
         
-        # Check for intent mismatch (how well does step serve the known goal)
-        intent_analysis = identify_intent_mismatch(
-            step_def, intent_frame, step_index, total_steps, "System 2 fatigue"
-        )
+        # Sample outcome
+        sampled_value = rng.random()
+        sampled_outcome = sampled_value < final_prob  # True = continue, False = drop
         
-        if intent_analysis['is_intent_mismatch']:
-            intent_mismatches.append({
+        if record_traces:
+            # Record intent mismatch (how well does step serve the known goal)
+            if is_mismatch:
+                intent_mismatches.append(step_table.mismatch_record(intent_index, step_index))
+            
+            # Record step with intent information and full diagnostic
+            journey.append({
                 'step': step_name,
-                'mismatch_score': intent_analysis['mismatch_score'],
-                'violated_intent': intent_analysis['violated_intent'],
-                'mismatch_type': intent_analysis['mismatch_type'],
-                'explanation': intent_analysis['explanation']
+                'cognitive_energy': state.cognitive_energy,
+                'perceived_risk': state.perceived_risk,
+                'perceived_effort': state.perceived_effort,
+                'perceived_value': state.perceived_value,
+                'perceived_control': state.perceived_control,
+                'costs': costs,
+                'intent_alignment': alignment,
+                'intent_id': sampled_intent_id,
+                'probability_diagnostic': prob_diagnostic,  # Full diagnostic output
+                'continuation_probability': final_prob,
+                'continue': "True"
             })
-        
-        # Record step with intent information and full diagnostic
-        journey.append({
-            'step': step_name,
-            'cognitive_energy': state.cognitive_energy,
-            'perceived_risk': state.perceived_risk,
-            'perceived_effort': state.perceived_effort,
-            'perceived_value': state.perceived_value,
-            'perceived_control': state.perceived_control,
-            'costs': costs,
-            'intent_alignment': alignment,
-            'intent_id': sampled_intent_id,
-            'probability_diagnostic': prob_diagnostic,  # Full diagnostic output
-            'continuation_probability': final_prob,
-            'continue': "True"
-        })
-        
-        # NEW: Capture decision trace AT DECISION TIME (before sampling)
-        from decision_graph.decision_trace import (
-            create_decision_trace,
-            DecisionOutcome
-        )
-        
-        # Determine dominant factors from diagnostic and state
-        dominant_factors = []
-        if prob_diagnostic and isinstance(prob_diagnostic, dict):
-            # Extract dominant factors from diagnostic
-            if 'penalties' in prob_diagnostic:
-                penalties = prob_diagnostic['penalties']
-                if penalties.get('intent', 0) > 0.05:
+            
+            # NEW: Capture decision trace AT DECISION TIME (before sampling)
+            # Determine dominant factors from diagnostic and state
+            dominant_factors = []
+            if prob_diagnostic and isinstance(prob_diagnostic, dict):
+                # Extract dominant factors from diagnostic
+                if 'penalties' in prob_diagnostic:
+                    penalties = prob_diagnostic['penalties']
+                    if penalties.get('intent', 0) > 0.05:
+                        dominant_factors.append('intent_mismatch')
+                    if penalties.get('cognitive', 0) > 0.05:
+                        dominant_factors.append('cognitive_fatigue')
+                    if penalties.get('risk', 0) > 0.05:
+                        dominant_factors.append('risk_spike')
+                    if penalties.get('effort', 0) > 0.05:
+                        dominant_factors.append('effort_demand')
+            
+            # If no dominant factors from diagnostic, use failure reason logic
+            if not dominant_factors:
+                if is_mismatch and mismatch_score > 0.4:
                     dominant_factors.append('intent_mismatch')
-                if penalties.get('cognitive', 0) > 0.05:
+                if state.cognitive_energy < 0.3:
                     dominant_factors.append('cognitive_fatigue')
-                if penalties.get('risk', 0) > 0.05:
+                if state.perceived_risk > 0.7:
                     dominant_factors.append('risk_spike')
-                if penalties.get('effort', 0) > 0.05:
+                if state.perceived_effort > 0.7:
                     dominant_factors.append('effort_demand')
-        
-        # If no dominant factors from diagnostic, use failure reason logic
-        if not dominant_factors:
-            if intent_analysis.get('is_intent_mismatch') and intent_analysis.get('mismatch_score', 0) > 0.4:
-                dominant_factors.append('intent_mismatch')
-            if state.cognitive_energy < 0.3:
-                dominant_factors.append('cognitive_fatigue')
-            if state.perceived_risk > 0.7:
-                dominant_factors.append('risk_spike')
-            if state.perceived_effort > 0.7:
-                dominant_factors.append('effort_demand')
-        
-        if not dominant_factors:
-            dominant_factors = ['multi_factor']
-        
-        # Sample outcome
-        sampled_value = np.random.random()
-        sampled_outcome = sampled_value < final_prob  # True = continue, False = drop
-        
-        # Create decision trace BEFORE we know the outcome
-        # (This is the key - capture at decision time)
-        decision = DecisionOutcome.CONTINUE if sampled_outcome else DecisionOutcome.DROP
-        
-        cognitive_state_dict = {
-            'cognitive_energy': state.cognitive_energy,
-            'perceived_risk': state.perceived_risk,
-            'perceived_effort': state.perceived_effort,
-            'perceived_value': state.perceived_value,
-            'perceived_control': state.perceived_control
-        }
-        
-        intent_info_dict = {
-            'inferred_intent': sampled_intent_id,
-            'alignment_score': alignment
-        }
-        
-        # Get current policy version (enforced policy versioning)
-        try:
-            from policy_registry.get_current_policy import get_current_policy_version
-            current_policy_version = get_current_policy_version()
-        except:
-            # Fallback to default if policy registry not available
-            current_policy_version = "v1.0"
-        
-        trace = create_decision_trace(
-            persona_id=persona_id,
-            step_id=step_name,
-            step_index=step_index,
-            decision=decision,
-            probability_before_sampling=final_prob,
-            sampled_outcome=sampled_outcome,
-            cognitive_state=cognitive_state_dict,
-            intent_info=intent_info_dict,
-            dominant_factors=dominant_factors,
-            policy_version=current_policy_version
-        )
-        
-        # Compute decision attribution (game-theoretic force attribution)
-        try:
-            from decision_attribution.shap_attributor import compute_decision_attribution
             
-            # Extract step forces from step_def
-            step_forces = {
-                'step_effort': step_def.get('effort_demand', 0.0),
-                'step_risk': step_def.get('risk_signal', 0.0),
-                'step_value': step_def.get('explicit_value', 0.0),
-                'step_trust': step_def.get('reassurance_signal', 0.0)
-            }
+            if not dominant_factors:
+                dominant_factors = ['multi_factor']
+            
+            # Create decision trace BEFORE we know the outcome
+            # (This is the key - capture at decision time)
+            decision = DecisionOutcome.CONTINUE if sampled_outcome else DecisionOutcome.DROP
             
-            # Extract cognitive state with tolerances from priors
-            cognitive_state_for_attribution = {
+            cognitive_state_dict = {
                 'cognitive_energy': state.cognitive_energy,
                 'perceived_risk': state.perceived_risk,
                 'perceived_effort': state.perceived_effort,
                 'perceived_value': state.perceived_value,
-                'perceived_control': state.perceived_control,
-                'effort_tolerance': priors.get('ET', 0.5),  # Effort Tolerance
-                'risk_tolerance': priors.get('RT', 0.5),    # Risk Tolerance
-                'trust_baseline': priors.get('TB', 0.5),   # Trust Baseline
-                'value_expectation': priors.get('MS', 0.5)  # Motivation Strength (value expectation)
+                'perceived_control': state.perceived_control
             }
             
-            # Extract intent info
-            intent_attribution_info = {
-                'intent_strength': intent_frame.tolerance_for_effort if fixed_intent else 0.5,
-                'intent_mismatch': intent_analysis.get('mismatch_score', 0.0) if intent_analysis.get('is_intent_mismatch', False) else 0.0
+            intent_info_dict = {
+                'inferred_intent': sampled_intent_id,
+                'alignment_score': alignment
             }
             
-            # Compute attribution
-            attribution = compute_decision_attribution(
-                cognitive_state=cognitive_state_for_attribution,
-                step_forces=step_forces,
-                intent_info=intent_attribution_info,
+            trace = create_decision_trace(
+                persona_id=persona_id,
                 step_id=step_name,
                 step_index=step_index,
-                total_steps=total_steps,
-                decision=decision.value,
-                final_probability=final_prob,
-                modifiers=modifiers,
-                intent_alignment=alignment
+                decision=decision,
+                probability_before_sampling=final_prob,
+                sampled_outcome=sampled_outcome,
+                cognitive_state=cognitive_state_dict,
+                intent_info=intent_info_dict,
+                dominant_factors=dominant_factors,
+                policy_version=policy_version
             )
             
-            # Attach attribution to trace
-            trace.attribution = attribution
-        except Exception as e:
-            # If attribution fails, continue without it (non-critical)
-            import warnings
-            warnings.warn(f"Failed to compute attribution for {step_name}: {e}")
-        
-        decision_traces.append(trace)
+            if record_attribution:
+                # Queue decision attribution (game-theoretic force attribution);
+                # computed for the whole trajectory in one batch below
+                step_forces = step_table.step_forces[step_index]
+                
+                # Cognitive state with tolerances from priors
+                cognitive_state_for_attribution = {
+                    'cognitive_energy': state.cognitive_energy,
+                    'perceived_risk': state.perceived_risk,
+                    'perceived_effort': state.perceived_effort,
+                    'perceived_value': state.perceived_value,
+                    'perceived_control': state.perceived_control,
+                    'effort_tolerance': priors.get('ET', 0.5),  # Effort Tolerance
+                    'risk_tolerance': priors.get('RT', 0.5),    # Risk Tolerance
+                    'trust_baseline': priors.get('TB', 0.5),   # Trust Baseline
+                    'value_expectation': priors.get('MS', 0.5)  # Motivation Strength (value expectation)
+                }
+                
+                intent_attribution_info = {
+                    'intent_strength': intent_frame.tolerance_for_effort if fixed_intent else 0.5,
+                    'intent_mismatch': mismatch_score if is_mismatch else 0.0
+                }
+                
+                attribution_requests.append({
+                    'cognitive_state': cognitive_state_for_attribution,
+                    'step_forces': step_forces,
+                    'intent_info': intent_attribution_info,
+                    'step_id': step_name,
+                    'step_index': step_index,
+                    'total_steps': total_steps,
+                    'decision': decision.value,
+                    'final_probability': final_prob,
+                    'modifiers': modifiers,
+                    'intent_alignment': alignment
+                })
+            
+            decision_traces.append(trace)
         
         # Decision
         if not sampled_outcome:  # Dropped
             exit_step = step_name
+            steps_entered = step_index + 1
+            if record_traces:
+                journey[-1]['continue'] = "False"
+            if not record_summary:
+                break
             
             # Determine failure reason
             # For fixed intent: focus on friction, not intent mismatch
             # Intent mismatch should only be cited if step clearly blocks the known goal
             if fixed_intent is not None:
                 # Fixed intent: explain as friction blocking the known goal
-                if intent_analysis['is_intent_mismatch'] and intent_analysis['mismatch_score'] > 0.5:
+                if is_mismatch and mismatch_score > 0.5:
                     # Step clearly blocks the known goal
-                    failure_reason = f"Step blocked comparison goal: {intent_analysis['mismatch_type']}"
+                    failure_reason = f"Step blocked comparison goal: {mismatch_types[step_index]}"
                 else:
                     # Use behavioral failure reason (friction-based)
-                    from behavioral_engine_improved import identify_failure_reason_improved
                     failure_reason_enum = identify_failure_reason_improved(costs, state)
                     failure_reason = failure_reason_enum.value if failure_reason_enum else "High friction"
             else:
                 # Probabilistic intent: can cite intent mismatch
-                if intent_analysis['is_intent_mismatch'] and intent_analysis['mismatch_score'] > 0.4:
-                    failure_reason = f"Intent mismatch: {intent_analysis['mismatch_type']}"
+                if is_mismatch and mismatch_score > 0.4:
+                    failure_reason = f"Intent mismatch: {mismatch_types[step_index]}"
                 else:
-                    from behavioral_engine_improved import identify_failure_reason_improved
                     failure_reason_enum = identify_failure_reason_improved(costs, state)
                     failure_reason = failure_reason_enum.value if failure_reason_enum else "Multi-factor"
-            
-            journey[-1]['continue'] = "False"
             break
         
         previous_step = step_def
@@ -325,40 +543,168 @@ def simulate_persona_trajectory_intent_aware(
     if exit_step is None:
         exit_step = "Completed"
         failure_reason = None
+        steps_entered = total_steps
     
-    # Determine final outcome for decision sequence
-    from decision_graph.decision_trace import DecisionOutcome
-    final_outcome = DecisionOutcome.CONTINUE if exit_step == "Completed" else DecisionOutcome.DROP
+    # Compute decision attribution for every step in one vectorized pass
+    if record_attribution:
+        try:
+            attributions = shap_attributor.compute_decision_attributions_batch(attribution_requests)
+            for trace, attribution in zip(decision_traces, attributions):
+                trace.attribution = attribution
+        except Exception as e:
+            # If attribution fails, continue without it (non-critical)
+            warnings.warn(f"Failed to compute attribution for {persona_id}: {e}")
     
-    return {
+    trajectory = {
         'variant': variant_name,
         'intent_id': sampled_intent_id,
-        'intent_frame': intent_frame.to_dict(),
-        'journey': journey,
         'exit_step': exit_step,
         'failure_reason': failure_reason,
         'completed': exit_step == "Completed",
-        'intent_mismatches': intent_mismatches,
-        'final_state': {
+        'steps_entered': steps_entered,
+        'persona_id': persona_id  # For building sequences
+    }
+    if record_summary:
+        trajectory['intent_frame'] = intent_frame.to_dict()
+        trajectory['final_state'] = {
             'cognitive_energy': state.cognitive_energy,
             'perceived_risk': state.perceived_risk,
             'perceived_effort': state.perceived_effort,
             'perceived_value': state.perceived_value,
             'perceived_control': state.perceived_control
-        },
+        }
+    if record_traces:
+        trajectory['journey'] = journey
+        trajectory['intent_mismatches'] = intent_mismatches
         # NEW: Decision traces as first-class data
-        'decision_traces': decision_traces,  # List of DecisionTrace objects
-        'persona_id': persona_id  # For building sequences
+        trajectory['decision_traces'] = decision_traces  # List of DecisionTrace objects
+    return trajectory
+
+
+def summarize_persona_trajectories(trajectories: List[Dict]) -> Dict:
+    """
+    Aggregate one persona's variant trajectories into a result row.
+    
+    Shared by the scalar and batch engines so both produce identical columns.
+    """
+    # Aggregate results
+    exit_steps = [t['exit_step'] for t in trajectories]
+    failure_reasons = [t['failure_reason'] for t in trajectories if t['failure_reason']]
+    completed_count = sum(1 for t in trajectories if t['completed'])
+    
+    # Intent distribution in this persona's trajectories
+    intent_counts = Counter([t['intent_id'] for t in trajectories])
+    
+    # Intent mismatch analysis
+    all_mismatches = []
+    for traj in trajectories:
+        all_mismatches.extend(traj.get('intent_mismatches', []))
+    
+    exit_counter = Counter(exit_steps)
+    dominant_exit = exit_counter.most_common(1)[0][0]
+    
+    if failure_reasons:
+        reason_counter = Counter(failure_reasons)
+        dominant_reason = reason_counter.most_common(1)[0][0]
+    else:
+        dominant_reason = None
+    
+    consistency = exit_counter.most_common(1)[0][1] / len(trajectories)
+    
+    return {
+        'dominant_exit_step': dominant_exit,
+        'dominant_failure_reason': dominant_reason,
+        'consistency_score': consistency,
+        'variants_completed': completed_count,
+        'variants_total': len(trajectories),
+        'completion_rate': completed_count / len(trajectories),
+        'intent_distribution': dict(intent_counts),
+        'intent_mismatch_count': len(all_mismatches),
+        'trajectories': trajectories
     }
 
 
+def _simulate_persona_rows(
+    df: pd.DataFrame,
+    product_steps: Dict,
+    intent_distribution: Optional[Dict[str, float]],
+    fixed_intent: Optional[IntentFrame],
+    seed: int,
+    rng_mode: str,
+    policy_version: Optional[str],
+    trace_table: bool = False,
+    verbose: bool = False,
+    parameters: Optional[EngineParameters] = None,
+    step_table: Optional[StepIntentTable] = None,
+    capture: str = "full"
+) -> Tuple[List[Dict], Optional['DecisionTraceTable']]:
+    """
+    Simulate every persona row in df (one shard of a run).
+    
+    Module-level so it can be shipped to worker processes. Returns one
+    summarize_persona_trajectories() dict per row, in row order, plus the
+    shard's trace table when trace_table is set. In that case each
+    trajectory's traces are moved into the table as soon as its persona is
+    done, and the trajectory keeps only its '_trace_range' (start, stop).
+    """
+    results = []
+    builder = None
+    if trace_table:
+        from decision_graph.trace_table import DecisionTraceTableBuilder
+        builder = DecisionTraceTableBuilder()
+    
+    # Priors and modifiers once per persona (shared by all variants, and by
+    # later runs over the same personas via the prior cache)
+    compiled = get_prior_cache().compile(df)
+    
+    for position, (idx, row) in enumerate(df.iterrows()):
+        derived = {col: row[col] for col in DERIVED_FEATURE_COLUMNS if col in row.index}
+        persona_priors = compiled.row(position)
+        
+        # Simulate all variants with intent awareness
+        trajectories = []
+        
+        for variant_idx, variant_name in enumerate(INTENT_AWARE_VARIANTS):
+            traj = simulate_persona_trajectory_intent_aware(
+                row, derived, variant_name, product_steps,
+                intent_distribution=intent_distribution if fixed_intent is None else None,
+                fixed_intent=fixed_intent,
+                policy_version=policy_version,
+                rng=trajectory_rng(seed, idx, variant_idx, rng_mode),
+                parameters=parameters,
+                step_table=step_table,
+                persona_priors=persona_priors,
+                capture=capture
+            )
+            trajectories.append(traj)
+        
+        if builder is not None:
+            for traj in trajectories:
+                start = len(builder)
+                builder.extend(traj.pop('decision_traces'))
+                traj['_trace_range'] = (start, len(builder))
+        
+        results.append(summarize_persona_trajectories(trajectories))
+        
+        if verbose and (idx + 1) % 50 == 0:
+            print(f"   Simulated {idx + 1}/{len(df)} personas")
+    
+    return results, (builder.build() if builder is not None else None)
+
+
 def run_intent_aware_simulation(
     df: pd.DataFrame,
     product_steps: Dict,
     intent_distribution: Optional[Dict[str, float]] = None,
     fixed_intent: Optional[IntentFrame] = None,
     verbose: bool = True,
-    seed: int = 42
+    seed: int = 42,
+    n_workers: int = 1,
+    rng_mode: str = "legacy",
+    trace_table: bool = False,
+    parameters: Optional[EngineParameters] = None,
+    capture: str = "full",
+    trace_sink: Optional['TraceSink'] = None
 ) -> pd.DataFrame:
     """
     Run intent-aware behavioral simulation.
@@ -369,118 +715,165 @@ def run_intent_aware_simulation(
         intent_distribution: Optional pre-computed intent distribution
         verbose: Print progress
         seed: Random seed
+        n_workers: Worker processes; >1 shards the personas across a
+            process pool (None/0 = all cores). Results are identical to
+            n_workers=1 because every trajectory has its own random stream.
+        rng_mode: Per-trajectory random stream, see trajectory_rng
+        trace_table: Store decision traces in one columnar
+            DecisionTraceTable (result_df.attrs['decision_trace_table'])
+            instead of lists of DecisionTrace objects; each trajectory's
+            'decision_traces' becomes a zero-copy slice of it
+        parameters: Calibrated engine constants (EngineParameters, immutable
+            and picklable, so every shard runs with the same set); defaults
+            if None
+        capture: What each trajectory records (see CAPTURE_LEVELS):
+            'metrics' for completion and drop-off counts only, 'summary' to
+            add failure reasons and final states, 'traces' for journeys and
+            decision traces, 'full' to add attribution. Exits are identical
+            at every level.
+        trace_sink: Stream trajectories to this sink (dropsim_trace_sink)
+            in batches of TRACE_SINK_BATCH_PERSONAS personas instead of
+            keeping them; the result then has no 'trajectories' column and
+            carries the sink in result_df.attrs['trace_sink']
     
     Returns:
-        DataFrame with simulation results including intent information
+        DataFrame with simulation results including intent information;
+        result_df.attrs['outcome_matrix'] holds every trajectory's outcome
+        (dropsim_outcome_matrix.OutcomeMatrix)
     """
+    if rng_mode not in RNG_MODES:
+        raise ValueError(f"Unknown rng_mode '{rng_mode}'. Expected one of {RNG_MODES}")
+    if capture not in CAPTURE_LEVELS:
+        raise ValueError(f"Unknown capture level '{capture}'. Expected one of {CAPTURE_LEVELS}")
+    if trace_table and capture not in TRACE_CAPTURE_LEVELS:
+        raise ValueError(f"trace_table needs capture in {TRACE_CAPTURE_LEVELS}, got '{capture}'")
+    if trace_table and trace_sink is not None:
+        raise ValueError("trace_table keeps every trace in memory; use it or trace_sink, not both")
+    
     if verbose:
         print("🧠 Running Intent-Aware Behavioral Simulation")
         print(f"   Personas: {len(df)}")
         print(f"   Product Steps: {len(product_steps)}")
         print(f"   Seed: {seed}")
     
-        # Use fixed intent if provided, otherwise infer intent distribution
-        if fixed_intent is not None:
-            # Fixed global intent (e.g., Credigo - all users want credit card recommendation)
-            if verbose:
-                print(f"\n   Using Fixed Global Intent:")
-                print(f"     Intent ID: {fixed_intent.intent_id}")
-                print(f"     Description: {fixed_intent.description}")
-                print(f"     Primary Goal: {fixed_intent.primary_goal}")
-        elif intent_distribution is None:
-            # Infer from product characteristics
-            # Extract entry page info from first step
-            first_step = list(product_steps.values())[0]
-            entry_text = first_step.get('description', '')
-            cta_phrasing = first_step.get('cta_phrasing', '')
-            
-            # Infer intent distribution (now with product_steps for better inference)
-            intent_result = infer_intent_distribution(
-                entry_page_text=entry_text,
-                cta_phrasing=cta_phrasing,
-                product_type='fintech',  # Default, can be parameterized
-                persona_attributes={'intent': 'medium', 'urgency': 'medium'},
-                product_steps=product_steps  # Pass steps for intent signal analysis
-            )
-            intent_distribution = intent_result['intent_distribution']
-            
-            if verbose:
-                print(f"\n   Inferred Intent Distribution:")
-                for intent_id, prob in sorted(intent_distribution.items(), key=lambda x: x[1], reverse=True):
-                    print(f"     {intent_id}: {prob:.1%}")
-    
-    # Derived feature columns
-    derived_cols = [
-        'urban_rural', 'regional_cluster',
-        'digital_literacy_score', 'aspirational_score',
-        'english_score', 'openness_score',
-        'trust_score', 'status_quo_score',
-        'debt_aversion_score', 'cc_relevance_score',
-        'generation_bucket'
-    ]
-    
-    all_results = []
-    
-    for idx, row in df.iterrows():
-        derived = {col: row[col] for col in derived_cols if col in row.index}
-        
-        # Simulate all variants with intent awareness
-        trajectories = []
-        persona_seed = seed + idx * 10000
-        
-        for variant_idx, variant_name in enumerate(['fresh_motivated', 'tired_commuter', 'distrustful_arrival', 
-                                                    'browsing_casually', 'urgent_need', 'price_sensitive', 
-                                                    'tech_savvy_optimistic']):
-            variant_seed = persona_seed + variant_idx * 1000
-            traj = simulate_persona_trajectory_intent_aware(
-                row, derived, variant_name, product_steps,
-                intent_distribution=intent_distribution if fixed_intent is None else None,
-                fixed_intent=fixed_intent,
-                seed=variant_seed
-            )
-            trajectories.append(traj)
-        
-        # Aggregate results
-        exit_steps = [t['exit_step'] for t in trajectories]
-        failure_reasons = [t['failure_reason'] for t in trajectories if t['failure_reason']]
-        completed_count = sum(1 for t in trajectories if t['completed'])
-        
-        # Intent distribution in this persona's trajectories
-        intent_counts = Counter([t['intent_id'] for t in trajectories])
-        
-        # Intent mismatch analysis
-        all_mismatches = []
-        for traj in trajectories:
-            all_mismatches.extend(traj.get('intent_mismatches', []))
-        
-        exit_counter = Counter(exit_steps)
-        dominant_exit = exit_counter.most_common(1)[0][0]
-        
-        if failure_reasons:
-            reason_counter = Counter(failure_reasons)
-            dominant_reason = reason_counter.most_common(1)[0][0]
-        else:
-            dominant_reason = None
-        
-        consistency = exit_counter.most_common(1)[0][1] / len(trajectories)
+    # Use fixed intent if provided, otherwise infer intent distribution
+    if fixed_intent is not None:
+        # Fixed global intent (e.g., Credigo - all users want credit card recommendation)
+        if verbose:
+            print(f"\n   Using Fixed Global Intent:")
+            print(f"     Intent ID: {fixed_intent.intent_id}")
+            print(f"     Description: {fixed_intent.description}")
+            print(f"     Primary Goal: {fixed_intent.primary_goal}")
+    elif intent_distribution is None:
+        # Infer from product characteristics
+        # Extract entry page info from first step
+        first_step = list(product_steps.values())[0]
+        entry_text = first_step.get('description', '')
+        cta_phrasing = first_step.get('cta_phrasing', '')
         
-        all_results.append({
-            'dominant_exit_step': dominant_exit,
-            'dominant_failure_reason': dominant_reason,
-            'consistency_score': consistency,
-            'variants_completed': completed_count,
-            'variants_total': len(trajectories),
-            'completion_rate': completed_count / len(trajectories),
-            'intent_distribution': dict(intent_counts),
-            'intent_mismatch_count': len(all_mismatches),
-            'trajectories': trajectories
-        })
+        # Infer intent distribution (now with product_steps for better inference)
+        intent_result = infer_intent_distribution(
+            entry_page_text=entry_text,
+            cta_phrasing=cta_phrasing,
+            product_type='fintech',  # Default, can be parameterized
+            persona_attributes={'intent': 'medium', 'urgency': 'medium'},
+            product_steps=product_steps  # Pass steps for intent signal analysis
+        )
+        intent_distribution = intent_result['intent_distribution']
         
-        if verbose and (idx + 1) % 50 == 0:
-            print(f"   Simulated {idx + 1}/{len(df)} personas")
+        if verbose:
+            print(f"\n   Inferred Intent Distribution:")
+            for intent_id, prob in sorted(intent_distribution.items(), key=lambda x: x[1], reverse=True):
+                print(f"     {intent_id}: {prob:.1%}")
+    
+    # One policy version for the whole run, stamped on every trace
+    policy_version = resolve_policy_version() if capture in TRACE_CAPTURE_LEVELS else None
+    
+    # (step, intent) alignment and mismatch analysis, compiled once per run
+    step_table = compile_step_intent_table(
+        product_steps, candidate_intent_frames(intent_distribution, fixed_intent)
+    )
+    
+    shard_kwargs = dict(
+        product_steps=product_steps,
+        intent_distribution=intent_distribution,
+        fixed_intent=fixed_intent,
+        seed=seed,
+        rng_mode=rng_mode,
+        policy_version=policy_version,
+        trace_table=trace_table,
+        parameters=parameters,
+        step_table=step_table,
+        capture=capture
+    )
+    
+    from dropsim_sharding import resolve_worker_count, split_into_shards, map_shards, iter_shards, SHARDS_PER_WORKER
+    workers = resolve_worker_count(n_workers)
+    
+    if trace_sink is not None:
+        from dropsim_trace_sink import TRACE_SINK_BATCH_PERSONAS
+        # Shards of at most TRACE_SINK_BATCH_PERSONAS personas, written to the
+        # sink (and dropped) as they complete, so only the summaries grow
+        n_shards = max(
+            workers * SHARDS_PER_WORKER if workers > 1 else 1,
+            -(-len(df) // TRACE_SINK_BATCH_PERSONAS)
+        )
+        shard_slices = split_into_shards(len(df), n_shards)
+        if verbose and workers > 1:
+            print(f"   Workers: {workers} ({len(shard_slices)} shards)")
+        shard_outputs = iter_shards(
+            _simulate_persona_rows, [df.iloc[s] for s in shard_slices], workers,
+            verbose=verbose and workers == 1, **shard_kwargs
+        )
+        all_results = []
+        outcomes = OutcomeMatrixBuilder(list(product_steps.keys()))
+        for shard_slice, (shard_results, _) in zip(shard_slices, shard_outputs):
+            batch = []
+            for persona_index, result in enumerate(shard_results, start=shard_slice.start):
+                trajectories = result.pop('trajectories')
+                outcomes.add(trajectories)
+                for traj in trajectories:
+                    traj['persona_index'] = persona_index
+                    batch.append(traj)
+            trace_sink.write(batch)
+            all_results.extend(shard_results)
+        shard_outputs = []
+    elif workers == 1:
+        shard_outputs = [_simulate_persona_rows(df, verbose=verbose, **shard_kwargs)]
+    else:
+        shards = [df.iloc[s] for s in split_into_shards(len(df), workers * SHARDS_PER_WORKER)]
+        if verbose:
+            print(f"   Workers: {workers} ({len(shards)} shards)")
+        # Partial results come back in shard order, i.e. persona order
+        shard_outputs = map_shards(_simulate_persona_rows, shards, workers, **shard_kwargs)
+    
+    if trace_sink is None:
+        all_results = [result for shard_results, _ in shard_outputs for result in shard_results]
+        outcome_matrix = OutcomeMatrix.from_trajectories(
+            [result['trajectories'] for result in all_results], list(product_steps.keys())
+        )
+    else:
+        outcome_matrix = outcomes.build()
+    
+    table = None
+    if trace_table:
+        from decision_graph.trace_table import DecisionTraceTable
+        table = DecisionTraceTable.concat([shard_table for _, shard_table in shard_outputs])
+        offset = 0
+        for shard_results, shard_table in shard_outputs:
+            for result in shard_results:
+                for traj in result['trajectories']:
+                    start, stop = traj.pop('_trace_range')
+                    traj['decision_traces'] = table[offset + start:offset + stop]
+            offset += len(shard_table)
     
     results_df = pd.DataFrame(all_results)
     final_df = pd.concat([df.reset_index(drop=True), results_df], axis=1)
+    attach_outcome_matrix(final_df, outcome_matrix)
+    if table is not None:
+        final_df.attrs['decision_trace_table'] = table
+    if trace_sink is not None:
+        final_df.attrs['trace_sink'] = trace_sink
     
     if verbose:
         print(f"\n✅ Intent-aware simulation complete!")
@@ -556,7 +949,6 @@ def generate_intent_analysis(
             if intent_id in CANONICAL_INTENTS:
                 intent_frame = CANONICAL_INTENTS[intent_id]
             elif intent_id == 'compare_credit_cards':
-                from dropsim_intent_model import CREDIGO_GLOBAL_INTENT
                 intent_frame = CREDIGO_GLOBAL_INTENT
             else:
                 continue  # Skip unknown intents
@@ -592,7 +984,6 @@ def generate_intent_analysis(
             if dominant_violation in CANONICAL_INTENTS:
                 intent_frame = CANONICAL_INTENTS[dominant_violation]
             elif dominant_violation == 'compare_credit_cards':
-                from dropsim_intent_model import CREDIGO_GLOBAL_INTENT
                 intent_frame = CREDIGO_GLOBAL_INTENT
             else:
                 # Fallback
@@ -677,7 +1068,6 @@ def export_intent_artifacts(
             if intent_id in CANONICAL_INTENTS:
                 intent_frame = CANONICAL_INTENTS[intent_id]
             elif intent_id == 'compare_credit_cards':
-                from dropsim_intent_model import CREDIGO_GLOBAL_INTENT
                 intent_frame = CREDIGO_GLOBAL_INTENT
             else:
                 continue  # Skip unknown intents
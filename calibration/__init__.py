@@ -26,6 +26,7 @@ from calibration.optimizer import (
     random_search_optimize,
     grid_search_optimize,
     bayesian_optimize,
+    evaluate_candidates,
     OptimizationResult
 )
 
@@ -44,6 +45,7 @@ from calibration.calibrator import (
     CalibrationResult,
     calibrate_parameters,
     run_simulation_with_parameters,
+    SimulationLoss,
     inject_parameters_into_engine,
     export_calibration_result
 )
@@ -52,7 +54,9 @@ from calibration.confidence_estimation import (
     ConfidenceEstimate,
     estimate_confidence_intervals,
     estimate_step_level_confidence,
-    run_stochastic_simulations
+    run_stochastic_simulations,
+    ReplicationResult,
+    run_replicated_simulations
 )
 
 from calibration.sensitivity_analysis import (
@@ -138,6 +142,7 @@ __all__ = [
     'random_search_optimize',
     'grid_search_optimize',
     'bayesian_optimize',
+    'evaluate_candidates',
     'OptimizationResult',
     
     # Validation
@@ -154,6 +159,7 @@ __all__ = [
     'CalibrationResult',
     'calibrate_parameters',
     'run_simulation_with_parameters',
+    'SimulationLoss',
     'inject_parameters_into_engine',
     'export_calibration_result',
     
@@ -162,6 +168,8 @@ __all__ = [
     'estimate_confidence_intervals',
     'estimate_step_level_confidence',
     'run_stochastic_simulations',
+    'ReplicationResult',
+    'run_replicated_simulations',
     
     # Sensitivity analysis
     'SensitivityResult',
@@ -12,6 +12,9 @@ from dataclasses import dataclass
 from datetime import datetime
 import json
 import copy
+import functools
+import inspect
+import warnings
 
 from calibration.parameter_space import (
     get_default_parameters,
@@ -20,10 +23,12 @@ from calibration.parameter_space import (
 )
 from calibration.loss_functions import (
     extract_simulated_metrics_from_results,
-    compute_composite_loss
+    compute_composite_loss,
+    with_metrics_capture
 )
 from calibration.optimizer import random_search_optimize, OptimizationResult
 from calibration.validation import validate_all, compute_confidence_intervals
+from behavioral_engine_improved import EngineParameters
 
 
 @dataclass
@@ -36,6 +41,7 @@ class CalibrationConfig:
     validation_strict: bool = False
     random_seed: int = 42
     verbose: bool = True
+    n_workers: int = 1  # Candidates evaluated in parallel (None/0 = all cores); results match n_workers=1
 
 
 @dataclass
@@ -53,9 +59,18 @@ class CalibrationResult:
 
 
 # ============================================================================
-# PARAMETER INJECTION
+# PARAMETER INJECTION (deprecated)
 # ============================================================================
 
+def _force_keywords(function: Callable, **forced) -> Callable:
+    """Wrap function so every call uses the forced keyword arguments."""
+    @functools.wraps(function)
+    def patched(*args, **kwargs):
+        kwargs.update(forced)
+        return function(*args, **kwargs)
+    return patched
+
+
 def inject_parameters_into_engine(
     parameters: Dict[str, float],
     engine_module: str = 'behavioral_engine_improved'
@@ -63,8 +78,10 @@ def inject_parameters_into_engine(
     """
     Inject calibrated parameters into the behavioral engine.
     
-    This patches the engine functions to use calibrated parameters.
-    We do this by monkey-patching the functions that use hardcoded values.
+    Deprecated: the engines take an explicit `parameters=EngineParameters(...)`
+    argument, which needs no patching and is safe to use concurrently. This
+    shim patches module globals for the duration of the context, so it is
+    process-global and must not be used from several threads at once.
     
     Args:
         parameters: Dict of calibrated parameters
@@ -74,142 +91,46 @@ def inject_parameters_into_engine(
         Context manager that restores original functions on exit
     """
     import contextlib
-    import sys
+    import behavioral_engine_improved
+    import dropsim_intent_model
+    
+    warnings.warn(
+        "inject_parameters_into_engine is deprecated; pass "
+        "parameters=EngineParameters.from_dict(...) to the simulation instead",
+        DeprecationWarning,
+        stacklevel=2
+    )
     
+    engine_parameters = EngineParameters.from_dict(parameters)
+    continuation_kwargs = {'parameters': engine_parameters}
+    intent_kwargs = {'intent_penalty_weight': engine_parameters.intent_penalty_weight}
+    
+    # (module, attribute, forced keywords); modules that import the functions
+    # by name hold their own reference, so they are patched as well
     if engine_module == 'behavioral_engine_improved':
-        import behavioral_engine_improved as engine
+        targets = [(behavioral_engine_improved, 'should_continue_probabilistic', continuation_kwargs)]
     elif engine_module == 'behavioral_engine_intent_aware':
-        import behavioral_engine_intent_aware as engine
-        # Intent-aware uses improved engine, so we need to patch both
-        import behavioral_engine_improved as base_engine
+        import behavioral_engine_intent_aware
+        targets = [
+            (behavioral_engine_improved, 'should_continue_probabilistic', continuation_kwargs),
+            (behavioral_engine_intent_aware, 'should_continue_probabilistic', continuation_kwargs),
+            (dropsim_intent_model, 'compute_intent_conditioned_continuation_prob', intent_kwargs),
+            (behavioral_engine_intent_aware, 'compute_intent_conditioned_continuation_prob', intent_kwargs)
+        ]
     else:
         raise ValueError(f"Unknown engine module: {engine_module}")
     
-    # Store original functions
-    original_functions = {}
-    
     @contextlib.contextmanager
     def parameter_patch():
-        # Always patch behavioral_engine_improved since it's the base
-        import behavioral_engine_improved as base_engine
-        
-        # Patch should_continue_probabilistic in base engine
-        if hasattr(base_engine, 'should_continue_probabilistic'):
-            original = base_engine.should_continue_probabilistic
-            original_functions['should_continue_probabilistic'] = original
-            
-            def patched_should_continue_probabilistic(state, priors, step_index, total_steps, modifiers=None):
-                """Patched version with calibrated parameters."""
-                # We need to replicate the original logic but with calibrated parameters
-                # The original function computes base_prob, then applies BASE_COMPLETION_PROB and persistence_bonus
-                
-                if modifiers is None:
-                    modifiers = {'base_persistence': 1.0, 'value_sensitivity': 1.0, 
-                                 'fatigue_resilience': 1.0, 'risk_tolerance_mult': 1.0}
-                
-                # Get calibrated parameters
-                BASE_COMPLETION_RATE = parameters.get('BASE_COMPLETION_RATE', 0.60)
-                PERSISTENCE_BONUS_START = parameters.get('PERSISTENCE_BONUS_START', 0.18)
-                PERSISTENCE_BONUS_RATE = parameters.get('PERSISTENCE_BONUS_RATE', 0.22)
-                VALUE_SENSITIVITY = parameters.get('VALUE_SENSITIVITY', 1.0)
-                
-                # Replicate original logic up to the point where parameters are applied
-                left = (state.perceived_value * priors['MS']) + state.perceived_control
-                right = state.perceived_risk + state.perceived_effort
-                base_advantage = left - right
-                
-                # Value override
-                value_override = 0.0
-                if state.perceived_value > 0.7:
-                    value_override = state.perceived_value * 0.3
-                
-                # Commitment effect
-                progress = step_index / total_steps if total_steps > 0 else 0
-                commitment_boost = progress * 0.8
-                
-                if progress > 0.2:
-                    early_progress_bonus = (progress - 0.2) * 0.5
-                    commitment_boost += early_progress_bonus
-                
-                # Cognitive recovery
-                energy_factor = state.cognitive_energy
-                if state.cognitive_energy < 0.2 and state.perceived_value > 0.6:
-                    energy_factor = 0.3
-                
-                adjusted_advantage = base_advantage + value_override + commitment_boost
-                steepness = 1.2
-                base_prob = 1 / (1 + np.exp(-steepness * adjusted_advantage))
-                progress_prob_boost = progress * 0.20
-                base_prob += progress_prob_boost
-                
-                # Apply archetype modifiers
-                adjusted_prob = base_prob * modifiers['base_persistence']
-                
-                # Value sensitivity (calibrated)
-                if state.perceived_value > 0.6:
-                    value_bonus = (state.perceived_value - 0.6) * 0.2 * modifiers.get('value_sensitivity', 1.0) * VALUE_SENSITIVITY
-                    adjusted_prob += value_bonus
-                
-                # Fatigue resilience
-                if state.cognitive_energy < 0.3:
-                    fatigue_penalty = (0.3 - state.cognitive_energy) * 0.15
-                    fatigue_penalty *= (2.0 - modifiers.get('fatigue_resilience', 1.0))
-                    adjusted_prob -= fatigue_penalty
-                
-                # Apply calibrated BASE_COMPLETION_RATE (replaces hardcoded 0.60)
-                adjusted_prob = max(BASE_COMPLETION_RATE, adjusted_prob)
-                
-                # Apply calibrated persistence bonus (replaces hardcoded 0.18 + 0.22 * progress)
-                persistence_bonus = PERSISTENCE_BONUS_START + PERSISTENCE_BONUS_RATE * progress
-                adjusted_prob += persistence_bonus
-                
-                # Clamp to [0.05, 0.95]
-                adjusted_prob = np.clip(adjusted_prob, 0.05, 0.95)
-                
-                return adjusted_prob
-            
-            # Patch in the module
-            base_engine.should_continue_probabilistic = patched_should_continue_probabilistic
-        
-        # Patch intent model if using intent-aware
-        if engine_module == 'behavioral_engine_intent_aware':
-            from dropsim_intent_model import compute_intent_conditioned_continuation_prob
-            original_intent = compute_intent_conditioned_continuation_prob
-            original_functions['compute_intent_conditioned_continuation_prob'] = original_intent
-            
-            def patched_intent_conditioned(base_prob, intent_frame, step, step_index, total_steps, state):
-                """Patched version with calibrated intent penalty."""
-                # Call original
-                prob, diagnostic = original_intent(base_prob, intent_frame, step, step_index, total_steps, state)
-                
-                # Apply calibrated intent penalty weight (scale the penalty)
-                INTENT_PENALTY_WEIGHT = parameters.get('INTENT_PENALTY_WEIGHT', 0.025)
-                default_intent_weight = 0.025
-                if default_intent_weight > 0:
-                    scale_factor = INTENT_PENALTY_WEIGHT / default_intent_weight
-                    # Adjust penalty in diagnostic
-                    if 'penalties' in diagnostic and 'intent' in diagnostic['penalties']:
-                        original_penalty = diagnostic['penalties']['intent']
-                        diagnostic['penalties']['intent'] = original_penalty * scale_factor
-                        prob = base_prob + diagnostic['penalties']['intent']  # Recompute
-                
-                return prob, diagnostic
-            
-            # Monkey patch
-            import dropsim_intent_model
-            dropsim_intent_model.compute_intent_conditioned_continuation_prob = patched_intent_conditioned
-        
+        originals = [(module, name, getattr(module, name)) for module, name, _ in targets]
+        for (module, name, forced), (_, _, original) in zip(targets, originals):
+            setattr(module, name, _force_keywords(original, **forced))
         try:
             yield
         finally:
             # Restore original functions
-            import behavioral_engine_improved as base_engine
-            for func_name, original_func in original_functions.items():
-                if func_name == 'should_continue_probabilistic':
-                    base_engine.should_continue_probabilistic = original_func
-                elif func_name == 'compute_intent_conditioned_continuation_prob':
-                    import dropsim_intent_model
-                    dropsim_intent_model.compute_intent_conditioned_continuation_prob = original_func
+            for module, name, original in originals:
+                setattr(module, name, original)
     
     return parameter_patch()
 
@@ -218,6 +139,14 @@ def inject_parameters_into_engine(
 # SIMULATION RUNNER WRAPPER
 # ============================================================================
 
+def _accepts_engine_parameters(simulation_function: Callable) -> bool:
+    """Whether simulation_function takes the explicit `parameters` argument."""
+    try:
+        return 'parameters' in inspect.signature(simulation_function).parameters
+    except (TypeError, ValueError):
+        return False
+
+
 def run_simulation_with_parameters(
     parameters: Dict[str, float],
     simulation_function: Callable,
@@ -225,13 +154,19 @@ def run_simulation_with_parameters(
     engine_module: str = 'behavioral_engine_improved'
 ) -> pd.DataFrame:
     """
-    Run simulation with calibrated parameters injected.
+    Run simulation with calibrated parameters.
+    
+    The engines' simulation functions (run_behavioral_simulation_improved,
+    run_intent_aware_simulation, run_intent_aware_simulation_batch) receive
+    the parameters as an immutable EngineParameters argument, so nothing
+    global changes and calls can run concurrently. Other callables fall back
+    to the deprecated module patching.
     
     Args:
         parameters: Calibrated parameters to inject
         simulation_function: Function to run simulation (e.g., run_behavioral_simulation_improved)
         simulation_args: Arguments to pass to simulation function
-        engine_module: Engine module to patch
+        engine_module: Engine module to patch (fallback only)
     
     Returns:
         Simulation results DataFrame
@@ -239,13 +174,58 @@ def run_simulation_with_parameters(
     # Validate parameters
     validated_params = validate_parameters(parameters)
     
-    # Inject parameters and run simulation
-    with inject_parameters_into_engine(validated_params, engine_module):
+    if _accepts_engine_parameters(simulation_function):
+        engine_parameters = EngineParameters.from_dict(validated_params)
+        return simulation_function(**{**simulation_args, 'parameters': engine_parameters})
+    
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', DeprecationWarning)
+        patch = inject_parameters_into_engine(validated_params, engine_module)
+    with patch:
         result_df = simulation_function(**simulation_args)
     
     return result_df
 
 
+@dataclass
+class SimulationLoss:
+    """
+    Calibration loss for one simulation setup: run the simulation with the
+    candidate parameters and score it against the observed metrics.
+    
+    A module-level callable (unlike a closure), so it pickles and the
+    optimizers can evaluate candidates on a process pool.
+    """
+    simulation_function: Callable
+    simulation_args: Dict
+    observed_metrics: Dict
+    product_steps: Dict
+    loss_weights: Optional[Dict[str, float]] = None
+    engine_module: str = 'behavioral_engine_improved'
+    
+    def __call__(self, parameters: Dict[str, float]) -> float:
+        """Compute loss for given parameters."""
+        # Run simulation with these parameters
+        result_df = run_simulation_with_parameters(
+            parameters,
+            self.simulation_function,
+            self.simulation_args,
+            self.engine_module
+        )
+        
+        # Extract simulated metrics
+        simulated_metrics = extract_simulated_metrics_from_results(result_df, self.product_steps)
+        
+        # Compute loss
+        loss_result = compute_composite_loss(
+            simulated_metrics,
+            self.observed_metrics,
+            self.loss_weights
+        )
+        
+        return loss_result['total_loss']
+
+
 # ============================================================================
 # CALIBRATION RUNNER
 # ============================================================================
@@ -266,8 +246,11 @@ def calibrate_parameters(
         simulation_args: Arguments for simulation function
         observed_metrics: Dict with 'completion_rate', 'dropoff_by_step', 'avg_steps_completed'
         product_steps: Dict of step definitions
-        config: Calibration configuration
-        engine_module: Engine module to patch
+        config: Calibration configuration (n_workers > 1 evaluates random-search
+            candidates on a process pool; simulation_function and
+            simulation_args must then be picklable)
+        engine_module: Engine module to patch (only for simulation functions
+            without a `parameters` argument)
     
     Returns:
         CalibrationResult with calibrated parameters and metrics
@@ -277,28 +260,18 @@ def calibrate_parameters(
     
     rng = np.random.default_rng(config.random_seed)
     
+    # Only completion and drop-off counts are scored: skip trace capture
+    simulation_args = with_metrics_capture(simulation_function, simulation_args)
+    
     # Define loss function
-    def loss_function(parameters: Dict[str, float]) -> float:
-        """Compute loss for given parameters."""
-        # Run simulation with these parameters
-        result_df = run_simulation_with_parameters(
-            parameters,
-            simulation_function,
-            simulation_args,
-            engine_module
-        )
-        
-        # Extract simulated metrics
-        simulated_metrics = extract_simulated_metrics_from_results(result_df, product_steps)
-        
-        # Compute loss
-        loss_result = compute_composite_loss(
-            simulated_metrics,
-            observed_metrics,
-            config.loss_weights
-        )
-        
-        return loss_result['total_loss']
+    loss_function = SimulationLoss(
+        simulation_function,
+        simulation_args,
+        observed_metrics,
+        product_steps,
+        loss_weights=config.loss_weights,
+        engine_module=engine_module
+    )
     
     # Run optimization
     if config.verbose:
@@ -317,7 +290,8 @@ def calibrate_parameters(
         early_stopping_patience=config.early_stopping_patience,
         tolerance=config.tolerance,
         rng=rng,
-        verbose=config.verbose
+        verbose=config.verbose,
+        n_workers=config.n_workers
     )
     
     # Run final simulation with best parameters to get metrics for validation
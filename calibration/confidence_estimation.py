@@ -2,15 +2,26 @@
 confidence_estimation.py - Confidence Interval Estimation
 
 Runs stochastic simulations to estimate prediction variance and confidence intervals.
+
+Two replication modes:
+- "rerun": call the simulation function once per seed (any simulation function)
+- "crn": common-random-numbers replication for the engine entry points. The
+  seed-independent part of a run (priors, modifiers, state path and
+  continuation probability of every trajectory at every step) is computed
+  once; all replicates' noise and Bernoulli draws are then applied as one
+  (replicates x trajectories x steps) array operation, optionally stopping
+  once the confidence interval is narrow enough.
 """
 
 import numpy as np
 import pandas as pd
+from statistics import NormalDist
 from typing import Dict, List, Optional, Callable, Tuple
 from dataclasses import dataclass
 from collections import defaultdict
 
-from calibration.loss_functions import extract_simulated_metrics_from_results
+from calibration.loss_functions import extract_simulated_metrics_from_results, with_metrics_capture
+from dropsim_outcome_matrix import get_outcome_matrix
 
 
 @dataclass
@@ -43,12 +54,252 @@ class ConfidenceEstimate:
         }
 
 
+# ============================================================================
+# COMMON-RANDOM-NUMBERS REPLICATION
+# ============================================================================
+
+REPLICATION_MODES = ("rerun", "crn")
+
+# Noise model of each engine: personality noise std, probability floor, and
+# whether every step draws fresh numbers. The improved engine reseeds with
+# the trajectory seed before each step, so one (noise, uniform) pair is
+# reused at every step of a trajectory.
+REPLICATION_ENGINES = {
+    'intent_aware': {'noise_std': 0.08, 'min_prob': 0.35, 'per_step_draws': True},
+    'improved': {'noise_std': 0.15, 'min_prob': 0.05, 'per_step_draws': False}
+}
+
+
+@dataclass
+class ReplicationResult:
+    """Per-replicate metrics from a common-random-numbers replication run."""
+    completion_rates: np.ndarray  # (replicates,)
+    dropoff_rates: np.ndarray  # (replicates, steps): dropped / entered per step
+    step_names: List[str]
+    n_trajectories: int
+    half_width: float  # CI half-width of the stopping metric at the end
+    stopped_early: bool
+    
+    @property
+    def n_replicates(self) -> int:
+        return len(self.completion_rates)
+    
+    def dropoff_by_step(self) -> Dict[str, np.ndarray]:
+        """step_name -> per-replicate drop-off rate."""
+        return {name: self.dropoff_rates[:, k] for k, name in enumerate(self.step_names)}
+
+
+def ci_half_width(values: np.ndarray, confidence_level: float = 0.95) -> float:
+    """Normal-approximation half-width of the CI of the mean of values."""
+    if len(values) < 2:
+        return float('inf')
+    z = NormalDist().inv_cdf(0.5 + confidence_level / 2)
+    return float(z * np.std(values, ddof=1) / np.sqrt(len(values)))
+
+
+def replicate_exit_indices(
+    table: np.ndarray,
+    intent_choice: np.ndarray,
+    noise: np.ndarray,
+    uniforms: np.ndarray,
+    min_prob: float
+) -> np.ndarray:
+    """
+    Exit step index of every (replicate, trajectory); n_steps = completed.
+    
+    Args:
+        table: (n_intents, n_trajectories, n_steps) pre-noise probabilities
+        intent_choice: (replicates, n_trajectories) intent index
+        noise, uniforms: (replicates, n_trajectories, n_steps or 1) draws
+        min_prob: Probability floor applied after the noise
+    """
+    n_steps = table.shape[2]
+    prob = table[intent_choice, np.arange(table.shape[1])]
+    final_prob = np.clip(np.clip(prob + noise, 0.05, 0.95), min_prob, 0.95)
+    continues = uniforms < final_prob
+    return np.where(continues.all(axis=2), n_steps, continues.argmin(axis=2))
+
+
+def run_replicated_simulations(
+    df: pd.DataFrame,
+    product_steps: Dict,
+    engine: str = 'intent_aware',
+    fixed_intent=None,
+    intent_distribution: Optional[Dict[str, float]] = None,
+    parameters=None,
+    n_replicates: int = 50,
+    random_seed_base: int = 42,
+    target_half_width: Optional[float] = None,
+    confidence_level: float = 0.95,
+    stop_metric: str = 'completion_rate',
+    block_size: int = 10,
+    verbose: bool = False
+) -> ReplicationResult:
+    """
+    Replicate a simulation with common random numbers.
+    
+    The continuation-probability table is built once (one batch-engine pass
+    over every trajectory and step); replicates then only draw noise and
+    uniforms. Replicate r always draws from np.random.default_rng(
+    [random_seed_base, r]), so runs that differ only in parameters or step
+    definitions see the same random numbers and their difference has much
+    lower variance than independent reruns.
+    
+    Args:
+        df: Personas DataFrame (with derived feature columns)
+        product_steps: Product step definitions
+        engine: 'intent_aware' (run_intent_aware_simulation and the batch
+            engine) or 'improved' (run_behavioral_simulation_improved)
+        fixed_intent / intent_distribution: As for run_intent_aware_simulation
+            (the distribution is inferred from the steps if neither is given)
+        parameters: Calibrated EngineParameters (defaults if None)
+        n_replicates: Maximum number of replicates
+        random_seed_base: Base seed of the replicate streams
+        target_half_width: Stop once the CI half-width of stop_metric is at
+            most this (checked after every block); None runs all replicates
+        confidence_level: Confidence level of the half-width
+        stop_metric: 'completion_rate', or 'dropoff_by_step' (widest step)
+        block_size: Replicates drawn per array operation
+        verbose: Print progress
+    
+    Returns:
+        ReplicationResult with per-replicate completion and drop-off rates
+    """
+    from behavioral_engine_batch import continuation_table_batch, _resolve_intent_distribution
+    from dropsim_intent_model import CANONICAL_INTENTS
+    
+    if engine not in REPLICATION_ENGINES:
+        raise ValueError(f"Unknown engine '{engine}'. Expected one of {list(REPLICATION_ENGINES)}")
+    if stop_metric not in ('completion_rate', 'dropoff_by_step'):
+        raise ValueError(f"Unknown stop_metric '{stop_metric}'")
+    noise_model = REPLICATION_ENGINES[engine]
+    
+    # Candidate intents
+    intent_probs = None
+    if engine == 'improved':
+        intent_frames = None
+    elif fixed_intent is not None:
+        intent_frames = [fixed_intent]
+    else:
+        if intent_distribution is None:
+            intent_distribution = _resolve_intent_distribution(product_steps)
+        intent_frames = [CANONICAL_INTENTS[i] for i in intent_distribution]
+        intent_probs = list(intent_distribution.values())
+    
+    # Seed-independent part, computed once
+    table = continuation_table_batch(df, product_steps, intent_frames, parameters)
+    n_traj, n_steps = table.shape[1], table.shape[2]
+    draw_steps = n_steps if noise_model['per_step_draws'] else 1
+    
+    if verbose:
+        print(f"Replicating {n_traj:,} trajectories x {n_steps} steps (up to {n_replicates} replicates)...")
+    
+    exit_counts = []
+    half_width = float('inf')
+    stopped_early = False
+    done = 0
+    while done < n_replicates:
+        block = range(done, min(done + block_size, n_replicates))
+        intent_choice = np.zeros((len(block), n_traj), dtype=np.int64)
+        noise = np.empty((len(block), n_traj, draw_steps))
+        uniforms = np.empty((len(block), n_traj, draw_steps))
+        for b, r in enumerate(block):
+            rng = np.random.default_rng([random_seed_base, r])
+            if intent_probs is not None:
+                intent_choice[b] = rng.choice(len(intent_probs), size=n_traj, p=intent_probs)
+            noise[b] = rng.normal(0, noise_model['noise_std'], size=(n_traj, draw_steps))
+            uniforms[b] = rng.random((n_traj, draw_steps))
+        
+        exits = replicate_exit_indices(table, intent_choice, noise, uniforms, noise_model['min_prob'])
+        # Exit histogram per replicate: column k = exits at step k, column n_steps = completed
+        offsets = (np.arange(len(block)) * (n_steps + 1))[:, None]
+        exit_counts.append(
+            np.bincount((exits + offsets).ravel(), minlength=len(block) * (n_steps + 1)).reshape(len(block), n_steps + 1)
+        )
+        done = block.stop
+        
+        if target_half_width is not None:
+            completion_rates, dropoff_rates = _replicate_rates(np.concatenate(exit_counts), n_traj)
+            if stop_metric == 'completion_rate':
+                half_width = ci_half_width(completion_rates, confidence_level)
+            else:
+                half_width = max(ci_half_width(dropoff_rates[:, k], confidence_level) for k in range(n_steps))
+            if half_width <= target_half_width and done < n_replicates:
+                stopped_early = True
+                break
+    
+    completion_rates, dropoff_rates = _replicate_rates(np.concatenate(exit_counts), n_traj)
+    if target_half_width is None:
+        half_width = ci_half_width(completion_rates, confidence_level)
+    
+    if verbose:
+        print(f"  {len(completion_rates)} replicates, CI half-width {half_width:.4f}"
+              f"{' (target reached)' if stopped_early else ''}")
+    
+    return ReplicationResult(
+        completion_rates=completion_rates,
+        dropoff_rates=dropoff_rates,
+        step_names=list(product_steps.keys()),
+        n_trajectories=n_traj,
+        half_width=half_width,
+        stopped_early=stopped_early
+    )
+
+
+def _replicate_rates(exit_counts: np.ndarray, n_trajectories: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Completion and per-step drop-off rates from (replicates, steps + 1) exit counts."""
+    completion_rates = exit_counts[:, -1] / n_trajectories
+    # Trajectories entering step k: everyone who did not exit before it
+    entered = n_trajectories - np.cumsum(exit_counts[:, :-1], axis=1) + exit_counts[:, :-1]
+    dropoff_rates = np.divide(
+        exit_counts[:, :-1], entered,
+        out=np.zeros(entered.shape), where=entered > 0
+    )
+    return completion_rates, dropoff_rates
+
+
+def _replication_kwargs(simulation_function: Callable, simulation_args: Dict) -> Dict:
+    """run_replicated_simulations arguments equivalent to simulation_function(**simulation_args)."""
+    from behavioral_engine_improved import run_behavioral_simulation_improved
+    from behavioral_engine_intent_aware import run_intent_aware_simulation
+    from behavioral_engine_batch import run_intent_aware_simulation_batch
+    
+    if simulation_function is run_behavioral_simulation_improved:
+        from behavioral_engine import PRODUCT_STEPS
+        return {
+            'df': simulation_args['df'],
+            'product_steps': simulation_args.get('product_steps') or PRODUCT_STEPS,
+            'engine': 'improved',
+            'parameters': simulation_args.get('parameters')
+        }
+    if simulation_function in (run_intent_aware_simulation, run_intent_aware_simulation_batch):
+        return {
+            'df': simulation_args['df'],
+            'product_steps': simulation_args['product_steps'],
+            'engine': 'intent_aware',
+            'fixed_intent': simulation_args.get('fixed_intent'),
+            'intent_distribution': simulation_args.get('intent_distribution'),
+            'parameters': simulation_args.get('parameters')
+        }
+    raise ValueError(
+        "replication='crn' needs run_behavioral_simulation_improved, run_intent_aware_simulation "
+        "or run_intent_aware_simulation_batch as the simulation function"
+    )
+
+
+# ============================================================================
+# STOCHASTIC SIMULATIONS
+# ============================================================================
+
 def run_stochastic_simulations(
     simulation_function: Callable,
     simulation_args: Dict,
     n_simulations: int = 50,
     random_seed_base: int = 42,
-    verbose: bool = True
+    verbose: bool = True,
+    replication: str = "rerun",
+    target_half_width: Optional[float] = None,
+    confidence_level: float = 0.95
 ) -> List[float]:
     """
     Run multiple stochastic simulations with different random seeds.
@@ -59,11 +310,31 @@ def run_stochastic_simulations(
         n_simulations: Number of stochastic runs
         random_seed_base: Base seed (each run gets seed_base + i)
         verbose: Print progress
+        replication: "rerun" (one full simulation per seed) or "crn"
+            (run_replicated_simulations; engine entry points only)
+        target_half_width: "crn" only - stop early once the completion-rate
+            CI half-width is at most this
+        confidence_level: Confidence level of that half-width
     
     Returns:
         List of completion rates from each simulation
     """
+    if replication not in REPLICATION_MODES:
+        raise ValueError(f"Unknown replication mode '{replication}'. Expected one of {REPLICATION_MODES}")
+    if replication == "crn":
+        replicated = run_replicated_simulations(
+            **_replication_kwargs(simulation_function, simulation_args),
+            n_replicates=n_simulations,
+            random_seed_base=random_seed_base,
+            target_half_width=target_half_width,
+            confidence_level=confidence_level,
+            verbose=verbose
+        )
+        return replicated.completion_rates.tolist()
+    
     completion_rates = []
+    # Only completion counts are read: skip trace capture
+    simulation_args = with_metrics_capture(simulation_function, simulation_args)
     
     if verbose:
         print(f"Running {n_simulations} stochastic simulations...")
@@ -89,16 +360,9 @@ def run_stochastic_simulations(
             if 'completion_rate' in result_df.columns:
                 completion_rate = result_df['completion_rate'].mean()
             else:
-                # Extract from trajectories
-                total_completed = 0
-                total_trajectories = 0
-                for _, row in result_df.iterrows():
-                    trajectories = row.get('trajectories', [])
-                    for traj in trajectories:
-                        total_trajectories += 1
-                        if traj.get('exit_step') == 'Completed':
-                            total_completed += 1
-                completion_rate = total_completed / total_trajectories if total_trajectories > 0 else 0.0
+                # Extract from the run's outcome matrix
+                outcomes = get_outcome_matrix(result_df)
+                completion_rate = float(outcomes.completed.mean()) if len(outcomes) > 0 else 0.0
             
             completion_rates.append(completion_rate)
             
@@ -123,7 +387,9 @@ def estimate_confidence_intervals(
     n_simulations: int = 50,
     random_seed_base: int = 42,
     product_steps: Optional[Dict] = None,
-    verbose: bool = True
+    verbose: bool = True,
+    replication: str = "rerun",
+    target_half_width: Optional[float] = None
 ) -> ConfidenceEstimate:
     """
     Estimate confidence intervals by running stochastic simulations.
@@ -135,6 +401,8 @@ def estimate_confidence_intervals(
         random_seed_base: Base random seed
         product_steps: Optional product steps for extracting metrics
         verbose: Print progress
+        replication: "rerun" or "crn" (see run_stochastic_simulations)
+        target_half_width: "crn" only - early-stopping CI half-width
     
     Returns:
         ConfidenceEstimate with percentiles and stability score
@@ -145,7 +413,9 @@ def estimate_confidence_intervals(
         simulation_args,
         n_simulations=n_simulations,
         random_seed_base=random_seed_base,
-        verbose=verbose
+        verbose=verbose,
+        replication=replication,
+        target_half_width=target_half_width
     )
     
     if not completion_rates:
@@ -191,7 +461,9 @@ def estimate_step_level_confidence(
     product_steps: Dict,
     n_simulations: int = 50,
     random_seed_base: int = 42,
-    verbose: bool = True
+    verbose: bool = True,
+    replication: str = "rerun",
+    target_half_width: Optional[float] = None
 ) -> Dict[str, ConfidenceEstimate]:
     """
     Estimate confidence intervals for each step's drop-off rate.
@@ -203,10 +475,16 @@ def estimate_step_level_confidence(
         n_simulations: Number of stochastic runs
         random_seed_base: Base random seed
         verbose: Print progress
+        replication: "rerun" or "crn" (see run_stochastic_simulations)
+        target_half_width: "crn" only - stop early once every step's
+            drop-off CI half-width is at most this
     
     Returns:
         Dict mapping step_name -> ConfidenceEstimate for drop-off rate
     """
+    if replication not in REPLICATION_MODES:
+        raise ValueError(f"Unknown replication mode '{replication}'. Expected one of {REPLICATION_MODES}")
+    
     step_dropoff_rates = defaultdict(list)
     
     if verbose:
@@ -214,29 +492,43 @@ def estimate_step_level_confidence(
     
     step_names = list(product_steps.keys())
     
-    for i in range(n_simulations):
-        seed = random_seed_base + i
-        args_with_seed = simulation_args.copy()
-        args_with_seed['seed'] = seed
-        
-        try:
-            result_df = simulation_function(**args_with_seed)
-            
-            # Extract step-level metrics
-            simulated_metrics = extract_simulated_metrics_from_results(result_df, product_steps)
-            dropoff_by_step = simulated_metrics.get('dropoff_by_step', {})
+    if replication == "crn":
+        replication_kwargs = _replication_kwargs(simulation_function, simulation_args)
+        replication_kwargs['product_steps'] = product_steps
+        replicated = run_replicated_simulations(
+            **replication_kwargs,
+            n_replicates=n_simulations,
+            random_seed_base=random_seed_base,
+            target_half_width=target_half_width,
+            stop_metric='dropoff_by_step',
+            verbose=verbose
+        )
+        for step_name, dropoff_rates in replicated.dropoff_by_step().items():
+            step_dropoff_rates[step_name] = dropoff_rates.tolist()
+    else:
+        for i in range(n_simulations):
+            seed = random_seed_base + i
+            args_with_seed = simulation_args.copy()
+            args_with_seed['seed'] = seed
             
-            for step_name in step_names:
-                dropoff_rate = dropoff_by_step.get(step_name, 0.0)
-                step_dropoff_rates[step_name].append(dropoff_rate)
+            try:
+                result_df = simulation_function(**args_with_seed)
+                
+                # Extract step-level metrics
+                simulated_metrics = extract_simulated_metrics_from_results(result_df, product_steps)
+                dropoff_by_step = simulated_metrics.get('dropoff_by_step', {})
+                
+                for step_name in step_names:
+                    dropoff_rate = dropoff_by_step.get(step_name, 0.0)
+                    step_dropoff_rates[step_name].append(dropoff_rate)
+                
+                if verbose and (i + 1) % 10 == 0:
+                    print(f"  Completed {i + 1}/{n_simulations} simulations...")
             
-            if verbose and (i + 1) % 10 == 0:
-                print(f"  Completed {i + 1}/{n_simulations} simulations...")
-        
-        except Exception as e:
-            if verbose:
-                print(f"  Warning: Simulation {i+1} failed: {e}")
-            continue
+            except Exception as e:
+                if verbose:
+                    print(f"  Warning: Simulation {i+1} failed: {e}")
+                continue
     
     # Compute confidence estimates for each step
     step_confidence = {}
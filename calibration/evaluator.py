@@ -81,7 +81,8 @@ def evaluate_model(
     confidence_level: float = 0.90,
     engine_module: str = 'behavioral_engine_improved',
     parameter_subset: Optional[list] = None,
-    verbose: bool = True
+    verbose: bool = True,
+    replication: str = "rerun"
 ) -> EvaluationReport:
     """
     Run comprehensive model evaluation.
@@ -97,6 +98,9 @@ def evaluate_model(
         engine_module: Engine module to use
         parameter_subset: Optional list of parameters to analyze (if None, analyze all)
         verbose: Print progress
+        replication: Confidence-interval replication, "rerun" or "crn"
+            (common random numbers, engine entry points only; see
+            confidence_estimation.run_replicated_simulations)
     
     Returns:
         EvaluationReport with all evaluation metrics
@@ -118,7 +122,8 @@ def evaluate_model(
         simulation_args,
         n_simulations=n_stochastic_runs,
         product_steps=product_steps,
-        verbose=verbose
+        verbose=verbose,
+        replication=replication
     )
     
     step_confidence = estimate_step_level_confidence(
@@ -126,7 +131,8 @@ def evaluate_model(
         simulation_args,
         product_steps,
         n_simulations=n_stochastic_runs,
-        verbose=verbose
+        verbose=verbose,
+        replication=replication
     )
     
     # 2. Stability Assessment
@@ -4,10 +4,13 @@ loss_functions.py - Loss Functions for Calibration
 Compares simulated outcomes with observed real-world data.
 """
 
-from typing import Dict, List, Optional
+from typing import Callable, Dict, List, Optional
+import inspect
 import numpy as np
 from collections import Counter
 
+from dropsim_outcome_matrix import get_outcome_matrix
+
 
 def compute_completion_rate_error(
     simulated_completion_rate: float,
@@ -144,6 +147,23 @@ def compute_composite_loss(
     }
 
 
+def with_metrics_capture(simulation_function: Callable, simulation_args: Dict) -> Dict:
+    """
+    simulation_args with capture='metrics' when simulation_function takes it.
+    
+    extract_simulated_metrics_from_results only needs exit steps and steps
+    entered, so the engines can skip journeys, decision traces and
+    attribution. An explicit 'capture' in simulation_args is kept.
+    """
+    if 'capture' in simulation_args:
+        return simulation_args
+    try:
+        accepts_capture = 'capture' in inspect.signature(simulation_function).parameters
+    except (TypeError, ValueError):
+        accepts_capture = False
+    return {**simulation_args, 'capture': 'metrics'} if accepts_capture else simulation_args
+
+
 def extract_simulated_metrics_from_results(
     result_df,
     product_steps: Dict
@@ -152,64 +172,14 @@ def extract_simulated_metrics_from_results(
     Extract observable metrics from simulation results DataFrame.
     
     Args:
-        result_df: DataFrame with simulation results (must have 'trajectories' column)
+        result_df: DataFrame with simulation results ('trajectories' column
+            or an attached outcome matrix)
         product_steps: Dict of step definitions (for step names)
     
     Returns:
         Dict with completion_rate, dropoff_by_step, avg_steps_completed
     """
-    step_names = list(product_steps.keys())
-    total_trajectories = 0
-    completed_trajectories = 0
-    step_dropoff_counts = {step: 0 for step in step_names}
-    step_entry_counts = {step: 0 for step in step_names}
-    total_steps_completed = 0
-    
-    # Aggregate across all personas and trajectories
-    for _, row in result_df.iterrows():
-        trajectories = row.get('trajectories', [])
-        for traj in trajectories:
-            total_trajectories += 1
-            journey = traj.get('journey', [])
-            exit_step = traj.get('exit_step', 'Completed')
-            
-            # Count completion
-            if exit_step == 'Completed':
-                completed_trajectories += 1
-            
-            # Track step dropoffs
-            for step_idx, step_data in enumerate(journey):
-                step_name = step_data.get('step', '')
-                if step_name in step_entry_counts:
-                    step_entry_counts[step_name] += 1
-                    
-                    # If this is the last step before exit, count as dropout
-                    if step_idx == len(journey) - 1 and exit_step != 'Completed':
-                        if step_name in step_dropoff_counts:
-                            step_dropoff_counts[step_name] += 1
-            
-            # Count steps completed
-            total_steps_completed += len(journey)
-    
-    # Compute completion rate
-    completion_rate = completed_trajectories / total_trajectories if total_trajectories > 0 else 0.0
-    
-    # Compute dropoff rates per step
-    dropoff_by_step = {}
-    for step_name in step_names:
-        entered = step_entry_counts.get(step_name, 0)
-        dropped = step_dropoff_counts.get(step_name, 0)
-        dropoff_rate = dropped / entered if entered > 0 else 0.0
-        dropoff_by_step[step_name] = dropoff_rate
-    
-    # Compute average steps completed
-    avg_steps_completed = total_steps_completed / total_trajectories if total_trajectories > 0 else 0.0
-    
-    return {
-        'completion_rate': completion_rate,
-        'dropoff_by_step': dropoff_by_step,
-        'avg_steps_completed': avg_steps_completed,
-        'total_trajectories': total_trajectories,
-        'completed_trajectories': completed_trajectories
-    }
+    # Counts over the run's outcome matrix (built from the 'trajectories'
+    # column if the engine did not attach one)
+    return get_outcome_matrix(result_df, list(product_steps.keys())).metrics()
 
@@ -2,6 +2,10 @@
 optimizer.py - Optimization Algorithms for Parameter Calibration
 
 Implements random search and optional Bayesian optimization.
+
+Random and grid search can evaluate candidates on a process pool
+(n_workers > 1). Candidates are generated and accepted in the same order
+as a serial run, so a seeded parallel run returns the same result.
 """
 
 from typing import Dict, List, Tuple, Optional, Callable
@@ -14,6 +18,7 @@ from calibration.parameter_space import (
     sample_random_parameters,
     get_parameter_bounds
 )
+from dropsim_sharding import resolve_worker_count, split_into_shards, map_shards
 
 
 @dataclass
@@ -27,17 +32,62 @@ class OptimizationResult:
     convergence_reason: str
 
 
+# ============================================================================
+# CANDIDATE EVALUATION
+# ============================================================================
+
+def _evaluate_shard(candidates: List[Dict[str, float]], loss_function: Callable) -> List[float]:
+    """Evaluate one shard of candidates (runs in a worker process)."""
+    return [loss_function(candidate) for candidate in candidates]
+
+
+def evaluate_candidates(
+    loss_function: Callable[[Dict[str, float]], float],
+    candidates: List[Dict[str, float]],
+    n_workers: int = 1
+) -> List[float]:
+    """
+    Evaluate the loss of every candidate, returned in candidate order.
+    
+    Args:
+        loss_function: Loss to evaluate; with n_workers > 1 it must be
+            picklable (a module-level function, functools.partial of one, or
+            a callable object such as calibration.calibrator.SimulationLoss)
+            and deterministic for a given candidate
+        candidates: Parameter dicts
+        n_workers: Worker processes (1 = inline, None/0 = all cores)
+    """
+    workers = resolve_worker_count(n_workers)
+    if workers == 1 or len(candidates) <= 1:
+        return [loss_function(candidate) for candidate in candidates]
+    
+    shards = [candidates[s] for s in split_into_shards(len(candidates), workers)]
+    shard_losses = map_shards(_evaluate_shard, shards, workers, loss_function=loss_function)
+    return [loss for losses in shard_losses for loss in losses]
+
+
+# ============================================================================
+# OPTIMIZERS
+# ============================================================================
+
 def random_search_optimize(
     loss_function: Callable[[Dict[str, float]], float],
     max_iterations: int = 100,
     early_stopping_patience: int = 20,
     tolerance: float = 0.01,
     rng: Optional[np.random.Generator] = None,
-    verbose: bool = True
+    verbose: bool = True,
+    n_workers: int = 1,
+    batch_size: Optional[int] = None
 ) -> OptimizationResult:
     """
     Random search optimization.
     
+    Candidates are sampled batch_size at a time and evaluated together (on
+    n_workers processes), then accepted one by one in sampling order. The
+    result and history equal a serial run with the same rng; after an early
+    stop the rest of that batch is discarded (its draws still advance rng).
+    
     Args:
         loss_function: Function that takes parameters dict and returns loss (lower is better)
         max_iterations: Maximum number of iterations
@@ -45,6 +95,8 @@ def random_search_optimize(
         tolerance: Minimum improvement to count as progress
         rng: Random number generator
         verbose: Print progress
+        n_workers: Worker processes for candidate evaluation (see evaluate_candidates)
+        batch_size: Candidates per batch (default: one per worker)
     
     Returns:
         OptimizationResult with best parameters found
@@ -72,42 +124,52 @@ def random_search_optimize(
         print(f"  Max iterations: {max_iterations}")
         print(f"  Early stopping patience: {early_stopping_patience}\n")
     
-    for iteration in range(1, max_iterations + 1):
-        # Sample random parameters
-        candidate_params = sample_random_parameters(rng)
+    workers = resolve_worker_count(n_workers)
+    if batch_size is None:
+        batch_size = workers
+    
+    for batch_start in range(1, max_iterations + 1, batch_size):
+        iterations = range(batch_start, min(batch_start + batch_size, max_iterations + 1))
+        
+        # Sample random parameters (same draw order as one at a time)
+        batch = [sample_random_parameters(rng) for _ in iterations]
         
         # Evaluate loss
-        candidate_loss = loss_function(candidate_params)
+        batch_losses = evaluate_candidates(loss_function, batch, workers)
         
-        # Check if better
-        improvement = best_loss - candidate_loss
-        if improvement > tolerance:
-            best_params = candidate_params
-            best_loss = candidate_loss
-            no_improvement_count = 0
+        for iteration, candidate_params, candidate_loss in zip(iterations, batch, batch_losses):
+            # Check if better
+            improvement = best_loss - candidate_loss
+            if improvement > tolerance:
+                best_params = candidate_params
+                best_loss = candidate_loss
+                no_improvement_count = 0
+                
+                if verbose and iteration % 10 == 0:
+                    print(f"  Iteration {iteration}: New best loss = {best_loss:.6f} "
+                          f"(improvement: {improvement:.6f})")
+            else:
+                no_improvement_count += 1
             
-            if verbose and iteration % 10 == 0:
-                print(f"  Iteration {iteration}: New best loss = {best_loss:.6f} "
-                      f"(improvement: {improvement:.6f})")
-        else:
-            no_improvement_count += 1
-        
-        # Record history
-        history.append({
-            'iteration': iteration,
-            'loss': candidate_loss,
-            'parameters': candidate_params.copy(),
-            'best_loss': best_loss,
-            'improvement': improvement
-        })
+            # Record history
+            history.append({
+                'iteration': iteration,
+                'loss': candidate_loss,
+                'parameters': candidate_params.copy(),
+                'best_loss': best_loss,
+                'improvement': improvement
+            })
+            
+            # Check early stopping
+            if no_improvement_count >= early_stopping_patience:
+                converged = True
+                convergence_reason = f"early_stopping (no improvement for {early_stopping_patience} iterations)"
+                if verbose:
+                    print(f"\nEarly stopping at iteration {iteration}")
+                    print(f"  No improvement for {early_stopping_patience} iterations")
+                break
         
-        # Check early stopping
-        if no_improvement_count >= early_stopping_patience:
-            converged = True
-            convergence_reason = f"early_stopping (no improvement for {early_stopping_patience} iterations)"
-            if verbose:
-                print(f"\nEarly stopping at iteration {iteration}")
-                print(f"  No improvement for {early_stopping_patience} iterations")
+        if converged:
             break
     
     if verbose:
@@ -129,7 +191,8 @@ def random_search_optimize(
 def grid_search_optimize(
     loss_function: Callable[[Dict[str, float]], float],
     grid_size: int = 3,
-    verbose: bool = True
+    verbose: bool = True,
+    n_workers: int = 1
 ) -> OptimizationResult:
     """
     Grid search optimization (coarse, for validation).
@@ -141,6 +204,8 @@ def grid_search_optimize(
         loss_function: Function that takes parameters dict and returns loss
         grid_size: Number of points per parameter (3 = low, mid, high)
         verbose: Print progress
+        n_workers: Worker processes; the whole grid is evaluated at once
+            (see evaluate_candidates) and scanned in grid order
     
     Returns:
         OptimizationResult with best parameters found
@@ -163,8 +228,23 @@ def grid_search_optimize(
     # Use defaults for other parameters
     defaults = get_default_parameters()
     
+    # Create all combinations (nested loops)
+    import itertools
+    param_names = list(grids.keys())
+    param_values = [grids[name] for name in param_names]
+    
+    candidates = []
+    for combination in itertools.product(*param_values):
+        candidate_params = defaults.copy()
+        for name, value in zip(param_names, combination):
+            candidate_params[name] = value
+        candidates.append(candidate_params)
+    
+    # Defaults first, then the grid
+    losses = evaluate_candidates(loss_function, [defaults.copy()] + candidates, n_workers)
+    
     best_params = defaults.copy()
-    best_loss = loss_function(best_params)
+    best_loss = losses[0]
     
     history = [{
         'iteration': 0,
@@ -182,18 +262,8 @@ def grid_search_optimize(
     total_combinations = grid_size ** len(key_params)
     iteration = 0
     
-    # Create all combinations (nested loops)
-    import itertools
-    param_names = list(grids.keys())
-    param_values = [grids[name] for name in param_names]
-    
-    for combination in itertools.product(*param_values):
+    for candidate_params, candidate_loss in zip(candidates, losses[1:]):
         iteration += 1
-        candidate_params = defaults.copy()
-        for name, value in zip(param_names, combination):
-            candidate_params[name] = value
-        
-        candidate_loss = loss_function(candidate_params)
         
         if candidate_loss < best_loss:
             best_params = candidate_params
@@ -7,6 +7,7 @@ This converts the system from theoretically calibrated to empirically grounded.
 
 import numpy as np
 import json
+from functools import partial
 from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass, asdict
 from datetime import datetime
@@ -19,6 +20,7 @@ from calibration.parameter_space import (
 )
 from calibration.loss_functions import extract_simulated_metrics_from_results
 from calibration.calibrator import run_simulation_with_parameters
+from calibration.optimizer import evaluate_candidates
 from entry_model.funnel_integration import compute_full_funnel_prediction
 
 
@@ -323,7 +325,8 @@ def calibrate_to_real_data(
     initial_parameters: Optional[Dict[str, float]] = None,
     regularization_weight: float = 0.1,
     max_iterations: int = 50,
-    verbose: bool = True
+    verbose: bool = True,
+    n_workers: int = 1
 ) -> Tuple[Dict[str, float], CalibrationSummary, CalibrationDiagnostics]:
     """
     Calibrate model parameters to match observed funnel data.
@@ -338,6 +341,9 @@ def calibrate_to_real_data(
         regularization_weight: Weight for regularization (prevents overfitting)
         max_iterations: Maximum optimization iterations
         verbose: Print progress
+        n_workers: Worker processes; the 5 test values of each coordinate
+            step are evaluated in parallel (simulation_function and
+            simulation_args must then be picklable). Results match n_workers=1.
     
     Returns:
         Tuple of (calibrated_parameters, summary, diagnostics)
@@ -394,6 +400,18 @@ def calibrate_to_real_data(
     
     param_names = list(CALIBRATABLE_PARAMETERS.keys())
     
+    # Objective for one candidate (a partial, so it pickles for the worker pool)
+    objective = partial(
+        calibration_objective,
+        observed=observed_funnel,
+        simulation_function=simulation_function,
+        simulation_args=simulation_args,
+        product_steps=product_steps,
+        entry_signals=entry_signals,
+        regularization_weight=regularization_weight,
+        default_parameters=default_parameters
+    )
+    
     # Coordinate descent: optimize one parameter at a time
     iteration = 0
     converged = False
@@ -420,22 +438,16 @@ def calibrate_to_real_data(
             best_param_value = best_parameters[param_name]
             best_param_error = best_error
             
+            candidates = []
             for test_value in test_values:
                 candidate_params = best_parameters.copy()
                 candidate_params[param_name] = test_value
-                
-                # Evaluate objective
-                error = calibration_objective(
-                    candidate_params,
-                    observed_funnel,
-                    simulation_function,
-                    simulation_args,
-                    product_steps,
-                    entry_signals=entry_signals,
-                    regularization_weight=regularization_weight,
-                    default_parameters=default_parameters
-                )
-                
+                candidates.append(candidate_params)
+            
+            # Evaluate objective (all test values at once), then pick in order
+            errors = evaluate_candidates(objective, candidates, n_workers)
+            
+            for test_value, error in zip(test_values, errors):
                 if error < best_param_error:
                     best_param_error = error
                     best_param_value = test_value
@@ -8,6 +8,7 @@ Shows Credigo simulation results using decision-first queries (not analytics).
 import json
 import sys
 from decision_graph.decision_trace import DecisionTrace, DecisionSequence, DecisionOutcome
+from decision_graph.decision_index import DecisionIndex
 from decision_graph.graph_queries import (
     query_decision_boundaries,
     query_persona_differentiation,
@@ -106,6 +107,9 @@ def main():
     # Get step list for queries
     step_list = list(product_steps.keys())
     
+    # Group traces once for all queries below
+    index = DecisionIndex(sequences)
+    
     # QUERY 1: Decision Boundaries at Landing Page
     print("=" * 80)
     print("DECISION BOUNDARIES: Landing Page")
@@ -113,7 +117,7 @@ def main():
     print()
     
     landing_step = step_list[0] if step_list else "Find the Best Credit Card In 60 seconds"
-    boundaries = query_decision_boundaries(sequences, landing_step)
+    boundaries = query_decision_boundaries(index, landing_step)
     
     print(f"Step: {landing_step}")
     print(f"Persona classes at decision boundary: {len(boundaries)}")
@@ -158,7 +162,7 @@ def main():
     print("=" * 80)
     print()
     
-    competing = query_competing_explanations(sequences, primary_factor="intent_alignment")
+    competing = query_competing_explanations(index, primary_factor="intent_alignment")
     print(f"Found {len(competing)} competing explanations")
     print()
     
@@ -190,7 +194,7 @@ def main():
     print("=" * 80)
     print()
     
-    surfaces = query_acceptance_surface(sequences, product_steps)
+    surfaces = query_acceptance_surface(index, product_steps)
     print(f"Found {len(surfaces)} persona class acceptance surfaces")
     print()
     
@@ -215,7 +219,7 @@ def main():
     
     for step_idx in range(min(3, len(step_list))):
         step_id = step_list[step_idx]
-        boundaries = query_decision_boundaries(sequences, step_id)
+        boundaries = query_decision_boundaries(index, step_id)
         
         print(f"Step {step_idx + 1}: {step_id[:55]}")
         print(f"  Persona classes: {len(boundaries)}")
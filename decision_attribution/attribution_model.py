@@ -6,7 +6,122 @@ It must match the actual decision logic used by behavioral_engine_intent_aware.
 """
 
 import numpy as np
-from typing import Dict, Optional, List
+from typing import Dict, Optional, List, Union
+
+
+FEATURE_NAMES = [
+    'cognitive_energy',
+    'intent_strength',
+    'effort_tolerance',
+    'risk_tolerance',
+    'trust_baseline',
+    'value_expectation',
+    'step_effort',
+    'step_risk',
+    'step_value',
+    'step_trust',
+    'intent_mismatch'
+]
+
+FEATURE_DEFAULTS = {
+    'cognitive_energy': 0.5,
+    'intent_strength': 0.5,
+    'effort_tolerance': 0.5,
+    'risk_tolerance': 0.5,
+    'trust_baseline': 0.5,
+    'value_expectation': 0.5,
+    'step_effort': 0.0,
+    'step_risk': 0.0,
+    'step_value': 0.0,
+    'step_trust': 0.0,
+    'intent_mismatch': 0.0
+}
+
+DEFAULT_MODIFIERS = {
+    'base_persistence': 1.0,
+    'value_sensitivity': 1.0,
+    'fatigue_resilience': 1.0,
+    'risk_tolerance_mult': 1.0
+}
+
+ArrayLike = Union[float, np.ndarray]
+
+
+def compute_probability_array(
+    feature_matrix: np.ndarray,
+    step_index: ArrayLike,
+    total_steps: ArrayLike,
+    intent_alignment: ArrayLike = 0.5,
+    base_persistence: ArrayLike = 1.0,
+    value_sensitivity: ArrayLike = 1.0,
+    fatigue_resilience: ArrayLike = 1.0
+) -> np.ndarray:
+    """
+    Vectorized LocalDecisionFunction.compute_probability.
+    
+    The last axis of feature_matrix holds the features in FEATURE_NAMES
+    order; every other argument broadcasts against feature_matrix[..., 0].
+    Operations are applied in the same order as the scalar function so the
+    results are identical, not merely close.
+    
+    Returns:
+        Array of P(CONTINUE) with shape feature_matrix.shape[:-1]
+    """
+    X = np.asarray(feature_matrix, dtype=float)
+    (cognitive_energy, _intent_strength, effort_tolerance, risk_tolerance,
+     trust_baseline, value_expectation, step_effort, step_risk, step_value,
+     step_trust, intent_mismatch) = np.moveaxis(X, -1, 0)
+    
+    step_index = np.asarray(step_index, dtype=float)
+    total_steps = np.asarray(total_steps, dtype=float)
+    intent_alignment = np.asarray(intent_alignment, dtype=float)
+    
+    perceived_value = np.minimum(1.0, value_expectation + step_value)
+    perceived_control = np.minimum(1.0, trust_baseline + step_trust)
+    perceived_effort = np.minimum(1.0, step_effort * (1 - effort_tolerance))
+    perceived_risk = np.minimum(1.0, step_risk * (1 - risk_tolerance))
+    
+    left = (perceived_value * value_expectation) + perceived_control
+    right = perceived_risk + perceived_effort
+    base_advantage = left - right
+    
+    value_override = np.where(perceived_value > 0.7, perceived_value * 0.3, 0.0)
+    
+    has_steps = total_steps > 0
+    progress = np.where(has_steps, step_index / np.where(has_steps, total_steps, 1.0), 0.0)
+    commitment_boost = progress * 0.8
+    commitment_boost = commitment_boost + np.where(progress > 0.2, (progress - 0.2) * 0.5, 0.0)
+    
+    adjusted_advantage = base_advantage + value_override + commitment_boost
+    
+    steepness = 1.2
+    base_prob = 1 / (1 + np.exp(-steepness * adjusted_advantage))
+    base_prob = base_prob + progress * 0.20
+    
+    adjusted_prob = base_prob * base_persistence
+    adjusted_prob = adjusted_prob + np.where(
+        perceived_value > 0.6, (perceived_value - 0.6) * 0.2 * value_sensitivity, 0.0
+    )
+    fatigue_penalty = ((0.3 - cognitive_energy) * 0.15) * (2.0 - fatigue_resilience)
+    adjusted_prob = adjusted_prob - np.where(cognitive_energy < 0.3, fatigue_penalty, 0.0)
+    
+    adjusted_prob = np.maximum(0.60, adjusted_prob)
+    adjusted_prob = adjusted_prob + (0.18 + 0.22 * progress)
+    adjusted_prob = np.minimum(adjusted_prob, 0.95)
+    
+    # Intent alignment adjustment (only after step 2)
+    intent_active = step_index >= 2
+    intent_penalty_factor = 1.0 - (((1.0 - intent_alignment) * 0.10) * 0.25)
+    penalty_dampening = 1.0 - (0.4 * progress)
+    intent_penalty_factor = 1.0 - ((1.0 - intent_penalty_factor) * penalty_dampening)
+    adjusted_prob = adjusted_prob * np.where(intent_active, intent_penalty_factor, 1.0)
+    adjusted_prob = adjusted_prob + np.where(
+        intent_active & (intent_alignment >= 0.8), (intent_alignment - 0.8) * 0.15, 0.0
+    )
+    
+    adjusted_prob = adjusted_prob - np.where(intent_mismatch > 0.5, intent_mismatch * 0.05, 0.0)
+    
+    return np.clip(adjusted_prob, 0.35, 0.95)
 
 
 class LocalDecisionFunction:
@@ -28,12 +143,7 @@ class LocalDecisionFunction:
             modifiers: Archetype modifiers (base_persistence, value_sensitivity, etc.)
         """
         if modifiers is None:
-            modifiers = {
-                'base_persistence': 1.0,
-                'value_sensitivity': 1.0,
-                'fatigue_resilience': 1.0,
-                'risk_tolerance_mult': 1.0
-            }
+            modifiers = dict(DEFAULT_MODIFIERS)
         self.modifiers = modifiers
     
     def compute_probability(
@@ -178,19 +288,35 @@ class LocalDecisionFunction:
         
         return float(adjusted_prob)
     
+    def compute_probability_batch(
+        self,
+        feature_matrix: np.ndarray,
+        step_index: ArrayLike,
+        total_steps: ArrayLike,
+        intent_alignment: ArrayLike = 0.5
+    ) -> np.ndarray:
+        """
+        Compute P(CONTINUE) for many feature rows at once.
+        
+        Args:
+            feature_matrix: Array whose last axis follows get_feature_names()
+            step_index, total_steps, intent_alignment: Scalars or arrays
+                broadcastable against feature_matrix[..., 0]
+        
+        Returns:
+            Array of P(CONTINUE) with shape feature_matrix.shape[:-1]
+        """
+        return compute_probability_array(
+            feature_matrix,
+            step_index,
+            total_steps,
+            intent_alignment,
+            base_persistence=self.modifiers['base_persistence'],
+            value_sensitivity=self.modifiers['value_sensitivity'],
+            fatigue_resilience=self.modifiers['fatigue_resilience']
+        )
+    
     def get_feature_names(self) -> List[str]:
         """Get list of feature names in order."""
-        return [
-            'cognitive_energy',
-            'intent_strength',
-            'effort_tolerance',
-            'risk_tolerance',
-            'trust_baseline',
-            'value_expectation',
-            'step_effort',
-            'step_risk',
-            'step_value',
-            'step_trust',
-            'intent_mismatch'
-        ]
+        return list(FEATURE_NAMES)
 
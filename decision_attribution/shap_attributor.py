@@ -2,15 +2,238 @@
 SHAP-based attribution using Shapley values (game-theoretic).
 
 Computes local attribution for each decision without training.
-Uses exact Shapley value computation for small feature sets.
+
+Two backends are available:
+- "exact": evaluates each of the 2^n coalitions once (vectorized) and
+  combines them with the Shapley weights. Matches the enumerative
+  definition to floating-point precision.
+- "permutation": Monte Carlo permutation sampling that stops once the
+  standard error of every estimate is within a configurable tolerance.
+
+Both run batched over many decisions at once.
 """
 
 import numpy as np
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple, Union
 from itertools import combinations
 
 from decision_attribution.attribution_types import DecisionAttribution
-from decision_attribution.attribution_model import LocalDecisionFunction
+from decision_attribution.attribution_model import (
+    LocalDecisionFunction,
+    FEATURE_NAMES,
+    FEATURE_DEFAULTS,
+    DEFAULT_MODIFIERS,
+    compute_probability_array
+)
+
+
+SHAPLEY_METHODS = ("exact", "permutation")
+
+# Decisions evaluated together in exact mode (bounds the coalition tensor
+# to roughly chunk * 2^n * n floats)
+EXACT_CHUNK_SIZE = 128
+
+# Two-sided 95% normal quantile used for the permutation error bound
+PERMUTATION_Z = 1.96
+
+
+# ============================================================================
+# COALITION TABLES
+# ============================================================================
+
+_COALITION_CACHE: Dict[int, Tuple[np.ndarray, np.ndarray, np.ndarray]] = {}
+
+
+def _coalition_tables(n_features: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Coalition masks and marginal-contribution index tables for n features (cached).
+    
+    Returns:
+        (masks, without, weights):
+        - masks (2^n, n) bool, row k holds the bits of coalition code k
+        - without (n, 2^(n-1)) codes of the coalitions that exclude feature i
+        - weights (n, 2^(n-1)) Shapley weight 1 / (n * C(n-1, |S|)) of each
+    """
+    if n_features not in _COALITION_CACHE:
+        codes = np.arange(1 << n_features)
+        bits = 1 << np.arange(n_features)
+        masks = (codes[:, None] & bits[None, :]) != 0
+        sizes = masks.sum(axis=1)
+        size_weights = np.array([
+            1.0 / (n_features * _binomial_coefficient(n_features - 1, size))
+            for size in range(n_features)
+        ])
+        
+        without = np.stack([codes[~masks[:, i]] for i in range(n_features)])
+        weights = size_weights[sizes[without]]
+        _COALITION_CACHE[n_features] = (masks, without, weights)
+    
+    return _COALITION_CACHE[n_features]
+
+
+def _modifier_arrays(
+    modifiers: Union[None, Dict, List[Optional[Dict]]],
+    n_decisions: int
+) -> Dict[str, np.ndarray]:
+    """Per-decision modifier columns shaped (n_decisions, 1) for broadcasting."""
+    if modifiers is None or isinstance(modifiers, dict):
+        modifiers = [modifiers] * n_decisions
+    columns = {}
+    for key in ('base_persistence', 'value_sensitivity', 'fatigue_resilience'):
+        columns[key] = np.array([
+            (m if m is not None else DEFAULT_MODIFIERS)[key] for m in modifiers
+        ], dtype=float)[:, None]
+    return columns
+
+
+def _broadcast_column(value, n_decisions: int) -> np.ndarray:
+    """Scalar or per-decision value as an (n_decisions, 1) column."""
+    return np.broadcast_to(np.asarray(value, dtype=float), (n_decisions,)).reshape(-1, 1)
+
+
+# ============================================================================
+# BATCHED SHAPLEY BACKENDS
+# ============================================================================
+
+def compute_shapley_values_batch(
+    feature_matrix: np.ndarray,
+    baseline_matrix: np.ndarray,
+    step_index,
+    total_steps,
+    intent_alignment=0.5,
+    modifiers: Union[None, Dict, List[Optional[Dict]]] = None,
+    method: str = "exact",
+    tolerance: float = 0.01,
+    max_permutations: int = 2000,
+    permutation_batch: int = 64,
+    seed: Optional[int] = None,
+    return_stderr: bool = False
+):
+    """
+    Compute Shapley values for many decisions at once.
+    
+    Args:
+        feature_matrix: (D, n) feature values, columns in FEATURE_NAMES order
+        baseline_matrix: (D, n) or (n,) baseline feature values
+        step_index, total_steps, intent_alignment: Scalars or length-D arrays
+        modifiers: None, one modifiers dict, or one dict per decision
+        method: "exact" or "permutation"
+        tolerance: Permutation mode: stop once 1.96 * standard error of every
+            Shapley estimate is at most this value
+        max_permutations: Permutation mode: hard cap on permutations per decision
+        permutation_batch: Permutation mode: permutations drawn per round
+        seed: Permutation mode: RNG seed
+        return_stderr: Also return the (D, n) standard errors (zeros in exact mode)
+    
+    Returns:
+        (D, n) array of Shapley values, or (values, stderr) if return_stderr
+    """
+    if method not in SHAPLEY_METHODS:
+        raise ValueError(f"Unknown Shapley method '{method}'. Expected one of {SHAPLEY_METHODS}")
+    
+    X = np.atleast_2d(np.asarray(feature_matrix, dtype=float))
+    n_decisions, n_features = X.shape
+    B = np.broadcast_to(np.asarray(baseline_matrix, dtype=float), X.shape)
+    
+    context = {
+        'step_index': _broadcast_column(step_index, n_decisions),
+        'total_steps': _broadcast_column(total_steps, n_decisions),
+        'intent_alignment': _broadcast_column(intent_alignment, n_decisions),
+    }
+    context.update(_modifier_arrays(modifiers, n_decisions))
+    
+    if method == "exact":
+        values = _exact_shapley(X, B, context)
+        stderr = np.zeros_like(values)
+    else:
+        values, stderr = _permutation_shapley(
+            X, B, context, tolerance, max_permutations, permutation_batch, seed
+        )
+    
+    if return_stderr:
+        return values, stderr
+    return values
+
+
+def _exact_shapley(X: np.ndarray, B: np.ndarray, context: Dict[str, np.ndarray]) -> np.ndarray:
+    """Exact Shapley values: one evaluation per coalition, shared by all features."""
+    n_decisions, n_features = X.shape
+    masks, without, weights = _coalition_tables(n_features)
+    bits = 1 << np.arange(n_features)
+    
+    values = np.empty((n_decisions, n_features))
+    for start in range(0, n_decisions, EXACT_CHUNK_SIZE):
+        chunk = slice(start, start + EXACT_CHUNK_SIZE)
+        coalitions = np.where(masks[None, :, :], X[chunk, None, :], B[chunk, None, :])
+        coalition_values = compute_probability_array(
+            coalitions, **{k: v[chunk] for k, v in context.items()}
+        )
+        # Difference before weighting so features that never move the
+        # probability get exactly zero, as in the enumerative definition
+        for i in range(n_features):
+            marginal = coalition_values[:, without[i] | bits[i]] - coalition_values[:, without[i]]
+            values[chunk, i] = marginal @ weights[i]
+    return values
+
+
+def _permutation_shapley(
+    X: np.ndarray,
+    B: np.ndarray,
+    context: Dict[str, np.ndarray],
+    tolerance: float,
+    max_permutations: int,
+    permutation_batch: int,
+    seed: Optional[int]
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Permutation-sampling Shapley estimate with a standard-error stopping rule.
+    
+    Each permutation adds features one at a time; the change in P(CONTINUE)
+    when a feature joins is one sample of its marginal contribution.
+    Decisions stop drawing as soon as their estimates are within tolerance.
+    """
+    n_decisions, n_features = X.shape
+    rng = np.random.default_rng(seed)
+    
+    total = np.zeros((n_decisions, n_features))
+    total_sq = np.zeros((n_decisions, n_features))
+    counts = np.zeros(n_decisions, dtype=int)
+    active = np.ones(n_decisions, dtype=bool)
+    prefix_sizes = np.arange(n_features + 1)
+    
+    while active.any():
+        rows = np.flatnonzero(active)
+        k = int(min(permutation_batch, max_permutations - counts[rows].min()))
+        
+        # rank[d, p, j] = position of feature j in permutation p of decision d
+        order = np.argsort(rng.random((len(rows), k, n_features)), axis=-1)
+        rank = np.argsort(order, axis=-1)
+        
+        prefix_masks = rank[:, :, None, :] < prefix_sizes[None, None, :, None]
+        coalitions = np.where(prefix_masks, X[rows, None, None, :], B[rows, None, None, :])
+        prefix_values = compute_probability_array(
+            coalitions, **{key: v[rows][:, :, None] for key, v in context.items()}
+        )
+        
+        contributions = (
+            np.take_along_axis(prefix_values, rank + 1, axis=-1)
+            - np.take_along_axis(prefix_values, rank, axis=-1)
+        )
+        total[rows] += contributions.sum(axis=1)
+        total_sq[rows] += (contributions ** 2).sum(axis=1)
+        counts[rows] += k
+        
+        n = counts[rows][:, None].astype(float)
+        mean = total[rows] / n
+        variance = np.maximum(total_sq[rows] / n - mean ** 2, 0.0) * n / np.maximum(n - 1, 1)
+        half_width = PERMUTATION_Z * np.sqrt(variance / n)
+        done = (half_width.max(axis=1) <= tolerance) | (counts[rows] >= max_permutations)
+        active[rows[done]] = False
+    
+    n = counts[:, None].astype(float)
+    mean = total / n
+    variance = np.maximum(total_sq / n - mean ** 2, 0.0) * n / np.maximum(n - 1, 1)
+    return mean, np.sqrt(variance / n)
 
 
 def compute_shapley_values(
@@ -19,13 +242,63 @@ def compute_shapley_values(
     baseline: Dict[str, float],
     step_index: int,
     total_steps: int,
-    intent_alignment: float = 0.5
+    intent_alignment: float = 0.5,
+    method: str = "exact",
+    **sampling_options
 ) -> Dict[str, float]:
     """
-    Compute exact Shapley values for all features.
+    Compute Shapley values for all features.
     
     Shapley value = average marginal contribution across all coalitions.
     
+    Args:
+        decision_func: Local decision function
+        features: Current feature values
+        baseline: Baseline (neutral) feature values
+        step_index: Current step index
+        total_steps: Total number of steps
+        intent_alignment: Intent alignment score
+        method: "exact" or "permutation"
+        **sampling_options: tolerance / max_permutations / permutation_batch /
+            seed, forwarded to compute_shapley_values_batch
+    
+    Returns:
+        Dict mapping feature names to Shapley values
+    """
+    feature_names = decision_func.get_feature_names()
+    values = compute_shapley_values_batch(
+        _feature_vector(features, feature_names)[None, :],
+        _feature_vector(baseline, feature_names),
+        step_index,
+        total_steps,
+        intent_alignment,
+        modifiers=decision_func.modifiers,
+        method=method,
+        **sampling_options
+    )[0]
+    return {name: float(value) for name, value in zip(feature_names, values)}
+
+
+def _feature_vector(features: Dict[str, float], feature_names: List[str]) -> np.ndarray:
+    """Feature dict as a vector, using the decision function's defaults for missing keys."""
+    return np.array([features.get(name, FEATURE_DEFAULTS[name]) for name in feature_names], dtype=float)
+
+
+def _enumerate_shapley_values(
+    decision_func: LocalDecisionFunction,
+    features: Dict[str, float],
+    baseline: Dict[str, float],
+    step_index: int,
+    total_steps: int,
+    intent_alignment: float = 0.5
+) -> Dict[str, float]:
+    """
+    Reference Shapley computation by direct enumeration.
+    
+    Evaluates both sides of every marginal contribution separately
+    (2 * n * 2^(n-1) calls). Kept to validate and benchmark the batched
+    backend; use compute_shapley_values instead.
+    
     Args:
         decision_func: Local decision function
         features: Current feature values
@@ -145,38 +418,30 @@ def get_baseline_features(step_index: int = 0, total_steps: int = 11) -> Dict[st
     return baseline
 
 
-def compute_decision_attribution(
+# Feature -> force name (for readability); state tolerances and step forces
+# that describe the same force are summed
+FORCE_NAMES = {
+    'cognitive_energy': 'cognitive_energy',
+    'intent_strength': 'intent',
+    'effort_tolerance': 'effort_tolerance',
+    'risk_tolerance': 'risk_tolerance',
+    'trust_baseline': 'trust',
+    'value_expectation': 'value',
+    'step_effort': 'effort',
+    'step_risk': 'risk',
+    'step_value': 'value',
+    'step_trust': 'trust',
+    'intent_mismatch': 'intent_mismatch'
+}
+
+
+def _build_features(
     cognitive_state: Dict[str, float],
     step_forces: Dict[str, float],
-    intent_info: Dict[str, float],
-    step_id: str,
-    step_index: int,
-    total_steps: int,
-    decision: str,  # "CONTINUE" or "DROP"
-    final_probability: float,
-    modifiers: Dict = None,
-    intent_alignment: float = 0.5
-) -> DecisionAttribution:
-    """
-    Compute game-theoretic attribution for a decision.
-    
-    Args:
-        cognitive_state: Dict with cognitive_energy, perceived_risk, perceived_effort, etc.
-        step_forces: Dict with step_effort, step_risk, step_value, step_trust
-        intent_info: Dict with intent_strength, intent_mismatch
-        step_id: Step identifier
-        step_index: Current step index
-        total_steps: Total number of steps
-        decision: "CONTINUE" or "DROP"
-        final_probability: Actual P(CONTINUE) that was used
-        modifiers: Optional archetype modifiers
-        intent_alignment: Intent alignment score
-    
-    Returns:
-        DecisionAttribution object
-    """
-    # Build feature dict
-    features = {
+    intent_info: Dict[str, float]
+) -> Dict[str, float]:
+    """Assemble the decision function's feature dict from engine state."""
+    return {
         'cognitive_energy': cognitive_state.get('cognitive_energy', 0.5),
         'intent_strength': intent_info.get('intent_strength', 0.5),
         'effort_tolerance': cognitive_state.get('effort_tolerance', 0.5),
@@ -189,48 +454,45 @@ def compute_decision_attribution(
         'step_trust': step_forces.get('step_trust', 0.0),
         'intent_mismatch': intent_info.get('intent_mismatch', 0.0)
     }
-    
-    # Get adaptive baseline (context-aware)
-    baseline = get_baseline_features(step_index, total_steps)
-    
-    # Create decision function
-    decision_func = LocalDecisionFunction(modifiers=modifiers)
-    
-    # Compute baseline probability
-    baseline_prob = decision_func.compute_probability(
-        baseline, step_index, total_steps, intent_alignment
-    )
-    
-    # Compute Shapley values
-    shap_values = compute_shapley_values(
-        decision_func, features, baseline, step_index, total_steps, intent_alignment
-    )
-    
-    # Map to force names (for readability)
-    force_names = {
-        'cognitive_energy': 'cognitive_energy',
-        'intent_strength': 'intent',
-        'effort_tolerance': 'effort_tolerance',
-        'risk_tolerance': 'risk_tolerance',
-        'trust_baseline': 'trust',
-        'value_expectation': 'value',
-        'step_effort': 'effort',
-        'step_risk': 'risk',
-        'step_value': 'value',
-        'step_trust': 'trust',
-        'intent_mismatch': 'intent_mismatch'
-    }
-    
+
+
+def _build_attribution(
+    step_id: str,
+    decision: str,
+    baseline_prob: float,
+    final_probability: float,
+    shap_values: Dict[str, float]
+) -> DecisionAttribution:
+    """Aggregate per-feature Shapley values into a DecisionAttribution."""
     # Aggregate step forces with state tolerances (RAW VALUES)
     aggregated_shap_raw = {}
     for feature_name, shap_value in shap_values.items():
-        force_name = force_names.get(feature_name, feature_name)
+        force_name = FORCE_NAMES.get(feature_name, feature_name)
         if force_name in aggregated_shap_raw:
             # Combine state tolerance and step force
             aggregated_shap_raw[force_name] += shap_value
         else:
             aggregated_shap_raw[force_name] = shap_value
     
+    return build_attribution_from_forces(
+        step_id, decision, baseline_prob, final_probability, aggregated_shap_raw
+    )
+
+
+def build_attribution_from_forces(
+    step_id: str,
+    decision: str,
+    baseline_prob: float,
+    final_probability: float,
+    aggregated_shap_raw: Dict[str, float],
+    timestamp: Optional[str] = None
+) -> DecisionAttribution:
+    """
+    Build a DecisionAttribution from raw per-force Shapley values.
+    
+    Normalization and ranking are derived from the raw values, so this is
+    also how stored attributions (e.g. trace tables) are reconstructed.
+    """
     # Store raw values for transparency
     total_contribution_magnitude = sum(abs(v) for v in aggregated_shap_raw.values())
     
@@ -266,6 +528,120 @@ def compute_decision_attribution(
         shap_values=aggregated_shap_normalized,  # Normalized (percentages)
         shap_values_raw=aggregated_shap_raw,  # Raw SHAP values
         total_contribution=total_contribution_magnitude,  # Total magnitude
-        dominant_forces=dominant_forces
+        dominant_forces=dominant_forces,
+        **({'timestamp': timestamp} if timestamp is not None else {})
+    )
+
+
+def compute_decision_attribution(
+    cognitive_state: Dict[str, float],
+    step_forces: Dict[str, float],
+    intent_info: Dict[str, float],
+    step_id: str,
+    step_index: int,
+    total_steps: int,
+    decision: str,  # "CONTINUE" or "DROP"
+    final_probability: float,
+    modifiers: Dict = None,
+    intent_alignment: float = 0.5,
+    method: str = "exact",
+    **sampling_options
+) -> DecisionAttribution:
+    """
+    Compute game-theoretic attribution for a decision.
+    
+    Args:
+        cognitive_state: Dict with cognitive_energy, perceived_risk, perceived_effort, etc.
+        step_forces: Dict with step_effort, step_risk, step_value, step_trust
+        intent_info: Dict with intent_strength, intent_mismatch
+        step_id: Step identifier
+        step_index: Current step index
+        total_steps: Total number of steps
+        decision: "CONTINUE" or "DROP"
+        final_probability: Actual P(CONTINUE) that was used
+        modifiers: Optional archetype modifiers
+        intent_alignment: Intent alignment score
+        method: Shapley backend, "exact" or "permutation"
+        **sampling_options: Permutation-mode options (see compute_shapley_values_batch)
+    
+    Returns:
+        DecisionAttribution object
+    """
+    features = _build_features(cognitive_state, step_forces, intent_info)
+    
+    # Get adaptive baseline (context-aware)
+    baseline = get_baseline_features(step_index, total_steps)
+    
+    # Create decision function
+    decision_func = LocalDecisionFunction(modifiers=modifiers)
+    
+    # Compute baseline probability
+    baseline_prob = decision_func.compute_probability(
+        baseline, step_index, total_steps, intent_alignment
     )
+    
+    # Compute Shapley values
+    shap_values = compute_shapley_values(
+        decision_func, features, baseline, step_index, total_steps, intent_alignment,
+        method=method, **sampling_options
+    )
+    
+    return _build_attribution(step_id, decision, baseline_prob, final_probability, shap_values)
+
 
+def compute_decision_attributions_batch(
+    requests: List[Dict],
+    method: str = "exact",
+    **sampling_options
+) -> List[DecisionAttribution]:
+    """
+    Compute attributions for many decisions in one vectorized pass.
+    
+    Args:
+        requests: One dict per decision holding the keyword arguments of
+            compute_decision_attribution (cognitive_state, step_forces,
+            intent_info, step_id, step_index, total_steps, decision,
+            final_probability, and optionally modifiers / intent_alignment)
+        method: Shapley backend, "exact" or "permutation"
+        **sampling_options: Permutation-mode options (see compute_shapley_values_batch)
+    
+    Returns:
+        List of DecisionAttribution, in request order
+    """
+    if not requests:
+        return []
+    
+    feature_matrix = np.array([
+        _feature_vector(_build_features(r['cognitive_state'], r['step_forces'], r['intent_info']), FEATURE_NAMES)
+        for r in requests
+    ])
+    baseline_matrix = np.array([
+        _feature_vector(get_baseline_features(r['step_index'], r['total_steps']), FEATURE_NAMES)
+        for r in requests
+    ])
+    step_index = np.array([r['step_index'] for r in requests], dtype=float)
+    total_steps = np.array([r['total_steps'] for r in requests], dtype=float)
+    intent_alignment = np.array([r.get('intent_alignment', 0.5) for r in requests], dtype=float)
+    modifiers = [r.get('modifiers') for r in requests]
+    
+    shap_matrix = compute_shapley_values_batch(
+        feature_matrix, baseline_matrix, step_index, total_steps, intent_alignment,
+        modifiers=modifiers, method=method, **sampling_options
+    )
+    
+    modifier_columns = _modifier_arrays(modifiers, len(requests))
+    baseline_probs = compute_probability_array(
+        baseline_matrix, step_index, total_steps, intent_alignment,
+        **{key: column[:, 0] for key, column in modifier_columns.items()}
+    )
+    
+    return [
+        _build_attribution(
+            r['step_id'],
+            r['decision'],
+            float(baseline_prob),
+            r['final_probability'],
+            {name: float(value) for name, value in zip(FEATURE_NAMES, shap_row)}
+        )
+        for r, baseline_prob, shap_row in zip(requests, baseline_probs, shap_matrix)
+    ]
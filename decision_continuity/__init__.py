@@ -14,6 +14,7 @@ from .decision_event import DecisionEvent, DecisionEventType, BeliefState
 from .continuity_state import ContinuityState, EntityType
 from .precedent_graph import PrecedentGraph, PrecedentNode, PrecedentEdge
 from .continuity_engine import ContinuityEngine
+from .event_log import EventLog
 
 __all__ = [
     'DecisionEvent',
@@ -24,6 +25,7 @@ __all__ = [
     'PrecedentGraph',
     'PrecedentNode',
     'PrecedentEdge',
-    'ContinuityEngine'
+    'ContinuityEngine',
+    'EventLog'
 ]
 
@@ -9,6 +9,7 @@ The ContinuityEngine is the main interface for:
 """
 
 import json
+import weakref
 from typing import Dict, List, Optional, Set
 from pathlib import Path
 from datetime import datetime
@@ -16,6 +17,13 @@ from datetime import datetime
 from .decision_event import DecisionEvent, DecisionEventType, BeliefState, create_decision_event_from_trace
 from .continuity_state import ContinuityState, EntityType
 from .precedent_graph import PrecedentGraph
+from .event_log import EventLog, write_json_atomic
+
+
+SNAPSHOT_FILE = "snapshot.json"
+EVENT_LOG_FILE = "event_log.jsonl"
+SNAPSHOT_FORMAT_VERSION = 1
+EVENT_HISTORY_LIMIT = 10000  # Events kept in snapshots (the log holds the rest until compaction)
 
 
 class ContinuityEngine:
@@ -28,21 +36,47 @@ class ContinuityEngine:
     - Builds PrecedentGraph from historical events
     - Provides query interface for precedents
     - Integrates with existing DropSim components
+    
+    Persistence is a write-ahead log plus snapshots: every recorded event is
+    appended to event_log.jsonl (buffered, `flush_every` events per write),
+    and the full state is compacted into snapshot.json once the log tail
+    outgrows the snapshot. Call flush() (or close(), or use the engine as a
+    context manager) to make buffered events durable; pending events are also
+    flushed when the engine is garbage collected or the interpreter exits.
     """
     
-    def __init__(self, storage_path: Optional[str] = None):
+    def __init__(
+        self,
+        storage_path: Optional[str] = None,
+        flush_every: int = 1000,
+        snapshot_every: int = 100000
+    ):
         """
         Initialize ContinuityEngine.
         
         Args:
-            storage_path: Optional path to persist state (JSON files)
+            storage_path: Optional directory to persist state (snapshot + event log)
+            flush_every: Recorded events buffered per log write (1 = write each event)
+            snapshot_every: Minimum log length before it is compacted into a
+                snapshot; later compactions wait until the log is as long as
+                the history the snapshot covers, so they stay O(1) amortized
+                per event
         """
         self.storage_path = Path(storage_path) if storage_path else None
+        self.snapshot_every = snapshot_every
         
         # In-memory state
         self.continuity_states: Dict[str, ContinuityState] = {}  # entity_id -> ContinuityState
         self.precedent_graph = PrecedentGraph()
         self.event_history: List[DecisionEvent] = []  # Append-only event log
+        self._events_by_id: Dict[str, DecisionEvent] = {}  # event_id -> first event with that id
+        
+        # Write-ahead log and the sequence number the last snapshot covers
+        self._event_log: Optional[EventLog] = None
+        self._snapshot_seq = 0
+        if self.storage_path:
+            self._event_log = EventLog(str(self.storage_path / EVENT_LOG_FILE), flush_every=flush_every)
+            self._finalizer = weakref.finalize(self, self._event_log.flush)
         
         # Load persisted state if available
         if self.storage_path and self.storage_path.exists():
@@ -64,8 +98,24 @@ class ContinuityEngine:
             update_continuity: Whether to update ContinuityState
             update_precedents: Whether to update PrecedentGraph
         """
+        self._apply_event(event, update_continuity, update_precedents)
+        
+        # Persist if storage path is set
+        if self._event_log is not None:
+            self._event_log.append({
+                'event': event.to_dict(),
+                'update_continuity': update_continuity,
+                'update_precedents': update_precedents
+            })
+            log_length = self._event_log.last_seq - self._snapshot_seq
+            if log_length >= max(self.snapshot_every, self._snapshot_seq):
+                self.snapshot()
+    
+    def _apply_event(self, event: DecisionEvent, update_continuity: bool, update_precedents: bool):
+        """Apply an event to the in-memory state (recording and log replay)."""
         # Append to event history (immutable log)
         self.event_history.append(event)
+        self._events_by_id.setdefault(event.event_id, event)
         
         # Update continuity state
         if update_continuity:
@@ -84,16 +134,9 @@ class ContinuityEngine:
             # Find previous event in sequence
             previous_event = None
             if event.parent_event_id:
-                previous_event = next(
-                    (e for e in self.event_history if e.event_id == event.parent_event_id),
-                    None
-                )
+                previous_event = self._events_by_id.get(event.parent_event_id)
             
             self.precedent_graph.add_event(event, previous_event)
-        
-        # Persist if storage path is set
-        if self.storage_path:
-            self._save_state()
     
     def record_event_from_trace(
         self,
@@ -188,64 +231,102 @@ class ContinuityEngine:
             return continuity_state.has_irreversible_event(event_type)
         return False
     
+    def flush(self):
+        """Write buffered events to the event log."""
+        if self._event_log is not None:
+            self._event_log.flush()
+    
+    def snapshot(self):
+        """Compact the current state into snapshot.json and drop the event log."""
+        if self._event_log is None:
+            return
+        self._save_state()
+        self._event_log.reset()
+    
+    def close(self):
+        """Flush buffered events."""
+        self.flush()
+    
+    def __enter__(self) -> 'ContinuityEngine':
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+    
     def _save_state(self):
-        """Save state to disk."""
+        """Write a compacted snapshot covering every event recorded so far."""
         if not self.storage_path:
             return
         
         self.storage_path.mkdir(parents=True, exist_ok=True)
         
-        # Save continuity states
-        continuity_file = self.storage_path / "continuity_states.json"
-        continuity_data = {
-            key: state.to_dict()
-            for key, state in self.continuity_states.items()
+        last_seq = self._event_log.last_seq if self._event_log is not None else 0
+        snapshot = {
+            'format_version': SNAPSHOT_FORMAT_VERSION,
+            'last_seq': last_seq,
+            'continuity_states': {
+                key: state.to_dict()
+                for key, state in self.continuity_states.items()
+            },
+            'precedent_graph': self.precedent_graph.to_dict(),
+            # Last N events to avoid huge files
+            'event_history': [e.to_dict() for e in self.event_history[-EVENT_HISTORY_LIMIT:]]
         }
-        with open(continuity_file, 'w') as f:
-            json.dump(continuity_data, f, indent=2)
-        
-        # Save precedent graph
-        precedent_file = self.storage_path / "precedent_graph.json"
-        with open(precedent_file, 'w') as f:
-            json.dump(self.precedent_graph.to_dict(), f, indent=2)
-        
-        # Save event history (last N events to avoid huge files)
-        event_file = self.storage_path / "event_history.json"
-        recent_events = self.event_history[-10000:]  # Last 10k events
-        event_data = [e.to_dict() for e in recent_events]
-        with open(event_file, 'w') as f:
-            json.dump(event_data, f, indent=2)
+        write_json_atomic(self.storage_path / SNAPSHOT_FILE, snapshot)
+        self._snapshot_seq = last_seq
     
     def _load_state(self):
-        """Load state from disk."""
+        """Load the latest snapshot, then replay the event log after it."""
         if not self.storage_path or not self.storage_path.exists():
             return
         
-        # Load continuity states
-        continuity_file = self.storage_path / "continuity_states.json"
-        if continuity_file.exists():
-            with open(continuity_file, 'r') as f:
-                continuity_data = json.load(f)
-                self.continuity_states = {
-                    key: ContinuityState.from_dict(data)
-                    for key, data in continuity_data.items()
-                }
-        
-        # Load precedent graph
-        precedent_file = self.storage_path / "precedent_graph.json"
-        if precedent_file.exists():
-            with open(precedent_file, 'r') as f:
-                precedent_data = json.load(f)
-                self.precedent_graph = PrecedentGraph.from_dict(precedent_data)
+        snapshot_file = self.storage_path / SNAPSHOT_FILE
+        if snapshot_file.exists():
+            with open(snapshot_file, 'r') as f:
+                snapshot = json.load(f)
+            self._load_snapshot(
+                snapshot['continuity_states'], snapshot['precedent_graph'], snapshot['event_history']
+            )
+            self._snapshot_seq = snapshot['last_seq']
+        else:
+            self._load_legacy_state()
         
-        # Load event history
-        event_file = self.storage_path / "event_history.json"
-        if event_file.exists():
-            with open(event_file, 'r') as f:
-                event_data = json.load(f)
-                self.event_history = [
-                    DecisionEvent.from_dict(e) for e in event_data
-                ]
+        # Replay events recorded after the snapshot
+        if self._event_log is not None:
+            for record in self._event_log.replay(after_seq=self._snapshot_seq):
+                self._apply_event(
+                    DecisionEvent.from_dict(record['event']),
+                    record['update_continuity'],
+                    record['update_precedents']
+                )
+    
+    def _load_snapshot(self, continuity_data: Dict, precedent_data: Dict, event_data: List[Dict]):
+        """Restore in-memory state from snapshot sections."""
+        self.continuity_states = {
+            key: ContinuityState.from_dict(data)
+            for key, data in continuity_data.items()
+        }
+        self.precedent_graph = PrecedentGraph.from_dict(precedent_data)
+        self.event_history = [DecisionEvent.from_dict(e) for e in event_data]
+        self._events_by_id = {}
+        for event in self.event_history:
+            self._events_by_id.setdefault(event.event_id, event)
+    
+    def _load_legacy_state(self):
+        """Load state saved as separate JSON files (before the event log)."""
+        sections = []
+        for filename, default in [
+            ("continuity_states.json", {}),
+            ("precedent_graph.json", {}),
+            ("event_history.json", [])
+        ]:
+            path = self.storage_path / filename
+            if path.exists():
+                with open(path, 'r') as f:
+                    sections.append(json.load(f))
+            else:
+                sections.append(default)
+        self._load_snapshot(*sections)
     
     def export_summary(self) -> Dict:
         """Export summary of current state."""
@@ -0,0 +1,109 @@
+"""
+EventLog - Append-Only Write-Ahead Log for Recorded DecisionEvents
+
+The ContinuityEngine appends one JSON line per recorded event instead of
+rewriting its whole state. Lines are buffered and written in batches; a
+compacted snapshot of the engine state records the last sequence number it
+covers, and loading replays only the log records after it.
+
+Key invariant: sequence numbers increase by one per record and are never reused.
+"""
+
+import json
+import os
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+
+class EventLog:
+    """
+    JSON-lines write-ahead log with buffered appends.
+
+    Each record is {"seq": int, ...payload}. Appends are buffered in memory
+    and written with a single write() every `flush_every` records or on an
+    explicit flush(). A torn trailing line (crash mid-write) is dropped when
+    the log is replayed.
+    """
+
+    def __init__(self, path: str, flush_every: int = 1000):
+        """
+        Initialize EventLog.
+
+        Args:
+            path: Path of the .jsonl log file (created on first flush)
+            flush_every: Buffered records per write (1 = write every record)
+        """
+        self.path = Path(path)
+        self.flush_every = max(1, flush_every)
+        self.last_seq: int = 0
+        self._buffer: List[str] = []
+
+    def append(self, payload: Dict) -> int:
+        """Buffer a record and return its sequence number."""
+        self.last_seq += 1
+        record = dict(payload)
+        record['seq'] = self.last_seq
+        self._buffer.append(json.dumps(record, separators=(',', ':')))
+        if len(self._buffer) >= self.flush_every:
+            self.flush()
+        return self.last_seq
+
+    def flush(self):
+        """Write buffered records to disk."""
+        if not self._buffer:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, 'a') as f:
+            f.write('\n'.join(self._buffer) + '\n')
+        self._buffer = []
+
+    def replay(self, after_seq: int = 0) -> Iterator[Dict]:
+        """
+        Yield records with seq > after_seq, in log order.
+
+        Also advances last_seq past every record in the file, and truncates a
+        torn trailing line so later appends start on a clean line.
+        """
+        self.last_seq = max(self.last_seq, after_seq)
+        if not self.path.exists():
+            return
+
+        good_bytes = 0
+        with open(self.path, 'rb') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    break
+                if not line.endswith(b'\n'):
+                    break
+                good_bytes += len(line)
+                self.last_seq = max(self.last_seq, record['seq'])
+                if record['seq'] > after_seq:
+                    yield record
+
+        if good_bytes < self.path.stat().st_size:
+            with open(self.path, 'r+b') as f:
+                f.truncate(good_bytes)
+
+    def reset(self):
+        """Drop all records on disk (after a snapshot covering them); seq keeps counting."""
+        self._buffer = []
+        if self.path.exists():
+            os.remove(self.path)
+
+    @property
+    def pending(self) -> int:
+        """Records buffered but not yet written."""
+        return len(self._buffer)
+
+
+def write_json_atomic(path: Path, data: Dict, indent: Optional[int] = None):
+    """Write JSON to a temporary file and rename it over path."""
+    path = Path(path)
+    tmp_path = path.with_name(path.name + '.tmp')
+    with open(tmp_path, 'w') as f:
+        json.dump(data, f, indent=indent)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
@@ -12,6 +12,7 @@ from typing import Dict, List, Optional, Set, Tuple
 from collections import defaultdict
 from datetime import datetime
 import hashlib
+import math
 
 
 @dataclass
@@ -205,6 +206,21 @@ class PrecedentEdge:
         )
 
 
+# Precedent index: buckets per unit of each belief dimension, and the most
+# grid cells a signature may span before it is kept on its step's scan list
+INDEX_BUCKETS_PER_UNIT = 20
+INDEX_MAX_CELLS = 64
+
+SUCCESS_RATE_THRESHOLD = 0.5  # query_what_usually_works only returns actions above this
+
+
+def _bucket_span(low: float, high: float) -> Optional[range]:
+    """Index buckets a [low, high] range covers (None if it cannot be bucketed)."""
+    if not (math.isfinite(low) and math.isfinite(high)) or low > high:
+        return None
+    return range(math.floor(low * INDEX_BUCKETS_PER_UNIT), math.floor(high * INDEX_BUCKETS_PER_UNIT) + 1)
+
+
 class PrecedentGraph:
     """
     PrecedentGraph - Aggregates historical DecisionEvents into reusable precedents.
@@ -216,6 +232,12 @@ class PrecedentGraph:
     
     Key invariant: Precedents are derived from historical events, never mutated.
     New events are added, but historical precedents remain unchanged.
+    
+    Queries go through an index instead of walking every node: nodes are
+    filed by step_id and by the grid cells (INDEX_BUCKETS_PER_UNIT per unit)
+    their trust/value/commitment/risk/intent ranges cover, and the
+    (node, action) pairs whose success rate passes SUCCESS_RATE_THRESHOLD are
+    kept per step. Nodes added to `nodes` directly need rebuild_index().
     """
     
     def __init__(self):
@@ -223,6 +245,72 @@ class PrecedentGraph:
         self.nodes: Dict[str, PrecedentNode] = {}  # signature_hash -> PrecedentNode
         self.edges: Dict[Tuple[str, str], PrecedentEdge] = {}  # (from, to) -> PrecedentEdge
         self.total_events_processed: int = 0
+        self.rebuild_index()
+    
+    # ------------------------------------------------------------------
+    # Index maintenance
+    # ------------------------------------------------------------------
+    
+    def rebuild_index(self):
+        """Re-index every node (after loading or editing `nodes` directly)."""
+        self._node_order: Dict[str, int] = {}  # signature_hash -> insertion rank (query tie order)
+        self._cells: Dict[Tuple, List[str]] = defaultdict(list)  # (step_id, 5 buckets) -> hashes
+        self._unbucketed: Dict[str, List[str]] = defaultdict(list)  # step_id -> hashes always scanned
+        self._successful: Dict[str, Dict[Tuple[str, str], None]] = defaultdict(dict)  # step_id -> {(hash, action)}
+        self._action_order: Dict[Tuple[str, str], int] = {}  # (hash, action) -> position in action_distributions
+        for sig_hash, node in self.nodes.items():
+            self._index_node(sig_hash, node)
+            for position, action in enumerate(node.action_distributions):
+                self._action_order[(sig_hash, action)] = position
+                self._index_action(node, action)
+    
+    def _index_node(self, sig_hash: str, node: PrecedentNode):
+        """File a new node under its step and grid cells."""
+        self._node_order[sig_hash] = len(self._node_order)
+        signature = node.signature
+        spans = [
+            _bucket_span(*signature.trust_range),
+            _bucket_span(*signature.value_range),
+            _bucket_span(*signature.commitment_range),
+            _bucket_span(*signature.risk_range),
+            _bucket_span(*signature.intent_range)
+        ]
+        if any(span is None for span in spans) or math.prod(len(span) for span in spans) > INDEX_MAX_CELLS:
+            self._unbucketed[signature.step_id].append(sig_hash)
+            return
+        for t in spans[0]:
+            for v in spans[1]:
+                for c in spans[2]:
+                    for r in spans[3]:
+                        for i in spans[4]:
+                            self._cells[(signature.step_id, t, v, c, r, i)].append(sig_hash)
+    
+    def _index_action(self, node: PrecedentNode, action: str):
+        """Track whether an action of a node currently counts as successful."""
+        key = (node.signature_hash, action)
+        successful = self._successful[node.signature.step_id]
+        if node.action_distributions[action].success_rate > SUCCESS_RATE_THRESHOLD:
+            successful[key] = None
+        else:
+            successful.pop(key, None)
+    
+    def _candidate_nodes(
+        self,
+        step_id: str,
+        trust: float,
+        value: float,
+        commitment: float,
+        risk: float,
+        intent: float
+    ) -> List[str]:
+        """Hashes of the nodes that can match a query, in insertion order."""
+        candidates = list(self._unbucketed.get(step_id, ()))
+        values = (trust, value, commitment, risk, intent)
+        if all(math.isfinite(x) for x in values):
+            cell = (step_id,) + tuple(math.floor(x * INDEX_BUCKETS_PER_UNIT) for x in values)
+            candidates += self._cells.get(cell, ())
+        candidates.sort(key=self._node_order.__getitem__)
+        return candidates
     
     def add_event(self, event: 'DecisionEvent', previous_event: Optional['DecisionEvent'] = None):
         """
@@ -260,6 +348,7 @@ class PrecedentGraph:
                 signature_hash=sig_hash,
                 first_seen=event.timestamp
             )
+            self._index_node(sig_hash, self.nodes[sig_hash])
         
         node = self.nodes[sig_hash]
         node.total_events += 1
@@ -268,12 +357,14 @@ class PrecedentGraph:
         # Update action distribution
         action = event.action_taken
         if action not in node.action_distributions:
+            self._action_order[(sig_hash, action)] = len(node.action_distributions)
             node.action_distributions[action] = ActionOutcomeDistribution(action=action)
         
         dist = node.action_distributions[action]
         outcome = event.outcome_observed or event.event_type.value
         is_success = event.event_type.value in ["continuation", "value_realized"]
         dist.update(outcome, event.confidence_level, is_success)
+        self._index_action(node, action)
         
         # Create edge if previous event exists
         if previous_event:
@@ -335,9 +426,44 @@ class PrecedentGraph:
         Returns:
             List of precedent matches with outcome distributions
         """
+        candidates = (
+            self.nodes[sig_hash]
+            for sig_hash in self._candidate_nodes(step_id, trust, value, commitment, risk, intent)
+        )
+        return self._collect_precedents(candidates, step_id, trust, value, commitment, risk, intent, factors, action)
+    
+    def _scan_precedents(
+        self,
+        step_id: str,
+        trust: float,
+        value: float,
+        commitment: float,
+        risk: float,
+        intent: float,
+        factors: Set[str],
+        action: Optional[str] = None
+    ) -> List[Dict]:
+        """query_precedents by walking every node (reference for the index)."""
+        return self._collect_precedents(
+            self.nodes.values(), step_id, trust, value, commitment, risk, intent, factors, action
+        )
+    
+    def _collect_precedents(
+        self,
+        nodes,
+        step_id: str,
+        trust: float,
+        value: float,
+        commitment: float,
+        risk: float,
+        intent: float,
+        factors: Set[str],
+        action: Optional[str]
+    ) -> List[Dict]:
+        """Build the precedent matches among the given nodes."""
         matches = []
         
-        for node in self.nodes.values():
+        for node in nodes:
             if node.signature.step_id == step_id:
                 if node.signature.matches(trust, value, commitment, risk, intent, factors):
                     match = {
@@ -385,22 +511,25 @@ class PrecedentGraph:
         # This is a simplified implementation
         # In production, would use NLP to parse condition_description
         
-        results = []
+        # Only successful actions, straight from the index (node order, then action order)
+        if step_id:
+            entries = list(self._successful.get(step_id, {}))
+        else:
+            entries = [entry for successful in self._successful.values() for entry in successful]
+        entries.sort(key=lambda entry: (self._node_order[entry[0]], self._action_order[entry]))
         
-        for node in self.nodes.values():
-            if step_id and node.signature.step_id != step_id:
-                continue
-            
-            for action, dist in node.action_distributions.items():
-                if dist.success_rate > 0.5:  # Only successful actions
-                    results.append({
-                        'action': action,
-                        'success_rate': dist.success_rate,
-                        'total_occurrences': dist.total_occurrences,
-                        'average_confidence': dist.average_confidence,
-                        'step_id': node.signature.step_id,
-                        'condition_signature': node.signature.to_dict()
-                    })
+        results = []
+        for sig_hash, action in entries:
+            node = self.nodes[sig_hash]
+            dist = node.action_distributions[action]
+            results.append({
+                'action': action,
+                'success_rate': dist.success_rate,
+                'total_occurrences': dist.total_occurrences,
+                'average_confidence': dist.average_confidence,
+                'step_id': node.signature.step_id,
+                'condition_signature': node.signature.to_dict()
+            })
         
         # Sort by success rate
         results.sort(key=lambda x: x['success_rate'], reverse=True)
@@ -433,5 +562,6 @@ class PrecedentGraph:
             from_hash, to_hash = edge_key.split('_', 1)
             graph.edges[(from_hash, to_hash)] = PrecedentEdge.from_dict(edge_data)
         
+        graph.rebuild_index()
         return graph
 
@@ -21,6 +21,12 @@ from decision_graph.decision_trace import (
 
 from decision_graph.decision_event import DecisionEvent
 
+from decision_graph.trace_table import (
+    DecisionTraceTable,
+    DecisionTraceTableBuilder,
+    DecisionTraceView
+)
+
 from decision_graph.context_graph import (
     ContextGraph,
     ContextGraphNode,
@@ -29,6 +35,8 @@ from decision_graph.context_graph import (
     build_context_graph_from_traces
 )
 
+from decision_graph.decision_index import DecisionIndex
+
 from decision_graph.graph_queries import (
     query_decision_boundaries,
     query_persona_differentiation,
@@ -54,6 +62,11 @@ __all__ = [
     # Decision events
     'DecisionEvent',
     
+    # Columnar trace storage
+    'DecisionTraceTable',
+    'DecisionTraceTableBuilder',
+    'DecisionTraceView',
+    
     # Context graph
     'ContextGraph',
     'ContextGraphNode',
@@ -61,6 +74,9 @@ __all__ = [
     'ContextGraphSummary',
     'build_context_graph_from_traces',
     
+    # Grouped trace index (ledger and queries)
+    'DecisionIndex',
+    
     # Decision-first queries
     'query_decision_boundaries',
     'query_persona_differentiation',
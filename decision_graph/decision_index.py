@@ -0,0 +1,205 @@
+"""
+decision_index.py - Grouped Decision Trace Index
+
+The decision ledger and the decision-first queries all group traces the
+same way - by step, persona class (binned cognitive state) and outcome -
+and each used to rescan every trace of every sequence, re-deriving persona
+classes as it went (generate_decision_ledger once per step). A
+DecisionIndex does that grouping once:
+- one pass over the sequences records each trace's step, outcome, sorted
+  dominant factors, cognitive state and intent alignment
+- persona classes are binned over the cognitive-state columns in one
+  vectorized step
+- every group is an array of positions into those columns
+
+Groups keep first-seen order, so ledgers and query results built from the
+index equal those of a sequential scan, including tie order. Every ledger
+and query function accepts either a list of DecisionSequences or a
+DecisionIndex; build the index once when running several of them.
+"""
+
+from collections import defaultdict
+from typing import Dict, Iterator, List, Sequence, Tuple, Union
+
+import numpy as np
+
+from decision_graph.decision_trace import DecisionOutcome, DecisionSequence, DecisionTrace
+from decision_graph.trace_table import STATE_COLUMNS
+
+
+# Persona class levels, in bin order (> 0.6, > 0.3, otherwise)
+PERSONA_CLASS_LEVELS = ['high', 'medium', 'low']
+
+# Class label per code 9 * energy_bin + 3 * risk_bin + effort_bin
+PERSONA_CLASS_LABELS = [
+    f"{energy}_energy_{risk}_risk_{effort}_effort"
+    for energy in PERSONA_CLASS_LEVELS
+    for risk in PERSONA_CLASS_LEVELS
+    for effort in PERSONA_CLASS_LEVELS
+]
+
+
+_EMPTY = np.array([], dtype=int)
+
+
+def _level_bins(values: np.ndarray) -> np.ndarray:
+    return np.where(values > 0.6, 0, np.where(values > 0.3, 1, 2))
+
+
+def derive_persona_classes(energy: np.ndarray, risk: np.ndarray, effort: np.ndarray) -> List[str]:
+    """Persona class of every row (same binning as a per-trace derivation)."""
+    codes = 9 * _level_bins(energy) + 3 * _level_bins(risk) + _level_bins(effort)
+    return [PERSONA_CLASS_LABELS[code] for code in codes.tolist()]
+
+
+class DecisionIndex:
+    """
+    Traces of a list of DecisionSequences, grouped once.
+
+    traces[i], sequence_ids[i] (the owning sequence's persona_id),
+    persona_classes[i], factor_keys[i] (sorted dominant factors) and
+    states[column][i] describe the i-th trace in sequence order; group
+    accessors return int arrays of such positions.
+    """
+
+    def __init__(self, sequences: Sequence[DecisionSequence]):
+        self.sequences = sequences
+        self.traces: List[DecisionTrace] = []
+        self.sequence_ids: List[str] = []
+        self.factor_keys: List[Tuple[str, ...]] = []
+        step_ids: List[str] = []
+        decisions: List[DecisionOutcome] = []
+        rows: List[Tuple[float, ...]] = []
+        alignments: List[float] = []
+        # Per sequence with traces: (sequence, first position, deepest position)
+        sequence_rows: List[Tuple[DecisionSequence, int, int]] = []
+
+        for sequence in sequences:
+            first = len(self.traces)
+            deepest = None
+            for trace in sequence.traces:
+                if deepest is None or trace.step_index > self.traces[deepest].step_index:
+                    deepest = len(self.traces)
+                cs = trace.cognitive_state_snapshot
+                self.traces.append(trace)
+                self.sequence_ids.append(sequence.persona_id)
+                self.factor_keys.append(tuple(sorted(trace.dominant_factors)))
+                step_ids.append(trace.step_id)
+                decisions.append(trace.decision)
+                rows.append((cs.energy, cs.risk, cs.effort, cs.value, cs.control))
+                alignments.append(trace.intent.alignment_score)
+            if deepest is not None:
+                sequence_rows.append((sequence, first, deepest))
+
+        state_matrix = np.array(rows, dtype=float).reshape(-1, len(STATE_COLUMNS))
+        self.states: Dict[str, np.ndarray] = {
+            column: np.ascontiguousarray(state_matrix[:, j]) for j, column in enumerate(STATE_COLUMNS)
+        }
+        self.intent_alignment = np.array(alignments, dtype=float)
+        self.persona_classes = derive_persona_classes(
+            self.states['energy'], self.states['risk'], self.states['effort']
+        )
+
+        # Step index of the last trace seen at each step
+        self.step_index: Dict[str, int] = {}
+        by_step = defaultdict(list)
+        by_step_outcome = defaultdict(list)
+        by_group = defaultdict(list)
+        step_classes: Dict[str, Dict[str, None]] = defaultdict(dict)
+        by_precedent = defaultdict(list)
+        for position, (trace, step_id, decision, persona_class, factors) in enumerate(
+            zip(self.traces, step_ids, decisions, self.persona_classes, self.factor_keys)
+        ):
+            self.step_index[step_id] = trace.step_index
+            by_step[step_id].append(position)
+            by_step_outcome[(step_id, decision)].append(position)
+            by_group[(step_id, persona_class, decision)].append(position)
+            step_classes[step_id][persona_class] = None
+            by_precedent[(decision, step_id, persona_class, factors)].append(position)
+
+        self._by_step = {key: np.array(value) for key, value in by_step.items()}
+        self._by_step_outcome = {key: np.array(value) for key, value in by_step_outcome.items()}
+        self._by_group = {key: np.array(value) for key, value in by_group.items()}
+        self._step_classes = {step_id: list(classes) for step_id, classes in step_classes.items()}
+        self._by_precedent = {key: np.array(value) for key, value in by_precedent.items()}
+        self._sequence_rows = sequence_rows
+
+    @classmethod
+    def of(cls, sequences: Union[Sequence[DecisionSequence], 'DecisionIndex']) -> 'DecisionIndex':
+        """sequences itself if already indexed, else a new index over them."""
+        return sequences if isinstance(sequences, cls) else cls(sequences)
+
+    def __len__(self) -> int:
+        return len(self.traces)
+
+    # ------------------------------------------------------------------
+    # Groups (position arrays, in sequence order)
+    # ------------------------------------------------------------------
+
+    def at_step(self, step_id: str) -> np.ndarray:
+        return self._by_step.get(step_id, _EMPTY)
+
+    def at_step_outcome(self, step_id: str, outcome: DecisionOutcome) -> np.ndarray:
+        return self._by_step_outcome.get((step_id, outcome), _EMPTY)
+
+    def group(self, step_id: str, persona_class: str, outcome: DecisionOutcome) -> np.ndarray:
+        return self._by_group.get((step_id, persona_class, outcome), _EMPTY)
+
+    def classes_at(self, step_id: str) -> List[str]:
+        """Persona classes seen at step_id, in first-seen order."""
+        return self._step_classes.get(step_id, [])
+
+    def step_outcome_groups(self) -> Iterator[Tuple[str, DecisionOutcome, np.ndarray]]:
+        """(step_id, outcome, positions), in first-seen order."""
+        for (step_id, outcome), positions in self._by_step_outcome.items():
+            yield step_id, outcome, positions
+
+    def precedent_groups(self, outcome: DecisionOutcome) -> Iterator[Tuple[str, str, Tuple[str, ...], np.ndarray]]:
+        """(step_id, persona_class, sorted factors, positions) of traces with outcome, in first-seen order."""
+        for (decision, step_id, persona_class, factors), positions in self._by_precedent.items():
+            if decision == outcome:
+                yield step_id, persona_class, factors, positions
+
+    def sequence_surfaces(self) -> Iterator[Tuple[DecisionSequence, str, DecisionTrace]]:
+        """(sequence, persona class of its first trace, its deepest trace) per sequence with traces."""
+        for sequence, first, deepest in self._sequence_rows:
+            yield sequence, self.persona_classes[first], self.traces[deepest]
+
+    # ------------------------------------------------------------------
+    # Column access
+    # ------------------------------------------------------------------
+
+    def traces_at(self, positions: np.ndarray) -> List[DecisionTrace]:
+        return [self.traces[p] for p in positions.tolist()]
+
+    def state(self, column: str, positions: np.ndarray) -> np.ndarray:
+        """Cognitive-state column ('energy', 'risk', ...) at positions."""
+        return self.states[column][positions]
+
+    def factor_set_counts(self, positions: np.ndarray) -> Dict[Tuple[str, ...], int]:
+        """Occurrences of each distinct (sorted) dominant-factor set at positions."""
+        counts: Dict[Tuple[str, ...], int] = {}
+        for p in positions.tolist():
+            key = self.factor_keys[p]
+            counts[key] = counts.get(key, 0) + 1
+        return counts
+
+
+def mean_pairwise_jaccard_distance(factor_set_counts: Dict[Tuple[str, ...], int]) -> float:
+    """
+    Mean Jaccard distance over all pairs of traces whose factor sets are
+    not both empty, from the count of each distinct set (O(distinct sets^2)
+    instead of O(traces^2)).
+    """
+    sets = [(set(key), count) for key, count in factor_set_counts.items()]
+    total_distance = 0.0
+    pairs = 0
+    for i, (a, count_a) in enumerate(sets):
+        if a:
+            # Pairs within one set have distance 0
+            pairs += count_a * (count_a - 1) // 2
+        for b, count_b in sets[i + 1:]:
+            union = len(a | b)
+            total_distance += count_a * count_b * (1.0 - len(a & b) / union)
+            pairs += count_a * count_b
+    return total_distance / pairs if pairs else 0.0
@@ -51,10 +51,12 @@ If a value helps interpretation, remove it.
 If a value helps replay, keep it.
 """
 
-from typing import Dict, List, Tuple, Optional, Set
-from collections import defaultdict, Counter
+from typing import Dict, List, Tuple, Optional, Set, Union
+from collections import Counter
 from dataclasses import dataclass, field
 from decision_graph.decision_trace import DecisionTrace, DecisionSequence, DecisionOutcome
+from decision_graph.decision_index import DecisionIndex, mean_pairwise_jaccard_distance
+from decision_graph.trace_table import STATE_COLUMNS
 import numpy as np
 from datetime import datetime
 
@@ -260,17 +262,6 @@ class DecisionTerminationPoint:
         }
 
 
-def _derive_persona_class(trace: DecisionTrace) -> str:
-    """Derive persona class from cognitive state (deterministic binning)."""
-    cs = trace.cognitive_state_snapshot
-    
-    energy_level = "high_energy" if cs.energy > 0.6 else ("medium_energy" if cs.energy > 0.3 else "low_energy")
-    risk_level = "high_risk" if cs.risk > 0.6 else ("medium_risk" if cs.risk > 0.3 else "low_risk")
-    effort_level = "high_effort" if cs.effort > 0.6 else ("medium_effort" if cs.effort > 0.3 else "low_effort")
-    
-    return f"{energy_level}_{risk_level}_{effort_level}"
-
-
 def compute_persona_class_coherence(
     traces: List[DecisionTrace],
     persona_class: str,
@@ -282,7 +273,23 @@ def compute_persona_class_coherence(
     Measures internal stability of a persona class.
     If coherence is low, class is marked UNSTABLE.
     """
-    if not traces:
+    states = {
+        column: np.array([getattr(t.cognitive_state_snapshot, column) for t in traces], dtype=float)
+        for column in STATE_COLUMNS
+    }
+    factor_set_counts = Counter(tuple(sorted(set(t.dominant_factors))) for t in traces)
+    return _coherence_from_columns(states, factor_set_counts, persona_class, coherence_threshold)
+
+
+def _coherence_from_columns(
+    states: Dict[str, np.ndarray],
+    factor_set_counts: Dict[Tuple[str, ...], int],
+    persona_class: str,
+    coherence_threshold: float = 0.7
+) -> PersonaClassCoherence:
+    """Coherence from a class's cognitive-state columns and distinct factor sets."""
+    trace_count = len(states['energy'])
+    if not trace_count:
         return PersonaClassCoherence(
             persona_class=persona_class,
             trace_count=0,
@@ -298,33 +305,15 @@ def compute_persona_class_coherence(
         )
     
     # Compute cognitive state variance
-    energies = [t.cognitive_state_snapshot.energy for t in traces]
-    risks = [t.cognitive_state_snapshot.risk for t in traces]
-    efforts = [t.cognitive_state_snapshot.effort for t in traces]
-    values = [t.cognitive_state_snapshot.value for t in traces]
-    controls = [t.cognitive_state_snapshot.control for t in traces]
-    
-    energy_variance = float(np.var(energies))
-    risk_variance = float(np.var(risks))
-    effort_variance = float(np.var(efforts))
-    value_variance = float(np.var(values))
-    control_variance = float(np.var(controls))
-    
-    # Compute dominant factor variance (Jaccard distance)
-    factor_sets = [set(t.dominant_factors) for t in traces]
-    if len(factor_sets) > 1:
-        # Average pairwise Jaccard distance
-        jaccard_distances = []
-        for i in range(len(factor_sets)):
-            for j in range(i + 1, len(factor_sets)):
-                intersection = len(factor_sets[i] & factor_sets[j])
-                union = len(factor_sets[i] | factor_sets[j])
-                if union > 0:
-                    jaccard = 1.0 - (intersection / union)
-                    jaccard_distances.append(jaccard)
-        dominant_factor_variance = float(np.mean(jaccard_distances)) if jaccard_distances else 0.0
-    else:
-        dominant_factor_variance = 0.0
+    energy_variance = float(np.var(states['energy']))
+    risk_variance = float(np.var(states['risk']))
+    effort_variance = float(np.var(states['effort']))
+    value_variance = float(np.var(states['value']))
+    control_variance = float(np.var(states['control']))
+    
+    # Compute dominant factor variance (average pairwise Jaccard distance,
+    # over distinct factor sets weighted by their counts)
+    dominant_factor_variance = mean_pairwise_jaccard_distance(factor_set_counts)
     
     # Coherence score (inverse of normalized variance)
     # Lower variance = higher coherence
@@ -341,7 +330,7 @@ def compute_persona_class_coherence(
     
     return PersonaClassCoherence(
         persona_class=persona_class,
-        trace_count=len(traces),
+        trace_count=trace_count,
         energy_variance=energy_variance,
         risk_variance=risk_variance,
         effort_variance=effort_variance,
@@ -444,7 +433,7 @@ def _find_replay_complete_counterexamples(
 
 
 def generate_decision_boundary_assertions(
-    sequences: List[DecisionSequence],
+    sequences: Union[List[DecisionSequence], DecisionIndex],
     step_id: str
 ) -> Tuple[List[DecisionBoundaryAssertion], List[Dict]]:
     """
@@ -457,44 +446,36 @@ def generate_decision_boundary_assertions(
     Only includes patterns with:
     - Pattern Stable == True
     - Supporting Traces >= MIN_BOUNDARY_SUPPORT
+    
+    Pass a DecisionIndex when generating assertions for several steps.
     """
     stable_assertions = []
     unstable_patterns = []
     
-    # Group traces by step and persona class
-    step_traces_by_class = defaultdict(lambda: {'accepted': [], 'rejected': []})
-    step_index = None
-    
-    for sequence in sequences:
-        for trace in sequence.traces:
-            if trace.step_id == step_id:
-                step_index = trace.step_index
-                persona_class = _derive_persona_class(trace)
-                
-                if trace.decision == DecisionOutcome.CONTINUE:
-                    step_traces_by_class[persona_class]['accepted'].append(trace)
-                else:
-                    step_traces_by_class[persona_class]['rejected'].append(trace)
+    # Traces grouped by step, persona class and outcome
+    index = DecisionIndex.of(sequences)
+    step_index = index.step_index.get(step_id)
     
     if step_index is None:
         return [], []
     
     # Generate assertions for each persona class
-    for persona_class, traces in step_traces_by_class.items():
-        accepted = traces['accepted']
-        rejected = traces['rejected']
-        all_traces = accepted + rejected
-        
-        if not all_traces:
-            continue
+    for persona_class in index.classes_at(step_id):
+        accepted_positions = index.group(step_id, persona_class, DecisionOutcome.CONTINUE)
+        rejected_positions = index.group(step_id, persona_class, DecisionOutcome.DROP)
+        all_positions = np.concatenate([accepted_positions, rejected_positions])
         
         # Compute coherence
-        coherence = compute_persona_class_coherence(all_traces, persona_class)
+        coherence = _coherence_from_columns(
+            {column: index.state(column, all_positions) for column in STATE_COLUMNS},
+            index.factor_set_counts(all_positions),
+            persona_class
+        )
         
         # Check stability requirements
         is_stable_pattern = (
             coherence.is_stable and
-            len(all_traces) >= MIN_BOUNDARY_SUPPORT
+            len(all_positions) >= MIN_BOUNDARY_SUPPORT
         )
         
         if not is_stable_pattern:
@@ -502,28 +483,22 @@ def generate_decision_boundary_assertions(
             unstable_patterns.append({
                 'step_id': step_id,
                 'persona_class': persona_class,
-                'trace_count': len(all_traces),
+                'trace_count': len(all_positions),
                 'coherence_stable': coherence.is_stable,
-                'meets_support_threshold': len(all_traces) >= MIN_BOUNDARY_SUPPORT
+                'meets_support_threshold': len(all_positions) >= MIN_BOUNDARY_SUPPORT
             })
             continue
         
         # Compute cognitive thresholds from accepted traces
         cognitive_thresholds = {}
-        if accepted:
-            energies = [t.cognitive_state_snapshot.energy for t in accepted]
-            risks = [t.cognitive_state_snapshot.risk for t in accepted]
-            efforts = [t.cognitive_state_snapshot.effort for t in accepted]
-            values = [t.cognitive_state_snapshot.value for t in accepted]
-            controls = [t.cognitive_state_snapshot.control for t in accepted]
-            
-            cognitive_thresholds = {
-                'energy': (float(min(energies)), float(max(energies))),
-                'risk': (float(min(risks)), float(max(risks))),
-                'effort': (float(min(efforts)), float(max(efforts))),
-                'value': (float(min(values)), float(max(values))),
-                'control': (float(min(controls)), float(max(controls)))
-            }
+        if len(accepted_positions):
+            for column in STATE_COLUMNS:
+                observed = index.state(column, accepted_positions)
+                cognitive_thresholds[column] = (float(observed.min()), float(observed.max()))
+        
+        accepted = index.traces_at(accepted_positions)
+        rejected = index.traces_at(rejected_positions)
+        all_traces = accepted + rejected
         
         # Compute factor presence (not categorical labels)
         factor_presence = _compute_factor_presence(all_traces)
@@ -560,7 +535,7 @@ def generate_decision_boundary_assertions(
 
 
 def generate_precedent_assertions(
-    sequences: List[DecisionSequence],
+    sequences: Union[List[DecisionSequence], DecisionIndex],
     outcome: DecisionOutcome,
     minimum_occurrence: int = MIN_BOUNDARY_SUPPORT
 ) -> List[PrecedentAssertion]:
@@ -570,33 +545,15 @@ def generate_precedent_assertions(
     Separate function for ACCEPTANCE and REJECTION precedents.
     Contains only raw counts and timestamps (no rates).
     """
-    precedent_data = defaultdict(lambda: {
-        'count': 0,
-        'traces': [],
-        'personas': set()
-    })
-    
-    for sequence in sequences:
-        for trace in sequence.traces:
-            if trace.decision != outcome:
-                continue
-            
-            persona_class = _derive_persona_class(trace)
-            factors_tuple = tuple(sorted(trace.dominant_factors))
-            
-            key = (trace.step_id, persona_class, factors_tuple)
-            
-            precedent_data[key]['count'] += 1
-            precedent_data[key]['traces'].append(trace)
-            precedent_data[key]['personas'].add(sequence.persona_id)
-    
+    index = DecisionIndex.of(sequences)
     assertions = []
     
-    for (step_id, persona_class, factors_tuple), data in precedent_data.items():
-        if data['count'] < minimum_occurrence:
+    for step_id, persona_class, factors_tuple, positions in index.precedent_groups(outcome):
+        count = len(positions)
+        if count < minimum_occurrence:
             continue
         
-        traces = data['traces']
+        traces = index.traces_at(positions)
         timestamps = [t.timestamp for t in traces if t.timestamp]
         
         if not timestamps:
@@ -617,14 +574,14 @@ def generate_precedent_assertions(
         factor_presence = _compute_factor_presence(traces)
         
         # Stability based on occurrence count (not rate)
-        is_stable = data['count'] >= MIN_BOUNDARY_SUPPORT
+        is_stable = count >= MIN_BOUNDARY_SUPPORT
         
         assertion = PrecedentAssertion(
             step_id=step_id,
             persona_class=persona_class,
             factor_presence=factor_presence,
             outcome=outcome,
-            occurrence_count=data['count'],
+            occurrence_count=count,
             first_observed_timestamp=first_timestamp,
             last_observed_timestamp=last_timestamp,
             time_span_seconds=time_span_seconds,
@@ -639,7 +596,7 @@ def generate_precedent_assertions(
 
 
 def generate_decision_termination_points(
-    sequences: List[DecisionSequence],
+    sequences: Union[List[DecisionSequence], DecisionIndex],
     product_steps: Dict
 ) -> List[DecisionTerminationPoint]:
     """
@@ -653,27 +610,17 @@ def generate_decision_termination_points(
     for idx, step_id in enumerate(product_steps.keys()):
         step_indices[step_id] = idx
     
-    # Collect rejection decisions per step
-    step_rejections = defaultdict(lambda: {'count': 0, 'timestamps': []})
-    
-    for sequence in sequences:
-        for trace in sequence.traces:
-            if trace.decision == DecisionOutcome.DROP:
-                step_id = trace.step_id
-                step_rejections[step_id]['count'] += 1
-                if trace.timestamp:
-                    step_rejections[step_id]['timestamps'].append(trace.timestamp)
-    
+    index = DecisionIndex.of(sequences)
     assertions = []
     
     for step_id in product_steps.keys():
         step_index = step_indices.get(step_id, -1)
-        rejection_data = step_rejections.get(step_id, {'count': 0, 'timestamps': []})
+        rejections = index.traces_at(index.at_step_outcome(step_id, DecisionOutcome.DROP))
         
-        has_rejections = rejection_data['count'] > 0
-        rejection_count = rejection_data['count']
+        has_rejections = len(rejections) > 0
+        rejection_count = len(rejections)
         
-        timestamps = rejection_data['timestamps']
+        timestamps = [t.timestamp for t in rejections if t.timestamp]
         first_rejection_timestamp = min(timestamps) if timestamps else None
         last_rejection_timestamp = max(timestamps) if timestamps else None
         
@@ -691,7 +638,7 @@ def generate_decision_termination_points(
 
 
 def generate_decision_ledger(
-    sequences: List[DecisionSequence],
+    sequences: Union[List[DecisionSequence], DecisionIndex],
     product_steps: Dict,
     step_ids: Optional[List[str]] = None
 ) -> Dict:
@@ -712,19 +659,22 @@ def generate_decision_ledger(
     if step_ids is None:
         step_ids = list(product_steps.keys())
     
+    # Group every trace once; each section reads its groups
+    index = DecisionIndex.of(sequences)
+    
     # Generate assertions
     decision_boundaries = []
     unstable_patterns = []
     for step_id in step_ids:
-        boundaries, unstable = generate_decision_boundary_assertions(sequences, step_id)
+        boundaries, unstable = generate_decision_boundary_assertions(index, step_id)
         decision_boundaries.extend(boundaries)
         unstable_patterns.extend(unstable)
     
     # Separate precedents by outcome
-    acceptance_precedents = generate_precedent_assertions(sequences, DecisionOutcome.CONTINUE, minimum_occurrence=MIN_BOUNDARY_SUPPORT)
-    rejection_precedents = generate_precedent_assertions(sequences, DecisionOutcome.DROP, minimum_occurrence=MIN_BOUNDARY_SUPPORT)
+    acceptance_precedents = generate_precedent_assertions(index, DecisionOutcome.CONTINUE, minimum_occurrence=MIN_BOUNDARY_SUPPORT)
+    rejection_precedents = generate_precedent_assertions(index, DecisionOutcome.DROP, minimum_occurrence=MIN_BOUNDARY_SUPPORT)
     
-    decision_termination_points = generate_decision_termination_points(sequences, product_steps)
+    decision_termination_points = generate_decision_termination_points(index, product_steps)
     
     return {
         'decision_boundaries': [b.to_dict() for b in decision_boundaries],
@@ -733,6 +683,6 @@ def generate_decision_ledger(
         'decision_termination_points': [d.to_dict() for d in decision_termination_points],
         'non_binding_observations_excluded': unstable_patterns,
         'generated_timestamp': datetime.now().isoformat(),
-        'total_sequences': len(sequences),
+        'total_sequences': len(index.sequences),
         'total_steps': len(product_steps)
     }
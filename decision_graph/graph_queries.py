@@ -20,11 +20,13 @@ Key Principles:
 This ensures insights survive audit, replay, and precedent comparison.
 """
 
-from typing import Dict, List, Set, Tuple, Optional
+from typing import Dict, List, Set, Tuple, Optional, Union
 from collections import defaultdict, Counter
 from dataclasses import dataclass
 from decision_graph.context_graph import ContextGraph
+from decision_graph.decision_index import DecisionIndex
 from decision_graph.decision_trace import DecisionSequence, DecisionOutcome, DecisionTrace
+from decision_graph.trace_table import STATE_COLUMNS
 
 
 @dataclass
@@ -196,7 +198,7 @@ def _derive_persona_class(trace: DecisionTrace) -> str:
 
 
 def query_decision_boundaries(
-    sequences: List[DecisionSequence],
+    sequences: Union[List[DecisionSequence], DecisionIndex],
     step_id: str
 ) -> List[DecisionBoundary]:
     """
@@ -206,71 +208,45 @@ def query_decision_boundaries(
     "What cognitive thresholds separate them?"
     
     Returns decision boundaries with counterexamples to prevent monocausal claims.
+    Pass a DecisionIndex when querying several steps.
     """
     boundaries = []
     
-    # Group traces by step and persona class
-    step_traces_by_class = defaultdict(lambda: {'accepted': [], 'rejected': []})
-    step_index = None
-    
-    for sequence in sequences:
-        for trace in sequence.traces:
-            if trace.step_id == step_id:
-                step_index = trace.step_index
-                persona_class = _derive_persona_class(trace)
-                
-                if trace.decision == DecisionOutcome.CONTINUE:
-                    step_traces_by_class[persona_class]['accepted'].append(trace)
-                else:
-                    step_traces_by_class[persona_class]['rejected'].append(trace)
+    # Traces grouped by step, persona class and outcome
+    index = DecisionIndex.of(sequences)
+    step_index = index.step_index.get(step_id)
     
     if step_index is None:
         return []  # Step not found
     
     # For each persona class, compute thresholds and find counterexamples
-    for persona_class, traces in step_traces_by_class.items():
-        accepted = traces['accepted']
-        rejected = traces['rejected']
-        
-        if not accepted and not rejected:
-            continue
+    for persona_class in index.classes_at(step_id):
+        accepted = index.group(step_id, persona_class, DecisionOutcome.CONTINUE)
+        rejected = index.group(step_id, persona_class, DecisionOutcome.DROP)
         
         # Compute cognitive thresholds from accepted traces
         cognitive_thresholds = {}
-        if accepted:
-            energies = [t.cognitive_state_snapshot.energy for t in accepted]
-            risks = [t.cognitive_state_snapshot.risk for t in accepted]
-            efforts = [t.cognitive_state_snapshot.effort for t in accepted]
-            values = [t.cognitive_state_snapshot.value for t in accepted]
-            controls = [t.cognitive_state_snapshot.control for t in accepted]
-            
-            cognitive_thresholds = {
-                'energy': (min(energies), max(energies)),
-                'risk': (min(risks), max(risks)),
-                'effort': (min(efforts), max(efforts)),
-                'value': (min(values), max(values)),
-                'control': (min(controls), max(controls))
-            }
+        if len(accepted):
+            for column in STATE_COLUMNS:
+                observed = index.state(column, accepted)
+                cognitive_thresholds[column] = (float(observed.min()), float(observed.max()))
         
-        # Find counterexamples: accepted trace that violates thresholds
         counterexample_accepted = None
-        if accepted and rejected:
-            # Find accepted trace with low energy/high risk (should be rejected by thresholds)
-            for trace in accepted:
-                cs = trace.cognitive_state_snapshot
-                if cs.energy < 0.3 or cs.risk > 0.7:
-                    counterexample_accepted = trace
-                    break
-        
-        # Find counterexample: rejected trace that meets thresholds
         counterexample_rejected = None
-        if accepted and rejected:
-            # Find rejected trace with high energy/low risk (should be accepted by thresholds)
-            for trace in rejected:
-                cs = trace.cognitive_state_snapshot
-                if cs.energy > 0.6 and cs.risk < 0.3:
-                    counterexample_rejected = trace
-                    break
+        if len(accepted) and len(rejected):
+            # Counterexample: accepted trace with low energy/high risk (should be rejected by thresholds)
+            violating = accepted[
+                (index.state('energy', accepted) < 0.3) | (index.state('risk', accepted) > 0.7)
+            ]
+            if len(violating):
+                counterexample_accepted = index.traces[violating[0]]
+            
+            # Counterexample: rejected trace with high energy/low risk (should be accepted by thresholds)
+            meeting = rejected[
+                (index.state('energy', rejected) > 0.6) & (index.state('risk', rejected) < 0.3)
+            ]
+            if len(meeting):
+                counterexample_rejected = index.traces[meeting[0]]
         
         boundary = DecisionBoundary(
             step_id=step_id,
@@ -288,7 +264,7 @@ def query_decision_boundaries(
 
 
 def query_persona_differentiation(
-    sequences: List[DecisionSequence],
+    sequences: Union[List[DecisionSequence], DecisionIndex],
     step_x_id: str,
     step_x_plus_one_id: str
 ) -> List[PersonaDifferentiation]:
@@ -301,27 +277,21 @@ def query_persona_differentiation(
     This identifies personas that show divergent behavior patterns across steps.
     """
     differentiations = []
+    index = DecisionIndex.of(sequences)
     
     # Find sequences that have traces at both steps
     step_x_traces = {}  # persona_id -> trace
     step_x_plus_one_traces = {}  # persona_id -> trace
     
-    for sequence in sequences:
-        for trace in sequence.traces:
-            if trace.step_id == step_x_id:
-                step_x_traces[sequence.persona_id] = trace
-            elif trace.step_id == step_x_plus_one_id:
-                step_x_plus_one_traces[sequence.persona_id] = trace
+    for position in index.at_step(step_x_id).tolist():
+        step_x_traces[index.sequence_ids[position]] = index.traces[position]
+    if step_x_plus_one_id != step_x_id:
+        for position in index.at_step(step_x_plus_one_id).tolist():
+            step_x_plus_one_traces[index.sequence_ids[position]] = index.traces[position]
     
     # Find personas that failed at X but have trace at X+1 (impossible - if they failed at X, they don't reach X+1)
     # Actually, we need to compare different personas with similar entry conditions
     
-    # Group by entry cognitive state (first step state)
-    entry_states = {}  # persona_id -> first trace cognitive state
-    for sequence in sequences:
-        if sequence.traces:
-            entry_states[sequence.persona_id] = sequence.traces[0].cognitive_state_snapshot
-    
     # Find personas with similar entry states but different outcomes at step X
     failed_at_x = []  # (persona_id, trace)
     succeeded_at_x = []  # (persona_id, trace)
@@ -415,7 +385,7 @@ def query_stable_precedents(
 
 
 def query_competing_explanations(
-    sequences: List[DecisionSequence],
+    sequences: Union[List[DecisionSequence], DecisionIndex],
     primary_factor: str = "intent_alignment"
 ) -> List[CompetingExplanation]:
     """
@@ -429,47 +399,32 @@ def query_competing_explanations(
     """
     competing_explanations = []
     
-    # Group traces by step and outcome
-    step_outcome_traces = defaultdict(lambda: {'CONTINUE': [], 'DROP': []})
+    # Traces grouped by step and outcome
+    index = DecisionIndex.of(sequences)
     
-    for sequence in sequences:
-        for trace in sequence.traces:
-            outcome_key = trace.decision.value
-            step_outcome_traces[(trace.step_id, outcome_key)][outcome_key].append(trace)
+    # Primary factor column (other factors never contradict an outcome)
+    if primary_factor == "intent_alignment":
+        primary_column = index.intent_alignment
+    elif primary_factor == "cognitive_energy":
+        primary_column = index.states['energy']
+    else:
+        return competing_explanations
     
     # For each step-outcome combination, analyze primary factor vs competing factors
-    for (step_id, outcome_str), data in step_outcome_traces.items():
-        traces = data[outcome_str]
-        outcome = DecisionOutcome(outcome_str)
-        
-        if not traces:
-            continue
-        
-        # Extract primary factor values
-        if primary_factor == "intent_alignment":
-            primary_values = [t.intent.alignment_score for t in traces]
-        else:
-            # Default to cognitive energy if factor not recognized
-            primary_values = [t.cognitive_state_snapshot.energy for t in traces]
+    for step_id, outcome, positions in index.step_outcome_groups():
+        primary_values = primary_column[positions]
         
         # Find traces where primary factor contradicts outcome
         # High primary factor but DROP, or low primary factor but CONTINUE
         if outcome == DecisionOutcome.DROP:
             # Drops despite high primary factor
             threshold = 0.7  # High alignment/energy
-            contradictory_traces = [
-                t for t in traces
-                if (primary_factor == "intent_alignment" and t.intent.alignment_score >= threshold) or
-                   (primary_factor == "cognitive_energy" and t.cognitive_state_snapshot.energy >= threshold)
-            ]
+            contradictory = positions[primary_values >= threshold]
         else:
             # Continuations despite low primary factor
             threshold = 0.3  # Low alignment/energy
-            contradictory_traces = [
-                t for t in traces
-                if (primary_factor == "intent_alignment" and t.intent.alignment_score <= threshold) or
-                   (primary_factor == "cognitive_energy" and t.cognitive_state_snapshot.energy <= threshold)
-            ]
+            contradictory = positions[primary_values <= threshold]
+        contradictory_traces = index.traces_at(contradictory)
         
         if contradictory_traces:
             # Analyze competing factors in contradictory traces
@@ -499,7 +454,7 @@ def query_competing_explanations(
 
 
 def query_acceptance_surface(
-    sequences: List[DecisionSequence],
+    sequences: Union[List[DecisionSequence], DecisionIndex],
     product_steps: Dict
 ) -> List[AcceptanceSurface]:
     """
@@ -510,14 +465,12 @@ def query_acceptance_surface(
     
     This identifies the decision boundary surface for each persona class.
     """
-    # Group sequences by persona class (use first trace to determine class)
+    # Group sequences by persona class (use first trace to determine class),
+    # with each sequence's deepest trace
     sequences_by_class = defaultdict(list)
     
-    for sequence in sequences:
-        if sequence.traces:
-            first_trace = sequence.traces[0]
-            persona_class = _derive_persona_class(first_trace)
-            sequences_by_class[persona_class].append(sequence)
+    for sequence, persona_class, deepest_trace in DecisionIndex.of(sequences).sequence_surfaces():
+        sequences_by_class[persona_class].append((sequence, deepest_trace))
     
     acceptance_surfaces = []
     
@@ -526,16 +479,12 @@ def query_acceptance_surface(
         step_reach_counts = Counter()  # step_index -> count of sequences reaching it
         step_completion_counts = Counter()  # step_index -> count of sequences completing from it
         
-        for sequence in class_sequences:
-            if not sequence.traces:
-                continue
-            
-            # Find deepest step reached
-            deepest_step_index = max(t.step_index for t in sequence.traces)
+        for sequence, deepest_trace in class_sequences:
+            # Deepest step reached
+            deepest_step_index = deepest_trace.step_index
             step_reach_counts[deepest_step_index] += 1
             
             # Check if completed (has CONTINUE outcome at deepest step)
-            deepest_trace = max(sequence.traces, key=lambda t: t.step_index)
             if deepest_trace.decision == DecisionOutcome.CONTINUE and sequence.final_outcome == DecisionOutcome.CONTINUE:
                 step_completion_counts[deepest_step_index] += 1
         
@@ -0,0 +1,587 @@
+"""
+trace_table.py - Columnar Decision Trace Store
+
+A DecisionTraceTable holds many DecisionTraces as columns instead of a
+list of dataclasses:
+- fixed-width numeric columns for the cognitive state, probabilities and
+  Shapley force contributions
+- dictionary-encoded persona_id, step_id, intent, policy_version and
+  dominant factors (int32 codes + one shared list of strings)
+- factors as a flat code array with per-trace offsets
+
+Slicing is zero-copy, the table persists to Parquet through Arrow without
+copying the numeric columns, and DecisionTraceView exposes one row with the
+DecisionTrace attribute interface, so ledger, graph and autopsy code can
+iterate a table exactly like a list of traces.
+"""
+
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, Iterator, List, Sequence, Union
+
+import numpy as np
+
+from decision_graph.decision_trace import (
+    CognitiveStateSnapshot,
+    DecisionOutcome,
+    DecisionTrace,
+    IntentSnapshot
+)
+
+
+# Per-force raw Shapley columns, in the order compute_decision_attribution
+# first emits them (keeps rebuilt attributions identical, including ties)
+ATTRIBUTION_FORCES = [
+    'cognitive_energy', 'intent', 'effort_tolerance', 'risk_tolerance',
+    'trust', 'value', 'effort', 'risk', 'intent_mismatch'
+]
+
+STATE_COLUMNS = ['energy', 'risk', 'effort', 'value', 'control']
+
+# Dictionary-encoded string columns
+ENCODED_COLUMNS = ['persona_id', 'step_id', 'intent', 'policy_version']
+
+DECISIONS = [DecisionOutcome.CONTINUE, DecisionOutcome.DROP]
+_DECISION_CODES = {outcome: code for code, outcome in enumerate(DECISIONS)}
+
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+
+
+def _to_micros(timestamp: str) -> int:
+    """ISO timestamp -> microseconds since the (naive) epoch."""
+    return (datetime.fromisoformat(timestamp) - _EPOCH) // _MICROSECOND
+
+
+def _from_micros(micros: int) -> str:
+    return (_EPOCH + timedelta(microseconds=int(micros))).isoformat()
+
+
+def _shap_column(force: str) -> str:
+    return f"shap_{force}"
+
+
+NUMERIC_COLUMNS = {
+    'step_index': np.int32,
+    'decision': np.int8,
+    'probability': np.float64,
+    'sampled_outcome': np.bool_,
+    **{name: np.float64 for name in STATE_COLUMNS},
+    'alignment': np.float64,
+    'timestamp_us': np.int64,
+    'has_attribution': np.bool_,
+    'attribution_baseline': np.float64,
+    'attribution_final': np.float64,
+    'attribution_timestamp_us': np.int64,
+    **{_shap_column(force): np.float64 for force in ATTRIBUTION_FORCES},
+}
+
+
+# ============================================================================
+# ROW VIEW
+# ============================================================================
+
+class DecisionTraceView:
+    """
+    Read-only view of one row of a DecisionTraceTable.
+
+    Has the same attributes and to_dict() as DecisionTrace; nested
+    snapshots and attribution are built on access.
+    """
+
+    __slots__ = ('_table', '_row')
+
+    def __init__(self, table: 'DecisionTraceTable', row: int):
+        self._table = table
+        self._row = row
+
+    def _get(self, column: str):
+        return self._table.columns[column][self._row]
+
+    def _decode(self, column: str) -> str:
+        return self._table.dictionaries[column][self._table.codes[column][self._row]]
+
+    @property
+    def persona_id(self) -> str:
+        return self._decode('persona_id')
+
+    @property
+    def step_id(self) -> str:
+        return self._decode('step_id')
+
+    @property
+    def step_index(self) -> int:
+        return int(self._get('step_index'))
+
+    @property
+    def decision(self) -> DecisionOutcome:
+        return DECISIONS[self._get('decision')]
+
+    @property
+    def probability_before_sampling(self) -> float:
+        return float(self._get('probability'))
+
+    @property
+    def sampled_outcome(self) -> bool:
+        return bool(self._get('sampled_outcome'))
+
+    @property
+    def cognitive_state_snapshot(self) -> CognitiveStateSnapshot:
+        return CognitiveStateSnapshot(*(float(self._get(name)) for name in STATE_COLUMNS))
+
+    @property
+    def intent(self) -> IntentSnapshot:
+        return IntentSnapshot(
+            inferred_intent=self._decode('intent'),
+            alignment_score=float(self._get('alignment'))
+        )
+
+    @property
+    def dominant_factors(self) -> List[str]:
+        return self._table.factors_at(self._row)
+
+    @property
+    def policy_version(self) -> str:
+        return self._decode('policy_version')
+
+    @property
+    def timestamp(self) -> str:
+        return _from_micros(self._get('timestamp_us'))
+
+    @property
+    def attribution(self):
+        if not self._get('has_attribution'):
+            return None
+        from decision_attribution.shap_attributor import build_attribution_from_forces
+        return build_attribution_from_forces(
+            step_id=self.step_id,
+            decision=self.decision.value,
+            baseline_prob=float(self._get('attribution_baseline')),
+            final_probability=float(self._get('attribution_final')),
+            aggregated_shap_raw={
+                force: float(self._get(_shap_column(force))) for force in ATTRIBUTION_FORCES
+            },
+            timestamp=_from_micros(self._get('attribution_timestamp_us'))
+        )
+
+    def to_trace(self) -> DecisionTrace:
+        """Materialize as a DecisionTrace dataclass."""
+        return DecisionTrace(
+            persona_id=self.persona_id,
+            step_id=self.step_id,
+            step_index=self.step_index,
+            decision=self.decision,
+            probability_before_sampling=self.probability_before_sampling,
+            sampled_outcome=self.sampled_outcome,
+            cognitive_state_snapshot=self.cognitive_state_snapshot,
+            intent=self.intent,
+            dominant_factors=self.dominant_factors,
+            attribution=self.attribution,
+            policy_version=self.policy_version,
+            timestamp=self.timestamp
+        )
+
+    def to_dict(self) -> Dict:
+        """Convert to JSON-serializable dict (same shape as DecisionTrace.to_dict)."""
+        return self.to_trace().to_dict()
+
+    def __repr__(self) -> str:
+        return (f"DecisionTraceView(persona_id={self.persona_id!r}, step_id={self.step_id!r}, "
+                f"decision={self.decision.value})")
+
+
+# ============================================================================
+# TABLE
+# ============================================================================
+
+class DecisionTraceTable:
+    """
+    Columnar, immutable collection of decision traces.
+
+    Behaves like a sequence of DecisionTraceView rows (len, iteration,
+    integer indexing); slicing returns a zero-copy sub-table.
+    """
+
+    def __init__(
+        self,
+        columns: Dict[str, np.ndarray],
+        codes: Dict[str, np.ndarray],
+        dictionaries: Dict[str, List[str]],
+        factor_offsets: np.ndarray,
+        factor_codes: np.ndarray,
+        factor_dictionary: List[str]
+    ):
+        """
+        Args:
+            columns: Numeric columns (see NUMERIC_COLUMNS), all length n
+            codes: int32 codes for each ENCODED_COLUMNS entry, length n
+            dictionaries: Strings for each encoded column, indexed by code
+            factor_offsets: length n + 1; row i's factors are
+                factor_codes[factor_offsets[i]:factor_offsets[i + 1]]
+            factor_codes: int32 codes into factor_dictionary
+            factor_dictionary: Factor names, indexed by code
+        """
+        self.columns = columns
+        self.codes = codes
+        self.dictionaries = dictionaries
+        self.factor_offsets = factor_offsets
+        self.factor_codes = factor_codes
+        self.factor_dictionary = factor_dictionary
+        for array in list(columns.values()) + list(codes.values()) + [factor_offsets, factor_codes]:
+            array.flags.writeable = False
+
+    # ------------------------------------------------------------------
+    # Construction
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def from_traces(cls, traces: Iterable) -> 'DecisionTraceTable':
+        """Build a table from DecisionTrace objects (or views)."""
+        builder = DecisionTraceTableBuilder()
+        builder.extend(traces)
+        return builder.build()
+
+    @classmethod
+    def from_dicts(cls, trace_dicts: Iterable[Dict]) -> 'DecisionTraceTable':
+        """Build a table from DecisionTrace.to_dict() output."""
+        return cls.from_traces(DecisionTrace.from_dict(d) for d in trace_dicts)
+
+    @classmethod
+    def empty(cls) -> 'DecisionTraceTable':
+        return DecisionTraceTableBuilder().build()
+
+    @classmethod
+    def concat(cls, tables: Sequence['DecisionTraceTable']) -> 'DecisionTraceTable':
+        """Concatenate tables, merging their dictionaries."""
+        tables = [t for t in tables if len(t)]
+        if not tables:
+            return cls.empty()
+        if len(tables) == 1:
+            return tables[0]
+
+        columns = {
+            name: np.concatenate([t.columns[name] for t in tables])
+            for name in NUMERIC_COLUMNS
+        }
+
+        codes = {}
+        dictionaries = {}
+        for name in ENCODED_COLUMNS:
+            merged, remapped = _merge_dictionaries(
+                [t.dictionaries[name] for t in tables], [t.codes[name] for t in tables]
+            )
+            dictionaries[name] = merged
+            codes[name] = np.concatenate(remapped)
+
+        factor_dictionary, remapped_factors = _merge_dictionaries(
+            [t.factor_dictionary for t in tables],
+            [t.factor_codes[t.factor_offsets[0]:t.factor_offsets[-1]] for t in tables]
+        )
+        counts = np.concatenate([np.diff(t.factor_offsets) for t in tables])
+        factor_offsets = np.concatenate([[0], np.cumsum(counts)]).astype(np.int64)
+
+        return cls(columns, codes, dictionaries, factor_offsets,
+                   np.concatenate(remapped_factors), factor_dictionary)
+
+    # ------------------------------------------------------------------
+    # Sequence interface
+    # ------------------------------------------------------------------
+
+    def __len__(self) -> int:
+        return len(self.factor_offsets) - 1
+
+    def __iter__(self) -> Iterator[DecisionTraceView]:
+        for row in range(len(self)):
+            yield DecisionTraceView(self, row)
+
+    def __getitem__(self, key: Union[int, slice]):
+        if isinstance(key, slice):
+            start, stop, step = key.indices(len(self))
+            if step != 1:
+                return self.take(np.arange(start, stop, step))
+            return self._slice(start, max(start, stop))
+        row = int(key)
+        if row < 0:
+            row += len(self)
+        if not 0 <= row < len(self):
+            raise IndexError(f"row {key} out of range for table of {len(self)} traces")
+        return DecisionTraceView(self, row)
+
+    def __bool__(self) -> bool:
+        return len(self) > 0
+
+    def __copy__(self) -> 'DecisionTraceTable':
+        return self
+
+    def __deepcopy__(self, memo) -> 'DecisionTraceTable':
+        # Immutable, so sharing is a valid deep copy (pandas deep-copies
+        # DataFrame.attrs on most operations)
+        return self
+
+    def __repr__(self) -> str:
+        return f"DecisionTraceTable({len(self)} traces, {self.nbytes / 1e6:.1f} MB)"
+
+    def _slice(self, start: int, stop: int) -> 'DecisionTraceTable':
+        """Zero-copy contiguous slice (factor codes stay shared)."""
+        return DecisionTraceTable(
+            {name: array[start:stop] for name, array in self.columns.items()},
+            {name: array[start:stop] for name, array in self.codes.items()},
+            self.dictionaries,
+            self.factor_offsets[start:stop + 1],
+            self.factor_codes,
+            self.factor_dictionary
+        )
+
+    def take(self, indices) -> 'DecisionTraceTable':
+        """New table with the given rows (copies)."""
+        indices = np.asarray(indices, dtype=np.int64)
+        starts = self.factor_offsets[indices]
+        counts = self.factor_offsets[indices + 1] - starts
+        factor_offsets = np.concatenate([[0], np.cumsum(counts)]).astype(np.int64)
+        if counts.sum():
+            gather = np.repeat(starts - factor_offsets[:-1], counts) + np.arange(factor_offsets[-1])
+            factor_codes = self.factor_codes[gather]
+        else:
+            factor_codes = np.zeros(0, dtype=np.int32)
+        return DecisionTraceTable(
+            {name: array[indices] for name, array in self.columns.items()},
+            {name: array[indices] for name, array in self.codes.items()},
+            self.dictionaries,
+            factor_offsets,
+            factor_codes,
+            self.factor_dictionary
+        )
+
+    def filter(self, mask: np.ndarray) -> 'DecisionTraceTable':
+        """New table with the rows where mask is True."""
+        return self.take(np.flatnonzero(mask))
+
+    # ------------------------------------------------------------------
+    # Column access
+    # ------------------------------------------------------------------
+
+    @property
+    def nbytes(self) -> int:
+        arrays = list(self.columns.values()) + list(self.codes.values())
+        return sum(a.nbytes for a in arrays) + self.factor_offsets.nbytes + self.factor_codes.nbytes
+
+    def column(self, name: str) -> np.ndarray:
+        """Numeric column, or the decoded values of an encoded column (object array)."""
+        if name in self.columns:
+            return self.columns[name]
+        if name in self.codes:
+            return np.asarray(self.dictionaries[name], dtype=object)[self.codes[name]]
+        raise KeyError(name)
+
+    def code_of(self, column: str, value: str) -> int:
+        """Code of value in an encoded column, or -1 if it never occurs."""
+        try:
+            return self.dictionaries[column].index(value)
+        except ValueError:
+            return -1
+
+    def factors_at(self, row: int) -> List[str]:
+        start, stop = self.factor_offsets[row], self.factor_offsets[row + 1]
+        return [self.factor_dictionary[c] for c in self.factor_codes[start:stop]]
+
+    def to_traces(self) -> List[DecisionTrace]:
+        return [view.to_trace() for view in self]
+
+    def to_dicts(self) -> List[Dict]:
+        return [view.to_dict() for view in self]
+
+    # ------------------------------------------------------------------
+    # Arrow / Parquet
+    # ------------------------------------------------------------------
+
+    def to_arrow(self):
+        """Arrow table; numeric columns and dictionary codes are not copied."""
+        import pyarrow as pa
+
+        arrays = {}
+        for name in ENCODED_COLUMNS:
+            arrays[name] = pa.DictionaryArray.from_arrays(
+                pa.array(self.codes[name]), pa.array(self.dictionaries[name], type=pa.string())
+            )
+        offsets = self.factor_offsets - self.factor_offsets[0]
+        factor_values = pa.DictionaryArray.from_arrays(
+            pa.array(self.factor_codes[self.factor_offsets[0]:self.factor_offsets[-1]]),
+            pa.array(self.factor_dictionary, type=pa.string())
+        )
+        arrays['dominant_factors'] = pa.ListArray.from_arrays(
+            pa.array(offsets.astype(np.int32)), factor_values
+        )
+        for name in NUMERIC_COLUMNS:
+            arrays[name] = pa.array(self.columns[name])
+        return pa.table(arrays)
+
+    @classmethod
+    def from_arrow(cls, table) -> 'DecisionTraceTable':
+        """Inverse of to_arrow (numeric columns are zero-copy where Arrow allows)."""
+        table = table.unify_dictionaries().combine_chunks()
+        n = table.num_rows
+
+        def single(name):
+            column = table.column(name)
+            return column.chunk(0) if column.num_chunks else None
+
+        columns = {}
+        for name, dtype in NUMERIC_COLUMNS.items():
+            array = single(name)
+            columns[name] = (
+                array.to_numpy(zero_copy_only=False).astype(dtype, copy=False)
+                if array is not None else np.zeros(n, dtype=dtype)
+            )
+
+        codes = {}
+        dictionaries = {}
+        for name in ENCODED_COLUMNS:
+            array = single(name)
+            if array is None:
+                codes[name] = np.zeros(0, dtype=np.int32)
+                dictionaries[name] = []
+                continue
+            codes[name] = array.indices.to_numpy(zero_copy_only=False).astype(np.int32, copy=False)
+            dictionaries[name] = array.dictionary.to_pylist()
+
+        factors = single('dominant_factors')
+        if factors is None:
+            factor_offsets = np.zeros(1, dtype=np.int64)
+            factor_codes = np.zeros(0, dtype=np.int32)
+            factor_dictionary = []
+        else:
+            raw_offsets = factors.offsets.to_numpy().astype(np.int64)
+            values = factors.values
+            factor_codes = values.indices.to_numpy(zero_copy_only=False).astype(np.int32, copy=False)
+            factor_codes = factor_codes[raw_offsets[0]:raw_offsets[-1]]
+            factor_offsets = raw_offsets - raw_offsets[0]
+            factor_dictionary = values.dictionary.to_pylist()
+
+        return cls(columns, codes, dictionaries, factor_offsets, factor_codes, factor_dictionary)
+
+    def to_parquet(self, path: str) -> str:
+        """Write the table to a Parquet file (dictionary encoding preserved)."""
+        import pyarrow.parquet as pq
+        pq.write_table(self.to_arrow(), path)
+        return path
+
+    @classmethod
+    def read_parquet(cls, path: str, memory_map: bool = True) -> 'DecisionTraceTable':
+        """Read a table written by to_parquet."""
+        import pyarrow.parquet as pq
+        return cls.from_arrow(pq.read_table(path, memory_map=memory_map))
+
+
+def _merge_dictionaries(dictionaries: List[List[str]], codes: List[np.ndarray]):
+    """Union several dictionaries and remap each code array into the union."""
+    merged: List[str] = []
+    positions: Dict[str, int] = {}
+    remapped = []
+    for dictionary, code_array in zip(dictionaries, codes):
+        mapping = np.empty(len(dictionary), dtype=np.int32)
+        for i, value in enumerate(dictionary):
+            if value not in positions:
+                positions[value] = len(merged)
+                merged.append(value)
+            mapping[i] = positions[value]
+        remapped.append(mapping[code_array] if len(code_array) else code_array.astype(np.int32))
+    return merged, remapped
+
+
+# ============================================================================
+# BUILDER
+# ============================================================================
+
+class DecisionTraceTableBuilder:
+    """
+    Append traces one at a time, then build() a DecisionTraceTable.
+
+    Values accumulate in plain lists; the numpy columns are created once.
+    """
+
+    def __init__(self):
+        self._values: Dict[str, list] = {name: [] for name in NUMERIC_COLUMNS}
+        self._codes: Dict[str, list] = {name: [] for name in ENCODED_COLUMNS}
+        self._encoders: Dict[str, Dict[str, int]] = {name: {} for name in ENCODED_COLUMNS}
+        self._factor_codes: list = []
+        self._factor_offsets: list = [0]
+        self._factor_encoder: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._factor_offsets) - 1
+
+    def _encode(self, column: str, value: str) -> None:
+        encoder = self._encoders[column]
+        code = encoder.get(value)
+        if code is None:
+            code = encoder[value] = len(encoder)
+        self._codes[column].append(code)
+
+    def append(self, trace) -> None:
+        """Append one DecisionTrace (or DecisionTraceView)."""
+        values = self._values
+        snapshot = trace.cognitive_state_snapshot
+
+        self._encode('persona_id', trace.persona_id)
+        self._encode('step_id', trace.step_id)
+        self._encode('intent', trace.intent.inferred_intent)
+        self._encode('policy_version', trace.policy_version)
+
+        values['step_index'].append(trace.step_index)
+        values['decision'].append(_DECISION_CODES[trace.decision])
+        values['probability'].append(trace.probability_before_sampling)
+        values['sampled_outcome'].append(bool(trace.sampled_outcome))
+        values['energy'].append(snapshot.energy)
+        values['risk'].append(snapshot.risk)
+        values['effort'].append(snapshot.effort)
+        values['value'].append(snapshot.value)
+        values['control'].append(snapshot.control)
+        values['alignment'].append(trace.intent.alignment_score)
+        values['timestamp_us'].append(_to_micros(trace.timestamp))
+
+        for factor in trace.dominant_factors:
+            code = self._factor_encoder.get(factor)
+            if code is None:
+                code = self._factor_encoder[factor] = len(self._factor_encoder)
+            self._factor_codes.append(code)
+        self._factor_offsets.append(len(self._factor_codes))
+
+        attribution = trace.attribution
+        values['has_attribution'].append(attribution is not None)
+        if attribution is not None:
+            raw = attribution.shap_values_raw or {}
+            unknown = set(raw) - set(ATTRIBUTION_FORCES)
+            if unknown:
+                raise ValueError(f"Unknown attribution forces: {sorted(unknown)}")
+            values['attribution_baseline'].append(attribution.baseline_probability)
+            values['attribution_final'].append(attribution.final_probability)
+            values['attribution_timestamp_us'].append(_to_micros(attribution.timestamp))
+            for force in ATTRIBUTION_FORCES:
+                values[_shap_column(force)].append(raw.get(force, 0.0))
+        else:
+            values['attribution_baseline'].append(np.nan)
+            values['attribution_final'].append(np.nan)
+            values['attribution_timestamp_us'].append(0)
+            for force in ATTRIBUTION_FORCES:
+                values[_shap_column(force)].append(np.nan)
+
+    def extend(self, traces: Iterable) -> None:
+        for trace in traces:
+            self.append(trace)
+
+    def build(self) -> DecisionTraceTable:
+        return DecisionTraceTable(
+            columns={
+                name: np.array(self._values[name], dtype=dtype)
+                for name, dtype in NUMERIC_COLUMNS.items()
+            },
+            codes={
+                name: np.array(self._codes[name], dtype=np.int32)
+                for name in ENCODED_COLUMNS
+            },
+            dictionaries={
+                name: list(self._encoders[name]) for name in ENCODED_COLUMNS
+            },
+            factor_offsets=np.array(self._factor_offsets, dtype=np.int64),
+            factor_codes=np.array(self._factor_codes, dtype=np.int32),
+            factor_dictionary=list(self._factor_encoder)
+        )
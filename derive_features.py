@@ -21,6 +21,7 @@ Key Derived Features (with 0-10 scoring where applicable):
 All rules calibrated for 2025 India FinTech context.
 """
 
+import numpy as np
 import pandas as pd
 import re
 from typing import Dict, List, Optional, Tuple
@@ -704,94 +705,583 @@ def derive_cc_relevance_score(row: pd.Series, derived: Dict) -> Tuple[str, int]:
         return ('Low', final_score)
 
 
+def derive_features_for_row(row: pd.Series) -> Dict:
+    """
+    Derive all features for a single persona row (reference implementation).
+
+    derive_feature_frame() computes the same values column-wise; this
+    row-wise version is kept for single personas and parity checks.
+    """
+    derived = {}
+
+    # Geographic features
+    urban_cat, urban_score = derive_urban_rural(row)
+    derived['urban_rural'] = urban_cat
+    derived['urban_score'] = urban_score
+    derived['regional_cluster'] = derive_regional_cluster(row)
+
+    # Language features
+    derived['primary_language'] = derive_primary_language(row)
+    english_cat, english_score = derive_english_proficiency(row)
+    derived['english_proficiency'] = english_cat
+    derived['english_score'] = english_score
+
+    # Psychographic features (all 0-10 scales)
+    asp_cat, asp_score = derive_aspirational_intensity(row)
+    derived['aspirational_intensity'] = asp_cat
+    derived['aspirational_score'] = asp_score
+
+    dig_cat, dig_score = derive_digital_literacy(row)
+    derived['digital_literacy'] = dig_cat
+    derived['digital_literacy_score'] = dig_score
+
+    trust_cat, trust_score = derive_trust_risk_orientation(row)
+    derived['trust_orientation'] = trust_cat
+    derived['trust_score'] = trust_score
+
+    sq_cat, sq_score = derive_status_quo_sufficiency(row)
+    derived['status_quo_sufficiency'] = sq_cat
+    derived['status_quo_score'] = sq_score
+
+    open_cat, open_score = derive_openness_hobby_breadth(row)
+    derived['openness_hobby_breadth'] = open_cat
+    derived['openness_score'] = open_score
+
+    debt_cat, debt_score = derive_debt_aversion(row)
+    derived['debt_aversion'] = debt_cat
+    derived['debt_aversion_score'] = debt_score
+
+    privacy_cat, privacy_score = derive_privacy_sensitivity(row)
+    derived['privacy_sensitivity'] = privacy_cat
+    derived['privacy_score'] = privacy_score
+
+    # Generation bucket
+    gen_bucket, gen_code = derive_generation_bucket(row)
+    derived['generation_bucket'] = gen_bucket
+    derived['generation_code'] = gen_code
+
+    # Credit card relevance (composite)
+    cc_cat, cc_score = derive_cc_relevance_score(row, derived)
+    derived['cc_relevance'] = cc_cat
+    derived['cc_relevance_score'] = cc_score
+
+    return derived
+
+
+# ============================================================================
+# VECTORIZED DERIVATION (column-wise, same rules as the derive_* functions)
+# ============================================================================
+
+def _keyword_pattern(keywords: List[str]) -> 're.Pattern':
+    """Compile a keyword list into one alternation: matches iff any kw is a substring."""
+    return re.compile('|'.join(re.escape(kw) for kw in keywords))
+
+
+class _KeywordSet:
+    """
+    A keyword list prepared for column-wise counting.
+
+    The row-wise rules count `sum(1 for kw in KEYWORDS if kw in text)`.
+    A keyword without a space can only occur inside one space-separated
+    token, so each single-word keyword gets a bit and a text's keywords are
+    the OR of its tokens' bits (see _token_masks). Multi-word keywords are
+    few and are searched in the full text.
+    """
+
+    def __init__(self, keywords: List[str]):
+        unique = list(dict.fromkeys(keywords))
+        self.single_word = [kw for kw in unique if ' ' not in kw]
+        self.multi_word = [_keyword_pattern([kw]) for kw in unique if ' ' in kw]
+        # Listed twice -> counted twice, as in the row-wise rules
+        self.repeats = {kw: keywords.count(kw) - 1 for kw in unique if keywords.count(kw) > 1}
+        if len(self.single_word) > 64:
+            raise ValueError("keyword sets are limited to 64 single-word keywords")
+
+    def token_bits(self, token: str) -> int:
+        return sum(1 << i for i, kw in enumerate(self.single_word) if kw in token)
+
+    def count(self, masks: np.ndarray, text: pd.Series) -> np.ndarray:
+        """Keyword count per row from OR-ed token masks and the full text."""
+        counts = _popcount(masks)
+        # Combined free texts are nearly all distinct: search them directly
+        for pattern in self.multi_word:
+            counts += text.str.contains(pattern).to_numpy(dtype=bool)
+        for kw, extra in self.repeats.items():
+            if ' ' in kw:
+                counts += extra * text.str.contains(kw, regex=False).to_numpy(dtype=bool)
+            else:
+                counts += extra * ((masks >> np.uint64(self.single_word.index(kw))) & np.uint64(1)).astype(np.int64)
+        return counts
+
+
+def _popcount(masks: np.ndarray) -> np.ndarray:
+    """Number of set bits per uint64."""
+    if hasattr(np, 'bitwise_count'):
+        return np.bitwise_count(masks).astype(np.int64)
+    return np.unpackbits(masks.view(np.uint8).reshape(-1, 8), axis=1).sum(axis=1).astype(np.int64)
+
+
+def _token_masks(text: pd.Series, keyword_sets: List[_KeywordSet]) -> List[np.ndarray]:
+    """
+    Tokenize a text column once and return one uint64 keyword mask per set.
+
+    Token -> bits lookups are memoized for the whole column; OR-ing the
+    masks of several fields gives the mask of their ' '-joined text.
+    """
+    offsets = [64 * i for i in range(len(keyword_sets))]
+    token_bits: Dict[str, int] = {}
+
+    def bits_of(token: str) -> int:
+        bits = 0
+        for offset, keyword_set in zip(offsets, keyword_sets):
+            bits |= keyword_set.token_bits(token) << offset
+        token_bits[token] = bits
+        return bits
+
+    def row_masks(values: pd.Series) -> np.ndarray:
+        out = np.zeros((len(values), len(keyword_sets)), dtype=np.uint64)
+        for i, value in enumerate(values):
+            mask = 0
+            for token in value.split(' '):
+                bits = token_bits.get(token)
+                mask |= bits_of(token) if bits is None else bits
+            if mask:
+                out[i] = [(mask >> offset) & 0xFFFFFFFFFFFFFFFF for offset in offsets]
+        return out
+
+    masks = _per_unique(text, row_masks)
+    return [masks[:, i] for i in range(len(keyword_sets))]
+
+
+CAPITAL_INDICATORS = ['capital', 'municipal', 'corporation', 'metro', 'urban', 'city']
+SEMI_URBAN_INDICATORS = ['town', 'nagar', 'pur', 'pura', 'puram', 'bad', 'abad']
+HOBBY_KEYWORDS = ['reading', 'music', 'sports', 'travel', 'cooking', 'gaming',
+                  'photography', 'art', 'dance', 'yoga', 'fitness', 'movies',
+                  'writing', 'gardening', 'crafts', 'collection', 'hiking',
+                  'adventure', 'social', 'community', 'volunteer']
+TECH_OCCUPATIONS = ['software', 'engineer', 'developer', 'data', 'security']
+
+_TIER1_PATTERN = _keyword_pattern([city.lower() for city in TIER1_METRO_DISTRICTS])
+_TIER2_PATTERN = _keyword_pattern([city.lower() for city in TIER2_URBAN_DISTRICTS])
+_CAPITAL_PATTERN = _keyword_pattern(CAPITAL_INDICATORS)
+_SEMI_URBAN_PATTERN = _keyword_pattern(SEMI_URBAN_INDICATORS)
+_DIGITAL_OCC_PATTERN = _keyword_pattern(DIGITAL_NATIVE_OCCUPATIONS)
+_TRADITIONAL_OCC_PATTERN = _keyword_pattern(TRADITIONAL_OCCUPATIONS)
+_ASPIRATIONAL_OCC_PATTERN = _keyword_pattern(ASPIRATIONAL_OCCUPATIONS)
+_TECH_OCC_PATTERN = _keyword_pattern(TECH_OCCUPATIONS)
+_HIGH_EDUCATION_PATTERN = _keyword_pattern(HIGH_EDUCATION_LEVELS)
+_PRO_EDUCATION_PATTERN = _keyword_pattern(['professional', 'post-graduate', 'engineering'])
+_GRADUATE_PATTERN = _keyword_pattern(['graduate', 'bachelor', 'diploma'])
+_ANY_GRADUATE_PATTERN = _keyword_pattern(['professional', 'post-graduate', 'graduate'])
+_HIGHER_SECONDARY_PATTERN = _keyword_pattern(['higher secondary', '12th'])
+_SECONDARY_PATTERN = _keyword_pattern(['secondary', '10th'])
+_ENGLISH_PATTERN = _keyword_pattern(['english'])
+_MARRIED_PATTERN = _keyword_pattern(['married'])
+_STUDENT_PATTERN = _keyword_pattern(['student'])
+_STATE_PATTERNS = [(_keyword_pattern([name.lower()]), region) for name, region in STATE_TO_REGION.items()]
+_ZONE_PATTERNS = [(_keyword_pattern(keywords), region) for region, keywords in REGIONAL_CLUSTERS.items()]
+
+_HIGH_ASPIRATION = _KeywordSet(HIGH_ASPIRATION_KEYWORDS)
+_STABILITY = _KeywordSet(STABILITY_KEYWORDS)
+_DEBT_AVERSION = _KeywordSet(DEBT_AVERSION_KEYWORDS)
+_HOBBIES = _KeywordSet(HOBBY_KEYWORDS)
+
+
+def _per_unique(text: pd.Series, fn) -> np.ndarray:
+    """
+    Evaluate fn on the distinct values of text only and broadcast back.
+
+    Most persona fields (state, district, occupation, education, ...) have a
+    few hundred distinct values across a million rows.
+    """
+    codes, uniques = pd.factorize(text)
+    return np.asarray(fn(pd.Series(uniques, dtype=object)))[codes]
+
+
+def _text_column(df: pd.DataFrame, column: str, case: Optional[str] = None) -> pd.Series:
+    """
+    str() of every value (NaN -> 'nan'), '' for a missing column - as row.get() does.
+
+    case='lower'/'upper' applies str.lower()/str.upper() (per distinct value).
+    """
+    if column not in df.columns:
+        return pd.Series(np.full(len(df), '', dtype=object), dtype=object)
+    values = df[column].to_numpy(dtype=object)
+    text = pd.Series(np.fromiter(map(str, values), dtype=object, count=len(values)), dtype=object)
+    if case == 'lower':
+        return pd.Series(_per_unique(text, lambda u: u.str.lower().to_numpy(dtype=object)), dtype=object)
+    if case == 'upper':
+        return pd.Series(_per_unique(text, lambda u: u.str.upper().to_numpy(dtype=object)), dtype=object)
+    return text
+
+
+def _age_column(df: pd.DataFrame) -> np.ndarray:
+    """int() of every age (truncates floats), 40 for a missing column."""
+    if 'age' not in df.columns:
+        return np.full(len(df), 40, dtype=np.int64)
+    values = df['age'].to_numpy(dtype=object)
+    return np.fromiter(map(int, values), dtype=np.int64, count=len(values))
+
+
+def _contains(text: pd.Series, pattern: 're.Pattern') -> np.ndarray:
+    """Boolean mask: any keyword of the compiled alternation occurs in the text."""
+    return _per_unique(text, lambda u: u.str.contains(pattern).to_numpy(dtype=bool)).astype(bool)
+
+
+def _clip_score(raw: np.ndarray) -> np.ndarray:
+    """max(0, min(10, int(raw))) element-wise."""
+    return np.clip(np.trunc(raw), 0, 10).astype(np.int64)
+
+
+def _categorize(scores: np.ndarray, high: str, mid: str, low: str, low_max: Optional[int] = None) -> np.ndarray:
+    """
+    Map 0-10 scores to labels: >= 7 -> high; then either <= low_max -> low
+    (the "<= 3" rules) or >= 4 -> mid (the ">= 4" rules).
+    """
+    if low_max is None:
+        return np.select([scores >= 7, scores >= 4], [high, mid], default=low).astype(object)
+    return np.select([scores >= 7, scores <= low_max], [high, low], default=mid).astype(object)
+
+
+def _urban_classes(district: pd.Series, state: pd.Series) -> Tuple[np.ndarray, np.ndarray]:
+    """urban_rural labels and urban_score (derive_urban_rural) from lowercased district/state."""
+    metro = _contains(district, _TIER1_PATTERN) | _contains(state, _TIER1_PATTERN)
+    urban_conditions = [
+        metro,
+        _contains(district, _TIER2_PATTERN) | _contains(district, _CAPITAL_PATTERN),
+        _contains(district, _SEMI_URBAN_PATTERN),
+    ]
+    urban_rural = np.select(urban_conditions, ['Metro', 'Urban', 'Semi-Urban'], default='Rural').astype(object)
+    urban_score = np.select(urban_conditions, [10, 7, 4], default=1).astype(np.int64)
+    return urban_rural, urban_score
+
+
+def _aspirational_scores(
+    aspiration_text: pd.Series,
+    high_mask: np.ndarray,
+    stable_mask: np.ndarray,
+    aspirational_occ: np.ndarray
+) -> np.ndarray:
+    """aspirational_score (derive_aspirational_intensity) from the joined text and its keyword masks."""
+    high_count = _HIGH_ASPIRATION.count(high_mask, aspiration_text)
+    stability_count = _STABILITY.count(stable_mask, aspiration_text)
+    raw = np.minimum(10, high_count) - (stability_count * 0.5) + np.where(aspirational_occ, 2, 0)
+    return _clip_score(raw * 1.2)
+
+
+def _digital_literacy_scores(
+    age: np.ndarray,
+    education: pd.Series,
+    occupation: pd.Series,
+    pro_education: np.ndarray,
+    aspirational_occ: np.ndarray,
+    traditional_occ: np.ndarray,
+    urban_score: np.ndarray
+) -> np.ndarray:
+    """digital_literacy_score (derive_digital_literacy) from age, education, occupation and urban score."""
+    score = np.select([age < 25, age < 35, age < 45, age < 55], [3, 2.5, 1.5, 0.5], default=0.0)
+    score = score + np.select(
+        [pro_education, _contains(education, _GRADUATE_PATTERN),
+         _contains(education, _HIGHER_SECONDARY_PATTERN), _contains(education, _SECONDARY_PATTERN)],
+        [3, 2, 1, 0.5], default=0.0
+    )
+    score = score + np.select(
+        [_contains(occupation, _DIGITAL_OCC_PATTERN), aspirational_occ,
+         _contains(occupation, _STUDENT_PATTERN), traditional_occ],
+        [3, 2, 2.5, 0.5], default=0.0
+    )
+    score = score + urban_score / 10
+    return _clip_score(score)
+
+
+def derive_feature_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Derive all features column-wise.
+
+    Same rules and outputs as derive_features_for_row() applied to every row,
+    but each text column is stringified and lowercased once, categorical
+    fields are matched per distinct value with precompiled alternations,
+    free-text keyword counts come from per-field token bitmasks, and shared
+    sub-features (urban score, occupation classes, digital literacy, trust)
+    are computed once instead of being re-derived inside other features.
+
+    Returns:
+        DataFrame of derived columns with a fresh RangeIndex
+    """
+    n = len(df)
+    age = _age_column(df)
+
+    district = _text_column(df, 'district', 'lower')
+    state = _text_column(df, 'state', 'lower')
+    zone = _text_column(df, 'zone', 'upper')
+    first_lang_raw = _text_column(df, 'first_language')
+    first_lang = _text_column(df, 'first_language', 'lower')
+    second_lang = _text_column(df, 'second_language', 'lower')
+    third_lang = _text_column(df, 'third_language', 'lower')
+    education = _text_column(df, 'education_level', 'lower')
+    occupation = _text_column(df, 'occupation', 'lower')
+    goals = _text_column(df, 'career_goals_and_ambitions', 'lower')
+    cultural = _text_column(df, 'cultural_background', 'lower')
+    marital = _text_column(df, 'marital_status', 'lower')
+    persona = _text_column(df, 'persona', 'lower')
+    professional = _text_column(df, 'professional_persona', 'lower')
+    hobbies = _text_column(df, 'hobbies_and_interests', 'lower')
+
+    # Keyword masks per free-text field: every field is tokenized once, and
+    # the mask of a ' '-joined text is the OR of its fields' masks
+    goals_high, goals_stable, goals_debt = _token_masks(goals, [_HIGH_ASPIRATION, _STABILITY, _DEBT_AVERSION])
+    cultural_high, cultural_stable, cultural_debt = _token_masks(
+        cultural, [_HIGH_ASPIRATION, _STABILITY, _DEBT_AVERSION]
+    )
+    occupation_high, occupation_stable = _token_masks(occupation, [_HIGH_ASPIRATION, _STABILITY])
+    persona_high, persona_stable = _token_masks(persona, [_HIGH_ASPIRATION, _STABILITY])
+    professional_high, professional_stable = _token_masks(professional, [_HIGH_ASPIRATION, _STABILITY])
+    (hobby_mask,) = _token_masks(hobbies, [_HOBBIES])
+
+    # Shared occupation / education classes
+    traditional_occ = _contains(occupation, _TRADITIONAL_OCC_PATTERN)
+    aspirational_occ = _contains(occupation, _ASPIRATIONAL_OCC_PATTERN)
+    pro_education = _contains(education, _PRO_EDUCATION_PATTERN)
+    married = _contains(marital, _MARRIED_PATTERN)
+
+    # --- Urban/rural (computed once; reused by digital literacy and status quo)
+    urban_rural, urban_score = _urban_classes(district, state)
+
+    # --- Regional cluster: first matching state in STATE_TO_REGION order, then zone
+    region_patterns = [(state, pattern, region) for pattern, region in _STATE_PATTERNS]
+    region_patterns += [(zone, pattern, region) for pattern, region in _ZONE_PATTERNS]
+    region_conditions = [_contains(text, pattern) for text, pattern, _ in region_patterns]
+    region_choices = [region for _, _, region in region_patterns]
+    regional_cluster = np.select(region_conditions, region_choices, default='Central').astype(object)
+
+    # --- Language
+    first_lang_values = first_lang_raw.to_numpy(dtype=object)
+    primary_language = np.where(
+        (first_lang_raw.str.len().to_numpy() > 0) & (first_lang.to_numpy(dtype=object) != 'nan'),
+        first_lang_values, 'Hindi'
+    ).astype(object)
+
+    english_first = _contains(first_lang, _ENGLISH_PATTERN)
+    english_second = _contains(second_lang, _ENGLISH_PATTERN)
+    english_third = _contains(third_lang, _ENGLISH_PATTERN)
+    english_conditions = [
+        english_first,
+        english_second & _contains(education, _HIGH_EDUCATION_PATTERN),
+        english_second,
+        english_third,
+        _contains(education, _ANY_GRADUATE_PATTERN),
+        _contains(education, _HIGHER_SECONDARY_PATTERN),
+    ]
+    english_proficiency = np.select(
+        english_conditions, ['Native', 'Fluent', 'Moderate', 'Basic', 'Basic', 'Minimal'], default='None'
+    ).astype(object)
+    english_score = np.select(english_conditions, [10, 8, 5, 3, 3, 2], default=0).astype(np.int64)
+
+    # --- Aspirational intensity
+    aspirational_score = _aspirational_scores(
+        goals + ' ' + persona + ' ' + professional + ' ' + occupation,
+        goals_high | persona_high | professional_high | occupation_high,
+        goals_stable | persona_stable | professional_stable | occupation_stable,
+        aspirational_occ,
+    )
+    aspirational_intensity = _categorize(aspirational_score, 'High', 'Medium', 'Low')
+
+    # --- Digital literacy
+    digital_literacy_score = _digital_literacy_scores(
+        age, education, occupation, pro_education, aspirational_occ, traditional_occ, urban_score
+    )
+    digital_literacy = _categorize(digital_literacy_score, 'High', 'Medium', 'Low')
+
+    # --- Trust/risk orientation
+    trust_text = goals + ' ' + cultural + ' ' + occupation
+    conservatism = 5 + np.minimum(3, _STABILITY.count(goals_stable | cultural_stable | occupation_stable, trust_text) * 0.5)
+    conservatism = conservatism + np.select([age > 55, age > 45, age < 30], [2, 1, -1.5], default=0.0)
+    conservatism = conservatism + np.where(married, 0.5, 0.0)
+    conservatism = conservatism + np.where(traditional_occ, 1, 0)
+    conservatism = conservatism - np.where(aspirational_occ, 2, 0)
+    conservatism = conservatism - np.minimum(
+        2, _HIGH_ASPIRATION.count(goals_high | cultural_high | occupation_high, trust_text) * 0.3
+    )
+    trust_score = _clip_score(conservatism)
+    trust_orientation = _categorize(trust_score, 'Conservative', 'Moderate', 'Open', low_max=3)
+
+    # --- Status quo sufficiency
+    score = 5 + np.minimum(3, _STABILITY.count(goals_stable, goals) * 0.5)
+    score = score - np.minimum(3, _HIGH_ASPIRATION.count(goals_high, goals) * 0.4)
+    score = score + np.select([age > 60, age > 50, age > 40, age < 30], [2.5, 1.5, 0.5, -1.5], default=0.0)
+    score = score + np.where(married, 0.5, 0.0)
+    score = score + np.select([urban_rural == 'Rural', urban_rural == 'Metro'], [1.5, -1], default=0.0)
+    status_quo_score = _clip_score(score)
+    status_quo_sufficiency = _categorize(status_quo_score, 'High', 'Medium', 'Low', low_max=3)
+
+    # --- Openness / hobby breadth
+    score = np.zeros(n)
+    for column in ('sports_persona', 'arts_persona', 'travel_persona', 'culinary_persona'):
+        score = score + np.where(_text_column(df, column).str.len().to_numpy() > 50, 2, 0)
+    score = score + np.minimum(2, _HOBBIES.count(hobby_mask, hobbies) * 0.3)
+    openness_score = _clip_score(score)
+    openness_hobby_breadth = _categorize(openness_score, 'Broad', 'Moderate', 'Narrow')
+
+    # --- Generation bucket
+    generation_conditions = [age <= 24, age <= 32, age <= 40, age <= 56]
+    generation_bucket = np.select(
+        generation_conditions, ['Gen Z', 'Young Millennial', 'Core Millennial', 'Gen X'], default='Boomer'
+    ).astype(object)
+    generation_code = np.select(
+        generation_conditions, ['GEN_Z', 'YOUNG_MILL', 'CORE_MILL', 'GEN_X'], default='BOOMER'
+    ).astype(object)
+
+    # --- Debt aversion
+    debt_text = goals + ' ' + cultural
+    score = 5 + np.minimum(3, _DEBT_AVERSION.count(goals_debt | cultural_debt, debt_text) * 0.5)
+    score = score + np.select([(age >= 40) & (age <= 55), age > 55, age < 25], [1.5, 1, 0.5], default=0.0)
+    score = score + np.where(traditional_occ, 1, 0)
+    score = score - np.where(aspirational_occ, 2, 0)
+    score = score + np.minimum(2, _STABILITY.count(goals_stable | cultural_stable, debt_text) * 0.3)
+    debt_aversion_score = _clip_score(score)
+    debt_aversion = _categorize(debt_aversion_score, 'High', 'Medium', 'Low', low_max=3)
+
+    # --- Privacy sensitivity (reuses digital literacy and trust scores)
+    score = 3 + (digital_literacy_score * 0.3)
+    score = score + trust_score * 0.2
+    score = score + np.where(pro_education, 1, 0)
+    score = score + np.where(_contains(occupation, _TECH_OCC_PATTERN), 1.5, 0.0)
+    score = score + np.where((age >= 35) & (age <= 50), 0.5, 0.0)
+    privacy_score = _clip_score(score)
+    privacy_sensitivity = _categorize(privacy_score, 'High', 'Medium', 'Low', low_max=3)
+
+    # --- Credit card relevance (composite)
+    score = urban_score * 0.2
+    score = score + digital_literacy_score * 0.2
+    score = score + aspirational_score * 0.15
+    score = score + np.select(
+        [np.isin(generation_bucket, ['Young Millennial', 'Core Millennial']),
+         generation_bucket == 'Gen Z', generation_bucket == 'Gen X'],
+        [2, 1.5, 0.5], default=0.0
+    )
+    score = score + (10 - status_quo_score) * 0.1
+    score = score + (10 - debt_aversion_score) * 0.1
+    score = score + english_score * 0.1
+    cc_relevance_score = _clip_score(score)
+    cc_relevance = _categorize(cc_relevance_score, 'High', 'Medium', 'Low')
+
+    return pd.DataFrame({
+        'urban_rural': urban_rural,
+        'urban_score': urban_score,
+        'regional_cluster': regional_cluster,
+        'primary_language': primary_language,
+        'english_proficiency': english_proficiency,
+        'english_score': english_score,
+        'aspirational_intensity': aspirational_intensity,
+        'aspirational_score': aspirational_score,
+        'digital_literacy': digital_literacy,
+        'digital_literacy_score': digital_literacy_score,
+        'trust_orientation': trust_orientation,
+        'trust_score': trust_score,
+        'status_quo_sufficiency': status_quo_sufficiency,
+        'status_quo_score': status_quo_score,
+        'openness_hobby_breadth': openness_hobby_breadth,
+        'openness_score': openness_score,
+        'debt_aversion': debt_aversion,
+        'debt_aversion_score': debt_aversion_score,
+        'privacy_sensitivity': privacy_sensitivity,
+        'privacy_score': privacy_score,
+        'generation_bucket': generation_bucket,
+        'generation_code': generation_code,
+        'cc_relevance': cc_relevance,
+        'cc_relevance_score': cc_relevance_score,
+    })
+
+
+# Raw persona columns each partially derivable feature reads
+FEATURE_SOURCE_COLUMNS = {
+    'urban_rural': ['district', 'state'],
+    'urban_score': ['district', 'state'],
+    'aspirational_score': ['career_goals_and_ambitions', 'persona', 'professional_persona', 'occupation'],
+    'digital_literacy_score': ['age', 'education_level', 'occupation', 'district', 'state'],
+}
+
+
+def derive_feature_subset(df: pd.DataFrame, features: List[str]) -> pd.DataFrame:
+    """
+    Derive only some columns of derive_feature_frame().
+
+    For cheap pre-filters (e.g. target groups) over many raw rows: only the
+    source columns of the requested features are read, see
+    FEATURE_SOURCE_COLUMNS for what can be derived this way.
+
+    Returns:
+        DataFrame with the requested columns, in request order, and a fresh RangeIndex
+    """
+    unknown = [f for f in features if f not in FEATURE_SOURCE_COLUMNS]
+    if unknown:
+        raise ValueError(f"Cannot derive {unknown} on their own; use derive_feature_frame()")
+
+    columns = {}
+    if {'urban_rural', 'urban_score', 'digital_literacy_score'} & set(features):
+        columns['urban_rural'], columns['urban_score'] = _urban_classes(
+            _text_column(df, 'district', 'lower'), _text_column(df, 'state', 'lower')
+        )
+
+    if {'aspirational_score', 'digital_literacy_score'} & set(features):
+        occupation = _text_column(df, 'occupation', 'lower')
+    if 'aspirational_score' in features:
+        goals = _text_column(df, 'career_goals_and_ambitions', 'lower')
+        persona = _text_column(df, 'persona', 'lower')
+        professional = _text_column(df, 'professional_persona', 'lower')
+        masks = [_token_masks(text, [_HIGH_ASPIRATION, _STABILITY]) for text in (goals, persona, professional, occupation)]
+        columns['aspirational_score'] = _aspirational_scores(
+            goals + ' ' + persona + ' ' + professional + ' ' + occupation,
+            np.bitwise_or.reduce([high for high, _ in masks]),
+            np.bitwise_or.reduce([stable for _, stable in masks]),
+            _contains(occupation, _ASPIRATIONAL_OCC_PATTERN),
+        )
+
+    if 'digital_literacy_score' in features:
+        education = _text_column(df, 'education_level', 'lower')
+        columns['digital_literacy_score'] = _digital_literacy_scores(
+            _age_column(df), education, occupation,
+            _contains(education, _PRO_EDUCATION_PATTERN),
+            _contains(occupation, _ASPIRATIONAL_OCC_PATTERN),
+            _contains(occupation, _TRADITIONAL_OCC_PATTERN),
+            columns['urban_score'],
+        )
+
+    return pd.DataFrame({feature: columns[feature] for feature in features}, index=pd.RangeIndex(len(df)))
+
+
 # ============================================================================
 # MAIN DERIVATION PIPELINE
 # ============================================================================
 
-def derive_all_features(df: pd.DataFrame, verbose: bool = True) -> pd.DataFrame:
+def derive_all_features(df: pd.DataFrame, verbose: bool = True, vectorized: bool = True) -> pd.DataFrame:
     """
     Main entry point: Derive all simulation features for the dataset.
-    
+
     Takes raw persona DataFrame and adds derived feature columns with 0-10 scores.
-    
+
     Args:
         df: DataFrame with raw persona data (28 columns)
         verbose: Print progress information
-    
+        vectorized: Derive column-wise (derive_feature_frame); False runs the
+            row-wise reference (derive_features_for_row per row)
+
     Returns:
         DataFrame with additional derived feature columns
     """
     if verbose:
         print("🔧 Deriving simulation features...")
         print(f"   Processing {len(df):,} personas")
-    
+
     # Create copy to avoid modifying original
     result_df = df.copy()
-    
-    # Derive each feature
-    derived_data = []
-    
-    for idx, row in df.iterrows():
-        derived = {}
-        
-        # Geographic features
-        urban_cat, urban_score = derive_urban_rural(row)
-        derived['urban_rural'] = urban_cat
-        derived['urban_score'] = urban_score
-        derived['regional_cluster'] = derive_regional_cluster(row)
-        
-        # Language features
-        derived['primary_language'] = derive_primary_language(row)
-        english_cat, english_score = derive_english_proficiency(row)
-        derived['english_proficiency'] = english_cat
-        derived['english_score'] = english_score
-        
-        # Psychographic features (all 0-10 scales)
-        asp_cat, asp_score = derive_aspirational_intensity(row)
-        derived['aspirational_intensity'] = asp_cat
-        derived['aspirational_score'] = asp_score
-        
-        dig_cat, dig_score = derive_digital_literacy(row)
-        derived['digital_literacy'] = dig_cat
-        derived['digital_literacy_score'] = dig_score
-        
-        trust_cat, trust_score = derive_trust_risk_orientation(row)
-        derived['trust_orientation'] = trust_cat
-        derived['trust_score'] = trust_score
-        
-        sq_cat, sq_score = derive_status_quo_sufficiency(row)
-        derived['status_quo_sufficiency'] = sq_cat
-        derived['status_quo_score'] = sq_score
-        
-        open_cat, open_score = derive_openness_hobby_breadth(row)
-        derived['openness_hobby_breadth'] = open_cat
-        derived['openness_score'] = open_score
-        
-        debt_cat, debt_score = derive_debt_aversion(row)
-        derived['debt_aversion'] = debt_cat
-        derived['debt_aversion_score'] = debt_score
-        
-        privacy_cat, privacy_score = derive_privacy_sensitivity(row)
-        derived['privacy_sensitivity'] = privacy_cat
-        derived['privacy_score'] = privacy_score
-        
-        # Generation bucket
-        gen_bucket, gen_code = derive_generation_bucket(row)
-        derived['generation_bucket'] = gen_bucket
-        derived['generation_code'] = gen_code
-        
-        # Credit card relevance (composite)
-        cc_cat, cc_score = derive_cc_relevance_score(row, derived)
-        derived['cc_relevance'] = cc_cat
-        derived['cc_relevance_score'] = cc_score
-        
-        derived_data.append(derived)
-        
-        if verbose and (idx + 1) % 200 == 0:
-            print(f"   Processed {idx + 1:,}/{len(df):,} personas")
-    
-    # Convert to DataFrame and join
-    derived_df = pd.DataFrame(derived_data)
+
+    if vectorized:
+        derived_df = derive_feature_frame(df)
+    else:
+        derived_df = pd.DataFrame([derive_features_for_row(row) for _, row in df.iterrows()])
+
+    # Join derived columns
     result_df = pd.concat([result_df.reset_index(drop=True), derived_df], axis=1)
     
     if verbose:
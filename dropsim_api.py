@@ -7,20 +7,60 @@ No auth (dev-mode only).
 """
 
 from fastapi import FastAPI, HTTPException, Query
-from fastapi.responses import JSONResponse
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
-from typing import List, Dict, Optional
+from typing import Any, Dict, Iterator, List, Optional
+from collections import OrderedDict
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from functools import partial
+import asyncio
 import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+import uuid
 
 from fintech_presets import get_default_fintech_scenario, compile_persona_from_raw
 from fintech_demo import run_fintech_demo_simulation
 from behavioral_engine import STATE_VARIANTS
-from behavioral_aggregator import generate_full_report
+from dropsim_sharding import resolve_worker_count
+from dropsim_outcome_matrix import get_outcome_matrix
+from dropsim_result_cache import ResultCache, get_result_cache, link_or_copy, scenario_cache_key
+
+
+# Worker pool sizing. CPU-bound simulations run in worker processes so the
+# event loop (and /health) stays responsive; at most MAX_PENDING jobs wait
+# for a free worker before submissions are rejected with 503.
+API_MAX_WORKERS = int(os.environ.get("DROPSIM_API_WORKERS", "0"))  # 0 = all cores
+API_MAX_PENDING = int(os.environ.get("DROPSIM_API_MAX_PENDING", "8"))
+API_EXECUTOR = os.environ.get("DROPSIM_API_EXECUTOR", "process")  # "process" or "thread"
+API_MAX_RETAINED_JOBS = 256
+RETRY_AFTER_SECONDS = 5
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+# Result cache: summaries keyed by scenario content, traces as a side file;
+# the engine fingerprint follows these modules' local imports
+API_CACHE_KIND = "api_scenario_summary"
+API_ENGINE_MODULES = ("dropsim_api", "fintech_demo", "fintech_presets", "behavioral_engine")
+TRACES_FILE = "traces.ndjson"
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    shutdown_job_manager()
+
 
 app = FastAPI(
     title="DropSim API",
     description="Behavioral Simulation Engine API",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 
@@ -122,158 +162,583 @@ class ScenarioSummary(BaseModel):
 
 
 # ============================================================================
-# API Endpoints
+# Scenario Execution (runs in worker processes)
 # ============================================================================
 
-@app.post("/simulate", response_model=Dict)
-async def simulate(
-    scenario: ScenarioConfig,
-    include_traces: bool = Query(False, description="Include full traces in response")
-):
+def _json_default(value: Any) -> Any:
+    """JSON fallback for numpy scalars and sets in traces."""
+    if hasattr(value, 'item'):
+        return value.item()
+    if isinstance(value, (set, frozenset)):
+        return sorted(value)
+    return str(value)
+
+
+def _column(result_df, name: str, default=None) -> List:
     """
-    Run behavioral simulation for a scenario.
+    Values of a result column as a list.
+    
+    run_fintech_demo_simulation output repeats persona_name and
+    persona_description (persona frame + summary columns); the first copy wins.
+    """
+    if name not in result_df.columns:
+        return [default] * len(result_df)
+    values = result_df[name]
+    if values.ndim == 2:
+        values = values.iloc[:, 0]
+    return values.tolist()
+
+
+def _persona_names(result_df) -> List[str]:
+    return [str(name).split('\n')[0] for name in _column(result_df, 'persona_name')]
+
+
+def prepare_scenario(scenario: Dict):
+    """
+    Convert a ScenarioConfig dict into engine inputs.
     
     Returns:
-    - scenario_summary: Step-level and persona-level summaries
-    - traces (optional): Full trajectory traces if include_traces=true
+        Tuple of (personas, state_variants, product_steps)
     """
-    try:
-        # Convert Pydantic models to dicts for engine
-        personas_list = []
-        for persona in scenario.personas:
-            # Compile priors if not provided
-            if persona.compiled_priors:
-                priors = persona.compiled_priors.dict()
-            else:
-                priors = compile_persona_from_raw(persona.raw_fields.dict())
-            
-            personas_list.append({
-                'name': persona.name,
-                'description': persona.description,
-                'raw_fields': persona.raw_fields.dict(),
-                'priors': priors
-            })
-        
-        # Convert steps to dict
-        product_steps = {}
-        for step in scenario.steps:
-            product_steps[step.name] = {
-                'cognitive_demand': step.cognitive_demand,
-                'effort_demand': step.effort_demand,
-                'risk_signal': step.risk_signal,
-                'irreversibility': step.irreversibility,
-                'delay_to_value': step.delay_to_value,
-                'explicit_value': step.explicit_value,
-                'reassurance_signal': step.reassurance_signal,
-                'authority_signal': step.authority_signal,
-                'description': step.description or step.name
-            }
+    personas_list = []
+    for persona in scenario['personas']:
+        # Compile priors if not provided
+        if persona.get('compiled_priors'):
+            priors = persona['compiled_priors']
+        else:
+            priors = compile_persona_from_raw(persona['raw_fields'])
         
-        # Use provided state variants or default
-        state_variants = scenario.state_variants if scenario.state_variants else STATE_VARIANTS
-        
-        # Run simulation
-        result_df = run_fintech_demo_simulation(
-            personas_list,
-            state_variants,
-            product_steps,
-            verbose=False
-        )
-        
-        # Generate summary
-        report = generate_full_report(result_df, product_steps=product_steps)
+        personas_list.append({
+            'name': persona['name'],
+            'description': persona['description'],
+            'raw_fields': persona['raw_fields'],
+            'priors': priors
+        })
+    
+    product_steps = {}
+    for step in scenario['steps']:
+        product_steps[step['name']] = {
+            'cognitive_demand': step['cognitive_demand'],
+            'effort_demand': step['effort_demand'],
+            'risk_signal': step['risk_signal'],
+            'irreversibility': step['irreversibility'],
+            'delay_to_value': step['delay_to_value'],
+            'explicit_value': step['explicit_value'],
+            'reassurance_signal': step['reassurance_signal'],
+            'authority_signal': step['authority_signal'],
+            'description': step.get('description') or step['name']
+        }
+    
+    # Use provided state variants or default
+    state_variants = scenario.get('state_variants') or STATE_VARIANTS
+    return personas_list, state_variants, product_steps
+
+
+def build_scenario_summary(
+    result_df,
+    product_steps: Dict,
+    total_trajectories: int,
+    scenario_name: Optional[str] = None
+) -> Dict:
+    """
+    Build the scenario_summary block of a /simulate response.
+    
+    Failures and failure reasons per step come from the run's outcome
+    matrix (dropsim_outcome_matrix) rather than a walk over trajectories.
+    """
+    step_failures = get_outcome_matrix(result_df, list(product_steps.keys())).failures_by_step()
+    
+    step_summaries = []
+    for step_name in product_steps.keys():
+        failures, failure_reasons = step_failures[step_name]
+        failure_rate = failures / total_trajectories if total_trajectories > 0 else 0.0
         
-        # Build step summaries
-        step_summaries = []
-        total_trajectories = len(personas_list) * len(state_variants)
+        # Primary/secondary costs
+        primary_cost = None
+        primary_pct = 0.0
+        secondary_cost = None
+        secondary_pct = 0.0
         
-        for step_name in product_steps.keys():
-            # Count failures at this step
-            failures = 0
-            failure_reasons = {}
-            
-            for _, row in result_df.iterrows():
-                trajectories = row.get('trajectories', [])
-                for traj in trajectories:
-                    if traj.get('exit_step') == step_name:
-                        failures += 1
-                        reason = traj.get('failure_reason')
-                        if reason:
-                            failure_reasons[reason] = failure_reasons.get(reason, 0) + 1
-            
-            failure_rate = failures / total_trajectories if total_trajectories > 0 else 0.0
-            
-            # Primary/secondary costs
-            primary_cost = None
-            primary_pct = 0.0
-            secondary_cost = None
-            secondary_pct = 0.0
+        if failure_reasons:
+            sorted_reasons = sorted(failure_reasons.items(), key=lambda x: x[1], reverse=True)
+            primary_cost, primary_count = sorted_reasons[0]
+            primary_pct = (primary_count / failures * 100) if failures > 0 else 0.0
             
-            if failure_reasons:
-                sorted_reasons = sorted(failure_reasons.items(), key=lambda x: x[1], reverse=True)
-                if sorted_reasons:
-                    primary_cost, primary_count = sorted_reasons[0]
-                    primary_pct = (primary_count / failures * 100) if failures > 0 else 0.0
-                    
-                    if len(sorted_reasons) > 1:
-                        secondary_cost, secondary_count = sorted_reasons[1]
-                        secondary_pct = (secondary_count / failures * 100) if failures > 0 else 0.0
-            
-            step_summaries.append(StepSummary(
-                step_name=step_name,
-                failure_rate=failure_rate,
-                primary_cost=primary_cost,
-                primary_cost_pct=primary_pct,
-                secondary_cost=secondary_cost,
-                secondary_cost_pct=secondary_pct,
-                total_trajectories=total_trajectories,
-                failures=failures
-            ))
-        
-        # Build persona summaries
-        persona_summaries = []
-        for _, row in result_df.iterrows():
-            persona_summaries.append(PersonaSummary(
-                persona_name=str(row['persona_name']).split('\n')[0],
-                dominant_exit_step=row['dominant_exit_step'],
-                dominant_failure_reason=row.get('dominant_failure_reason'),
-                consistency_score=row['consistency_score'],
-                variants_completed=row['variants_completed'],
-                variants_total=row['variants_total']
-            ))
-        
-        # Count completions
-        completed = sum(p.variants_completed for p in persona_summaries)
+            if len(sorted_reasons) > 1:
+                secondary_cost, secondary_count = sorted_reasons[1]
+                secondary_pct = (secondary_count / failures * 100) if failures > 0 else 0.0
         
-        response = {
-            "scenario_summary": {
-                "scenario_name": scenario.scenario_name or "custom_scenario",
-                "total_trajectories": total_trajectories,
-                "completed_trajectories": completed,
-                "completion_rate": completed / total_trajectories if total_trajectories > 0 else 0.0,
-                "step_summaries": [s.dict() for s in step_summaries],
-                "persona_summaries": [p.dict() for p in persona_summaries]
+        step_summaries.append(StepSummary(
+            step_name=step_name,
+            failure_rate=failure_rate,
+            primary_cost=primary_cost,
+            primary_cost_pct=primary_pct,
+            secondary_cost=secondary_cost,
+            secondary_cost_pct=secondary_pct,
+            total_trajectories=total_trajectories,
+            failures=failures
+        ))
+    
+    persona_summaries = [
+        PersonaSummary(
+            persona_name=persona_name,
+            dominant_exit_step=dominant_exit_step,
+            dominant_failure_reason=dominant_failure_reason,
+            consistency_score=consistency_score,
+            variants_completed=variants_completed,
+            variants_total=variants_total
+        )
+        for (persona_name, dominant_exit_step, dominant_failure_reason, consistency_score,
+             variants_completed, variants_total) in zip(
+            _persona_names(result_df),
+            _column(result_df, 'dominant_exit_step'),
+            _column(result_df, 'dominant_failure_reason'),
+            _column(result_df, 'consistency_score'),
+            _column(result_df, 'variants_completed'),
+            _column(result_df, 'variants_total')
+        )
+    ]
+    
+    completed = sum(p.variants_completed for p in persona_summaries)
+    return {
+        "scenario_name": scenario_name or "custom_scenario",
+        "total_trajectories": total_trajectories,
+        "completed_trajectories": completed,
+        "completion_rate": completed / total_trajectories if total_trajectories > 0 else 0.0,
+        "step_summaries": [s.dict() for s in step_summaries],
+        "persona_summaries": [p.dict() for p in persona_summaries]
+    }
+
+
+def iter_traces(result_df) -> Iterator[Dict]:
+    """Yield one trace dict per trajectory, in persona then variant order."""
+    for persona_name, trajectories in zip(_persona_names(result_df), _column(result_df, 'trajectories', [])):
+        for traj in trajectories:
+            yield {
+                "persona_name": persona_name,
+                "variant": traj.get('variant'),
+                "exit_step": traj.get('exit_step'),
+                "failure_reason": traj.get('failure_reason'),
+                "journey": traj.get('journey', [])
             }
+
+
+def run_scenario_job(scenario: Dict, trace_path: Optional[str] = None) -> Dict:
+    """
+    Run one scenario and summarize it (module-level so process pools can pickle it).
+    
+    Args:
+        scenario: ScenarioConfig as a plain dict
+        trace_path: If given, traces are written here as NDJSON (one per line)
+            rather than returned, so they never cross the process boundary
+            or sit in memory as one list
+    
+    Returns:
+        scenario_summary dict
+    """
+    personas_list, state_variants, product_steps = prepare_scenario(scenario)
+    result_df = run_fintech_demo_simulation(
+        personas_list,
+        state_variants,
+        product_steps,
+        verbose=False
+    )
+    
+    total_trajectories = len(personas_list) * len(state_variants)
+    summary = build_scenario_summary(
+        result_df, product_steps, total_trajectories, scenario.get('scenario_name')
+    )
+    
+    if trace_path is not None:
+        with open(trace_path, 'w') as f:
+            for trace in iter_traces(result_df):
+                f.write(json.dumps(trace, default=_json_default))
+                f.write('\n')
+    
+    return summary
+
+
+def scenario_result_key(scenario: Dict) -> str:
+    """
+    Result cache key for a ScenarioConfig dict.
+    
+    scenario_name is not part of the key (it only labels the summary).
+    
+    Raises:
+        TypeError: If the scenario has no canonical form
+    """
+    return scenario_cache_key(
+        API_CACHE_KIND,
+        scenario['steps'],
+        scenario['personas'],
+        scenario.get('state_variants'),
+        engine_modules=API_ENGINE_MODULES
+    )
+
+
+# ============================================================================
+# Job Management
+# ============================================================================
+
+class JobQueueFull(Exception):
+    """Raised when every worker is busy and the pending queue is full."""
+
+
+@dataclass
+class SimulationJob:
+    """A submitted scenario and, once finished, its summary or error."""
+    job_id: str
+    scenario_name: str
+    include_traces: bool
+    future: Future = field(repr=False)
+    trace_path: Optional[str] = None
+    cached: bool = False
+    created_at: float = field(default_factory=time.time)
+    # NDJSON responses reading trace_path (the job is not evicted while > 0)
+    active_streams: int = 0
+    
+    @property
+    def status(self) -> str:
+        """queued, running, done, failed or cancelled."""
+        if self.future.cancelled():
+            return "cancelled"
+        if self.future.done():
+            return "failed" if self.future.exception() is not None else "done"
+        return "running" if self.future.running() else "queued"
+    
+    def to_dict(self) -> Dict:
+        """Status payload for GET /jobs/{job_id}."""
+        status = self.status
+        payload = {
+            "job_id": self.job_id,
+            "scenario_name": self.scenario_name,
+            "status": status,
+            "created_at": self.created_at,
+            "include_traces": self.include_traces,
+            "cached": self.cached
         }
+        if status == "done":
+            payload["scenario_summary"] = self.future.result()
+            if self.include_traces:
+                payload["traces_url"] = f"/jobs/{self.job_id}/traces"
+        elif status == "failed":
+            payload["error"] = str(self.future.exception())
+        return payload
+
+
+class SimulationJobManager:
+    """
+    Bounded worker pool for scenario simulations.
+    
+    At most max_workers jobs run at once and at most max_pending more wait
+    for a worker; beyond that submit() raises JobQueueFull so callers can
+    apply backpressure. Finished jobs are kept (oldest evicted first, along
+    with their trace files) so clients can poll for results.
+    
+    With a ResultCache, scenarios seen before complete immediately from the
+    cache (without taking a worker or counting against capacity), and every
+    finished job is stored in it.
+    """
+    
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        max_pending: int = API_MAX_PENDING,
+        executor: str = API_EXECUTOR,
+        max_retained: int = API_MAX_RETAINED_JOBS,
+        cache: Optional[ResultCache] = None
+    ):
+        if executor not in ("process", "thread"):
+            raise ValueError(f"executor must be 'process' or 'thread', got {executor!r}")
+        self.max_workers = resolve_worker_count(max_workers)
+        self.max_pending = max(0, max_pending)
+        self.max_retained = max_retained
+        self.cache = cache
+        pool_class = ProcessPoolExecutor if executor == "process" else ThreadPoolExecutor
+        self._executor: Executor = pool_class(max_workers=self.max_workers)
+        self._jobs: "OrderedDict[str, SimulationJob]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._spool_dir = tempfile.mkdtemp(prefix="dropsim_jobs_")
+    
+    @property
+    def capacity(self) -> int:
+        """Maximum number of unfinished (running + queued) jobs."""
+        return self.max_workers + self.max_pending
+    
+    def active_count(self) -> int:
+        """Number of unfinished jobs."""
+        return sum(1 for job in self._jobs.values() if not job.future.done())
+    
+    def submit(self, scenario: Dict, include_traces: bool = False, hold: bool = False) -> SimulationJob:
+        """
+        Queue a scenario (a ScenarioConfig dict).
+        
+        With hold, the job starts with one active stream, so it is never
+        evicted before the caller has read it (the caller discards it).
+        
+        Raises:
+            JobQueueFull: If capacity unfinished jobs are already queued or running
+        """
+        cache_key = None
+        if self.cache is not None:
+            try:
+                cache_key = scenario_result_key(scenario)
+            except TypeError:
+                pass
+        if cache_key is not None:
+            job = self._cached_job(cache_key, scenario, include_traces, hold)
+            if job is not None:
+                return job
         
-        # Add traces if requested
+        with self._lock:
+            if self.active_count() >= self.capacity:
+                raise JobQueueFull(
+                    f"{self.capacity} simulations already queued or running; retry later"
+                )
+            job_id = uuid.uuid4().hex
+            trace_path = os.path.join(self._spool_dir, f"{job_id}.ndjson") if include_traces else None
+            future = self._executor.submit(run_scenario_job, scenario, trace_path)
+            if cache_key is not None:
+                # Runs before any other callback, so the trace file still exists
+                future.add_done_callback(partial(self._store_result, cache_key, trace_path))
+            job = SimulationJob(
+                job_id=job_id,
+                scenario_name=scenario.get('scenario_name') or "custom_scenario",
+                include_traces=include_traces,
+                future=future,
+                trace_path=trace_path,
+                active_streams=int(hold)
+            )
+            self._jobs[job_id] = job
+            self._evict_finished()
+            return job
+    
+    def _cached_job(
+        self, cache_key: str, scenario: Dict, include_traces: bool, hold: bool = False
+    ) -> Optional[SimulationJob]:
+        """A finished job served from the result cache, or None on a miss."""
+        cached_traces = None
         if include_traces:
-            traces = []
-            for _, row in result_df.iterrows():
-                for traj in row.get('trajectories', []):
-                    traces.append({
-                        "persona_name": str(row['persona_name']).split('\n')[0],
-                        "variant": traj.get('variant'),
-                        "exit_step": traj.get('exit_step'),
-                        "failure_reason": traj.get('failure_reason'),
-                        "journey": traj.get('journey', [])
-                    })
-            response["traces"] = traces
+            cached_traces = self.cache.get_file(cache_key, TRACES_FILE)
+            if cached_traces is None:
+                return None
+        summary = self.cache.get(cache_key)
+        if summary is None:
+            return None
+        
+        scenario_name = scenario.get('scenario_name') or "custom_scenario"
+        job_id = uuid.uuid4().hex
+        trace_path = None
+        if cached_traces is not None:
+            # Own copy (hard link), so cache eviction cannot pull it from under a stream
+            trace_path = os.path.join(self._spool_dir, f"{job_id}.ndjson")
+            try:
+                link_or_copy(cached_traces, trace_path)
+            except FileNotFoundError:
+                return None
         
-        return response
+        future = Future()
+        future.set_result({**summary, 'scenario_name': scenario_name})
+        job = SimulationJob(
+            job_id=job_id,
+            scenario_name=scenario_name,
+            include_traces=include_traces,
+            future=future,
+            trace_path=trace_path,
+            cached=True,
+            active_streams=int(hold)
+        )
+        with self._lock:
+            self._jobs[job_id] = job
+            self._evict_finished()
+        return job
+    
+    def _store_result(self, cache_key: str, trace_path: Optional[str], future: Future):
+        """Done-callback: put a successful job's summary (and traces) in the cache."""
+        if future.cancelled() or future.exception() is not None:
+            return
+        files = {TRACES_FILE: trace_path} if trace_path and os.path.exists(trace_path) else None
+        try:
+            self.cache.put(cache_key, future.result(), files=files)
+        except OSError:
+            pass
+    
+    def get(self, job_id: str) -> Optional[SimulationJob]:
+        """Look up a job by id."""
+        return self._jobs.get(job_id)
+    
+    def open_stream(self, job: SimulationJob):
+        """Mark a job's traces as being streamed (protects it from eviction)."""
+        with self._lock:
+            job.active_streams += 1
+    
+    def close_stream(self, job: SimulationJob):
+        with self._lock:
+            job.active_streams -= 1
+    
+    def discard(self, job_id: str):
+        """Forget a job and delete its trace file."""
+        with self._lock:
+            job = self._jobs.pop(job_id, None)
+        if job is not None and job.trace_path and os.path.exists(job.trace_path):
+            os.remove(job.trace_path)
+    
+    def _evict_finished(self):
+        """Drop the oldest finished jobs beyond max_retained, except those being streamed (lock held)."""
+        excess = len(self._jobs) - self.max_retained
+        evictable = [j for j, job in self._jobs.items() if job.future.done() and not job.active_streams]
+        for job_id in evictable[:max(0, excess)]:
+            job = self._jobs.pop(job_id)
+            if job.trace_path and os.path.exists(job.trace_path):
+                os.remove(job.trace_path)
+    
+    def shutdown(self):
+        """Stop the pool (cancelling queued jobs) and delete trace files."""
+        self._executor.shutdown(wait=True, cancel_futures=True)
+        shutil.rmtree(self._spool_dir, ignore_errors=True)
+
+
+_job_manager: Optional[SimulationJobManager] = None
+_job_manager_lock = threading.Lock()
+
+
+def get_job_manager() -> SimulationJobManager:
+    """Get the process-wide job manager, creating it on first use."""
+    global _job_manager
+    with _job_manager_lock:
+        if _job_manager is None:
+            _job_manager = SimulationJobManager(max_workers=API_MAX_WORKERS, cache=get_result_cache())
+        return _job_manager
+
+
+def shutdown_job_manager():
+    """Shut down the process-wide job manager, if one was created."""
+    global _job_manager
+    with _job_manager_lock:
+        if _job_manager is not None:
+            _job_manager.shutdown()
+            _job_manager = None
+
+
+def _submit_or_503(scenario: ScenarioConfig, include_traces: bool, hold: bool = False) -> SimulationJob:
+    try:
+        return get_job_manager().submit(scenario.dict(), include_traces=include_traces, hold=hold)
+    except JobQueueFull as e:
+        raise HTTPException(
+            status_code=503, detail=str(e), headers={"Retry-After": str(RETRY_AFTER_SECONDS)}
+        )
+
+
+def _stream_ndjson(summary: Dict, trace_path: Optional[str]) -> Iterator[str]:
+    """First line is the scenario summary, then one trace per line."""
+    yield json.dumps({"scenario_summary": summary}) + '\n'
+    if trace_path is not None:
+        with open(trace_path) as f:
+            yield from f
+
+
+# ============================================================================
+# API Endpoints
+# ============================================================================
+
+@app.post("/simulate", response_model=Dict)
+async def simulate(
+    scenario: ScenarioConfig,
+    include_traces: bool = Query(False, description="Stream full traces as NDJSON")
+):
+    """
+    Run behavioral simulation for a scenario.
+    
+    The simulation runs on the worker pool; this request waits for it
+    without blocking other requests. Returns 503 when the pool is saturated.
     
+    Returns:
+    - scenario_summary: Step-level and persona-level summaries
+    - with include_traces=true, an NDJSON stream instead: the first line is
+      {"scenario_summary": ...}, then one trajectory trace per line
+    """
+    # Held until discarded below, so eviction cannot remove its trace file
+    job = _submit_or_503(scenario, include_traces, hold=True)
+    try:
+        summary = await asyncio.wrap_future(job.future)
     except Exception as e:
+        get_job_manager().discard(job.job_id)
         raise HTTPException(status_code=500, detail=str(e))
+    
+    if not include_traces:
+        get_job_manager().discard(job.job_id)
+        return {"scenario_summary": summary}
+    
+    def stream():
+        try:
+            yield from _stream_ndjson(summary, job.trace_path)
+        finally:
+            get_job_manager().discard(job.job_id)
+    
+    return StreamingResponse(stream(), media_type=NDJSON_MEDIA_TYPE)
+
+
+@app.post("/jobs", status_code=202)
+async def submit_job(
+    scenario: ScenarioConfig,
+    include_traces: bool = Query(False, description="Keep full traces for GET /jobs/{job_id}/traces")
+):
+    """
+    Queue a scenario simulation and return immediately.
+    
+    Poll GET /jobs/{job_id} for status and the scenario summary.
+    Returns 503 (with Retry-After) when the pool is saturated.
+    """
+    job = _submit_or_503(scenario, include_traces)
+    return {
+        "job_id": job.job_id,
+        "status": job.status,
+        "status_url": f"/jobs/{job.job_id}"
+    }
+
+
+@app.get("/jobs/{job_id}")
+async def get_job(job_id: str):
+    """Job status; includes scenario_summary once done, error if failed."""
+    job = get_job_manager().get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Unknown job: {job_id}")
+    return job.to_dict()
+
+
+@app.get("/jobs/{job_id}/traces")
+async def get_job_traces(job_id: str):
+    """Stream a finished job's traces as NDJSON (summary line first)."""
+    job = get_job_manager().get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Unknown job: {job_id}")
+    if not job.include_traces:
+        raise HTTPException(status_code=404, detail="Job was submitted without include_traces=true")
+    status = job.status
+    if status == "failed":
+        raise HTTPException(status_code=500, detail=str(job.future.exception()))
+    if status != "done":
+        raise HTTPException(status_code=409, detail=f"Job is {status}")
+    
+    manager = get_job_manager()
+    manager.open_stream(job)
+    
+    def stream():
+        try:
+            yield from _stream_ndjson(job.future.result(), job.trace_path)
+        finally:
+            manager.close_stream(job)
+    
+    return StreamingResponse(stream(), media_type=NDJSON_MEDIA_TYPE)
+
+
+@app.get("/cache/stats")
+async def cache_stats():
+    """Result cache hit/miss counters and disk usage."""
+    cache = get_job_manager().cache
+    if cache is None:
+        return {"enabled": False}
+    return {"enabled": True, **cache.stats.to_dict(), "disk_bytes": cache.disk_usage()}
 
 
 @app.get("/health")
@@ -285,4 +750,3 @@ async def health():
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000, reload=True)
-
@@ -11,42 +11,14 @@ import json
 import sys
 import os
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import TYPE_CHECKING, Dict, List, Optional
 
-from fintech_presets import get_default_fintech_scenario
-from fintech_demo import (
-    run_fintech_demo_simulation,
-    print_fintech_trace,
-    export_fintech_json
-)
-from behavioral_aggregator import generate_full_report
-from dropsim_calibration import (
-    ObservedFunnel,
-    compare_scenario_to_observed,
-    suggest_coefficient_adjustments,
-    format_calibration_report,
-    format_tuning_suggestions
-)
-from dropsim_visualization_data import (
-    build_step_level_series,
-    export_step_level_csv,
-    export_step_level_json,
-    build_trajectory_series,
-    export_trajectory_csv,
-    export_trajectory_json
-)
-from dropsim_narrative import generate_narrative_summary
-from dropsim_lite_input import load_lite_scenario, lite_to_scenario
-from dropsim_target_filter import load_target_group, TargetGroup
-from dropsim_llm_ingestion import (
-    infer_lite_scenario_and_target_from_llm,
-    OpenAILLMClient,
-    LLMClient
-)
-from dropsim_wizard import (
-    WizardInput,
-    run_fintech_wizard
-)
+# Engine, LLM and calibration modules are imported inside the commands that
+# use them: `--help` and argument errors never load pandas, and simulate /
+# simulate-lite load neither the LLM stack nor (without --observed-funnel)
+# calibration
+if TYPE_CHECKING:
+    from dropsim_target_filter import TargetGroup
 
 
 def load_scenario_from_json(filepath: str) -> Dict:
@@ -55,7 +27,17 @@ def load_scenario_from_json(filepath: str) -> Dict:
         return json.load(f)
 
 
-def run_scenario_simulation(scenario: Dict, verbose: bool = True, target_group: Optional[TargetGroup] = None) -> Dict:
+# Modules whose source determines run_scenario_simulation results (with the
+# local modules they import)
+SCENARIO_ENGINE_MODULES = ("fintech_demo", "fintech_presets", "behavioral_engine", "dropsim_target_filter")
+
+
+def run_scenario_simulation(
+    scenario: Dict,
+    verbose: bool = True,
+    target_group: Optional['TargetGroup'] = None,
+    use_cache: bool = True
+) -> Dict:
     """
     Run simulation for a generic scenario (not just fintech).
     
@@ -63,12 +45,16 @@ def run_scenario_simulation(scenario: Dict, verbose: bool = True, target_group:
         scenario: ScenarioConfig dict with personas, steps, optional state_variants
         verbose: Print progress
         target_group: Optional TargetGroup filter
+        use_cache: Reuse the result of an identical earlier run (same compiled
+            personas, steps, state variants, target group and engine code)
+            from the result cache
     
     Returns:
         Dict with results_df and summary
     """
     from fintech_demo import run_fintech_demo_simulation
     from behavioral_engine import STATE_VARIANTS
+    from dropsim_result_cache import get_result_cache, scenario_cache_key
     
     # Extract components
     personas = scenario.get('personas', [])
@@ -95,13 +81,32 @@ def run_scenario_simulation(scenario: Dict, verbose: bool = True, target_group:
     
     # Run simulation (reuse fintech demo logic)
     target_group_dict = target_group.to_dict() if target_group else None
-    result_df = run_fintech_demo_simulation(
-        compiled_personas,
-        state_variants,
-        product_steps,
-        verbose=verbose,
-        target_group=target_group_dict
-    )
+    
+    cache = get_result_cache() if use_cache else None
+    cache_key = None
+    if cache is not None:
+        try:
+            cache_key = scenario_cache_key(
+                "fintech_demo_result", product_steps, compiled_personas, state_variants,
+                engine_modules=SCENARIO_ENGINE_MODULES, target_group=target_group_dict
+            )
+        except TypeError:
+            cache_key = None
+    
+    result_df = cache.get(cache_key) if cache_key is not None else None
+    if result_df is not None:
+        if verbose:
+            print(f"♻️  Reusing cached simulation results ({len(result_df)} personas)")
+    else:
+        result_df = run_fintech_demo_simulation(
+            compiled_personas,
+            state_variants,
+            product_steps,
+            verbose=verbose,
+            target_group=target_group_dict
+        )
+        if cache_key is not None:
+            cache.put(cache_key, result_df)
     
     return {
         'result_df': result_df,
@@ -133,6 +138,9 @@ def format_step_summary(step_name: str, failure_rate: float, primary_cost: Optio
 
 def export_plot_data(results: Dict, product_steps: Dict, output_path: str, calibration_report_dict: Optional[Dict] = None):
     """Export step-level plot data to CSV/JSON."""
+    from behavioral_aggregator import generate_full_report
+    from dropsim_visualization_data import build_step_level_series, export_step_level_csv, export_step_level_json
+    
     result_df = results['result_df']
     report = generate_full_report(result_df, product_steps=product_steps)
     
@@ -156,6 +164,8 @@ def export_plot_data(results: Dict, product_steps: Dict, output_path: str, calib
 
 def export_trajectory_plot_data(result_df, persona_name: str, variant: str, product_steps: Dict, output_path: str):
     """Export trajectory plot data for a specific persona × variant."""
+    from dropsim_visualization_data import build_trajectory_series, export_trajectory_csv, export_trajectory_json
+    
     # Find persona and variant
     persona_row = None
     for idx, row in result_df.iterrows():
@@ -194,6 +204,9 @@ def export_trajectory_plot_data(result_df, persona_name: str, variant: str, prod
 
 def print_narrative_summary(results: Dict, product_steps: Dict, calibration_report_dict: Optional[Dict] = None):
     """Print narrative summary for founders/PMs."""
+    from behavioral_aggregator import generate_full_report
+    from dropsim_narrative import generate_narrative_summary
+    
     result_df = results['result_df']
     report = generate_full_report(result_df, product_steps=product_steps)
     
@@ -214,6 +227,8 @@ def print_narrative_summary(results: Dict, product_steps: Dict, calibration_repo
 
 def print_simulation_summary(results: Dict, product_steps: Dict):
     """Print PM-friendly summary matching design doc format."""
+    from behavioral_aggregator import generate_full_report
+    
     result_df = results['result_df']
     total_trajectories = len(result_df) * 7  # 7 variants per persona
     
@@ -253,6 +268,15 @@ def print_simulation_summary(results: Dict, product_steps: Dict):
 
 def print_calibration_report(results: Dict, product_steps: Dict, observed_funnel_path: str) -> Optional[Dict]:
     """Load observed funnel and print calibration report. Returns calibration_report dict if available."""
+    from behavioral_aggregator import generate_full_report
+    from dropsim_calibration import (
+        ObservedFunnel,
+        compare_scenario_to_observed,
+        suggest_coefficient_adjustments,
+        format_calibration_report,
+        format_tuning_suggestions
+    )
+    
     # Load observed funnel
     with open(observed_funnel_path, 'r') as f:
         observed_data = json.load(f)
@@ -337,6 +361,7 @@ Examples:
     sim_parser.add_argument('--observed-funnel', type=str, help='Path to observed funnel JSON file for calibration')
     sim_parser.add_argument('--target-group', type=str, help='Path to target group filter JSON file')
     sim_parser.add_argument('--export', type=str, help='Export traces to JSON file')
+    sim_parser.add_argument('--no-cache', action='store_true', help='Re-run the simulation even if an identical run is cached')
     sim_parser.add_argument('--export-plot-data', type=str, help='Export step-level plot data to CSV/JSON')
     sim_parser.add_argument('--trace-plot-data', type=str, help='Export trajectory plot data to CSV/JSON (requires --persona-name and --variant)')
     
@@ -347,6 +372,7 @@ Examples:
     lite_parser.add_argument('--observed-funnel', type=str, help='Path to observed funnel JSON file for calibration')
     lite_parser.add_argument('--target-group', type=str, help='Path to target group filter JSON file')
     lite_parser.add_argument('--export', type=str, help='Export traces to JSON file')
+    lite_parser.add_argument('--no-cache', action='store_true', help='Re-run the simulation even if an identical run is cached')
     lite_parser.add_argument('--export-plot-data', type=str, help='Export step-level plot data to CSV/JSON')
     lite_parser.add_argument('--trace-plot-data', type=str, help='Export trajectory plot data to CSV/JSON (requires --persona-name and --variant)')
     
@@ -361,6 +387,7 @@ Examples:
     ingest_parser.add_argument('--observed-funnel', type=str, help='Path to observed funnel JSON file for calibration')
     ingest_parser.add_argument('--export-plot-data', type=str, help='Export step-level plot data to CSV/JSON')
     ingest_parser.add_argument('--export', type=str, help='Export traces to JSON file')
+    ingest_parser.add_argument('--no-cache', action='store_true', help='Re-run the simulation even if an identical run is cached')
     ingest_parser.add_argument('--verbose', action='store_true', help='Print debug information')
     ingest_parser.add_argument('--dry-run', action='store_true', help='Only extract scenario, do not run simulation')
     
@@ -390,6 +417,10 @@ Examples:
     
     # Handle wizard-fintech command first (before simulate checks)
     if args.command == 'wizard-fintech':
+        from dropsim_wizard import WizardInput, run_fintech_wizard
+        from dropsim_llm_client import LLM_CACHE_DIR, create_llm_client
+        from fintech_demo import export_fintech_json
+        
         print("\n" + "=" * 80)
         print("🧙 DropSim Fintech Wizard")
         print("=" * 80)
@@ -433,7 +464,11 @@ Examples:
             print("   Set --openai-api-key or OPENAI_API_KEY environment variable")
             sys.exit(1)
         
-        llm_client = OpenAILLMClient(api_key=api_key, model=args.llm_model)
+        llm_client = create_llm_client(
+            api_key=api_key,
+            model=args.llm_model,
+            cache_dir=None if getattr(args, 'no_cache', False) else LLM_CACHE_DIR
+        )
         
         # Get Firecrawl API key if provided
         firecrawl_key = args.firecrawl_api_key or os.environ.get('FIRECRAWL_API_KEY')
@@ -452,6 +487,7 @@ Examples:
         # Load observed funnel if provided
         observed_funnel = None
         if args.observed_funnel:
+            from dropsim_calibration import ObservedFunnel
             with open(args.observed_funnel, 'r') as f:
                 funnel_data = json.load(f)
                 observed_funnel = ObservedFunnel.from_dict(funnel_data)
@@ -598,6 +634,11 @@ Examples:
     
     # Handle ingest-fintech command
     if args.command == 'ingest-fintech':
+        from dropsim_llm_ingestion import infer_lite_scenario_and_target_from_llm
+        from dropsim_llm_client import LLM_CACHE_DIR, create_llm_client
+        from dropsim_lite_input import lite_to_scenario
+        from fintech_demo import export_fintech_json
+        
         print("\n" + "=" * 80)
         print("🤖 DropSim LLM Ingest: Fintech Product")
         print("=" * 80)
@@ -624,7 +665,11 @@ Examples:
             print("   Set --openai-api-key or OPENAI_API_KEY environment variable")
             sys.exit(1)
         
-        llm_client = OpenAILLMClient(api_key=api_key, model=args.llm_model)
+        llm_client = create_llm_client(
+            api_key=api_key,
+            model=args.llm_model,
+            cache_dir=None if getattr(args, 'no_cache', False) else LLM_CACHE_DIR
+        )
         
         # Extract scenario from LLM
         print("\n🤖 Extracting scenario from product description using LLM...")
@@ -701,7 +746,7 @@ Examples:
         print("🚀 Running Simulation on Inferred Scenario")
         print("=" * 80)
         
-        results = run_scenario_simulation(scenario, verbose=True, target_group=target_group)
+        results = run_scenario_simulation(scenario, verbose=True, target_group=target_group, use_cache=not args.no_cache)
         
         # Print summary
         print_simulation_summary(results, results['product_steps'])
@@ -735,6 +780,10 @@ Examples:
     
     # Handle simulate-lite command
     if args.command == 'simulate-lite':
+        from dropsim_lite_input import load_lite_scenario, lite_to_scenario
+        from dropsim_target_filter import load_target_group
+        from fintech_demo import print_fintech_trace, export_fintech_json
+        
         print("\n" + "=" * 80)
         print("🚀 DropSim: Lite Input Mode (Human-Friendly Labels)")
         print("=" * 80)
@@ -775,7 +824,7 @@ Examples:
                 return
         
         # Run simulation
-        results = run_scenario_simulation(scenario, verbose=True, target_group=target_group)
+        results = run_scenario_simulation(scenario, verbose=True, target_group=target_group, use_cache=not args.no_cache)
         
         # Print summary
         print_simulation_summary(results, results['product_steps'])
@@ -841,6 +890,10 @@ Examples:
         print("❌ Error: Cannot specify both --preset and --scenario-file")
         sys.exit(1)
     
+    from fintech_presets import get_default_fintech_scenario
+    from fintech_demo import run_fintech_demo_simulation, print_fintech_trace, export_fintech_json
+    from dropsim_target_filter import load_target_group
+    
     # Run simulation
     if args.preset == 'fintech':
         print("\n" + "=" * 80)
@@ -930,7 +983,7 @@ Examples:
                 return
         
         # Run simulation
-        results = run_scenario_simulation(scenario, verbose=True)
+        results = run_scenario_simulation(scenario, verbose=True, use_cache=not args.no_cache)
         
         # Print summary
         print_simulation_summary(results, results['product_steps'])
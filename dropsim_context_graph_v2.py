@@ -15,13 +15,23 @@ Edges:
 - "was justified by"
 - "led to"
 - "overrode"
+
+Storage: a local SQLite file with adjacency indexes on (to_node, edge_type)
+and (from_node, edge_type), plus node_type and timestamp indexes. Writes go
+into an open transaction that is committed every `batch_size` inserts (or
+on flush()/close()), so ingestion stays linear and neighbour queries cost
+O(degree).
 """
 
-from typing import Dict, List, Optional, Set
+from typing import Dict, Iterator, List, Optional, Set
+from collections.abc import Mapping
+from contextlib import contextmanager
 from dataclasses import dataclass, field
 from datetime import datetime
 import json
 import os
+import sqlite3
+import weakref
 
 
 @dataclass
@@ -64,55 +74,209 @@ class GraphEdge:
         }
 
 
+# ============================================================================
+# SQLite Storage
+# ============================================================================
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS nodes (
+    seq INTEGER PRIMARY KEY,
+    node_id TEXT NOT NULL UNIQUE,
+    node_type TEXT NOT NULL,
+    properties TEXT NOT NULL,
+    timestamp TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS edges (
+    seq INTEGER PRIMARY KEY,
+    edge_id TEXT NOT NULL UNIQUE,
+    from_node TEXT NOT NULL,
+    to_node TEXT NOT NULL,
+    edge_type TEXT NOT NULL,
+    properties TEXT NOT NULL,
+    timestamp TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_nodes_type ON nodes (node_type, seq);
+CREATE INDEX IF NOT EXISTS idx_nodes_timestamp ON nodes (timestamp);
+CREATE INDEX IF NOT EXISTS idx_edges_to ON edges (to_node, edge_type, seq);
+CREATE INDEX IF NOT EXISTS idx_edges_from ON edges (from_node, edge_type, seq);
+CREATE INDEX IF NOT EXISTS idx_edges_timestamp ON edges (timestamp);
+"""
+
+_NODE_COLUMNS = "node_id, node_type, properties, timestamp"
+_EDGE_COLUMNS = "edge_id, from_node, to_node, edge_type, properties, timestamp"
+
+
+def _store_is_file(store_path: str) -> bool:
+    """False for SQLite's in-memory / temporary databases."""
+    return store_path not in ("", ":memory:") and not store_path.startswith("file::memory:")
+
+
+def _close_connection(conn: sqlite3.Connection):
+    conn.commit()
+    conn.close()
+
+
+def _node_from_row(row) -> GraphNode:
+    return GraphNode(node_id=row[0], node_type=row[1], properties=json.loads(row[2]), timestamp=row[3])
+
+
+def _edge_from_row(row) -> GraphEdge:
+    return GraphEdge(
+        edge_id=row[0], from_node=row[1], to_node=row[2], edge_type=row[3],
+        properties=json.loads(row[4]), timestamp=row[5]
+    )
+
+
+class _TableView(Mapping):
+    """Read-only id -> node/edge mapping over a table, in insertion order."""
+    
+    def __init__(self, conn: sqlite3.Connection, table: str, key: str, columns: str, from_row):
+        self._conn = conn
+        self._table = table
+        self._key = key
+        self._columns = columns
+        self._from_row = from_row
+    
+    def __getitem__(self, item_id: str):
+        row = self._conn.execute(
+            f"SELECT {self._columns} FROM {self._table} WHERE {self._key} = ?", (item_id,)
+        ).fetchone()
+        if row is None:
+            raise KeyError(item_id)
+        return self._from_row(row)
+    
+    def __contains__(self, item_id) -> bool:
+        return self._conn.execute(
+            f"SELECT 1 FROM {self._table} WHERE {self._key} = ?", (item_id,)
+        ).fetchone() is not None
+    
+    def __iter__(self) -> Iterator[str]:
+        for (item_id,) in self._conn.execute(f"SELECT {self._key} FROM {self._table} ORDER BY seq"):
+            yield item_id
+    
+    def __len__(self) -> int:
+        return self._conn.execute(f"SELECT COUNT(*) FROM {self._table}").fetchone()[0]
+    
+    def values(self) -> List:
+        return [self._from_row(row) for row in self._conn.execute(
+            f"SELECT {self._columns} FROM {self._table} ORDER BY seq"
+        )]
+    
+    def items(self) -> List:
+        return [(getattr(item, self._key), item) for item in self.values()]
+
+
+# ============================================================================
+# Context Graph
+# ============================================================================
+
 class ContextGraphV2:
-    """Context Graph v2 - records actual decisions and relationships."""
+    """
+    Context Graph v2 - records actual decisions and relationships.
+    
+    `nodes` and `edges` are read-only id -> GraphNode/GraphEdge mappings over
+    the store. A JSON file from the earlier storage format next to store_path
+    (same name, .json) is imported into an empty store on first open.
+    """
     
-    def __init__(self, store_path: str = "context_graph_v2.json"):
+    def __init__(self, store_path: str = "context_graph_v2.db", batch_size: int = 1000):
+        """
+        Args:
+            store_path: SQLite file (":memory:" for a throwaway graph)
+            batch_size: Inserts per committed transaction
+        """
+        if store_path.endswith('.json'):
+            store_path = store_path[:-len('.json')] + '.db'
         self.store_path = store_path
-        self.nodes: Dict[str, GraphNode] = {}
-        self.edges: Dict[str, GraphEdge] = {}
+        self.batch_size = max(1, batch_size)
+        self._pending = 0
+        self._batch_depth = 0
+        
+        self._conn = sqlite3.connect(store_path)
+        self._conn.executescript(_SCHEMA)
+        self._finalizer = weakref.finalize(self, _close_connection, self._conn)
+        
+        self.nodes: Mapping = _TableView(self._conn, "nodes", "node_id", _NODE_COLUMNS, _node_from_row)
+        self.edges: Mapping = _TableView(self._conn, "edges", "edge_id", _EDGE_COLUMNS, _edge_from_row)
         self._load()
     
     def _load(self):
-        """Load graph from disk."""
-        if os.path.exists(self.store_path):
-            try:
-                with open(self.store_path, 'r') as f:
-                    data = json.load(f)
-                    
-                    # Load nodes
+        """Import a legacy JSON graph into an empty store."""
+        if _store_is_file(self.store_path) and len(self.nodes) == 0 and len(self.edges) == 0:
+            legacy_path = os.path.splitext(self.store_path)[0] + '.json'
+            if os.path.exists(legacy_path):
+                try:
+                    with open(legacy_path, 'r') as f:
+                        data = json.load(f)
+                except Exception:
+                    return
+                with self.batch():
                     for node_data in data.get('nodes', []):
-                        node = GraphNode(
+                        self._put_node(GraphNode(
                             node_id=node_data['node_id'],
                             node_type=node_data['node_type'],
                             properties=node_data['properties'],
                             timestamp=node_data.get('timestamp', datetime.now().isoformat())
-                        )
-                        self.nodes[node.node_id] = node
-                    
-                    # Load edges
+                        ))
                     for edge_data in data.get('edges', []):
-                        edge = GraphEdge(
+                        self._put_edge(GraphEdge(
                             edge_id=edge_data['edge_id'],
                             from_node=edge_data['from_node'],
                             to_node=edge_data['to_node'],
                             edge_type=edge_data['edge_type'],
                             properties=edge_data['properties'],
                             timestamp=edge_data.get('timestamp', datetime.now().isoformat())
-                        )
-                        self.edges[edge.edge_id] = edge
-            except Exception:
-                pass
+                        ))
     
-    def _save(self):
-        """Save graph to disk."""
-        data = {
-            'nodes': [n.to_dict() for n in self.nodes.values()],
-            'edges': [e.to_dict() for e in self.edges.values()],
-            'last_updated': datetime.now().isoformat()
-        }
-        with open(self.store_path, 'w') as f:
-            json.dump(data, f, indent=2, default=str)
+    # ------------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------------
+    
+    def _put_node(self, node: GraphNode):
+        # Upsert keeps the original seq, so a re-added node keeps its position
+        self._conn.execute(
+            f"INSERT INTO nodes ({_NODE_COLUMNS}) VALUES (?, ?, ?, ?) "
+            "ON CONFLICT(node_id) DO UPDATE SET node_type = excluded.node_type, "
+            "properties = excluded.properties, timestamp = excluded.timestamp",
+            (node.node_id, node.node_type, json.dumps(node.properties, default=str), node.timestamp)
+        )
+        self._wrote()
+    
+    def _put_edge(self, edge: GraphEdge):
+        self._conn.execute(
+            f"INSERT INTO edges ({_EDGE_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT(edge_id) DO UPDATE SET from_node = excluded.from_node, "
+            "to_node = excluded.to_node, edge_type = excluded.edge_type, "
+            "properties = excluded.properties, timestamp = excluded.timestamp",
+            (edge.edge_id, edge.from_node, edge.to_node, edge.edge_type,
+             json.dumps(edge.properties, default=str), edge.timestamp)
+        )
+        self._wrote()
+    
+    def _wrote(self):
+        self._pending += 1
+        if self._pending >= self.batch_size and self._batch_depth == 0:
+            self.flush()
+    
+    def flush(self):
+        """Commit pending inserts."""
+        self._conn.commit()
+        self._pending = 0
+    
+    def close(self):
+        """Commit pending inserts and close the store."""
+        self._finalizer()
+    
+    @contextmanager
+    def batch(self):
+        """Group inserts into one transaction, committed when the block exits."""
+        self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+            if self._batch_depth == 0:
+                self.flush()
     
     def add_node(
         self,
@@ -127,8 +291,7 @@ class ContextGraphV2:
             properties=properties,
             timestamp=datetime.now().isoformat()
         )
-        self.nodes[node_id] = node
-        self._save()
+        self._put_node(node)
     
     def add_edge(
         self,
@@ -148,8 +311,27 @@ class ContextGraphV2:
             properties=properties or {},
             timestamp=datetime.now().isoformat()
         )
-        self.edges[edge_id] = edge
-        self._save()
+        self._put_edge(edge)
+    
+    # ------------------------------------------------------------------
+    # Indexed reads
+    # ------------------------------------------------------------------
+    
+    def _neighbors(self, node_id: str, edge_type: str, direction: str, limit: Optional[int] = None) -> List[str]:
+        """Nodes at the other end of `edge_type` edges into (direction='in') or out of a node."""
+        if direction == 'in':
+            sql = "SELECT from_node FROM edges WHERE to_node = ? AND edge_type = ? ORDER BY seq"
+        else:
+            sql = "SELECT to_node FROM edges WHERE from_node = ? AND edge_type = ? ORDER BY seq"
+        if limit is not None:
+            sql += f" LIMIT {int(limit)}"
+        return [row[0] for row in self._conn.execute(sql, (node_id, edge_type))]
+    
+    def nodes_of_type(self, node_type: str) -> List[GraphNode]:
+        """All nodes of a type, in insertion order."""
+        return [_node_from_row(row) for row in self._conn.execute(
+            f"SELECT {_NODE_COLUMNS} FROM nodes WHERE node_type = ? ORDER BY seq", (node_type,)
+        )]
     
     def add_decision_trace(self, trace):
         """Add a decision trace to the graph."""
@@ -214,32 +396,35 @@ class ContextGraphV2:
                 {}
             )
     
+    def add_decision_traces(self, traces: List) -> None:
+        """Add many decision traces in one transaction."""
+        with self.batch():
+            for trace in traces:
+                self.add_decision_trace(trace)
+    
     def get_decisions_influenced_by(self, node_id: str) -> List[str]:
         """Get all decisions influenced by a given node."""
-        decisions = []
-        for edge in self.edges.values():
-            if edge.from_node == node_id and edge.edge_type == "was_influenced_by":
-                decisions.append(edge.to_node)
-        return decisions
+        return self._neighbors(node_id, "was_influenced_by", direction='out')
     
     def get_precedents_for(self, decision_id: str) -> List[str]:
         """Get precedent decisions for a given decision."""
         decision_node_id = f"decision_{decision_id}"
-        precedents = []
-        for edge in self.edges.values():
-            if edge.to_node == decision_node_id and edge.edge_type == "was_justified_by":
-                precedents.append(edge.from_node.replace("decision_", ""))
-        return precedents
+        return [
+            from_node.replace("decision_", "")
+            for from_node in self._neighbors(decision_node_id, "was_justified_by", direction='in')
+        ]
     
     def get_graph_delta(self, since_timestamp: str) -> Dict:
         """Get changes to the graph since a timestamp."""
         new_nodes = [
-            n.to_dict() for n in self.nodes.values()
-            if n.timestamp > since_timestamp
+            _node_from_row(row).to_dict() for row in self._conn.execute(
+                f"SELECT {_NODE_COLUMNS} FROM nodes WHERE timestamp > ? ORDER BY seq", (since_timestamp,)
+            )
         ]
         new_edges = [
-            e.to_dict() for e in self.edges.values()
-            if e.timestamp > since_timestamp
+            _edge_from_row(row).to_dict() for row in self._conn.execute(
+                f"SELECT {_EDGE_COLUMNS} FROM edges WHERE timestamp > ? ORDER BY seq", (since_timestamp,)
+            )
         ]
         
         return {
@@ -261,28 +446,25 @@ class ContextGraphV2:
         similar_decisions = []
         
         # Find decision nodes with similar context
-        for node in self.nodes.values():
-            if node.node_type == "decision":
-                props = node.properties
+        for node in self.nodes_of_type("decision"):
+            props = node.properties
+            
+            # Check if similar
+            if props.get('chosen_action', {}).get('action_type') == action_type:
+                # Find associated state (first influencing edge)
+                state_node = None
+                influencing = self._neighbors(node.node_id, "was_influenced_by", direction='in', limit=1)
+                if influencing:
+                    state_node = self.nodes.get(influencing[0])
                 
-                # Check if similar
-                if props.get('chosen_action', {}).get('action_type') == action_type:
-                    # Find associated state
-                    state_node = None
-                    for edge in self.edges.values():
-                        if edge.to_node == node.node_id and edge.edge_type == "was_influenced_by":
-                            state_node = self.nodes.get(edge.from_node)
-                            break
-                    
-                    if state_node:
-                        similar_decisions.append({
-                            'decision_id': props.get('decision_id'),
-                            'chosen_action': props.get('chosen_action'),
-                            'rationale': props.get('rationale'),
-                            'confidence': props.get('confidence'),
-                            'context': state_node.properties,
-                            'timestamp': node.timestamp
-                        })
+                if state_node:
+                    similar_decisions.append({
+                        'decision_id': props.get('decision_id'),
+                        'chosen_action': props.get('chosen_action'),
+                        'rationale': props.get('rationale'),
+                        'confidence': props.get('confidence'),
+                        'context': state_node.properties,
+                        'timestamp': node.timestamp
+                    })
         
         return similar_decisions
-
@@ -11,18 +11,22 @@ Fully deterministic - no randomness, no ML models.
 """
 
 from typing import Dict, List, Optional, Tuple, Literal
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from copy import deepcopy
 import math
 
+import numpy as np
+
 from dropsim_context_graph import EventTrace, Event
 from behavioral_engine import (
     InternalState,
     update_state,
     should_continue,
     identify_failure_reason,
-    initialize_state
+    initialize_state,
+    is_commitment_gate
 )
+from behavioral_engine_batch import BatchState, STATE_FIELDS
 
 
 # ============================================================================
@@ -65,6 +69,249 @@ class CounterfactualResult:
         }
 
 
+# ============================================================================
+# Replay Helpers
+# ============================================================================
+
+# Attribute defaults when a product step is an object rather than a dict
+STEP_ATTRIBUTE_DEFAULTS = {
+    'cognitive_demand': 0.5,
+    'effort_demand': 0.5,
+    'risk_signal': 0.5,
+    'irreversibility': 0,
+    'delay_to_value': 0,
+    'explicit_value': 0.5,
+    'reassurance_signal': 0.5,
+    'authority_signal': 0.5
+}
+
+# Intervention delta key -> step attribute it shifts (clamped to [0, 1])
+STEP_DELTA_FIELDS = {
+    'effort': 'effort_demand',
+    'risk': 'risk_signal',
+    'cognitive': 'cognitive_demand',
+    'value': 'explicit_value',
+    'reassurance': 'reassurance_signal'
+}
+
+EFFECT_SIZE_SCORES = {"none": 0, "small": 1, "medium": 2, "large": 3}
+SENSITIVITY_SCORES = {"low": 1, "medium": 2, "high": 3}
+
+# Total |delta| across the five state variables above which an effect counts as medium/small
+MEDIUM_EFFECT_DELTA = 0.5
+SMALL_EFFECT_DELTA = 0.1
+MEDIUM_SENSITIVITY_DELTA = 0.3
+
+
+def _step_dict(step_def) -> Dict:
+    """Copy a product step into a plain dict (objects fall back to attribute defaults)."""
+    if isinstance(step_def, dict):
+        return step_def.copy()
+    return {key: getattr(step_def, key, default) for key, default in STEP_ATTRIBUTE_DEFAULTS.items()}
+
+
+def _apply_step_delta(step_dict: Dict, delta: Dict) -> Dict:
+    """Shift step attributes by an intervention delta, in place."""
+    for key, attr in STEP_DELTA_FIELDS.items():
+        if key in delta:
+            step_dict[attr] = max(0.0, min(1.0, step_dict.get(attr, 0.5) + delta[key]))
+    return step_dict
+
+
+def _original_outcome(base_trace: EventTrace) -> Tuple[Dict, Optional[str]]:
+    """Final recorded state of a trace and the step it dropped at (if any)."""
+    original_final_state = base_trace.events[-1].state_after
+    original_exit_step = None
+    if base_trace.final_outcome == "dropped":
+        for event in base_trace.events:
+            if event.decision == "drop":
+                original_exit_step = event.step_id
+                break
+    return original_final_state, original_exit_step
+
+
+def _replay_events(
+    base_trace: EventTrace,
+    product_steps: Dict,
+    priors: Dict,
+    state: InternalState,
+    previous_step: Optional[Dict],
+    start: int,
+    stop: int,
+    intervention: Optional[Dict] = None,
+    intervention_index: Optional[int] = None,
+    checkpoints: Optional[List[Tuple[InternalState, Optional[Dict]]]] = None
+) -> Tuple[InternalState, Optional[Dict], Optional[int]]:
+    """
+    Replay base_trace.events[start:stop] from state.
+
+    The intervention's step delta is applied at intervention_index. If
+    checkpoints is a list, (state, previous_step) before each replayed event
+    is appended to it.
+
+    Returns:
+        (state, previous_step, index of the event the replay dropped at or None)
+    """
+    for i in range(start, min(stop, len(base_trace.events))):
+        event = base_trace.events[i]
+        step_name = event.step_id
+        if checkpoints is not None:
+            checkpoints.append((state, previous_step))
+
+        if step_name not in product_steps:
+            # Step not found - use event's state_after as next state
+            state = InternalState(
+                cognitive_energy=event.state_after.get('cognitive_energy', state.cognitive_energy),
+                perceived_risk=event.state_after.get('perceived_risk', state.perceived_risk),
+                perceived_effort=event.state_after.get('perceived_effort', state.perceived_effort),
+                perceived_value=event.state_after.get('perceived_value', state.perceived_value),
+                perceived_control=event.state_after.get('perceived_control', state.perceived_control)
+            )
+            continue
+
+        step_dict = _step_dict(product_steps[step_name])
+        if i == intervention_index:
+            _apply_step_delta(step_dict, intervention.get('delta', {}))
+
+        state, costs = update_state(state, step_dict, priors, previous_step=previous_step)
+        if not should_continue(state, priors):
+            return state, previous_step, i
+
+        previous_step = step_dict
+
+    return state, previous_step, None
+
+
+def _resume_index(base_trace: EventTrace, product_steps: Dict, intervention_index: int) -> int:
+    """Position in product_steps after the intervention step (where the rerun continues)."""
+    step_names = list(product_steps.keys())
+    try:
+        intervention_step_name = base_trace.events[intervention_index].step_id
+        if intervention_step_name in step_names:
+            return step_names.index(intervention_step_name) + 1
+        return intervention_index + 1
+    except (ValueError, IndexError):
+        return intervention_index + 1
+
+
+def _run_remaining_steps(
+    product_steps: Dict,
+    priors: Dict,
+    state: InternalState,
+    previous_step: Optional[Dict],
+    start_idx: int
+) -> Tuple[InternalState, Optional[str], bool]:
+    """Run product steps from start_idx on. Returns (state, exit_step, dropped)."""
+    for step_name in list(product_steps.keys())[start_idx:]:
+        step_dict = _step_dict(product_steps[step_name])
+        state, costs = update_state(state, step_dict, priors, previous_step=previous_step)
+        if not should_continue(state, priors):
+            return state, step_name, True
+        previous_step = step_dict
+    return state, None, False
+
+
+def _classify_effect(outcome_changed: bool, total_delta_magnitude: float) -> Tuple[str, str]:
+    """Effect size and sensitivity labels for one counterfactual."""
+    if outcome_changed:
+        effect_size = "large"
+    elif total_delta_magnitude > MEDIUM_EFFECT_DELTA:
+        effect_size = "medium"
+    elif total_delta_magnitude > SMALL_EFFECT_DELTA:
+        effect_size = "small"
+    else:
+        effect_size = "none"
+
+    # How much did a small change affect the outcome?
+    if outcome_changed:
+        sensitivity = "high"
+    elif total_delta_magnitude > MEDIUM_SENSITIVITY_DELTA:
+        sensitivity = "medium"
+    else:
+        sensitivity = "low"
+
+    return effect_size, sensitivity
+
+
+def _no_op_result(intervention: Dict, base_trace: EventTrace, exit_step: Optional[str]) -> CounterfactualResult:
+    return CounterfactualResult(
+        intervention=intervention,
+        original_outcome=base_trace.final_outcome,
+        new_outcome=base_trace.final_outcome,
+        original_exit_step=exit_step,
+        new_exit_step=exit_step,
+        delta_energy=0.0,
+        delta_risk=0.0,
+        delta_effort=0.0,
+        delta_value=0.0,
+        delta_control=0.0,
+        outcome_changed=False,
+        effect_size="none",
+        sensitivity="low"
+    )
+
+
+# ============================================================================
+# Replay Checkpoints
+# ============================================================================
+
+@dataclass
+class ReplayCheckpoints:
+    """
+    Baseline replay of one trace, with the state before every replayed event.
+
+    A step intervention leaves every event before its step unchanged, so a
+    counterfactual can start from states[intervention_index] instead of
+    replaying the prefix from initialize_state.
+    """
+    states: List[InternalState]  # State before event i
+    previous_steps: List[Optional[Dict]]  # previous_step before event i
+    previous_step_ids: List[Optional[str]]  # Name of that previous step
+    first_index: Dict[str, int]  # step_id -> index of its first event
+    drop_index: Optional[int]  # Event the unmodified replay dropped at (replay stops there)
+    final_state: InternalState  # State where the unmodified replay stopped
+
+
+def build_replay_checkpoints(
+    base_trace: EventTrace,
+    product_steps: Dict,
+    priors: Dict,
+    state_variant_name: str
+) -> ReplayCheckpoints:
+    """
+    Replay a trace once without intervention, keeping per-step checkpoints.
+
+    Checkpoints are only valid for the same product_steps, priors and
+    state variant they were built with.
+    """
+    recorded = []
+    state = initialize_state(state_variant_name, priors)
+    state, _, drop_index = _replay_events(
+        base_trace, product_steps, priors, state, None, 0, len(base_trace.events),
+        checkpoints=recorded
+    )
+
+    first_index = {}
+    for i, event in enumerate(base_trace.events):
+        first_index.setdefault(event.step_id, i)
+
+    previous_step_ids = []
+    previous_step_id = None
+    for event in base_trace.events[:len(recorded)]:
+        previous_step_ids.append(previous_step_id)
+        if event.step_id in product_steps:
+            previous_step_id = event.step_id
+
+    return ReplayCheckpoints(
+        states=[s for s, _ in recorded],
+        previous_steps=[p for _, p in recorded],
+        previous_step_ids=previous_step_ids,
+        first_index=first_index,
+        drop_index=drop_index,
+        final_state=state
+    )
+
+
 # ============================================================================
 # Counterfactual Engine
 # ============================================================================
@@ -74,7 +321,8 @@ def simulate_counterfactual(
     intervention: Dict,
     product_steps: Dict,
     priors: Dict,
-    state_variant_name: str
+    state_variant_name: str,
+    checkpoints: Optional[ReplayCheckpoints] = None
 ) -> CounterfactualResult:
     """
     Applies a minimal perturbation to the simulation and recomputes outcome deltas.
@@ -96,27 +344,16 @@ def simulate_counterfactual(
         product_steps: Dict of product steps keyed by step name
         priors: Compiled behavioral priors
         state_variant_name: Name of state variant (for re-initialization)
+        checkpoints: Optional build_replay_checkpoints() result for this trace;
+            step modifications then resume from the checkpoint before the
+            intervention step instead of replaying the prefix
     
     Returns:
         CounterfactualResult with deltas and impact metrics
     """
     if not base_trace.events:
         # Empty trace - return no-op result
-        return CounterfactualResult(
-            intervention=intervention,
-            original_outcome=base_trace.final_outcome,
-            new_outcome=base_trace.final_outcome,
-            original_exit_step=None,
-            new_exit_step=None,
-            delta_energy=0.0,
-            delta_risk=0.0,
-            delta_effort=0.0,
-            delta_value=0.0,
-            delta_control=0.0,
-            outcome_changed=False,
-            effect_size="none",
-            sensitivity="low"
-        )
+        return _no_op_result(intervention, base_trace, None)
     
     # Find intervention point
     intervention_type = intervention.get('type')
@@ -126,210 +363,81 @@ def simulate_counterfactual(
     # Find the step index where intervention applies
     intervention_index = None
     if intervention_type == "step_modification" and intervention_step_id:
-        for i, event in enumerate(base_trace.events):
-            if event.step_id == intervention_step_id:
-                intervention_index = i
-                break
+        if checkpoints is not None:
+            intervention_index = checkpoints.first_index.get(intervention_step_id)
+        else:
+            for i, event in enumerate(base_trace.events):
+                if event.step_id == intervention_step_id:
+                    intervention_index = i
+                    break
     
     if intervention_index is None and intervention_type == "step_modification":
         # Intervention step not found - return no-op
-        return CounterfactualResult(
-            intervention=intervention,
-            original_outcome=base_trace.final_outcome,
-            new_outcome=base_trace.final_outcome,
-            original_exit_step=base_trace.events[-1].step_id if base_trace.events else None,
-            new_exit_step=base_trace.events[-1].step_id if base_trace.events else None,
-            delta_energy=0.0,
-            delta_risk=0.0,
-            delta_effort=0.0,
-            delta_value=0.0,
-            delta_control=0.0,
-            outcome_changed=False,
-            effect_size="none",
-            sensitivity="low"
-        )
+        return _no_op_result(intervention, base_trace, base_trace.events[-1].step_id)
     
-    # Get original final state
-    original_final_event = base_trace.events[-1]
-    original_final_state = original_final_event.state_after
+    original_final_state, original_exit_step = _original_outcome(base_trace)
     original_outcome = base_trace.final_outcome
-    original_exit_step = None
-    if original_outcome == "dropped":
-        # Find the step where drop occurred
-        for event in base_trace.events:
-            if event.decision == "drop":
-                original_exit_step = event.step_id
-                break
-    
-    # Reconstruct state up to intervention point
-    # Start from initial state
-    state = initialize_state(state_variant_name, priors)
     
-    # Apply persona adjustment if specified
-    if intervention_type == "persona_adjustment" and intervention_field:
-        delta = intervention.get('delta', 0.0)
-        if intervention_field == "cognitive_energy":
-            state.cognitive_energy = max(0.0, min(priors['CC'], state.cognitive_energy + delta))
-        elif intervention_field == "perceived_risk":
-            state.perceived_risk = max(0.0, min(3.0, state.perceived_risk + delta))
-        elif intervention_field == "perceived_effort":
-            state.perceived_effort = max(0.0, min(3.0, state.perceived_effort + delta))
-        elif intervention_field == "perceived_value":
-            state.perceived_value = max(0.0, min(3.0, state.perceived_value + delta))
-        elif intervention_field == "perceived_control":
-            state.perceived_control = max(0.0, min(2.0, state.perceived_control + delta))
-    
-    # Replay events up to and including intervention point
-    previous_step = None
-    new_exit_step = None
-    new_outcome = "completed"
-    
-    # Determine how many events to replay
-    events_to_replay = intervention_index + 1 if intervention_index is not None else len(base_trace.events)
-    
-    for i in range(events_to_replay):
-        if i >= len(base_trace.events):
-            break
-        
-        event = base_trace.events[i]
-        step_name = event.step_id
-        
-        # Get step definition
-        if step_name not in product_steps:
-            # Step not found - use event's state_after as next state
-            state = InternalState(
-                cognitive_energy=event.state_after.get('cognitive_energy', state.cognitive_energy),
-                perceived_risk=event.state_after.get('perceived_risk', state.perceived_risk),
-                perceived_effort=event.state_after.get('perceived_effort', state.perceived_effort),
-                perceived_value=event.state_after.get('perceived_value', state.perceived_value),
-                perceived_control=event.state_after.get('perceived_control', state.perceived_control)
-            )
-            continue
-        
-        step_def = product_steps[step_name]
-        if isinstance(step_def, dict):
-            step_dict = step_def.copy()
+    if checkpoints is not None and intervention_type == "step_modification":
+        if checkpoints.drop_index is not None and checkpoints.drop_index < intervention_index:
+            # The unmodified prefix already drops before the intervention step
+            state, previous_step, drop_index = checkpoints.final_state, None, checkpoints.drop_index
         else:
-            # Convert object to dict
-            step_dict = {
-                'cognitive_demand': getattr(step_def, 'cognitive_demand', 0.5),
-                'effort_demand': getattr(step_def, 'effort_demand', 0.5),
-                'risk_signal': getattr(step_def, 'risk_signal', 0.5),
-                'irreversibility': getattr(step_def, 'irreversibility', 0),
-                'delay_to_value': getattr(step_def, 'delay_to_value', 0),
-                'explicit_value': getattr(step_def, 'explicit_value', 0.5),
-                'reassurance_signal': getattr(step_def, 'reassurance_signal', 0.5),
-                'authority_signal': getattr(step_def, 'authority_signal', 0.5)
-            }
-        
-        # Apply intervention if this is the intervention step
-        if i == intervention_index and intervention_type == "step_modification":
-            delta = intervention.get('delta', {})
-            if 'effort' in delta:
-                step_dict['effort_demand'] = max(0.0, min(1.0, step_dict.get('effort_demand', 0.5) + delta['effort']))
-            if 'risk' in delta:
-                step_dict['risk_signal'] = max(0.0, min(1.0, step_dict.get('risk_signal', 0.5) + delta['risk']))
-            if 'cognitive' in delta:
-                step_dict['cognitive_demand'] = max(0.0, min(1.0, step_dict.get('cognitive_demand', 0.5) + delta['cognitive']))
-            if 'value' in delta:
-                step_dict['explicit_value'] = max(0.0, min(1.0, step_dict.get('explicit_value', 0.5) + delta['value']))
-            if 'reassurance' in delta:
-                step_dict['reassurance_signal'] = max(0.0, min(1.0, step_dict.get('reassurance_signal', 0.5) + delta['reassurance']))
+            state, previous_step, drop_index = _replay_events(
+                base_trace, product_steps, priors,
+                checkpoints.states[intervention_index], checkpoints.previous_steps[intervention_index],
+                intervention_index, intervention_index + 1, intervention, intervention_index
+            )
+    else:
+        # Reconstruct state from the initial state
+        state = initialize_state(state_variant_name, priors)
         
-        # Update state
-        state, costs = update_state(state, step_dict, priors, previous_step=previous_step)
+        # Apply persona adjustment if specified
+        if intervention_type == "persona_adjustment" and intervention_field:
+            delta = intervention.get('delta', 0.0)
+            if intervention_field == "cognitive_energy":
+                state.cognitive_energy = max(0.0, min(priors['CC'], state.cognitive_energy + delta))
+            elif intervention_field == "perceived_risk":
+                state.perceived_risk = max(0.0, min(3.0, state.perceived_risk + delta))
+            elif intervention_field == "perceived_effort":
+                state.perceived_effort = max(0.0, min(3.0, state.perceived_effort + delta))
+            elif intervention_field == "perceived_value":
+                state.perceived_value = max(0.0, min(3.0, state.perceived_value + delta))
+            elif intervention_field == "perceived_control":
+                state.perceived_control = max(0.0, min(2.0, state.perceived_control + delta))
         
-        # Check if we should continue
-        if not should_continue(state, priors):
-            # Dropped at this step
-            new_exit_step = step_name
-            new_outcome = "dropped"
-            break
-        
-        previous_step = step_dict
+        # Replay events up to and including intervention point
+        events_to_replay = intervention_index + 1 if intervention_index is not None else len(base_trace.events)
+        state, previous_step, drop_index = _replay_events(
+            base_trace, product_steps, priors, state, None,
+            0, events_to_replay, intervention, intervention_index
+        )
     
-    # If we haven't dropped yet, continue through remaining steps
-    if new_outcome != "dropped" and intervention_index is not None:
-        # Continue from step after intervention
-        step_names = list(product_steps.keys())
-        try:
-            intervention_step_name = base_trace.events[intervention_index].step_id
-            if intervention_step_name in step_names:
-                start_idx = step_names.index(intervention_step_name) + 1
-            else:
-                start_idx = intervention_index + 1
-        except (ValueError, IndexError):
-            start_idx = intervention_index + 1
-        
-        for step_name in step_names[start_idx:]:
-            if step_name not in product_steps:
-                continue
-            
-            step_def = product_steps[step_name]
-            if isinstance(step_def, dict):
-                step_dict = step_def.copy()
-            else:
-                step_dict = {
-                    'cognitive_demand': getattr(step_def, 'cognitive_demand', 0.5),
-                    'effort_demand': getattr(step_def, 'effort_demand', 0.5),
-                    'risk_signal': getattr(step_def, 'risk_signal', 0.5),
-                    'irreversibility': getattr(step_def, 'irreversibility', 0),
-                    'delay_to_value': getattr(step_def, 'delay_to_value', 0),
-                    'explicit_value': getattr(step_def, 'explicit_value', 0.5),
-                    'reassurance_signal': getattr(step_def, 'reassurance_signal', 0.5),
-                    'authority_signal': getattr(step_def, 'authority_signal', 0.5)
-                }
-            
-            # Update state
-            state, costs = update_state(state, step_dict, priors, previous_step=previous_step)
-            
-            # Check continuation
-            if not should_continue(state, priors):
-                new_exit_step = step_name
+    if drop_index is not None:
+        new_outcome = "dropped"
+        new_exit_step = base_trace.events[drop_index].step_id
+    else:
+        new_outcome = "completed"
+        new_exit_step = None
+        if intervention_index is not None:
+            # Continue through the product steps after the intervention step
+            start_idx = _resume_index(base_trace, product_steps, intervention_index)
+            state, new_exit_step, dropped = _run_remaining_steps(
+                product_steps, priors, state, previous_step, start_idx
+            )
+            if dropped:
                 new_outcome = "dropped"
-                break
-            
-            previous_step = step_dict
-        else:
-            # Completed all steps
-            if new_exit_step is None:
-                new_outcome = "completed"
     
     # Compute deltas
-    new_final_state = {
-        'cognitive_energy': state.cognitive_energy,
-        'perceived_risk': state.perceived_risk,
-        'perceived_effort': state.perceived_effort,
-        'perceived_value': state.perceived_value,
-        'perceived_control': state.perceived_control
-    }
-    
-    delta_energy = new_final_state['cognitive_energy'] - original_final_state.get('cognitive_energy', 0)
-    delta_risk = new_final_state['perceived_risk'] - original_final_state.get('perceived_risk', 0)
-    delta_effort = new_final_state['perceived_effort'] - original_final_state.get('perceived_effort', 0)
-    delta_value = new_final_state['perceived_value'] - original_final_state.get('perceived_value', 0)
-    delta_control = new_final_state['perceived_control'] - original_final_state.get('perceived_control', 0)
+    delta_energy = state.cognitive_energy - original_final_state.get('cognitive_energy', 0)
+    delta_risk = state.perceived_risk - original_final_state.get('perceived_risk', 0)
+    delta_effort = state.perceived_effort - original_final_state.get('perceived_effort', 0)
+    delta_value = state.perceived_value - original_final_state.get('perceived_value', 0)
+    delta_control = state.perceived_control - original_final_state.get('perceived_control', 0)
     
-    # Determine effect size
     outcome_changed = (original_outcome != new_outcome)
     total_delta_magnitude = abs(delta_energy) + abs(delta_risk) + abs(delta_effort) + abs(delta_value) + abs(delta_control)
-    
-    if outcome_changed:
-        effect_size = "large"
-    elif total_delta_magnitude > 0.5:
-        effect_size = "medium"
-    elif total_delta_magnitude > 0.1:
-        effect_size = "small"
-    else:
-        effect_size = "none"
-    
-    # Determine sensitivity (how much did small change affect outcome?)
-    if outcome_changed:
-        sensitivity = "high"
-    elif total_delta_magnitude > 0.3:
-        sensitivity = "medium"
-    else:
-        sensitivity = "low"
+    effect_size, sensitivity = _classify_effect(outcome_changed, total_delta_magnitude)
     
     return CounterfactualResult(
         intervention=intervention,
@@ -348,6 +456,374 @@ def simulate_counterfactual(
     )
 
 
+# ============================================================================
+# Batched Counterfactuals
+# ============================================================================
+
+# Priors read by update_state / should_continue
+ARRAY_PRIOR_KEYS = ['CC', 'FR', 'LAM', 'ET', 'DR', 'CN', 'MS']
+
+_EFFECT_SIZE_LABELS = {score: label for label, score in EFFECT_SIZE_SCORES.items()}
+_SENSITIVITY_LABELS = {score: label for label, score in SENSITIVITY_SCORES.items()}
+
+
+@dataclass
+class CounterfactualBaseline:
+    """
+    Baseline replay of every scorable trace (traces whose persona has priors).
+
+    Built once and shared by every intervention scored against the traces.
+    """
+    traces: List[EventTrace]
+    positions: List[int]  # Index of each trace in the input list
+    priors: List[Dict]
+    variant_names: List[str]
+    checkpoints: List[Optional[ReplayCheckpoints]]  # None where the baseline replay failed
+    original_states: np.ndarray  # (n_traces, 5) final recorded state, STATE_FIELDS order
+    original_exit_steps: List[Optional[str]]
+    step_plans: Dict[str, '_StepPlan'] = field(default_factory=dict, repr=False)  # Filled per step on first use
+
+    def head(self, n_traces: int) -> 'CounterfactualBaseline':
+        """Traces among the first n_traces of the input list."""
+        keep = [k for k, position in enumerate(self.positions) if position < n_traces]
+        return CounterfactualBaseline(
+            traces=[self.traces[k] for k in keep],
+            positions=[self.positions[k] for k in keep],
+            priors=[self.priors[k] for k in keep],
+            variant_names=[self.variant_names[k] for k in keep],
+            checkpoints=[self.checkpoints[k] for k in keep],
+            original_states=self.original_states[keep],
+            original_exit_steps=[self.original_exit_steps[k] for k in keep]
+        )
+
+
+def build_counterfactual_baseline(
+    event_traces: List[EventTrace],
+    product_steps: Dict,
+    priors_map: Dict[str, Dict],
+    state_variant_map: Dict[str, str]
+) -> CounterfactualBaseline:
+    """Replay every trace with priors once, keeping per-step checkpoints."""
+    traces, positions, priors_list, variant_names, checkpoints = [], [], [], [], []
+    original_states, original_exit_steps = [], []
+    for position, trace in enumerate(event_traces):
+        priors = priors_map.get(trace.persona_id, {})
+        if not priors:
+            continue
+        variant_name = state_variant_map.get(trace.persona_id, "fresh_motivated")
+        try:
+            trace_checkpoints = build_replay_checkpoints(trace, product_steps, priors, variant_name)
+        except Exception:
+            # Counterfactuals for this trace fall back to the full replay
+            trace_checkpoints = None
+        final_state, exit_step = _original_outcome(trace) if trace.events else ({}, None)
+
+        traces.append(trace)
+        positions.append(position)
+        priors_list.append(priors)
+        variant_names.append(variant_name)
+        checkpoints.append(trace_checkpoints)
+        original_states.append([final_state.get(f, 0) for f in STATE_FIELDS])
+        original_exit_steps.append(exit_step)
+
+    return CounterfactualBaseline(
+        traces=traces,
+        positions=positions,
+        priors=priors_list,
+        variant_names=variant_names,
+        checkpoints=checkpoints,
+        original_states=np.array(original_states, dtype=float).reshape(len(traces), len(STATE_FIELDS)),
+        original_exit_steps=original_exit_steps
+    )
+
+
+@dataclass
+class CounterfactualBatch:
+    """One intervention scored across a baseline (one array row per trace with a result)."""
+    intervention: Dict
+    rows: np.ndarray  # Baseline rows that produced a result (traces whose counterfactual raised are skipped)
+    original_outcomes: List[str]
+    original_exit_steps: List[Optional[str]]
+    new_dropped: np.ndarray
+    new_exit_steps: np.ndarray  # object array of step names / None
+    deltas: np.ndarray  # (n, 5) new - original final state, STATE_FIELDS order
+    outcome_changed: np.ndarray
+    effect_scores: np.ndarray  # EFFECT_SIZE_SCORES values
+    sensitivity_scores: np.ndarray  # SENSITIVITY_SCORES values
+
+    def result(self, k: int) -> CounterfactualResult:
+        """Materialize the CounterfactualResult for result k."""
+        deltas = [float(d) for d in self.deltas[k]]
+        return CounterfactualResult(
+            intervention=self.intervention,
+            original_outcome=self.original_outcomes[k],
+            new_outcome="dropped" if self.new_dropped[k] else "completed",
+            original_exit_step=self.original_exit_steps[k],
+            new_exit_step=self.new_exit_steps[k],
+            delta_energy=deltas[0],
+            delta_risk=deltas[1],
+            delta_effort=deltas[2],
+            delta_value=deltas[3],
+            delta_control=deltas[4],
+            outcome_changed=bool(self.outcome_changed[k]),
+            effect_size=_EFFECT_SIZE_LABELS[int(self.effect_scores[k])],
+            sensitivity=_SENSITIVITY_LABELS[int(self.sensitivity_scores[k])]
+        )
+
+
+def _update_state_arrays(
+    state: BatchState,
+    step: Dict,
+    priors: Dict[str, np.ndarray],
+    previous_step: Optional[Dict]
+) -> BatchState:
+    """Vectorized behavioral_engine.update_state (same operation order, identical floats)."""
+    if is_commitment_gate(step, previous_step):
+        transition_cognitive = 0.25 * (1 - state.cognitive_energy) * (1 + priors['FR'])
+        transition_effort = 0.30 * (1 - priors['ET'])
+        transition_risk = 0.35 * priors['LAM'] * (1 - state.perceived_control)
+    else:
+        transition_cognitive = transition_effort = transition_risk = 0.0
+
+    cognitive_cost = step['cognitive_demand'] * (1 + priors['FR']) * (1 - state.cognitive_energy)
+    effort_cost = step['effort_demand'] * (1 - priors['ET'])
+    risk_cost = step['risk_signal'] * priors['LAM'] * (1 + step['irreversibility'])
+    value_yield = step['explicit_value'] * np.exp(-priors['DR'] * step['delay_to_value'])
+    reassurance_yield = (step['reassurance_signal'] + step['authority_signal']) * (1 - priors['CN'])
+
+    new_state = BatchState(
+        cognitive_energy=np.maximum(0.0, state.cognitive_energy - (cognitive_cost + transition_cognitive)),
+        perceived_risk=np.minimum(3.0, state.perceived_risk + (risk_cost + transition_risk)),
+        perceived_effort=np.minimum(3.0, state.perceived_effort + (effort_cost + transition_effort)),
+        perceived_value=np.minimum(3.0, state.perceived_value + value_yield),
+        perceived_control=np.minimum(2.0, state.perceived_control + reassurance_yield)
+    )
+    new_state.clamp(priors)
+    return new_state
+
+
+def _should_continue_arrays(state: BatchState, priors: Dict[str, np.ndarray]) -> np.ndarray:
+    """Vectorized behavioral_engine.should_continue."""
+    return (state.perceived_value * priors['MS']) + state.perceived_control > state.perceived_risk + state.perceived_effort
+
+
+@dataclass
+class _StepPlan:
+    """
+    How a baseline splits for step modifications at one step (shared by every delta).
+
+    live: rows that reach the step, with their checkpointed start state
+    static: rows whose result does not depend on the delta (step absent, or the
+        unmodified prefix drops first), with that result precomputed
+    Remaining rows (no checkpoints, non-numeric priors) use the scalar path.
+    """
+    live_rows: np.ndarray
+    start_state: np.ndarray  # (n_live, 5), STATE_FIELDS order
+    priors: Dict[str, np.ndarray]
+    previous_step_ids: np.ndarray  # object array, '' for no previous step
+    static_rows: np.ndarray
+    static_results: List[CounterfactualResult]
+    scalar_rows: np.ndarray
+
+
+def _plan_step(baseline: CounterfactualBaseline, step_id: str, product_steps: Dict) -> _StepPlan:
+    """Split the baseline for step modifications at step_id (cached on the baseline)."""
+    if step_id in baseline.step_plans:
+        return baseline.step_plans[step_id]
+
+    no_delta = {'type': "step_modification", 'step_id': step_id, 'delta': {}}
+    live, starts, previous_ids, static, static_results, scalar = [], [], [], [], [], []
+    for row, checkpoints in enumerate(baseline.checkpoints):
+        priors = baseline.priors[row]
+        if checkpoints is None or not all(isinstance(priors.get(key), (int, float)) for key in ARRAY_PRIOR_KEYS):
+            scalar.append(row)
+            continue
+        index = checkpoints.first_index.get(step_id)
+        if step_id in product_steps and index is not None and (
+            checkpoints.drop_index is None or checkpoints.drop_index >= index
+        ):
+            live.append(row)
+            starts.append([getattr(checkpoints.states[index], f) for f in STATE_FIELDS])
+            previous_ids.append(checkpoints.previous_step_ids[index] or '')
+        elif index is None or checkpoints.drop_index is not None and checkpoints.drop_index < index:
+            static.append(row)
+            static_results.append(simulate_counterfactual(
+                baseline.traces[row], no_delta, product_steps, priors, baseline.variant_names[row],
+                checkpoints=checkpoints
+            ))
+        else:
+            scalar.append(row)
+
+    plan = _StepPlan(
+        live_rows=np.array(live, dtype=np.int64),
+        start_state=np.array(starts, dtype=float).reshape(len(live), len(STATE_FIELDS)),
+        priors={key: np.array([baseline.priors[r][key] for r in live], dtype=float) for key in ARRAY_PRIOR_KEYS},
+        previous_step_ids=np.array(previous_ids, dtype=object),
+        static_rows=np.array(static, dtype=np.int64),
+        static_results=static_results,
+        scalar_rows=np.array(scalar, dtype=np.int64)
+    )
+    baseline.step_plans[step_id] = plan
+    return plan
+
+
+def _advance_live_rows(
+    plan: _StepPlan,
+    intervention: Dict,
+    product_steps: Dict
+) -> Tuple[BatchState, np.ndarray, np.ndarray]:
+    """
+    Run one step modification for every live row of a plan at once.
+
+    Starts each row from its checkpoint before the intervention step, applies
+    the modified step, then advances the surviving rows through the remaining
+    product steps together.
+
+    Returns:
+        (final state, dropped mask, exit step per row)
+    """
+    step_id = intervention['step_id']
+    state = BatchState(*(plan.start_state[:, j].copy() for j in range(len(STATE_FIELDS))))
+    priors = plan.priors
+
+    step = _apply_step_delta(_step_dict(product_steps[step_id]), intervention.get('delta', {}))
+
+    # The commitment gate depends on the previous step, which can differ between traces
+    for previous_id in dict.fromkeys(plan.previous_step_ids):
+        group = np.flatnonzero(plan.previous_step_ids == previous_id)
+        previous_step = _step_dict(product_steps[previous_id]) if previous_id else None
+        group_priors = {key: values[group] for key, values in priors.items()}
+        state.put(group, _update_state_arrays(state.take(group), step, group_priors, previous_step))
+
+    alive = _should_continue_arrays(state, priors)
+    exit_steps = np.full(len(alive), None, dtype=object)
+    exit_steps[~alive] = step_id
+
+    step_names = list(product_steps.keys())
+    previous_step = step
+    for step_name in step_names[step_names.index(step_id) + 1:]:
+        live = np.flatnonzero(alive)
+        if len(live) == 0:
+            break
+        step_dict = _step_dict(product_steps[step_name])
+        live_priors = {key: values[live] for key, values in priors.items()}
+        new_state = _update_state_arrays(state.take(live), step_dict, live_priors, previous_step)
+        state.put(live, new_state)
+        dropped = live[~_should_continue_arrays(new_state, live_priors)]
+        exit_steps[dropped] = step_name
+        alive[dropped] = False
+        previous_step = step_dict
+
+    return state, ~alive, exit_steps
+
+
+def simulate_counterfactual_batch(
+    baseline: CounterfactualBaseline,
+    intervention: Dict,
+    product_steps: Dict,
+    batched: bool = True
+) -> CounterfactualBatch:
+    """
+    Score one intervention against every trace in a baseline.
+
+    With batched=True, step modifications run as array operations over all
+    traces that reach the intervention step, and traces the delta cannot
+    affect reuse one precomputed result per step; the rest (and every other
+    intervention type) go through simulate_counterfactual with the trace's
+    checkpoints. Both paths give the same results as calling
+    simulate_counterfactual per trace.
+    """
+    n = len(baseline.traces)
+    deltas = np.zeros((n, len(STATE_FIELDS)))
+    new_dropped = np.zeros(n, dtype=bool)
+    new_exit_steps = np.full(n, None, dtype=object)
+    outcome_changed = np.zeros(n, dtype=bool)
+    effect_scores = np.zeros(n, dtype=np.int64)
+    sensitivity_scores = np.ones(n, dtype=np.int64)
+    has_result = np.zeros(n, dtype=bool)
+    original_exit_steps = list(baseline.original_exit_steps)
+
+    def put_result(row: int, result: CounterfactualResult):
+        deltas[row] = [result.delta_energy, result.delta_risk, result.delta_effort,
+                       result.delta_value, result.delta_control]
+        new_dropped[row] = result.new_outcome == "dropped"
+        new_exit_steps[row] = result.new_exit_step
+        outcome_changed[row] = result.outcome_changed
+        effect_scores[row] = EFFECT_SIZE_SCORES[result.effect_size]
+        sensitivity_scores[row] = SENSITIVITY_SCORES[result.sensitivity]
+        original_exit_steps[row] = result.original_exit_step
+        has_result[row] = True
+
+    scalar_rows = range(n)
+    if batched and intervention.get('type') == "step_modification" and intervention.get('step_id'):
+        plan = _plan_step(baseline, intervention['step_id'], product_steps)
+        for row, result in zip(plan.static_rows, plan.static_results):
+            put_result(row, result)
+        scalar_rows = plan.scalar_rows
+
+        rows = plan.live_rows
+        try:
+            state, dropped, exit_steps = _advance_live_rows(plan, intervention, product_steps)
+        except Exception:
+            # Malformed steps or deltas: let the scalar path decide row by row
+            scalar_rows = np.concatenate([scalar_rows, rows])
+        else:
+            final = np.column_stack([getattr(state, f) for f in STATE_FIELDS])
+            deltas[rows] = final - baseline.original_states[rows]
+            new_dropped[rows] = dropped
+            new_exit_steps[rows] = exit_steps
+            original_outcomes = np.array([baseline.traces[r].final_outcome for r in rows], dtype=object)
+            changed = original_outcomes != np.where(dropped, "dropped", "completed").astype(object)
+            magnitude = (np.abs(deltas[rows, 0]) + np.abs(deltas[rows, 1]) + np.abs(deltas[rows, 2])
+                         + np.abs(deltas[rows, 3]) + np.abs(deltas[rows, 4]))
+            outcome_changed[rows] = changed
+            effect_scores[rows] = np.select(
+                [changed, magnitude > MEDIUM_EFFECT_DELTA, magnitude > SMALL_EFFECT_DELTA], [3, 2, 1], 0
+            )
+            sensitivity_scores[rows] = np.select([changed, magnitude > MEDIUM_SENSITIVITY_DELTA], [3, 2], 1)
+            has_result[rows] = True
+
+    for row in scalar_rows:
+        try:
+            result = simulate_counterfactual(
+                baseline.traces[row],
+                intervention,
+                product_steps,
+                baseline.priors[row],
+                baseline.variant_names[row],
+                checkpoints=baseline.checkpoints[row]
+            )
+        except Exception:
+            continue
+        put_result(row, result)
+
+    rows = np.flatnonzero(has_result)
+    return CounterfactualBatch(
+        intervention=intervention,
+        rows=rows,
+        original_outcomes=[baseline.traces[r].final_outcome for r in rows],
+        original_exit_steps=[original_exit_steps[r] for r in rows],
+        new_dropped=new_dropped[rows],
+        new_exit_steps=new_exit_steps[rows],
+        deltas=deltas[rows],
+        outcome_changed=outcome_changed[rows],
+        effect_scores=effect_scores[rows],
+        sensitivity_scores=sensitivity_scores[rows]
+    )
+
+
+def _unique_interventions(interventions: List[Dict]) -> List[Tuple[Dict, int]]:
+    """Distinct interventions (by str key, first-seen order) with their multiplicity."""
+    unique = {}
+    for intervention in interventions:
+        key = str(intervention)
+        if key in unique:
+            unique[key][1] += 1
+        else:
+            unique[key] = [intervention, 1]
+    return [(intervention, count) for intervention, count in unique.values()]
+
+
 # ============================================================================
 # Sensitivity Analysis
 # ============================================================================
@@ -358,7 +834,9 @@ def rank_interventions_by_impact(
     priors_map: Dict[str, Dict],  # persona_id -> priors
     state_variant_map: Dict[str, str],  # persona_id -> variant_name
     intervention_candidates: List[Dict],
-    top_n: int = 10
+    top_n: int = 10,
+    batched: bool = True,
+    baseline: Optional[CounterfactualBaseline] = None
 ) -> List[Dict]:
     """
     Run multiple counterfactuals and rank by impact.
@@ -370,84 +848,45 @@ def rank_interventions_by_impact(
         state_variant_map: Map from persona_id to variant_name
         intervention_candidates: List of intervention dicts to test
         top_n: Number of top interventions to return
+        batched: Score step modifications as arrays across traces
+        baseline: Prebuilt build_counterfactual_baseline() for these traces
     
     Returns:
         List of intervention results sorted by impact (outcome changes first, then effect size)
     """
-    results = []
+    if baseline is None:
+        baseline = build_counterfactual_baseline(event_traces, product_steps, priors_map, state_variant_map)
     
-    for trace in event_traces:
-        persona_id = trace.persona_id
-        priors = priors_map.get(persona_id, {})
-        variant_name = state_variant_map.get(persona_id, "fresh_motivated")
-        
-        if not priors:
+    scored = []
+    for order, (intervention, multiplicity) in enumerate(_unique_interventions(intervention_candidates)):
+        batch = simulate_counterfactual_batch(baseline, intervention, product_steps, batched=batched)
+        if len(batch.rows) == 0:
             continue
-        
-        for intervention in intervention_candidates:
-            try:
-                result = simulate_counterfactual(
-                    trace,
-                    intervention,
-                    product_steps,
-                    priors,
-                    variant_name
-                )
-                results.append({
-                    'persona_id': persona_id,
-                    'variant_id': trace.variant_id,
-                    'intervention': intervention,
-                    'result': result
-                })
-            except Exception:
-                continue
-    
-    # Aggregate results by intervention
-    intervention_impact = {}
-    for item in results:
-        intervention_key = str(item['intervention'])
-        if intervention_key not in intervention_impact:
-            intervention_impact[intervention_key] = {
-                'intervention': item['intervention'],
-                'outcome_changes': 0,
-                'total_effect_size': 0.0,
-                'total_sensitivity': 0.0,
-                'count': 0,
-                'examples': []
-            }
-        
-        impact = intervention_impact[intervention_key]
-        impact['count'] += 1
-        
-        result = item['result']
-        if result.outcome_changed:
-            impact['outcome_changes'] += 1
-        
-        # Score effect size (large=3, medium=2, small=1, none=0)
-        effect_score = {"none": 0, "small": 1, "medium": 2, "large": 3}.get(result.effect_size, 0)
-        impact['total_effect_size'] += effect_score
-        
-        # Score sensitivity (high=3, medium=2, low=1)
-        sensitivity_score = {"low": 1, "medium": 2, "high": 3}.get(result.sensitivity, 1)
-        impact['total_sensitivity'] += sensitivity_score
-        
-        if len(impact['examples']) < 3:
-            impact['examples'].append(result.to_dict())
-    
-    # Compute average scores
-    for impact in intervention_impact.values():
-        if impact['count'] > 0:
-            impact['avg_effect_size'] = impact['total_effect_size'] / impact['count']
-            impact['avg_sensitivity'] = impact['total_sensitivity'] / impact['count']
-            impact['outcome_change_rate'] = impact['outcome_changes'] / impact['count']
-        else:
-            impact['avg_effect_size'] = 0.0
-            impact['avg_sensitivity'] = 0.0
-            impact['outcome_change_rate'] = 0.0
+        count = multiplicity * len(batch.rows)
+        # Examples in trace order, each trace once per duplicate candidate
+        examples = [batch.result(k).to_dict() for k in range(min(3, len(batch.rows))) for _ in range(multiplicity)]
+        outcome_changes = multiplicity * int(batch.outcome_changed.sum())
+        total_effect_size = float(multiplicity * int(batch.effect_scores.sum()))
+        total_sensitivity = float(multiplicity * int(batch.sensitivity_scores.sum()))
+        impact = {
+            'intervention': intervention,
+            'outcome_changes': outcome_changes,
+            'total_effect_size': total_effect_size,
+            'total_sensitivity': total_sensitivity,
+            'count': count,
+            'examples': examples[:3],
+            'avg_effect_size': total_effect_size / count,
+            'avg_sensitivity': total_sensitivity / count,
+            'outcome_change_rate': outcome_changes / count
+        }
+        # Interventions are listed in the order their first result appears (trace-major)
+        scored.append(((int(batch.rows[0]), order), impact))
+    
+    intervention_impact = [impact for _, impact in sorted(scored, key=lambda x: x[0])]
     
     # Sort by impact (outcome changes first, then effect size, then sensitivity)
     ranked = sorted(
-        intervention_impact.values(),
+        intervention_impact,
         key=lambda x: (
             x['outcome_change_rate'],  # Primary: outcome changes
             x['avg_effect_size'],  # Secondary: effect size
@@ -531,14 +970,22 @@ def compute_sensitivity_map(
     event_traces: List[EventTrace],
     product_steps: Dict,
     priors_map: Dict[str, Dict],
-    state_variant_map: Dict[str, str]
+    state_variant_map: Dict[str, str],
+    batched: bool = True,
+    baseline: Optional[CounterfactualBaseline] = None
 ) -> Dict:
     """
     Compute sensitivity map showing which variables are most sensitive.
     
+    Scores every trace (step modifications are batched across traces and
+    resume from the baseline checkpoints, so no sampling is needed).
+    
     Returns:
         Dict with sensitivity scores for each variable type
     """
+    if baseline is None:
+        baseline = build_counterfactual_baseline(event_traces, product_steps, priors_map, state_variant_map)
+    
     # Test small perturbations for each variable type
     test_interventions = [
         {'type': 'step_modification', 'step_id': step_id, 'delta': {'effort': -0.1}}
@@ -557,35 +1004,18 @@ def compute_sensitivity_map(
     cognitive_changes = 0
     total_tested = 0
     
-    for trace in event_traces[:100]:  # Sample first 100 for speed
-        persona_id = trace.persona_id
-        priors = priors_map.get(persona_id, {})
-        variant_name = state_variant_map.get(persona_id, "fresh_motivated")
+    for intervention, multiplicity in _unique_interventions(test_interventions):
+        batch = simulate_counterfactual_batch(baseline, intervention, product_steps, batched=batched)
+        total_tested += multiplicity * len(batch.rows)
+        changes = multiplicity * int(batch.outcome_changed.sum())
         
-        if not priors:
-            continue
-        
-        for intervention in test_interventions:
-            try:
-                result = simulate_counterfactual(
-                    trace,
-                    intervention,
-                    product_steps,
-                    priors,
-                    variant_name
-                )
-                total_tested += 1
-                
-                if result.outcome_changed:
-                    delta = intervention.get('delta', {})
-                    if 'effort' in delta:
-                        effort_changes += 1
-                    elif 'risk' in delta:
-                        risk_changes += 1
-                    elif 'cognitive' in delta:
-                        cognitive_changes += 1
-            except Exception:
-                continue
+        delta = intervention.get('delta', {})
+        if 'effort' in delta:
+            effort_changes += changes
+        elif 'risk' in delta:
+            risk_changes += changes
+        elif 'cognitive' in delta:
+            cognitive_changes += changes
     
     # Compute sensitivity scores
     effort_sensitivity = effort_changes / max(total_tested / 3, 1) if total_tested > 0 else 0.0
@@ -611,7 +1041,9 @@ def compute_robustness_score(
     event_traces: List[EventTrace],
     product_steps: Dict,
     priors_map: Dict[str, Dict],
-    state_variant_map: Dict[str, str]
+    state_variant_map: Dict[str, str],
+    batched: bool = True,
+    baseline: Optional[CounterfactualBaseline] = None
 ) -> float:
     """
     Compute robustness score (0-1) indicating how stable results are to small perturbations.
@@ -619,6 +1051,11 @@ def compute_robustness_score(
     Higher score = more robust (less sensitive to small changes)
     Lower score = less robust (highly sensitive to changes)
     """
+    if baseline is None:
+        baseline = build_counterfactual_baseline(event_traces[:50], product_steps, priors_map, state_variant_map)
+    else:
+        baseline = baseline.head(50)  # Sample for speed
+    
     # Test small random perturbations
     test_interventions = []
     for step_id in list(product_steps.keys())[:3]:  # Test first 3 steps
@@ -630,28 +1067,10 @@ def compute_robustness_score(
     outcome_changes = 0
     total_tested = 0
     
-    for trace in event_traces[:50]:  # Sample for speed
-        persona_id = trace.persona_id
-        priors = priors_map.get(persona_id, {})
-        variant_name = state_variant_map.get(persona_id, "fresh_motivated")
-        
-        if not priors:
-            continue
-        
-        for intervention in test_interventions:
-            try:
-                result = simulate_counterfactual(
-                    trace,
-                    intervention,
-                    product_steps,
-                    priors,
-                    variant_name
-                )
-                total_tested += 1
-                if result.outcome_changed:
-                    outcome_changes += 1
-            except Exception:
-                continue
+    for intervention, multiplicity in _unique_interventions(test_interventions):
+        batch = simulate_counterfactual_batch(baseline, intervention, product_steps, batched=batched)
+        total_tested += multiplicity * len(batch.rows)
+        outcome_changes += multiplicity * int(batch.outcome_changed.sum())
     
     if total_tested == 0:
         return 0.5  # Default moderate robustness
@@ -674,17 +1093,24 @@ def analyze_top_interventions(
     priors_map: Dict[str, Dict],
     state_variant_map: Dict[str, str],
     fragile_steps: List[Dict],
-    top_n: int = 5
+    top_n: int = 5,
+    batched: bool = True
 ) -> Dict:
     """
     Analyze and rank top interventions.
     
+    batched=False scores each (trace, intervention) pair with the scalar
+    replay (still resuming from checkpoints); results are identical.
+    
     Returns:
         Dict with top_interventions, sensitivity_map, most_impactful_step, robustness_score
     """
     # Generate intervention candidates
     candidates = generate_intervention_candidates(product_steps, fragile_steps)
     
+    # One baseline replay (with per-step checkpoints) shared by every analysis below
+    baseline = build_counterfactual_baseline(event_traces, product_steps, priors_map, state_variant_map)
+    
     # Rank by impact
     top_interventions = rank_interventions_by_impact(
         event_traces,
@@ -692,7 +1118,9 @@ def analyze_top_interventions(
         priors_map,
         state_variant_map,
         candidates,
-        top_n=top_n
+        top_n=top_n,
+        batched=batched,
+        baseline=baseline
     )
     
     # Compute sensitivity map
@@ -700,7 +1128,9 @@ def analyze_top_interventions(
         event_traces,
         product_steps,
         priors_map,
-        state_variant_map
+        state_variant_map,
+        batched=batched,
+        baseline=baseline
     )
     
     # Find most impactful step
@@ -717,7 +1147,9 @@ def analyze_top_interventions(
         event_traces,
         product_steps,
         priors_map,
-        state_variant_map
+        state_variant_map,
+        batched=batched,
+        baseline=baseline
     )
     
     return {
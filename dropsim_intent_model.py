@@ -629,19 +629,31 @@ def identify_intent_mismatch(
 # INTENT-CONDITIONED CONTINUATION PROBABILITY
 # ============================================================================
 
+# Max intent-mismatch reduction per step: 0.10 raw penalty * 0.25 attenuation
+DEFAULT_INTENT_PENALTY_WEIGHT = 0.025
+
+
 def compute_intent_conditioned_continuation_prob(
     base_prob: float,
     intent_frame: IntentFrame,
     step: Dict,
     step_index: int,
     total_steps: int,
-    state: Optional[Dict] = None
+    state: Optional[Dict] = None,
+    intent_penalty_weight: float = DEFAULT_INTENT_PENALTY_WEIGHT,
+    alignment: Optional[float] = None
 ) -> Tuple[float, Dict]:
     """
     Adjust continuation probability based on intent alignment.
     
     FIXED: Uses bounded additive scoring instead of multiplicative collapse.
     
+    Args:
+        intent_penalty_weight: Maximum intent-mismatch reduction per step
+            (calibratable, see EngineParameters.intent_penalty_weight)
+        alignment: Precomputed compute_intent_alignment_score for this
+            (step, intent, step_index), e.g. from a StepIntentTable
+    
     Returns:
         (adjusted_probability, diagnostic_dict)
     """
@@ -650,7 +662,8 @@ def compute_intent_conditioned_continuation_prob(
     MAX_PROB = 0.95
     MAX_TOTAL_PENALTY = 0.45  # Cap maximum total penalty contribution
     
-    alignment = compute_intent_alignment_score(step, intent_frame, step_index, total_steps)
+    if alignment is None:
+        alignment = compute_intent_alignment_score(step, intent_frame, step_index, total_steps)
     
     # Initialize diagnostic
     diagnostic = {
@@ -682,7 +695,8 @@ def compute_intent_conditioned_continuation_prob(
         # Intent penalty as attenuation factor (not direct reduction)
         # Extremely reduced penalties to prevent collapse
         intent_penalty_raw = alignment_deficit * 0.10  # Reduced to 0.10 (up to 10% penalty raw)
-        intent_penalty_factor = 1.0 - (intent_penalty_raw * 0.25)  # Bounded attenuation: max 2.5% reduction
+        intent_penalty_scale = intent_penalty_weight / DEFAULT_INTENT_PENALTY_WEIGHT  # 1.0 unless calibrated
+        intent_penalty_factor = 1.0 - (intent_penalty_raw * 0.25 * intent_penalty_scale)  # Bounded attenuation: max 2.5% reduction
         
         # Adaptive penalty dampening with progress
         progress_factor = step_index / total_steps if total_steps > 0 else 0
@@ -0,0 +1,536 @@
+#!/usr/bin/env python3
+"""
+dropsim_llm_client.py - LLM Client Layer
+
+One interface (LLMClient.complete) for every LLM call made by ingestion,
+the wizard and the LLM simulator, plus a wrapper that makes those calls
+cheap to repeat and safe to fan out:
+
+- OpenAILLMClient: one pooled openai.OpenAI client per instance
+- ManagedLLMClient: disk-backed response cache keyed on (model, prompt,
+  params), bounded-concurrency complete_many(), token-bucket rate limiting
+  and jittered exponential-backoff retries
+- FakeLLMClient: local scripted client for tests and dry runs
+"""
+
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Dict, List, Optional, Sequence, Union
+
+from dropsim_result_cache import ResultCache, canonical_hash
+
+
+# ============================================================================
+# Configuration
+# ============================================================================
+
+LLM_CACHE_DIR = os.environ.get("DROPSIM_LLM_CACHE_DIR", "./.dropsim_cache/llm")
+DEFAULT_MAX_CONCURRENCY = 8
+DEFAULT_MAX_RETRIES = 3
+DEFAULT_BACKOFF_BASE = 1.0   # seconds; attempt n waits up to base * 2**n
+DEFAULT_BACKOFF_MAX = 30.0
+
+# Exception class names (any provider SDK) and HTTP statuses worth retrying
+RETRYABLE_ERROR_NAMES = {
+    "RateLimitError", "APITimeoutError", "APIConnectionError", "InternalServerError",
+    "ServiceUnavailableError", "Timeout", "TimeoutError", "ConnectionError"
+}
+RETRYABLE_STATUS_CODES = {408, 409, 429, 500, 502, 503, 504}
+
+
+# ============================================================================
+# LLM Client Interface
+# ============================================================================
+
+class LLMClient:
+    """
+    Abstract LLM client interface.
+
+    Implementations should provide a `.complete(prompt: str, **params) -> str`
+    method. params are provider request options (system, temperature,
+    max_tokens, response_format, model); clients ignore what they do not
+    support.
+    """
+
+    def complete(self, prompt: str, **params) -> str:
+        """
+        Complete a prompt and return the response text.
+
+        Args:
+            prompt: The prompt string
+            **params: Optional request options
+
+        Returns:
+            Response text from the LLM
+        """
+        raise NotImplementedError("Subclasses must implement complete()")
+
+    def complete_many(
+        self,
+        prompts: Sequence[str],
+        validate: Optional[Callable[[str], Any]] = None,
+        return_exceptions: bool = False,
+        **params
+    ) -> List:
+        """
+        Complete several prompts (serially here; ManagedLLMClient runs them concurrently).
+
+        Args:
+            prompts: Prompt strings
+            validate: Optional check on each response; raising rejects it
+            return_exceptions: Return the exception in a failed prompt's slot
+                instead of raising it
+            **params: Request options shared by every prompt
+
+        Returns:
+            One response (or exception) per prompt, in order
+        """
+        results = []
+        for prompt in prompts:
+            try:
+                response = self.complete(prompt, **params)
+                if validate is not None:
+                    validate(response)
+                results.append(response)
+            except Exception as e:
+                if not return_exceptions:
+                    raise
+                results.append(e)
+        return results
+
+    def cache_identity(self) -> Dict:
+        """What, besides the prompt and params, determines a response (for cache keys)."""
+        return {'client': type(self).__name__}
+
+
+class LLMRetryableError(Exception):
+    """A transient LLM failure (rate limit, timeout, overload): safe to retry."""
+
+
+def is_retryable_error(error: BaseException) -> bool:
+    """True if error (or an exception it was raised from) is transient."""
+    seen = set()
+    while error is not None and id(error) not in seen:
+        seen.add(id(error))
+        if isinstance(error, LLMRetryableError) or type(error).__name__ in RETRYABLE_ERROR_NAMES:
+            return True
+        if getattr(error, 'status_code', None) in RETRYABLE_STATUS_CODES:
+            return True
+        error = error.__cause__ or error.__context__
+    return False
+
+
+# ============================================================================
+# OpenAI Client
+# ============================================================================
+
+DEFAULT_SYSTEM_PROMPT = (
+    "You are a helpful assistant that extracts structured information from product descriptions. "
+    "Always output valid JSON only."
+)
+
+
+class OpenAILLMClient(LLMClient):
+    """OpenAI chat-completions client that reuses one pooled HTTP client."""
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        model: str = "gpt-4o-mini",
+        system_prompt: str = DEFAULT_SYSTEM_PROMPT,
+        temperature: Optional[float] = 0.1,
+        max_tokens: Optional[int] = 2000,
+        client: Any = None
+    ):
+        """
+        Initialize OpenAI client.
+
+        Args:
+            api_key: OpenAI API key
+            model: Model name (default: gpt-4o-mini)
+            system_prompt: Default system message ("" for none)
+            temperature: Default temperature (low for deterministic extraction;
+                None: provider default)
+            max_tokens: Default response token limit (None: provider default)
+            client: Existing openai.OpenAI instance to use instead of creating one
+        """
+        self.api_key = api_key
+        self.model = model
+        self.system_prompt = system_prompt
+        self.temperature = temperature
+        self.max_tokens = max_tokens
+        self._client = client
+        self._client_lock = threading.Lock()
+
+    def _get_client(self):
+        """The shared openai.OpenAI instance (created on first use; thread-safe)."""
+        if self._client is None:
+            with self._client_lock:
+                if self._client is None:
+                    import openai
+                    self._client = openai.OpenAI(api_key=self.api_key)
+        return self._client
+
+    def complete(
+        self,
+        prompt: str,
+        system: Optional[str] = None,
+        images: Optional[List[str]] = None,
+        **params
+    ) -> str:
+        """
+        Complete prompt using OpenAI API.
+
+        Args:
+            prompt: The user message
+            system: System message (default: the client's; "" for none)
+            images: Image URLs (or data: URLs) sent with the prompt
+            **params: Request options overriding the client defaults
+        """
+        defaults = {'model': self.model, 'temperature': self.temperature, 'max_tokens': self.max_tokens}
+        request = {key: value for key, value in {**defaults, **params}.items() if value is not None}
+        system = self.system_prompt if system is None else system
+        content = prompt
+        if images:
+            content = [{"type": "text", "text": prompt}] + [
+                {"type": "image_url", "image_url": {"url": url}} for url in images
+            ]
+        messages = [{"role": "system", "content": system}] if system else []
+        messages.append({"role": "user", "content": content})
+        try:
+            client = self._get_client()
+        except ImportError:
+            raise ValueError("openai package not installed. Install with: pip install openai")
+        try:
+            response = client.chat.completions.create(messages=messages, **request)
+            return response.choices[0].message.content
+        except Exception as e:
+            # Chained, so ManagedLLMClient can still tell rate limits from bad requests
+            raise ValueError(f"OpenAI API call failed: {e}") from e
+
+    def cache_identity(self) -> Dict:
+        return {
+            'client': "openai",
+            'model': self.model,
+            'system_prompt': self.system_prompt,
+            'temperature': self.temperature,
+            'max_tokens': self.max_tokens
+        }
+
+
+# ============================================================================
+# Rate Limiting
+# ============================================================================
+
+class TokenBucket:
+    """
+    Thread-safe token bucket: rate tokens per second, up to capacity banked.
+
+    acquire() blocks until a token is available.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        capacity: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep
+    ):
+        if rate <= 0:
+            raise ValueError(f"rate must be positive, got {rate}")
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = self.capacity
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens: float = 1.0):
+        """Take tokens, waiting for the bucket to refill if needed."""
+        while True:
+            with self._lock:
+                now = self._clock()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return
+                wait = (tokens - self._tokens) / self.rate
+            self._sleep(wait)
+
+
+# ============================================================================
+# Managed Client (cache + concurrency + rate limit + retries)
+# ============================================================================
+
+@dataclass
+class LLMCallStats:
+    """Counters for one ManagedLLMClient."""
+    requests: int = 0
+    cache_hits: int = 0
+    api_calls: int = 0
+    retries: int = 0
+    failures: int = 0
+
+    def to_dict(self) -> Dict:
+        return asdict(self)
+
+
+class ManagedLLMClient(LLMClient):
+    """
+    Wraps any LLMClient with a response cache, bounded concurrency,
+    token-bucket rate limiting and jittered retries.
+
+    Responses are cached under (client identity, prompt, params), so re-runs
+    of the same prompts make no API calls. Only responses that pass
+    validate() are cached.
+    """
+
+    def __init__(
+        self,
+        client: LLMClient,
+        cache: Optional[ResultCache] = None,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        requests_per_second: Optional[float] = None,
+        burst: Optional[float] = None,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        backoff_base: float = DEFAULT_BACKOFF_BASE,
+        backoff_max: float = DEFAULT_BACKOFF_MAX,
+        seed: Optional[int] = None,
+        sleep: Callable[[float], None] = time.sleep
+    ):
+        """
+        Args:
+            client: The client that makes the actual calls
+            cache: Response cache (None: no caching)
+            max_concurrency: Most calls in flight at once (also the
+                complete_many thread count)
+            requests_per_second: Token-bucket rate (None: unlimited)
+            burst: Token-bucket capacity (default: one second's worth)
+            max_retries: Retries after the first attempt, for transient
+                errors and responses that fail validation
+            backoff_base: Retry n sleeps uniform(0, min(backoff_max, base * 2**n))
+            backoff_max: Cap on one backoff sleep
+            seed: Seed for the backoff jitter
+            sleep: Sleep function (injectable for tests)
+        """
+        self.client = client
+        self.cache = cache
+        self.max_concurrency = max(1, max_concurrency)
+        self.max_retries = max(0, max_retries)
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.stats = LLMCallStats()
+        self._bucket = TokenBucket(requests_per_second, burst, sleep=sleep) if requests_per_second else None
+        self._slots = threading.BoundedSemaphore(self.max_concurrency)
+        self._sleep = sleep
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def cache_identity(self) -> Dict:
+        return self.client.cache_identity()
+
+    def _count(self, **increments):
+        with self._lock:
+            for name, value in increments.items():
+                setattr(self.stats, name, getattr(self.stats, name) + value)
+
+    def _backoff(self, attempt: int) -> float:
+        """Full-jitter exponential backoff for retry number attempt (0-based)."""
+        with self._lock:
+            return self._rng.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+
+    def _call(self, prompt: str, validate: Optional[Callable[[str], Any]], params: Dict) -> str:
+        """One prompt through the rate limit, concurrency slots and retries."""
+        attempt = 0
+        while True:
+            with self._slots:
+                if self._bucket is not None:
+                    self._bucket.acquire()
+                self._count(api_calls=1)
+                try:
+                    response = self.client.complete(prompt, **params)
+                except Exception as e:
+                    error, retryable = e, is_retryable_error(e)
+                else:
+                    try:
+                        if validate is not None:
+                            validate(response)
+                        return response
+                    except Exception as e:
+                        # A malformed response is worth asking for again
+                        error, retryable = e, True
+            if not retryable or attempt >= self.max_retries:
+                self._count(failures=1)
+                raise error
+            self._count(retries=1)
+            self._sleep(self._backoff(attempt))
+            attempt += 1
+
+    def complete(
+        self,
+        prompt: str,
+        validate: Optional[Callable[[str], Any]] = None,
+        use_cache: bool = True,
+        **params
+    ) -> str:
+        """
+        Complete a prompt (from the cache if this exact request was made before).
+
+        Args:
+            prompt: The prompt string
+            validate: Optional check on the response; raising rejects it
+                (the call is retried and the response is not cached)
+            use_cache: Read and write the cache for this call
+            **params: Request options passed to the wrapped client
+        """
+        self._count(requests=1)
+        key = None
+        if self.cache is not None and use_cache:
+            key = canonical_hash({'identity': self.cache_identity(), 'prompt': prompt, 'params': params})
+            cached = self.cache.get(key)
+            if cached is not None:
+                self._count(cache_hits=1)
+                return cached
+
+        response = self._call(prompt, validate, params)
+        if key is not None:
+            self.cache.put(key, response)
+        return response
+
+    def complete_many(
+        self,
+        prompts: Sequence[str],
+        validate: Optional[Callable[[str], Any]] = None,
+        return_exceptions: bool = False,
+        use_cache: bool = True,
+        **params
+    ) -> List:
+        """
+        Complete prompts concurrently (at most max_concurrency in flight).
+
+        Duplicate prompts are requested once. Results keep prompt order.
+        """
+        unique = list(dict.fromkeys(prompts))
+
+        def run(prompt):
+            try:
+                return self.complete(prompt, validate=validate, use_cache=use_cache, **params)
+            except Exception as e:
+                if not return_exceptions:
+                    raise
+                return e
+
+        if len(unique) <= 1 or self.max_concurrency == 1:
+            responses = [run(prompt) for prompt in unique]
+        else:
+            with ThreadPoolExecutor(max_workers=min(self.max_concurrency, len(unique))) as executor:
+                responses = list(executor.map(run, unique))
+        by_prompt = dict(zip(unique, responses))
+        return [by_prompt[prompt] for prompt in prompts]
+
+
+# ============================================================================
+# Fake Client (tests / dry runs)
+# ============================================================================
+
+class FakeLLMClient(LLMClient):
+    """
+    Local LLM client returning scripted responses.
+
+    Records every call, tracks peak concurrency, can simulate latency and
+    fail its first calls with a transient error.
+    """
+
+    def __init__(
+        self,
+        responses: Union[str, Dict[str, str], Callable[..., str]] = "{}",
+        latency: float = 0.0,
+        fail_first: int = 0,
+        model: str = "fake"
+    ):
+        """
+        Args:
+            responses: One response for every prompt, a {prompt: response}
+                dict, or a function (prompt, **params) -> response
+            latency: Seconds each call takes
+            fail_first: Number of initial calls that raise LLMRetryableError
+            model: Reported in cache_identity()
+        """
+        self.responses = responses
+        self.latency = latency
+        self.fail_first = fail_first
+        self.model = model
+        self.calls: List = []
+        self.max_in_flight = 0
+        self._in_flight = 0
+        self._lock = threading.Lock()
+
+    def complete(self, prompt: str, **params) -> str:
+        with self._lock:
+            self.calls.append((prompt, params))
+            call_number = len(self.calls)
+            self._in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self._in_flight)
+        try:
+            if self.latency:
+                time.sleep(self.latency)
+            if call_number <= self.fail_first:
+                raise LLMRetryableError(f"fake transient failure (call {call_number})")
+            if callable(self.responses):
+                return self.responses(prompt, **params)
+            if isinstance(self.responses, dict):
+                return self.responses[prompt]
+            return self.responses
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+
+    def cache_identity(self) -> Dict:
+        return {'client': "fake", 'model': self.model}
+
+
+# ============================================================================
+# Factory
+# ============================================================================
+
+def create_llm_client(
+    api_key: Optional[str] = None,
+    model: str = "gpt-4o-mini",
+    cache_dir: Optional[str] = LLM_CACHE_DIR,
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+    requests_per_second: Optional[float] = None,
+    max_retries: int = DEFAULT_MAX_RETRIES,
+    **client_kwargs
+) -> ManagedLLMClient:
+    """
+    OpenAI client wrapped with the response cache, concurrency bound,
+    rate limit and retries.
+
+    Args:
+        api_key: OpenAI API key (default: OPENAI_API_KEY env var)
+        model: Model name
+        cache_dir: Response cache directory (None: no caching)
+        max_concurrency: Most requests in flight at once
+        requests_per_second: Rate limit (None: unlimited)
+        max_retries: Retries for transient errors
+        **client_kwargs: Passed to OpenAILLMClient
+
+    Raises:
+        ValueError: If no API key is given or set
+    """
+    api_key = api_key or os.environ.get("OPENAI_API_KEY")
+    if not api_key:
+        raise ValueError("OPENAI_API_KEY environment variable not set")
+    return ManagedLLMClient(
+        OpenAILLMClient(api_key=api_key, model=model, **client_kwargs),
+        cache=ResultCache(cache_dir) if cache_dir else None,
+        max_concurrency=max_concurrency,
+        requests_per_second=requests_per_second,
+        max_retries=max_retries
+    )
@@ -14,27 +14,10 @@ from dropsim_target_filter import TargetGroup
 
 
 # ============================================================================
-# LLM Client Interface (Abstract)
+# LLM Client Interface (re-exported; defined in dropsim_llm_client)
 # ============================================================================
 
-class LLMClient:
-    """
-    Abstract LLM client interface.
-    
-    Implementations should provide a `.complete(prompt: str) -> str` method.
-    """
-    
-    def complete(self, prompt: str) -> str:
-        """
-        Complete a prompt and return the response text.
-        
-        Args:
-            prompt: The prompt string
-        
-        Returns:
-            Response text from the LLM
-        """
-        raise NotImplementedError("Subclasses must implement complete()")
+from dropsim_llm_client import LLMClient, OpenAILLMClient
 
 
 # ============================================================================
@@ -1036,42 +1019,3 @@ def infer_lite_scenario_and_target_from_llm(
     
     return lite_scenario, target_group, fintech_archetype
 
-
-# ============================================================================
-# Helper: Simple OpenAI Client (Example Implementation)
-# ============================================================================
-
-class OpenAILLMClient(LLMClient):
-    """Simple OpenAI client implementation."""
-    
-    def __init__(self, api_key: str, model: str = "gpt-4o-mini"):
-        """
-        Initialize OpenAI client.
-        
-        Args:
-            api_key: OpenAI API key
-            model: Model name (default: gpt-4o-mini)
-        """
-        self.api_key = api_key
-        self.model = model
-    
-    def complete(self, prompt: str) -> str:
-        """Complete prompt using OpenAI API."""
-        try:
-            import openai
-            client = openai.OpenAI(api_key=self.api_key)
-            response = client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": "You are a helpful assistant that extracts structured information from product descriptions. Always output valid JSON only."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.1,  # Low temperature for deterministic extraction
-                max_tokens=2000
-            )
-            return response.choices[0].message.content
-        except ImportError:
-            raise ValueError("openai package not installed. Install with: pip install openai")
-        except Exception as e:
-            raise ValueError(f"OpenAI API call failed: {e}")
-
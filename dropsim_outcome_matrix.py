@@ -0,0 +1,231 @@
+"""
+dropsim_outcome_matrix.py - Compact Per-Trajectory Outcome Arrays
+
+Completion rates, drop-off by step and failure-reason tallies only need a
+handful of numbers per trajectory, yet every aggregator used to re-walk the
+nested 'trajectories' dicts (often with iterrows()) to get them. The engines
+now also emit an OutcomeMatrix in result_df.attrs['outcome_matrix']: one
+integer exit step index, steps-entered count and failure-reason code plus
+the final-state floats per (persona, variant), in persona then variant
+order. Metrics are then np.bincount / cumulative sums over those arrays.
+
+get_outcome_matrix(result_df, step_names) returns the attached matrix, or
+builds one in a single pass over the trajectories for results that do not
+carry it (older engines, filtered or concatenated frames).
+"""
+
+from collections import Counter
+from dataclasses import dataclass, field, replace
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+
+# Final-state fields, in column order of OutcomeMatrix.final_state
+FINAL_STATE_KEYS = ['cognitive_energy', 'perceived_risk', 'perceived_effort', 'perceived_value', 'perceived_control']
+
+# failure_code of trajectories without a failure reason
+NO_FAILURE = -1
+
+
+@dataclass(frozen=True)
+class OutcomeMatrix:
+    """
+    Outcome arrays for every trajectory of a run, in persona then variant order.
+
+    exit_index is the exit step's index in step_names, len(step_names) for
+    completed trajectories and -1 for exit steps outside step_names.
+    failure_code indexes failure_reasons (NO_FAILURE: none). final_state is
+    (n_trajectories, len(FINAL_STATE_KEYS)), NaN where not recorded.
+    source identifies the frame the matrix was attached to (see
+    attach_outcome_matrix).
+    """
+    step_names: List[str]
+    n_personas: int
+    persona_index: np.ndarray
+    exit_index: np.ndarray
+    steps_entered: np.ndarray
+    failure_code: np.ndarray
+    failure_reasons: List[str]
+    final_state: np.ndarray
+    source: Optional[Tuple[Any, Optional[np.ndarray]]] = field(default=None, compare=False, repr=False)
+
+    def __len__(self) -> int:
+        return len(self.exit_index)
+
+    def __deepcopy__(self, memo) -> 'OutcomeMatrix':
+        # Immutable; pandas deep-copies attrs on every derived frame
+        return self
+
+    @property
+    def n_steps(self) -> int:
+        return len(self.step_names)
+
+    @property
+    def completed(self) -> np.ndarray:
+        return self.exit_index == self.n_steps
+
+    @classmethod
+    def from_trajectories(cls, trajectory_lists: Iterable[List[Dict]], step_names: List[str]) -> 'OutcomeMatrix':
+        """Matrix over per-persona trajectory lists (one pass)."""
+        builder = OutcomeMatrixBuilder(step_names)
+        for trajectories in trajectory_lists:
+            builder.add(trajectories)
+        return builder.build()
+
+    def exit_counts(self) -> np.ndarray:
+        """Trajectories exiting at each step, then completed ones (len n_steps + 1)."""
+        known = self.exit_index[self.exit_index >= 0]
+        return np.bincount(known, minlength=self.n_steps + 1)
+
+    def metrics(self) -> Dict:
+        """Same dict as calibration.loss_functions.extract_simulated_metrics_from_results."""
+        n_steps = self.n_steps
+        total = len(self)
+        completed = int(np.count_nonzero(self.completed))
+
+        # Trajectories entering step k: those that entered more than k steps
+        depth_counts = np.bincount(self.steps_entered, minlength=n_steps + 1)
+        entered = total - np.cumsum(depth_counts)[:n_steps]
+        # A drop-off is counted at the last step a trajectory entered
+        dropped_depths = self.steps_entered[~self.completed & (self.steps_entered > 0)] - 1
+        dropped = np.bincount(dropped_depths, minlength=n_steps)[:n_steps]
+
+        dropoff_by_step = {
+            name: int(dropped[k]) / int(entered[k]) if entered[k] > 0 else 0.0
+            for k, name in enumerate(self.step_names)
+        }
+        steps_completed = int(self.steps_entered.sum())
+        return {
+            'completion_rate': completed / total if total > 0 else 0.0,
+            'dropoff_by_step': dropoff_by_step,
+            'avg_steps_completed': steps_completed / total if total > 0 else 0.0,
+            'total_trajectories': total,
+            'completed_trajectories': completed
+        }
+
+    def failures_by_step(self) -> Dict[str, Tuple[int, Counter]]:
+        """
+        {step: (failures, Counter of failure reasons)} for every step.
+
+        Reasons are inserted in order of first occurrence at that step, so
+        most_common() breaks ties exactly as a trajectory walk would.
+        """
+        n_steps, n_reasons = self.n_steps, len(self.failure_reasons)
+        failed = (self.exit_index >= 0) & (self.exit_index < n_steps)
+        failures = np.bincount(self.exit_index[failed], minlength=n_steps)
+
+        result = {name: (int(failures[k]), Counter()) for k, name in enumerate(self.step_names)}
+        coded = failed & (self.failure_code != NO_FAILURE)
+        cells = self.exit_index[coded].astype(np.int64) * max(n_reasons, 1) + self.failure_code[coded]
+        unique_cells, first_seen, cell_counts = np.unique(cells, return_index=True, return_counts=True)
+        for position in np.argsort(first_seen, kind='stable'):
+            step, code = divmod(int(unique_cells[position]), n_reasons)
+            result[self.step_names[step]][1][self.failure_reasons[code]] = int(cell_counts[position])
+        return result
+
+
+class OutcomeMatrixBuilder:
+    """Accumulates trajectories persona by persona (e.g. while streaming them to a trace sink)."""
+
+    def __init__(self, step_names: List[str]):
+        self.step_names = list(step_names)
+        self._step_index = {name: k for k, name in enumerate(self.step_names)}
+        self._step_index['Completed'] = len(self.step_names)
+        self._reason_codes: Dict[str, int] = {}
+        self._n_personas = 0
+        self._persona_index: List[int] = []
+        self._exit_index: List[int] = []
+        self._steps_entered: List[int] = []
+        self._failure_code: List[int] = []
+        self._final_state: List[Tuple[float, ...]] = []
+
+    def add(self, trajectories: List[Dict]):
+        """Append one persona's trajectories."""
+        n_steps = len(self.step_names)
+        missing_state = (np.nan,) * len(FINAL_STATE_KEYS)
+        for trajectory in trajectories:
+            self._persona_index.append(self._n_personas)
+            self._exit_index.append(self._step_index.get(trajectory.get('exit_step', 'Completed'), -1))
+            if 'steps_entered' in trajectory:
+                entered = trajectory['steps_entered']
+            else:
+                entered = len(trajectory.get('journey', []))
+            self._steps_entered.append(min(entered, n_steps))
+            reason = trajectory.get('failure_reason')
+            if reason:
+                code = self._reason_codes.setdefault(reason, len(self._reason_codes))
+            else:
+                code = NO_FAILURE
+            self._failure_code.append(code)
+            final_state = trajectory.get('final_state')
+            self._final_state.append(
+                tuple(final_state.get(key, np.nan) for key in FINAL_STATE_KEYS) if final_state else missing_state
+            )
+        self._n_personas += 1
+
+    def build(self) -> OutcomeMatrix:
+        arrays = {
+            'persona_index': np.array(self._persona_index, dtype=np.int32),
+            'exit_index': np.array(self._exit_index, dtype=np.int16),
+            'steps_entered': np.array(self._steps_entered, dtype=np.int16),
+            'failure_code': np.array(self._failure_code, dtype=np.int32),
+            'final_state': np.array(self._final_state, dtype=np.float32).reshape(-1, len(FINAL_STATE_KEYS))
+        }
+        for array in arrays.values():
+            array.flags.writeable = False
+        return OutcomeMatrix(
+            step_names=list(self.step_names),
+            n_personas=self._n_personas,
+            failure_reasons=list(self._reason_codes),
+            **arrays
+        )
+
+
+def _trajectory_ids(result_df) -> Optional[np.ndarray]:
+    """Identity of each row's trajectory list (None without a 'trajectories' column)."""
+    if 'trajectories' not in result_df.columns:
+        return None
+    return np.fromiter(map(id, result_df['trajectories']), dtype=np.int64, count=len(result_df))
+
+
+def attach_outcome_matrix(result_df, matrix: OutcomeMatrix):
+    """
+    Attach matrix to result_df as attrs['outcome_matrix'].
+
+    The matrix records result_df's index and trajectory lists, so derived
+    frames (which inherit attrs) only reuse it while they hold the same
+    rows in the same order.
+    """
+    result_df.attrs['outcome_matrix'] = replace(matrix, source=(result_df.index, _trajectory_ids(result_df)))
+
+
+def _describes(matrix: OutcomeMatrix, result_df) -> bool:
+    if matrix.source is None or matrix.n_personas != len(result_df):
+        return False
+    index, trajectory_ids = matrix.source
+    if not result_df.index.equals(index):
+        return False
+    current_ids = _trajectory_ids(result_df)
+    if trajectory_ids is None or current_ids is None:
+        return trajectory_ids is None and current_ids is None
+    return bool(np.array_equal(trajectory_ids, current_ids))
+
+
+def get_outcome_matrix(result_df, step_names: Optional[List[str]] = None) -> OutcomeMatrix:
+    """
+    Outcome matrix of a simulation result over step_names.
+
+    Uses result_df.attrs['outcome_matrix'] when it still describes
+    result_df (same index and trajectory lists as the frame it was
+    attached to); otherwise builds one from the 'trajectories' column.
+    step_names None accepts the attached matrix's steps (enough for
+    completion counts, which need no step names).
+    """
+    matrix: Optional[OutcomeMatrix] = getattr(result_df, 'attrs', {}).get('outcome_matrix')
+    if matrix is not None and _describes(matrix, result_df) and \
+            (step_names is None or matrix.step_names == list(step_names)):
+        return matrix
+    step_names = list(step_names) if step_names is not None else []
+    trajectories = result_df['trajectories'] if 'trajectories' in result_df.columns else []
+    return OutcomeMatrix.from_trajectories(trajectories, step_names)
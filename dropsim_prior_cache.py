@@ -0,0 +1,285 @@
+"""
+dropsim_prior_cache.py - Per-Persona Prior and Modifier Cache
+
+Latent priors and archetype modifiers depend only on a persona's attributes,
+yet every state variant, calibration iteration, stochastic replicate and
+sensitivity run used to recompute them (normalize_persona_inputs ->
+compile_latent_priors -> compute_archetype_modifiers). They are now compiled
+once per persona and stored as one compact float row (PRIOR_KEYS followed by
+MODIFIER_KEYS).
+
+Entries are keyed by (dataset uuid, input hash) within a prior-model
+version. The input hash covers the columns the prior model reads, so edited
+or synthetic personas that reuse a uuid never see stale priors; the version
+is a fingerprint of the prior model's source, so editing the model
+invalidates every entry.
+
+Two tiers:
+- memory: per-process index into a growing float matrix
+- disk (optional): Parquet part files under <cache_dir>/<version>/, one per
+  batch of newly compiled personas, loaded on first use of a version
+"""
+
+import os
+import threading
+import uuid as uuid_module
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from behavioral_engine import normalize_persona_inputs, compile_latent_priors
+from behavioral_engine_improved import compute_archetype_modifiers
+from dropsim_result_cache import code_fingerprint
+
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+
+PRIOR_KEYS = ['CC', 'FR', 'RT', 'LAM', 'ET', 'TB', 'DR', 'CN', 'MS']
+MODIFIER_KEYS = ['base_persistence', 'value_sensitivity', 'fatigue_resilience', 'risk_tolerance_mult']
+
+# Persona columns read by normalize_persona_inputs (raw, then derived)
+PRIOR_INPUT_COLUMNS = [
+    'occupation', 'education_level', 'marital_status', 'sex', 'age',
+    'urban_rural', 'regional_cluster', 'digital_literacy_score', 'aspirational_score',
+    'english_score', 'openness_score', 'generation_bucket'
+]
+
+# Modules whose source defines the prior model (part of every key)
+PRIOR_MODEL_MODULES = ['behavioral_engine', 'behavioral_engine_improved']
+
+# Unset: memory tier only
+PRIOR_CACHE_DIR = os.environ.get("DROPSIM_PRIOR_CACHE_DIR") or None
+# Memory tier bound; the tier is cleared when a version outgrows it
+PRIOR_CACHE_MAX_ENTRIES = int(os.environ.get("DROPSIM_PRIOR_CACHE_MAX_ENTRIES", "1000000"))
+
+# Bump when the key layout or part file schema changes
+PRIOR_CACHE_FORMAT_VERSION = 1
+
+
+def prior_model_version() -> str:
+    """Fingerprint of the prior model's source (changes when the model is edited)."""
+    return code_fingerprint(PRIOR_MODEL_MODULES)[:16]
+
+
+def persona_input_hashes(df: pd.DataFrame) -> np.ndarray:
+    """Stable uint64 hash per row of the columns the prior model reads."""
+    columns = [col for col in PRIOR_INPUT_COLUMNS if col in df.columns]
+    if not columns:
+        return np.zeros(len(df), dtype=np.uint64)
+    return pd.util.hash_pandas_object(df[columns], index=False).to_numpy(dtype=np.uint64)
+
+
+def compile_persona_priors(row: pd.Series, derived: Dict) -> Tuple[Dict, Dict]:
+    """Uncached (priors, modifiers) for one persona."""
+    inputs = normalize_persona_inputs(row, derived)
+    priors = compile_latent_priors(inputs)
+    return priors, compute_archetype_modifiers(priors, inputs)
+
+
+@dataclass(frozen=True)
+class PersonaPriors:
+    """
+    Compiled priors and modifiers for the rows of a persona DataFrame.
+
+    priors is (n_personas, len(PRIOR_KEYS)), modifiers is
+    (n_personas, len(MODIFIER_KEYS)), both in row order.
+    """
+    priors: np.ndarray
+    modifiers: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.priors)
+
+    def row(self, i: int) -> Tuple[Dict, Dict]:
+        """(priors, modifiers) dicts for row i, as the scalar engines use them."""
+        return dict(zip(PRIOR_KEYS, self.priors[i].tolist())), dict(zip(MODIFIER_KEYS, self.modifiers[i].tolist()))
+
+    def columns(self) -> Tuple[Dict[str, np.ndarray], Dict[str, np.ndarray]]:
+        """(priors, modifiers) as {key: per-row array}, as the batch engine uses them."""
+        return (
+            {key: self.priors[:, j] for j, key in enumerate(PRIOR_KEYS)},
+            {key: self.modifiers[:, j] for j, key in enumerate(MODIFIER_KEYS)}
+        )
+
+
+@dataclass
+class PriorCacheStats:
+    """Hit/miss counters for one PersonaPriorCache."""
+    hits: int = 0
+    misses: int = 0
+    disk_loads: int = 0
+    disk_writes: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class _VersionStore:
+    """Memory tier for one prior-model version: key -> row of a float matrix."""
+
+    def __init__(self):
+        self.index: Dict[Tuple[str, int], int] = {}
+        self.values = np.empty((1024, len(PRIOR_KEYS) + len(MODIFIER_KEYS)))
+
+    def add(self, keys: List[Tuple[str, int]], values: np.ndarray):
+        needed = len(self.index) + len(keys)
+        if needed > len(self.values):
+            grown = np.empty((max(needed, 2 * len(self.values)), self.values.shape[1]))
+            grown[:len(self.index)] = self.values[:len(self.index)]
+            self.values = grown
+        for key, vector in zip(keys, values):
+            position = self.index.get(key)
+            if position is None:
+                position = len(self.index)
+                self.index[key] = position
+            self.values[position] = vector
+
+
+class PersonaPriorCache:
+    """
+    Memory (+ optional Parquet) cache of compiled priors and modifiers.
+
+    Thread-safe; worker processes each hold their own memory tier and share
+    the disk tier.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Optional[str] = PRIOR_CACHE_DIR,
+        max_entries: int = PRIOR_CACHE_MAX_ENTRIES
+    ):
+        """
+        Args:
+            cache_dir: Parquet tier directory (None: memory tier only)
+            max_entries: Memory tier bound per prior-model version
+        """
+        self.cache_dir = cache_dir
+        self.max_entries = max_entries
+        self.stats = PriorCacheStats()
+        self._stores: Dict[str, _VersionStore] = {}
+        self._lock = threading.Lock()
+
+    # ------------------------------------------------------------------
+    # Disk tier
+    # ------------------------------------------------------------------
+
+    def _version_dir(self, version: str) -> str:
+        return os.path.join(self.cache_dir, f"v{PRIOR_CACHE_FORMAT_VERSION}-{version}")
+
+    def _load_version(self, version: str) -> _VersionStore:
+        """Memory tier for version, seeded from its part files (lock held)."""
+        store = _VersionStore()
+        directory = self._version_dir(version) if self.cache_dir else None
+        if directory and os.path.isdir(directory):
+            import pyarrow.parquet as pq
+            for name in sorted(os.listdir(directory)):
+                if name.startswith(".tmp-") or not name.endswith(".parquet"):
+                    continue
+                part = pq.read_table(os.path.join(directory, name)).to_pandas()
+                keys = list(zip(part['uuid'].tolist(), part['input_hash'].tolist()))
+                store.add(keys, part[PRIOR_KEYS + MODIFIER_KEYS].to_numpy(dtype=float))
+                self.stats.disk_loads += 1
+        return store
+
+    def _write_part(self, version: str, keys: List[Tuple[str, int]], values: np.ndarray):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        directory = self._version_dir(version)
+        os.makedirs(directory, exist_ok=True)
+        columns = {
+            'uuid': pa.array([key[0] for key in keys], type=pa.string()),
+            'input_hash': pa.array([key[1] for key in keys], type=pa.uint64())
+        }
+        for j, name in enumerate(PRIOR_KEYS + MODIFIER_KEYS):
+            columns[name] = pa.array(values[:, j])
+        name = f"part-{uuid_module.uuid4().hex}.parquet"
+        tmp_path = os.path.join(directory, ".tmp-" + name)
+        pq.write_table(pa.table(columns), tmp_path)
+        os.replace(tmp_path, os.path.join(directory, name))
+        with self._lock:
+            self.stats.disk_writes += 1
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def compile(self, df: pd.DataFrame) -> PersonaPriors:
+        """Priors and modifiers for every row of df, compiling only uncached personas."""
+        input_columns = [col for col in PRIOR_INPUT_COLUMNS if col in df.columns]
+
+        version = prior_model_version()
+        uuids = df['uuid'].astype(str).tolist() if 'uuid' in df.columns else [''] * len(df)
+        keys = list(zip(uuids, persona_input_hashes(df).tolist()))
+
+        with self._lock:
+            store = self._stores.get(version)
+            if store is None:
+                store = self._stores[version] = self._load_version(version)
+            positions = [store.index.get(key) for key in keys]
+            missing = [i for i, position in enumerate(positions) if position is None]
+            found = [i for i, position in enumerate(positions) if position is not None]
+            values = np.empty((len(df), store.values.shape[1]))
+            if found:
+                values[found] = store.values[[positions[i] for i in found]]
+            self.stats.hits += len(found)
+            self.stats.misses += len(missing)
+
+        if missing:
+            new_keys = []
+            for i in missing:
+                row = df.iloc[i]
+                derived = {col: row[col] for col in input_columns}
+                priors, modifiers = compile_persona_priors(row, derived)
+                values[i, :len(PRIOR_KEYS)] = [priors[key] for key in PRIOR_KEYS]
+                values[i, len(PRIOR_KEYS):] = [modifiers[key] for key in MODIFIER_KEYS]
+                new_keys.append(keys[i])
+
+            with self._lock:
+                store = self._stores.get(version)
+                if store is None or len(store.index) + len(new_keys) > self.max_entries:
+                    store = self._stores[version] = _VersionStore()
+                store.add(new_keys, values[missing])
+            if self.cache_dir:
+                self._write_part(version, new_keys, values[missing])
+
+        return PersonaPriors(
+            priors=values[:, :len(PRIOR_KEYS)],
+            modifiers=values[:, len(PRIOR_KEYS):]
+        )
+
+    def clear(self):
+        """Drop the memory tier (part files stay on disk)."""
+        with self._lock:
+            self._stores.clear()
+
+
+# ============================================================================
+# DEFAULT CACHE
+# ============================================================================
+
+_default_cache: Optional[PersonaPriorCache] = None
+_default_cache_lock = threading.Lock()
+
+
+def get_prior_cache() -> PersonaPriorCache:
+    """Process-wide cache used by the intent-aware engines."""
+    global _default_cache
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = PersonaPriorCache()
+        return _default_cache
+
+
+def set_prior_cache(cache: Optional[PersonaPriorCache]) -> Optional[PersonaPriorCache]:
+    """Replace the process-wide cache (None: recreate from config on next use). Returns the old one."""
+    global _default_cache
+    with _default_cache_lock:
+        previous, _default_cache = _default_cache, cache
+        return previous
@@ -0,0 +1,622 @@
+"""
+dropsim_result_cache.py - Content-Addressed Simulation Result Cache
+
+Simulations are deterministic in their inputs: the same product steps,
+personas (or compiled priors), state variants and seed run through the same
+engine code give the same result. Results are therefore stored under a
+canonical hash of those inputs, and repeat runs (re-opened reports, repeated
+API calls) are served from the cache instead of re-simulated.
+
+Two tiers:
+- memory: per-process LRU of pickled results, bounded by bytes
+- disk: one pickle per result (plus optional side files such as NDJSON
+  traces) under the cache directory, LRU-evicted by total size
+
+The engine "version" in a key is a fingerprint of the engine modules'
+source and of the local modules they import, followed transitively, so
+editing the engine or anything it builds on invalidates old entries
+without a manual version bump. Disk entries are pickles: only point the cache at a
+directory you trust.
+"""
+
+import ast
+import dataclasses
+import hashlib
+import importlib.util
+import json
+import os
+import pickle
+import shutil
+import sys
+import tempfile
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from enum import Enum
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+# numpy/pandas are not imported here: a value can only be one of their types
+# if its library is already loaded, so _canonical looks them up in sys.modules
+# (keeps this module, and the LLM client built on it, cheap to import)
+
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+
+RESULT_CACHE_DIR = os.environ.get("DROPSIM_RESULT_CACHE_DIR", "./.dropsim_cache/results")
+RESULT_CACHE_MAX_BYTES = int(os.environ.get("DROPSIM_RESULT_CACHE_MAX_BYTES", str(1 << 30)))
+RESULT_CACHE_MEMORY_BYTES = int(os.environ.get("DROPSIM_RESULT_CACHE_MEMORY_BYTES", str(64 << 20)))
+# "0" disables the default cache (explicit ResultCache instances still work)
+RESULT_CACHE_ENABLED = os.environ.get("DROPSIM_RESULT_CACHE", "1") != "0"
+
+# Bump when the key layout or entry format changes
+RESULT_CACHE_FORMAT_VERSION = 1
+
+ENTRY_SUFFIX = ".pkl"
+
+
+# ============================================================================
+# CANONICAL HASHING
+# ============================================================================
+
+def _canonical(value: Any) -> Any:
+    """
+    Reduce a value to JSON-serializable data that is equal for equal inputs.
+
+    Dict key order does not matter; floats keep full precision; arrays and
+    DataFrames are reduced to digests of their contents.
+
+    Raises:
+        TypeError: For values with no canonical form (the result is not cacheable)
+    """
+    np = sys.modules.get('numpy')
+    if np is not None and isinstance(value, np.generic):
+        return _canonical(value.item())
+    if value is None or isinstance(value, (bool, int, str)):
+        return value
+    if isinstance(value, float):
+        return repr(float(value))
+    if isinstance(value, Enum):
+        return _canonical(value.value)
+    if isinstance(value, dict):
+        return {'__dict__': sorted(
+            ([_canonical(k), _canonical(v)] for k, v in value.items()),
+            key=lambda pair: json.dumps(pair[0], sort_keys=True)
+        )}
+    if isinstance(value, (list, tuple)):
+        return [_canonical(v) for v in value]
+    if isinstance(value, (set, frozenset)):
+        return {'__set__': sorted((_canonical(v) for v in value), key=lambda v: json.dumps(v, sort_keys=True))}
+    if np is not None and isinstance(value, np.ndarray):
+        if value.dtype == object:
+            return {'__objects__': list(value.shape), 'values': [_canonical(v) for v in value.ravel().tolist()]}
+        data = np.ascontiguousarray(value)
+        return {'__ndarray__': str(data.dtype), 'shape': list(data.shape),
+                'sha256': hashlib.sha256(data.tobytes()).hexdigest()}
+    pd = sys.modules.get('pandas')
+    if pd is not None and isinstance(value, pd.Series):
+        return {'__series__': _canonical(value.name), 'frame': _canonical(value.to_frame())}
+    if pd is not None and isinstance(value, pd.DataFrame):
+        return _canonical_frame(value)
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return {'__dataclass__': type(value).__qualname__, 'fields': _canonical(dataclasses.asdict(value))}
+    if hasattr(value, 'to_dict'):
+        return {'__object__': type(value).__qualname__, 'fields': _canonical(value.to_dict())}
+    raise TypeError(f"Cannot build a cache key from {type(value).__name__}")
+
+
+def _canonical_frame(df) -> Dict:
+    """Digest of a DataFrame's columns, dtypes, index and values."""
+    import pandas as pd
+
+    digest = hashlib.sha256()
+    digest.update(pd.util.hash_pandas_object(df.index, index=False).values.tobytes())
+    for position in range(df.shape[1]):
+        column = df.iloc[:, position]
+        try:
+            hashed = pd.util.hash_pandas_object(column, index=False)
+        except TypeError:
+            # Unhashable cells (lists, dicts): hash their canonical JSON instead
+            hashed = pd.util.hash_pandas_object(
+                column.map(lambda cell: json.dumps(_canonical(cell), sort_keys=True)), index=False
+            )
+        digest.update(hashed.values.tobytes())
+    return {
+        '__dataframe__': [str(c) for c in df.columns],
+        'dtypes': [str(d) for d in df.dtypes],
+        'sha256': digest.hexdigest()
+    }
+
+
+def canonical_hash(*parts: Any) -> str:
+    """SHA-256 (hex) of the canonical form of parts."""
+    payload = json.dumps(_canonical(list(parts)), sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def file_digest(path: Optional[str]) -> Optional[str]:
+    """SHA-256 of a file's contents, or None if there is no such file."""
+    if not path or not os.path.isfile(path):
+        return None
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+# (source path) -> (mtime_ns, size, digest)
+_SOURCE_DIGESTS: Dict[str, Tuple[int, int, str]] = {}
+# (source path) -> (mtime_ns, size, names of the modules it imports)
+_SOURCE_IMPORTS: Dict[str, Tuple[int, int, Tuple[str, ...]]] = {}
+
+
+def _source_digest(path: str) -> str:
+    stat = os.stat(path)
+    cached = _SOURCE_DIGESTS.get(path)
+    if cached is None or cached[:2] != (stat.st_mtime_ns, stat.st_size):
+        cached = (stat.st_mtime_ns, stat.st_size, file_digest(path))
+        _SOURCE_DIGESTS[path] = cached
+    return cached[2]
+
+
+def _imported_names(path: str, module_name: str) -> Tuple[str, ...]:
+    """
+    Absolute names a module's source may import, anywhere in the file
+    (function-level imports included). 'from a import b' yields both a and
+    a.b, since b may be a submodule.
+    """
+    stat = os.stat(path)
+    cached = _SOURCE_IMPORTS.get(path)
+    if cached is not None and cached[:2] == (stat.st_mtime_ns, stat.st_size):
+        return cached[2]
+
+    is_package = os.path.basename(path) == '__init__.py'
+    package = module_name if is_package else module_name.rpartition('.')[0]
+    names = []
+    try:
+        with open(path, 'rb') as f:
+            tree = ast.parse(f.read(), filename=path)
+    except (SyntaxError, ValueError):
+        tree = None
+    for node in ast.walk(tree) if tree is not None else ():
+        if isinstance(node, ast.Import):
+            names.extend(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom):
+            if node.level:
+                parts = package.split('.') if package else []
+                parts = parts[:len(parts) - node.level + 1] + ([node.module] if node.module else [])
+                base = '.'.join(parts)
+            else:
+                base = node.module or ''
+            if base:
+                names.append(base)
+            names.extend(f"{base}.{alias.name}" if base else alias.name
+                         for alias in node.names if alias.name != '*')
+
+    result = tuple(dict.fromkeys(names))
+    _SOURCE_IMPORTS[path] = (stat.st_mtime_ns, stat.st_size, result)
+    return result
+
+
+def _local_module_path(root: str, name: str) -> Optional[str]:
+    """Source file of module name under root (None for modules outside it)."""
+    base = os.path.join(root, *name.split('.'))
+    for path in (base + '.py', os.path.join(base, '__init__.py')):
+        if os.path.isfile(path):
+            return path
+    return None
+
+
+def code_fingerprint(module_names: Iterable[str], follow_imports: bool = True) -> str:
+    """
+    Fingerprint of the source of the given modules (without importing them).
+
+    With follow_imports, modules they import from the same source root are
+    included transitively (a parsed-source walk, no imports), so an edit to
+    a helper module changes the fingerprint of every engine built on it.
+    Per-file digests and import lists are memoized on (mtime, size), so
+    repeated key computations do not re-read unchanged files.
+    """
+    # (module name, source path or None) in visiting order
+    modules: Dict[str, Optional[str]] = {}
+    pending = []
+    for name in module_names:
+        spec = importlib.util.find_spec(name)
+        path = spec.origin if spec is not None else None
+        if not path or not os.path.isfile(path):
+            path = None
+        modules[name] = path
+        if path is not None and follow_imports:
+            depth = name.count('.') + (2 if os.path.basename(path) == '__init__.py' else 1)
+            root = path
+            for _ in range(depth):
+                root = os.path.dirname(root)
+            pending.append((name, path, root))
+
+    while pending:
+        name, path, root = pending.pop()
+        for imported in _imported_names(path, name):
+            # Importing a.b also runs a/__init__
+            parts = imported.split('.')
+            for end in range(1, len(parts) + 1):
+                candidate = '.'.join(parts[:end])
+                if candidate in modules:
+                    continue
+                candidate_path = _local_module_path(root, candidate)
+                if candidate_path is None:
+                    continue
+                modules[candidate] = candidate_path
+                pending.append((candidate, candidate_path, root))
+
+    digest = hashlib.sha256()
+    for name in sorted(modules):
+        path = modules[name]
+        if path is None:
+            digest.update(f"{name}:missing;".encode('utf-8'))
+        else:
+            digest.update(f"{name}:{_source_digest(path)};".encode('utf-8'))
+    return digest.hexdigest()
+
+
+def scenario_cache_key(
+    kind: str,
+    product_steps: Any,
+    personas: Any,
+    state_variants: Any = None,
+    seed: Optional[int] = None,
+    engine_modules: Iterable[str] = (),
+    **extra: Any
+) -> str:
+    """
+    Cache key for one simulation.
+
+    Args:
+        kind: What is cached (distinct result shapes must use distinct kinds)
+        product_steps: Product step definitions
+        personas: Persona dicts, compiled priors or the persona DataFrame
+        state_variants: State variant definitions
+        seed: Random seed
+        engine_modules: Modules whose source determines the result
+        **extra: Any other inputs that change the result (flags, parameters)
+
+    Raises:
+        TypeError: If an input has no canonical form
+    """
+    return canonical_hash({
+        'format_version': RESULT_CACHE_FORMAT_VERSION,
+        'kind': kind,
+        'product_steps': product_steps,
+        'personas': personas,
+        'state_variants': state_variants,
+        'seed': seed,
+        'engine': code_fingerprint(engine_modules),
+        'extra': extra
+    })
+
+
+# ============================================================================
+# RESULT CACHE
+# ============================================================================
+
+@dataclass
+class CacheStats:
+    """Hit/miss counters for one ResultCache."""
+    memory_hits: int = 0
+    disk_hits: int = 0
+    misses: int = 0
+    writes: int = 0
+    evictions: int = 0
+    errors: int = 0
+
+    @property
+    def hits(self) -> int:
+        return self.memory_hits + self.disk_hits
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def to_dict(self) -> Dict:
+        return {**dataclasses.asdict(self), 'hits': self.hits, 'hit_rate': self.hit_rate}
+
+
+def link_or_copy(source: str, destination: str):
+    """Hard-link source to destination (copy across filesystems), replacing it."""
+    directory = os.path.dirname(os.path.abspath(destination))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-")
+    os.close(fd)
+    os.remove(tmp_path)
+    try:
+        os.link(source, tmp_path)
+    except OSError:
+        shutil.copyfile(source, tmp_path)
+    os.replace(tmp_path, destination)
+
+
+class ResultCache:
+    """
+    Two-tier (memory + disk) content-addressed store for simulation results.
+
+    Values are pickled on put and unpickled on every get, so callers never
+    share (or mutate) a cached object. An entry may carry named side files
+    (e.g. NDJSON traces); they are evicted together with the entry.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Optional[str] = RESULT_CACHE_DIR,
+        max_bytes: int = RESULT_CACHE_MAX_BYTES,
+        memory_bytes: int = RESULT_CACHE_MEMORY_BYTES
+    ):
+        """
+        Args:
+            cache_dir: Disk tier directory (None: memory tier only)
+            max_bytes: Disk tier size bound (entries plus side files)
+            memory_bytes: Memory tier size bound (pickled bytes)
+        """
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.memory_bytes = memory_bytes
+        self.stats = CacheStats()
+        self._memory: "OrderedDict[str, bytes]" = OrderedDict()
+        self._memory_used = 0
+        # Disk tier index, least recently used first: key -> (bytes, file names).
+        # Loaded by one directory scan on first use, then kept up to date, so
+        # puts do not rescan the directory.
+        self._disk: "Optional[OrderedDict[str, Tuple[int, List[str]]]]" = None
+        self._disk_used = 0
+        self._lock = threading.Lock()
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+
+    # ------------------------------------------------------------------
+    # Paths
+    # ------------------------------------------------------------------
+
+    def _entry_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key + ENTRY_SUFFIX)
+
+    def _file_path(self, key: str, name: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.{name}")
+
+    # ------------------------------------------------------------------
+    # Memory tier
+    # ------------------------------------------------------------------
+
+    def _remember(self, key: str, blob: bytes):
+        """Insert into the memory LRU (lock held)."""
+        if len(blob) > self.memory_bytes:
+            return
+        previous = self._memory.pop(key, None)
+        if previous is not None:
+            self._memory_used -= len(previous)
+        self._memory[key] = blob
+        self._memory_used += len(blob)
+        while self._memory_used > self.memory_bytes:
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_used -= len(evicted)
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Cached value for key, or default on a miss."""
+        with self._lock:
+            blob = self._memory.get(key)
+            if blob is not None:
+                self._memory.move_to_end(key)
+                self.stats.memory_hits += 1
+        if blob is not None:
+            return pickle.loads(blob)
+
+        if self.cache_dir:
+            path = self._entry_path(key)
+            try:
+                with open(path, 'rb') as f:
+                    blob = f.read()
+                value = pickle.loads(blob)
+            except FileNotFoundError:
+                pass
+            except Exception:
+                # Truncated or stale entry: drop it and recompute
+                with self._lock:
+                    self.stats.errors += 1
+                self.discard(key)
+            else:
+                try:
+                    os.utime(path)  # mtime orders entries when the index is next loaded
+                except OSError:
+                    pass
+                with self._lock:
+                    self.stats.disk_hits += 1
+                    self._remember(key, blob)
+                    index = self._disk_index()
+                    if key in index:
+                        index.move_to_end(key)
+                    else:
+                        # Written by another process since the index was loaded
+                        self._index_entry(key, len(blob), [key + ENTRY_SUFFIX])
+                return value
+
+        with self._lock:
+            self.stats.misses += 1
+        return default
+
+    def get_file(self, key: str, name: str) -> Optional[str]:
+        """Path of a side file stored with key, or None."""
+        if not self.cache_dir:
+            return None
+        path = self._file_path(key, name)
+        return path if os.path.exists(path) and os.path.exists(self._entry_path(key)) else None
+
+    def put(self, key: str, value: Any, files: Optional[Dict[str, str]] = None):
+        """
+        Store value under key.
+
+        Args:
+            key: Cache key (see scenario_cache_key)
+            value: Any picklable value
+            files: Optional {name: path} side files, hard-linked (or copied)
+                into the cache; the source files are left in place
+        """
+        blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        with self._lock:
+            self._remember(key, blob)
+            self.stats.writes += 1
+        if not self.cache_dir:
+            return
+
+        # Side files first: the entry file marks the entry complete
+        names, size = [], len(blob)
+        for name, source in (files or {}).items():
+            path = self._file_path(key, name)
+            link_or_copy(source, path)
+            names.append(os.path.basename(path))
+            size += os.path.getsize(path)
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, prefix=".tmp-")
+        with os.fdopen(fd, 'wb') as f:
+            f.write(blob)
+        os.replace(tmp_path, self._entry_path(key))
+        names.append(key + ENTRY_SUFFIX)
+
+        with self._lock:
+            self._index_entry(key, size, names)
+            evicted = self._pop_lru_over_budget()
+        self._remove_files(evicted)
+
+    def get_or_compute(self, key: str, compute: Callable[[], Any]) -> Any:
+        """Cached value for key, computing and storing it on a miss."""
+        missing = object()
+        value = self.get(key, missing)
+        if value is missing:
+            value = compute()
+            self.put(key, value)
+        return value
+
+    def discard(self, key: str):
+        """Remove an entry (both tiers, with its side files)."""
+        with self._lock:
+            blob = self._memory.pop(key, None)
+            if blob is not None:
+                self._memory_used -= len(blob)
+        if not self.cache_dir:
+            return
+        with self._lock:
+            entry = self._disk_index().pop(key, None)
+            if entry is not None:
+                self._disk_used -= entry[0]
+        self._remove_files([entry[1] if entry is not None else [key + ENTRY_SUFFIX]])
+
+    def clear(self):
+        """Remove every entry."""
+        with self._lock:
+            self._memory.clear()
+            self._memory_used = 0
+            self._disk = OrderedDict() if self.cache_dir else None
+            self._disk_used = 0
+        if self.cache_dir and os.path.isdir(self.cache_dir):
+            for entry in os.listdir(self.cache_dir):
+                os.remove(os.path.join(self.cache_dir, entry))
+
+    def disk_usage(self) -> int:
+        """Bytes used by the disk tier."""
+        if not self.cache_dir:
+            return 0
+        with self._lock:
+            self._disk_index()
+            return self._disk_used
+
+    # ------------------------------------------------------------------
+    # Disk tier index (lock held)
+    # ------------------------------------------------------------------
+
+    def _disk_index(self) -> "OrderedDict[str, Tuple[int, List[str]]]":
+        """The disk index, scanning the directory once on first use."""
+        if self._disk is None:
+            self._disk = OrderedDict()
+            self._disk_used = 0
+            for key, (_, size, names) in sorted(self._scan_disk().items(), key=lambda item: item[1][0]):
+                self._index_entry(key, size, names)
+        return self._disk
+
+    def _index_entry(self, key: str, size: int, names: List[str]):
+        index = self._disk_index()
+        previous = index.pop(key, None)
+        if previous is not None:
+            self._disk_used -= previous[0]
+        index[key] = (size, names)
+        self._disk_used += size
+
+    def _pop_lru_over_budget(self) -> List[List[str]]:
+        """Drop least recently used entries from the index until under max_bytes; their file names."""
+        index = self._disk_index()
+        evicted = []
+        while self._disk_used > self.max_bytes and index:
+            _, (size, names) = index.popitem(last=False)
+            self._disk_used -= size
+            evicted.append(names)
+            self.stats.evictions += 1
+        return evicted
+
+    def _remove_files(self, file_groups: List[List[str]]):
+        for names in file_groups:
+            for name in names:
+                try:
+                    os.remove(os.path.join(self.cache_dir, name))
+                except FileNotFoundError:
+                    pass
+
+    def _scan_disk(self) -> Dict[str, Tuple[float, int, list]]:
+        """key -> (last use, total bytes, file names) for the files on disk."""
+        entries: Dict[str, list] = {}
+        for entry in os.listdir(self.cache_dir):
+            if entry.startswith(".tmp-"):
+                continue
+            key = entry.split(".", 1)[0]
+            entries.setdefault(key, []).append(entry)
+        result = {}
+        for key, names in entries.items():
+            try:
+                stats = {name: os.stat(os.path.join(self.cache_dir, name)) for name in names}
+            except FileNotFoundError:
+                continue
+            # Side files without an entry file are orphans: oldest, evicted first
+            entry_name = key + ENTRY_SUFFIX
+            last_use = stats[entry_name].st_mtime if entry_name in stats else 0.0
+            result[key] = (last_use, sum(st.st_size for st in stats.values()), names)
+        return result
+
+
+# ============================================================================
+# DEFAULT CACHE
+# ============================================================================
+
+_default_cache: Optional[ResultCache] = None
+_default_cache_lock = threading.Lock()
+
+
+def get_result_cache() -> Optional[ResultCache]:
+    """
+    Process-wide cache used by the API, CLI and pipeline.
+
+    Returns None when disabled with DROPSIM_RESULT_CACHE=0.
+    """
+    global _default_cache
+    if not RESULT_CACHE_ENABLED:
+        return None
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = ResultCache()
+        return _default_cache
+
+
+def set_result_cache(cache: Optional[ResultCache]) -> Optional[ResultCache]:
+    """Replace the process-wide cache (None: recreate from config on next use). Returns the old one."""
+    global _default_cache
+    with _default_cache_lock:
+        previous, _default_cache = _default_cache, cache
+        return previous
@@ -0,0 +1,363 @@
+#!/usr/bin/env python3
+"""
+dropsim_screenshot_analysis.py - Screenshot Analysis Pipeline
+
+Turns a folder of product screenshots into per-screen descriptions (vision
+model) and, optionally, DropSim product step definitions (text model).
+
+- Screenshots are identified by content hash: duplicates are analyzed once
+- Each analysis is cached on disk as soon as it completes, keyed on
+  (image hash, prompt, model), so re-runs are free and interrupted runs
+  resume where they stopped
+- Uncached screenshots are analyzed concurrently
+
+The per-product scripts/analyze_*_screenshots.py are configs over
+run_screenshot_analysis().
+"""
+
+import base64
+import json
+import mimetypes
+import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from dropsim_llm_client import (
+    DEFAULT_MAX_CONCURRENCY,
+    LLMClient,
+    ManagedLLMClient,
+    OpenAILLMClient
+)
+from dropsim_result_cache import ResultCache, canonical_hash, file_digest
+
+
+# ============================================================================
+# Configuration
+# ============================================================================
+
+SCREENSHOT_CACHE_DIR = os.environ.get("DROPSIM_SCREENSHOT_CACHE_DIR", "./.dropsim_cache/screenshots")
+SCREENSHOT_EXTENSIONS = ('.jpeg', '.jpg', '.png', '.PNG')
+SCREENSHOT_CACHE_VERSION = 1
+
+
+@dataclass
+class ScreenshotProduct:
+    """
+    What to analyze for one product and where to write it.
+
+    screen_prompt is sent with each screenshot. steps_prompt, if set, is a
+    str.format template ({screenshots_text}, {n_screenshots}) for turning the
+    descriptions into a JSON step dict, written to output_file as a Python
+    module defining output_variable. Without it, the descriptions are
+    written to output_file as text.
+    """
+    name: str
+    screenshot_dir: str
+    screen_prompt: str
+    output_file: str
+    steps_prompt: Optional[str] = None
+    output_variable: Optional[str] = None
+    output_docstring: List[str] = field(default_factory=list)  # may use {n_steps}
+    extensions: Tuple[str, ...] = ('.jpeg',)
+    screenshot_names: Optional[List[str]] = None  # stems to look up instead of listing the folder
+    model: str = "gpt-4o-mini"
+    screen_max_tokens: int = 500
+    steps_max_tokens: int = 2000
+
+
+@dataclass
+class ScreenshotAnalysis:
+    """One screenshot's analysis."""
+    filename: str
+    path: str
+    digest: str
+    description: Optional[str] = None
+    error: Optional[str] = None
+    cached: bool = False
+
+
+# ============================================================================
+# Screenshot Discovery
+# ============================================================================
+
+def find_screenshots(product: ScreenshotProduct, verbose: bool = False) -> List[str]:
+    """Screenshot paths for product, in flow order."""
+    if product.screenshot_names is None:
+        return [
+            os.path.join(product.screenshot_dir, f)
+            for f in sorted(os.listdir(product.screenshot_dir))
+            if f.endswith(tuple(product.extensions))
+        ]
+
+    paths = []
+    for stem in product.screenshot_names:
+        path = next(
+            (os.path.join(product.screenshot_dir, stem + ext) for ext in product.extensions
+             if os.path.exists(os.path.join(product.screenshot_dir, stem + ext))),
+            None
+        )
+        if path is None:
+            if verbose:
+                print(f"⚠️  Warning: {stem} not found, skipping")
+            continue
+        paths.append(path)
+    return paths
+
+
+def image_data_url(path: str) -> str:
+    """Base64 data: URL for an image file."""
+    mime_type = mimetypes.guess_type(path)[0] or "image/jpeg"
+    with open(path, "rb") as image_file:
+        return f"data:{mime_type};base64,{base64.b64encode(image_file.read()).decode('utf-8')}"
+
+
+# ============================================================================
+# Analysis
+# ============================================================================
+
+def create_vision_client(
+    api_key: Optional[str] = None,
+    model: str = "gpt-4o-mini",
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY
+) -> ManagedLLMClient:
+    """
+    OpenAI client for screenshot analysis: no system message, provider
+    default temperature, retries and a concurrency bound. Caching is done
+    per screenshot by analyze_screenshots().
+
+    Raises:
+        ValueError: If no API key is given or set
+    """
+    api_key = api_key or os.environ.get("OPENAI_API_KEY")
+    if not api_key:
+        raise ValueError("OPENAI_API_KEY not set")
+    return ManagedLLMClient(
+        OpenAILLMClient(api_key=api_key, model=model, system_prompt="", temperature=None, max_tokens=None),
+        max_concurrency=max_concurrency
+    )
+
+
+def _analysis_key(kind: str, client: LLMClient, prompt: str, **extra) -> str:
+    return canonical_hash({
+        'kind': kind,
+        'version': SCREENSHOT_CACHE_VERSION,
+        'client': client.cache_identity(),
+        'prompt': prompt,
+        **extra
+    })
+
+
+def analyze_screenshots(
+    paths: List[str],
+    prompt: str,
+    client: LLMClient,
+    cache: Optional[ResultCache] = None,
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+    max_tokens: int = 500,
+    verbose: bool = False
+) -> List[ScreenshotAnalysis]:
+    """
+    Describe each screenshot with the vision model.
+
+    Identical images (by content) are analyzed once. Cached analyses are
+    reused; the rest run concurrently and are cached as each completes.
+    A failed screenshot gets error set instead of description.
+
+    Args:
+        paths: Screenshot paths, in flow order
+        prompt: Prompt sent with each screenshot
+        client: Vision-capable client (complete(prompt, images=[...]))
+        cache: Per-screenshot analysis cache (None: no caching)
+        max_concurrency: Screenshots analyzed at once
+        max_tokens: Response token limit per screenshot
+        verbose: Print progress
+
+    Returns:
+        One ScreenshotAnalysis per path, in order
+    """
+    analyses = [
+        ScreenshotAnalysis(filename=os.path.basename(path), path=path, digest=file_digest(path))
+        for path in paths
+    ]
+    keys = {
+        a.digest: _analysis_key("screenshot", client, prompt, image=a.digest, max_tokens=max_tokens)
+        for a in analyses
+    }
+
+    results: Dict[str, Tuple[Optional[str], Optional[str], bool]] = {}
+    pending: Dict[str, str] = {}  # digest -> path of its first screenshot
+    for analysis in analyses:
+        if analysis.digest in results or analysis.digest in pending:
+            continue
+        cached = cache.get(keys[analysis.digest]) if cache is not None else None
+        if cached is not None:
+            results[analysis.digest] = (cached, None, True)
+        else:
+            pending[analysis.digest] = analysis.path
+
+    if verbose:
+        duplicates = len(analyses) - len(set(keys))
+        print(f"   {len(results)} cached, {len(pending)} to analyze, {duplicates} duplicates")
+
+    def analyze(path: str) -> str:
+        return client.complete(prompt, images=[image_data_url(path)], max_tokens=max_tokens)
+
+    if pending:
+        with ThreadPoolExecutor(max_workers=max(1, min(max_concurrency, len(pending)))) as executor:
+            futures = {executor.submit(analyze, path): digest for digest, path in pending.items()}
+            for future in as_completed(futures):
+                digest = futures[future]
+                filename = os.path.basename(pending[digest])
+                try:
+                    description = future.result()
+                except Exception as e:
+                    results[digest] = (None, str(e), False)
+                    if verbose:
+                        print(f"   ❌ Error analyzing {filename}: {e}")
+                    continue
+                if cache is not None:
+                    cache.put(keys[digest], description)
+                results[digest] = (description, None, False)
+                if verbose:
+                    print(f"   ✅ {filename} analyzed")
+
+    for analysis in analyses:
+        analysis.description, analysis.error, analysis.cached = results[analysis.digest]
+    return analyses
+
+
+def extract_product_steps(
+    analyses: List[ScreenshotAnalysis],
+    steps_prompt: str,
+    client: LLMClient,
+    cache: Optional[ResultCache] = None,
+    max_tokens: int = 2000
+) -> Dict:
+    """
+    Turn screenshot descriptions into a product step dict (JSON mode).
+
+    Args:
+        analyses: Successful analyses, in flow order
+        steps_prompt: Template with {screenshots_text} and {n_screenshots}
+        client: Text client
+        cache: Response cache (None: no caching)
+        max_tokens: Response token limit
+
+    Returns:
+        {step_name: step attributes}
+    """
+    screenshots_text = "\n\n".join([
+        f"## SCREENSHOT {i+1} ({a.filename})\n{a.description}"
+        for i, a in enumerate(analyses)
+    ])
+    prompt = steps_prompt.format(screenshots_text=screenshots_text, n_screenshots=len(analyses))
+    key = _analysis_key("steps", client, prompt, max_tokens=max_tokens)
+    response = cache.get(key) if cache is not None else None
+    if response is None:
+        response = client.complete(prompt, response_format={"type": "json_object"}, max_tokens=max_tokens)
+        steps = json.loads(response)
+        if cache is not None:
+            cache.put(key, response)
+        return steps
+    return json.loads(response)
+
+
+# ============================================================================
+# Output
+# ============================================================================
+
+def write_steps_module(path: str, variable: str, steps: Dict, docstring: List[str]):
+    """Write steps as a Python module defining variable ({n_steps} in docstring lines is filled in)."""
+    with open(path, "w") as f:
+        f.write('"""\n')
+        for line in docstring:
+            f.write(line.format(n_steps=len(steps)) + '\n')
+        f.write('"""\n\n')
+        f.write(f'{variable} = ')
+        f.write(json.dumps(steps, indent=4))
+        f.write('\n')
+
+
+def write_descriptions(path: str, analyses: List[ScreenshotAnalysis]):
+    """Write screenshot descriptions as text, separated by '---'."""
+    stem = lambda filename: os.path.splitext(filename)[0]
+    with open(path, "w") as f:
+        f.write("\n---\n".join(f"Screenshot {stem(a.filename)}: {a.description}" for a in analyses))
+
+
+# ============================================================================
+# Entry Point
+# ============================================================================
+
+def run_screenshot_analysis(
+    product: ScreenshotProduct,
+    client: Optional[LLMClient] = None,
+    cache: Optional[ResultCache] = None,
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+    use_cache: bool = True,
+    verbose: bool = True
+):
+    """
+    Analyze a product's screenshots and write its output file.
+
+    Args:
+        product: What to analyze and where to write it
+        client: LLM client (default: create_vision_client())
+        cache: Analysis cache (default: SCREENSHOT_CACHE_DIR)
+        max_concurrency: Screenshots analyzed at once
+        use_cache: Read and write the analysis cache
+        verbose: Print progress
+
+    Returns:
+        The step dict (steps_prompt set), the list of analyses, or None on error
+    """
+    if client is None:
+        try:
+            client = create_vision_client(model=product.model, max_concurrency=max_concurrency)
+        except ValueError as e:
+            print(f"Error: {e}")
+            return None
+    if not use_cache:
+        cache = None
+    elif cache is None:
+        cache = ResultCache(SCREENSHOT_CACHE_DIR)
+
+    paths = find_screenshots(product, verbose=verbose)
+    if verbose:
+        print(f"\n🔍 Analyzing {len(paths)} {product.name} screenshots from {product.screenshot_dir}...")
+
+    analyses = analyze_screenshots(
+        paths, product.screen_prompt, client, cache=cache,
+        max_concurrency=max_concurrency, max_tokens=product.screen_max_tokens, verbose=verbose
+    )
+    analyzed = [a for a in analyses if a.description is not None]
+
+    if product.steps_prompt is None:
+        write_descriptions(product.output_file, analyzed)
+        if verbose:
+            print(f"✅ Saved descriptions to {product.output_file}")
+            print(f"\n📋 Total screenshots analyzed: {len(analyzed)}")
+        return analyses
+
+    if verbose:
+        print(f"\n📋 Extracting product steps...")
+    try:
+        product_steps = extract_product_steps(
+            analyzed, product.steps_prompt, client, cache=cache, max_tokens=product.steps_max_tokens
+        )
+    except Exception as e:
+        print(f"   ❌ Error extracting steps: {e}")
+        import traceback
+        traceback.print_exc()
+        return None
+
+    write_steps_module(product.output_file, product.output_variable, product_steps, product.output_docstring)
+    if verbose:
+        print(f"   ✅ Extracted {len(product_steps)} product steps")
+        print(f"\n✅ Product steps saved to {product.output_file}")
+        print(f"\n📊 Steps extracted:")
+        for i, (step_name, step_def) in enumerate(product_steps.items(), 1):
+            print(f"   {i}. {step_name}")
+            print(f"      Description: {step_def.get('description', 'N/A')}")
+    return product_steps
@@ -24,8 +24,10 @@ import numpy as np
 from typing import Dict, List, Optional, Tuple
 from collections import Counter
 
-from load_dataset import load_and_sample
+from load_dataset import load_and_sample, open_persona_store, sample_row_indices, SIMULATION_COLUMNS
 from derive_features import (
+    FEATURE_SOURCE_COLUMNS,
+    derive_feature_subset,
     derive_urban_rural,
     derive_regional_cluster,
     derive_primary_language,
@@ -48,8 +50,9 @@ from behavioral_engine import (
     identify_failure_reason,
     STATE_VARIANTS
 )
-from dropsim_target_filter import TargetGroup, persona_matches_target
+from dropsim_target_filter import TargetGroup, target_group_mask
 from dropsim_context_graph import Event, EventTrace
+from dropsim_sharding import resolve_worker_count, split_into_shards, map_shards, SHARDS_PER_WORKER
 
 
 # ============================================================================
@@ -360,6 +363,371 @@ def extract_persona_meta(persona_row: pd.Series, derived: Dict) -> Dict:
     }
 
 
+# ============================================================================
+# Vectorized Target Pre-filter (raw columns → meta tags → mask)
+# ============================================================================
+
+# Meta tag -> raw columns / derived features its rule in extract_persona_meta reads
+META_TAG_RAW_COLUMNS = {
+    'sec_band': ['occupation', 'education_level'],
+    'urban_rural': [],
+    'age_bucket_label': ['age'],
+    'digital_skill_band': [],
+    'risk_attitude_label': [],
+    'intent_label': [],
+}
+META_TAG_FEATURES = {
+    'sec_band': [],
+    'urban_rural': ['urban_rural'],
+    'age_bucket_label': [],
+    'digital_skill_band': ['digital_literacy_score'],
+    'risk_attitude_label': [],
+    'intent_label': ['aspirational_score', 'digital_literacy_score'],
+}
+
+# Rows per batch when scanning the cached dataset for target-group matches
+TARGET_SCAN_BATCH_ROWS = 10000
+
+_SEC_HIGH_OCCUPATIONS = r'engineer|doctor|manager|professional'
+_SEC_MID_EDUCATION = r'graduate|post'
+
+
+def _lower_text(personas_df: pd.DataFrame, column: str) -> pd.Series:
+    """str(value).lower() per row ('' for a missing column), as the scalar rules read it."""
+    if column not in personas_df.columns:
+        return pd.Series('', index=pd.RangeIndex(len(personas_df)), dtype=object)
+    return pd.Series(personas_df[column].to_numpy(dtype=object)).map(str).str.lower()
+
+
+def meta_source_columns(tags: List[str]) -> List[str]:
+    """Raw persona columns needed to derive the given meta tags."""
+    columns = []
+    for tag in tags:
+        columns += META_TAG_RAW_COLUMNS[tag]
+        for feature in META_TAG_FEATURES[tag]:
+            columns += FEATURE_SOURCE_COLUMNS[feature]
+    return list(dict.fromkeys(columns))
+
+
+def derive_persona_meta_frame(personas_df: pd.DataFrame, tags: Optional[List[str]] = None) -> pd.DataFrame:
+    """
+    Vectorized extract_persona_meta for a frame of raw personas.
+    
+    Gives the same tags as convert_persona_to_compiled_priors(row)['meta'],
+    but derives only the features the requested tags depend on, so it can
+    run over raw rows before any priors are compiled.
+    
+    Args:
+        personas_df: Raw persona rows (at least meta_source_columns(tags))
+        tags: Meta tags to derive (None = all)
+    
+    Returns:
+        DataFrame with one column per tag and a fresh RangeIndex
+    """
+    if tags is None:
+        tags = list(META_TAG_FEATURES)
+    features = list(dict.fromkeys(f for tag in tags for f in META_TAG_FEATURES[tag]))
+    derived = derive_feature_subset(personas_df, features)
+    
+    meta = {}
+    for tag in tags:
+        if tag == 'sec_band':
+            occupation = _lower_text(personas_df, 'occupation')
+            education = _lower_text(personas_df, 'education_level')
+            meta[tag] = np.select(
+                [occupation.str.contains(_SEC_HIGH_OCCUPATIONS).to_numpy(dtype=bool),
+                 education.str.contains(_SEC_MID_EDUCATION).to_numpy(dtype=bool)],
+                ['high', 'mid'], default='low'
+            )
+        elif tag == 'urban_rural':
+            urban_rural = derived['urban_rural'].to_numpy()
+            meta[tag] = np.select(
+                [urban_rural == 'Metro', np.isin(urban_rural, ['Urban', 'Semi-Urban'])],
+                ['metro', 'tier2'], default='rural'
+            )
+        elif tag == 'age_bucket_label':
+            if 'age' in personas_df.columns:
+                age = personas_df['age'].to_numpy(dtype=float)
+            else:
+                age = np.full(len(personas_df), 40.0)
+            meta[tag] = np.select([age <= 25, age <= 45], ['young', 'middle'], default='senior')
+        elif tag == 'digital_skill_band':
+            digital = derived['digital_literacy_score'].to_numpy()
+            meta[tag] = np.select([digital >= 7, digital >= 4], ['high', 'medium'], default='low')
+        elif tag == 'risk_attitude_label':
+            # extract_persona_meta reads derived['trust_risk_orientation'], which the
+            # conversion never sets, so its default score of 5 always applies
+            meta[tag] = np.full(len(personas_df), 'balanced')
+        elif tag == 'intent_label':
+            intent = (derived['aspirational_score'].to_numpy() + derived['digital_literacy_score'].to_numpy()) / 2
+            meta[tag] = np.select([intent >= 7, intent >= 4], ['high', 'medium'], default='low')
+        else:
+            raise KeyError(f"Unknown meta tag: {tag}")
+    
+    return pd.DataFrame(
+        {tag: values.astype(object) for tag, values in meta.items()},
+        index=pd.RangeIndex(len(personas_df))
+    )
+
+
+def select_target_group_rows(
+    store,
+    target_group: TargetGroup,
+    n_personas: int,
+    min_matched: int,
+    seed: int,
+    batch_rows: int = TARGET_SCAN_BATCH_ROWS
+) -> np.ndarray:
+    """
+    Cached-dataset rows of the personas matching a target group, in one pass.
+    
+    Rows are visited in the seeded order load_and_sample draws from, so the
+    first n_personas visited are exactly the unfiltered sample: all of its
+    matches are kept, and the scan continues just until min_matched personas
+    matched (or the dataset runs out). Only the raw columns the active
+    filters read are loaded, and no row is visited twice.
+    
+    Args:
+        store: Open load_dataset.PersonaStore
+        target_group: TargetGroup filter
+        n_personas: Size of the unfiltered sample
+        min_matched: Number of matched personas to reach
+        seed: Sampling seed
+        batch_rows: Rows per scan batch after the initial sample
+    
+    Returns:
+        Row positions in the store, in draw order
+    """
+    tags = list(target_group.active_filters())
+    columns = meta_source_columns(tags)
+    order = sample_row_indices(store.num_rows, store.num_rows, seed)
+    
+    selected = []
+    n_selected = 0
+    start = 0
+    while start < len(order) and (start < n_personas or n_selected < min_matched):
+        stop = n_personas if start < n_personas else start + batch_rows
+        rows = order[start:stop]
+        if columns:
+            raw = store.take(rows, columns)
+        else:
+            raw = pd.DataFrame(index=pd.RangeIndex(len(rows)))
+        matched = rows[target_group_mask(derive_persona_meta_frame(raw, tags), target_group)]
+        if start >= n_personas:
+            # Top-up batches contribute only what is still missing
+            matched = matched[:min_matched - n_selected]
+        selected.append(matched)
+        n_selected += len(matched)
+        start = stop
+    
+    return np.concatenate(selected) if selected else np.array([], dtype=np.int64)
+
+
+# ============================================================================
+# Per-Persona Simulation
+# ============================================================================
+
+def simulate_compiled_persona(
+    persona: Dict,
+    product_steps: Dict,
+    state_variants: Dict
+) -> Dict:
+    """
+    Run every state variant of one compiled persona through the product flow.
+    
+    Deterministic (no random draws), so personas can be simulated in any
+    order or process.
+    
+    Returns:
+        Result row for the persona (trajectories include event traces)
+    """
+    # Get persona priors
+    priors = persona['priors']
+    
+    # Track trajectories for this persona
+    trajectories = []
+    exit_steps = []
+    failure_reasons = []
+    
+    # For each state variant
+    for variant_name, variant_def in state_variants.items():
+        # Initialize state (M = initialize(M_0_variant))
+        state = initialize_state(variant_name, priors)
+        
+        # Track journey
+        journey = []
+        exit_step = None
+        failure_reason = None
+        previous_step = None  # Track previous step for transition costs
+        
+        # Track events for context graph
+        events = []
+        
+        # Step through product flow
+        for step_index, (step_name, step_def) in enumerate(product_steps.items()):
+            # Ensure step_def is a dict (handle both dict and object formats)
+            if isinstance(step_def, dict):
+                step_dict = step_def
+            else:
+                # Convert object to dict
+                step_dict = {
+                    'cognitive_demand': getattr(step_def, 'cognitive_demand', 0.5),
+                    'effort_demand': getattr(step_def, 'effort_demand', 0.5),
+                    'risk_signal': getattr(step_def, 'risk_signal', 0.5),
+                    'irreversibility': getattr(step_def, 'irreversibility', 0),
+                    'delay_to_value': getattr(step_def, 'delay_to_value', 0),
+                    'explicit_value': getattr(step_def, 'explicit_value', 0.5),
+                    'reassurance_signal': getattr(step_def, 'reassurance_signal', 0.5),
+                    'authority_signal': getattr(step_def, 'authority_signal', 0.5)
+                }
+            
+            # Capture state_before
+            state_before = {
+                'cognitive_energy': state.cognitive_energy,
+                'perceived_risk': state.perceived_risk,
+                'perceived_effort': state.perceived_effort,
+                'perceived_value': state.perceived_value,
+                'perceived_control': state.perceived_control
+            }
+            
+            # Update state (M = update_state(M, step, persona))
+            # Pass previous_step for transition cost calculation
+            state, costs = update_state(state, step_dict, priors, previous_step=previous_step)
+            
+            # Capture state_after
+            state_after = {
+                'cognitive_energy': state.cognitive_energy,
+                'perceived_risk': state.perceived_risk,
+                'perceived_effort': state.perceived_effort,
+                'perceived_value': state.perceived_value,
+                'perceived_control': state.perceived_control
+            }
+            
+            # Check continuation (if not continue(M))
+            should_continue_result = should_continue(state, priors)
+            decision = "continue" if should_continue_result else "drop"
+            
+            # Identify dominant factor
+            if not should_continue_result:
+                failure_reason_enum = identify_failure_reason(costs)
+                dominant_factor = failure_reason_enum.value if failure_reason_enum else "multi-factor"
+            else:
+                dominant_factor = None
+            
+            # Create Event
+            event = Event(
+                step_id=step_name,
+                persona_id=persona['name'],
+                variant_id=variant_name,
+                state_before=state_before,
+                state_after=state_after,
+                cost_components={
+                    'cognitive_cost': costs.get('cognitive_cost', 0),
+                    'effort_cost': costs.get('effort_cost', 0),
+                    'risk_cost': costs.get('risk_cost', 0),
+                    'value_yield': costs.get('value_yield', 0) if 'value_yield' in costs else 0,
+                    'reassurance_yield': costs.get('reassurance_yield', 0) if 'reassurance_yield' in costs else 0,
+                    'value_decay': costs.get('value_decay', 0)
+                },
+                decision=decision,
+                dominant_factor=dominant_factor or "none",
+                timestep=step_index
+            )
+            events.append(event)
+            
+            # Record step
+            journey.append({
+                'step': step_name,
+                'cognitive_energy': state.cognitive_energy,
+                'perceived_risk': state.perceived_risk,
+                'perceived_effort': state.perceived_effort,
+                'perceived_value': state.perceived_value,
+                'perceived_control': state.perceived_control,
+                'costs': {
+                    'cognitive_cost': costs.get('cognitive_cost', 0),
+                    'effort_cost': costs.get('effort_cost', 0),
+                    'risk_cost': costs.get('risk_cost', 0),
+                    'value_yield': costs.get('value_yield', 0) if 'value_yield' in costs else 0,
+                    'reassurance_yield': costs.get('reassurance_yield', 0) if 'reassurance_yield' in costs else 0,
+                    'value_decay': costs.get('value_decay', 0)
+                },
+                'continue': should_continue_result
+            })
+            
+            # If dropped, break
+            if not should_continue_result:
+                exit_step = step_name
+                failure_reason = identify_failure_reason(costs)
+                break  # break from step loop
+            
+            # Update previous_step for next iteration
+            previous_step = step_dict
+        
+        # Create EventTrace
+        event_trace = EventTrace(
+            persona_id=persona['name'],
+            variant_id=variant_name,
+            events=events,
+            final_outcome="completed" if exit_step is None else "dropped"
+        )
+        
+        # Log trajectory
+        trajectories.append({
+            'variant': variant_name,
+            'journey': journey,
+            'exit_step': exit_step if exit_step else "Completed",
+            'failure_reason': failure_reason.value if failure_reason else None,
+            'completed': exit_step is None,
+            'event_trace': event_trace  # Include event trace
+        })
+        
+        exit_steps.append(exit_step if exit_step else "Completed")
+        if failure_reason:
+            failure_reasons.append(failure_reason.value)
+        else:
+            failure_reasons.append(None)
+    
+    # Aggregate results for this persona
+    exit_counter = Counter(exit_steps)
+    reason_counter = Counter([r for r in failure_reasons if r])
+    
+    if exit_counter:
+        dominant_exit = exit_counter.most_common(1)[0][0]
+        consistency = exit_counter.most_common(1)[0][1] / len(trajectories)
+    else:
+        dominant_exit = "Completed"
+        consistency = 1.0
+    
+    if reason_counter:
+        dominant_reason = reason_counter.most_common(1)[0][0]
+    else:
+        dominant_reason = None
+    
+    completed_count = sum(1 for t in trajectories if t['completed'])
+    
+    return {
+        'persona_name': persona['name'],
+        'persona_description': persona['description'],
+        'dominant_exit_step': dominant_exit,
+        'dominant_failure_reason': dominant_reason,
+        'consistency_score': consistency,
+        'variants_completed': completed_count,
+        'variants_total': len(trajectories),
+        'trajectories': trajectories,
+        'priors': priors,
+        'meta': persona['meta']
+    }
+
+
+def _simulate_compiled_personas(
+    personas: List[Dict],
+    product_steps: Dict,
+    state_variants: Dict
+) -> List[Dict]:
+    """Simulate one shard of compiled personas, preserving order (process-pool worker)."""
+    return [simulate_compiled_persona(p, product_steps, state_variants) for p in personas]
+
+
 # ============================================================================
 # Main Simulation Runner
 # ============================================================================
@@ -372,7 +740,8 @@ def run_simulation_with_database_personas(
     seed: int = 42,
     data_dir: str = "./nemotron_personas_india_data/data",
     verbose: bool = True,
-    min_matched: int = 1000
+    min_matched: int = 1000,
+    n_workers: int = 1
 ) -> pd.DataFrame:
     """
     Main simulation runner: Load personas from database and run behavioral simulation.
@@ -395,6 +764,9 @@ def run_simulation_with_database_personas(
         seed: Random seed for persona sampling
         data_dir: Path to personas dataset
         verbose: Print progress
+        n_workers: Worker processes for the simulation step; >1 shards the
+            personas across a process pool (None/0 = all cores). Results are
+            merged in persona order and identical to a 1-worker run.
     
     Returns:
         DataFrame with simulation results (one row per persona)
@@ -410,15 +782,32 @@ def run_simulation_with_database_personas(
     
     # Step 1: Load personas from database
     try:
-        personas_df, metadata = load_and_sample(
-            n=n_personas,
-            seed=seed,
-            language="en_IN",
-            data_dir=data_dir,
-            validate=False,
-            verbose=verbose,
-            use_huggingface=True  # Use Hugging Face datasets library for full dataset access
-        )
+        if target_group:
+            # Target-group filters run on the raw columns first: only matched
+            # personas are loaded in full and compiled below
+            store = open_persona_store(
+                language="en_IN",
+                data_dir=data_dir,
+                use_huggingface=True,
+                verbose=verbose
+            )
+            if verbose:
+                print(f"\n🎯 Filtering personas by target group...")
+                print(f"   Filters: {target_group.to_dict()}")
+                print(f"   Target: At least {min_matched:,} matched personas")
+            rows = select_target_group_rows(store, target_group, n_personas, min_matched, seed)
+            personas_df = store.take(rows, SIMULATION_COLUMNS)
+        else:
+            personas_df, metadata = load_and_sample(
+                n=n_personas,
+                seed=seed,
+                language="en_IN",
+                data_dir=data_dir,
+                validate=False,
+                verbose=verbose,
+                use_huggingface=True,  # Use Hugging Face datasets library for full dataset access
+                columns=SIMULATION_COLUMNS  # Memory-mapped cache: read only what the engine uses
+            )
     except Exception as e:
         if verbose:
             print(f"❌ Error loading personas: {e}")
@@ -445,100 +834,10 @@ def run_simulation_with_database_personas(
     if verbose:
         print(f"✅ Converted {len(compiled_personas):,} personas")
     
-    # Step 3: Filter by target group if provided, ensuring minimum matched personas
+    # Step 3: Check the target group yielded enough matched personas
     if target_group:
-        if verbose:
-            print(f"\n🎯 Filtering personas by target group...")
-            print(f"   Before: {len(compiled_personas):,} personas")
-            print(f"   Target: At least {min_matched:,} matched personas")
-        
-        filtered_personas = []
-        for persona in compiled_personas:
-            if persona_matches_target(persona['meta'], target_group):
-                filtered_personas.append(persona)
-        
-        # If we don't have enough matched personas, sample more from database
-        # Keep sampling until we have exactly min_matched personas
-        max_attempts = 20  # Maximum number of resampling attempts
-        attempt = 0
-        
-        while len(filtered_personas) < min_matched and attempt < max_attempts:
-            attempt += 1
-            additional_needed = min_matched - len(filtered_personas)
-            
-            if verbose:
-                print(f"   Matched: {len(filtered_personas):,} personas (need {min_matched:,})")
-                print(f"   Resampling attempt {attempt}/{max_attempts} to reach {min_matched:,}...")
-            
-            # Estimate match rate from current results
-            if len(compiled_personas) > 0:
-                match_rate = len(filtered_personas) / len(compiled_personas)
-                # If match rate is very low, sample more aggressively
-                if match_rate < 0.1:
-                    sample_multiplier = 20  # Sample 20x more if match rate < 10%
-                elif match_rate < 0.3:
-                    sample_multiplier = 10  # Sample 10x more if match rate < 30%
-                else:
-                    sample_multiplier = 5   # Sample 5x more otherwise
-            else:
-                sample_multiplier = 10  # Default multiplier
-            
-            # Calculate how many to sample based on match rate
-            sample_size = max(10000, int(additional_needed * sample_multiplier))
-            
-            if verbose:
-                print(f"   Sampling {sample_size:,} additional personas (estimated match rate: {match_rate*100:.1f}%)...")
-            
-            # Sample in batches for efficiency
-            batch_size = 10000
-            batches_needed = (sample_size + batch_size - 1) // batch_size
-            
-            for batch_num in range(batches_needed):
-                if len(filtered_personas) >= min_matched:
-                    break
-                
-                current_batch_size = min(batch_size, sample_size - (batch_num * batch_size))
-                if current_batch_size <= 0:
-                    break
-                
-                if verbose and batch_num % 3 == 0:
-                    print(f"      Batch {batch_num + 1}/{batches_needed}... ({len(filtered_personas):,}/{min_matched:,} matched)")
-                
-                additional_df, _ = load_and_sample(
-                    n=current_batch_size,
-                    seed=seed + attempt * 1000 + batch_num,  # Different seed for each batch
-                    language="en_IN",
-                    data_dir=data_dir,
-                    validate=False,
-                    verbose=False,
-                    use_huggingface=True
-                )
-                
-                # Convert and filter additional personas
-                for idx, row in additional_df.iterrows():
-                    if len(filtered_personas) >= min_matched:
-                        break
-                    try:
-                        persona = convert_persona_to_compiled_priors(row, verbose=False)
-                        if persona_matches_target(persona['meta'], target_group):
-                            filtered_personas.append(persona)
-                    except Exception:
-                        continue
-            
-            if verbose:
-                print(f"   After attempt {attempt}: {len(filtered_personas):,}/{min_matched:,} matched personas")
-        
-        if len(filtered_personas) < min_matched:
-            if verbose:
-                print(f"⚠️  WARNING: Could only match {len(filtered_personas):,} personas (target: {min_matched:,})")
-                print(f"   Consider relaxing target group filters or increasing max_attempts")
-        elif verbose:
-            print(f"✅ Successfully matched {len(filtered_personas):,} personas (target: {min_matched:,})")
-        
-        compiled_personas = filtered_personas
-        
-        if verbose:
-            print(f"   Final matched: {len(compiled_personas):,} personas")
+        if verbose and len(compiled_personas) >= min_matched:
+            print(f"✅ Successfully matched {len(compiled_personas):,} personas (target: {min_matched:,})")
         
         if len(compiled_personas) == 0:
             if verbose:
@@ -581,185 +880,25 @@ def run_simulation_with_database_personas(
         print(f"   Product steps: {len(product_steps)}")
         print(f"   Total trajectories: {len(compiled_personas) * len(state_variants):,}")
     
-    all_results = []
-    
-    for persona in compiled_personas:
-        # Get persona priors
-        priors = persona['priors']
-        
-        # Track trajectories for this persona
-        trajectories = []
-        exit_steps = []
-        failure_reasons = []
-        
-        # For each state variant
-        for variant_name, variant_def in state_variants.items():
-            # Initialize state (M = initialize(M_0_variant))
-            state = initialize_state(variant_name, priors)
-            
-            # Track journey
-            journey = []
-            exit_step = None
-            failure_reason = None
-            previous_step = None  # Track previous step for transition costs
-            
-            # Track events for context graph
-            events = []
-            
-            # Step through product flow
-            for step_index, (step_name, step_def) in enumerate(product_steps.items()):
-                # Ensure step_def is a dict (handle both dict and object formats)
-                if isinstance(step_def, dict):
-                    step_dict = step_def
-                else:
-                    # Convert object to dict
-                    step_dict = {
-                        'cognitive_demand': getattr(step_def, 'cognitive_demand', 0.5),
-                        'effort_demand': getattr(step_def, 'effort_demand', 0.5),
-                        'risk_signal': getattr(step_def, 'risk_signal', 0.5),
-                        'irreversibility': getattr(step_def, 'irreversibility', 0),
-                        'delay_to_value': getattr(step_def, 'delay_to_value', 0),
-                        'explicit_value': getattr(step_def, 'explicit_value', 0.5),
-                        'reassurance_signal': getattr(step_def, 'reassurance_signal', 0.5),
-                        'authority_signal': getattr(step_def, 'authority_signal', 0.5)
-                    }
-                
-                # Capture state_before
-                state_before = {
-                    'cognitive_energy': state.cognitive_energy,
-                    'perceived_risk': state.perceived_risk,
-                    'perceived_effort': state.perceived_effort,
-                    'perceived_value': state.perceived_value,
-                    'perceived_control': state.perceived_control
-                }
-                
-                # Update state (M = update_state(M, step, persona))
-                # Pass previous_step for transition cost calculation
-                state, costs = update_state(state, step_dict, priors, previous_step=previous_step)
-                
-                # Capture state_after
-                state_after = {
-                    'cognitive_energy': state.cognitive_energy,
-                    'perceived_risk': state.perceived_risk,
-                    'perceived_effort': state.perceived_effort,
-                    'perceived_value': state.perceived_value,
-                    'perceived_control': state.perceived_control
-                }
-                
-                # Check continuation (if not continue(M))
-                should_continue_result = should_continue(state, priors)
-                decision = "continue" if should_continue_result else "drop"
-                
-                # Identify dominant factor
-                if not should_continue_result:
-                    failure_reason_enum = identify_failure_reason(costs)
-                    dominant_factor = failure_reason_enum.value if failure_reason_enum else "multi-factor"
-                else:
-                    dominant_factor = None
-                
-                # Create Event
-                event = Event(
-                    step_id=step_name,
-                    persona_id=persona['name'],
-                    variant_id=variant_name,
-                    state_before=state_before,
-                    state_after=state_after,
-                    cost_components={
-                        'cognitive_cost': costs.get('cognitive_cost', 0),
-                        'effort_cost': costs.get('effort_cost', 0),
-                        'risk_cost': costs.get('risk_cost', 0),
-                        'value_yield': costs.get('value_yield', 0) if 'value_yield' in costs else 0,
-                        'reassurance_yield': costs.get('reassurance_yield', 0) if 'reassurance_yield' in costs else 0,
-                        'value_decay': costs.get('value_decay', 0)
-                    },
-                    decision=decision,
-                    dominant_factor=dominant_factor or "none",
-                    timestep=step_index
-                )
-                events.append(event)
-                
-                # Record step
-                journey.append({
-                    'step': step_name,
-                    'cognitive_energy': state.cognitive_energy,
-                    'perceived_risk': state.perceived_risk,
-                    'perceived_effort': state.perceived_effort,
-                    'perceived_value': state.perceived_value,
-                    'perceived_control': state.perceived_control,
-                    'costs': {
-                        'cognitive_cost': costs.get('cognitive_cost', 0),
-                        'effort_cost': costs.get('effort_cost', 0),
-                        'risk_cost': costs.get('risk_cost', 0),
-                        'value_yield': costs.get('value_yield', 0) if 'value_yield' in costs else 0,
-                        'reassurance_yield': costs.get('reassurance_yield', 0) if 'reassurance_yield' in costs else 0,
-                        'value_decay': costs.get('value_decay', 0)
-                    },
-                    'continue': should_continue_result
-                })
-                
-                # If dropped, break
-                if not should_continue_result:
-                    exit_step = step_name
-                    failure_reason = identify_failure_reason(costs)
-                    break  # break from step loop
-                
-                # Update previous_step for next iteration
-                previous_step = step_dict
-            
-            # Create EventTrace
-            event_trace = EventTrace(
-                persona_id=persona['name'],
-                variant_id=variant_name,
-                events=events,
-                final_outcome="completed" if exit_step is None else "dropped"
+    workers = resolve_worker_count(n_workers)
+    if workers == 1:
+        all_results = _simulate_compiled_personas(compiled_personas, product_steps, state_variants)
+    else:
+        shards = [
+            compiled_personas[shard]
+            for shard in split_into_shards(len(compiled_personas), workers * SHARDS_PER_WORKER)
+        ]
+        if verbose:
+            print(f"   Workers: {workers} ({len(shards)} shards)")
+        # Partial results come back in shard order, i.e. persona order
+        all_results = [
+            result
+            for shard_results in map_shards(
+                _simulate_compiled_personas, shards, workers,
+                product_steps=product_steps, state_variants=state_variants
             )
-            
-            # Log trajectory
-            trajectories.append({
-                'variant': variant_name,
-                'journey': journey,
-                'exit_step': exit_step if exit_step else "Completed",
-                'failure_reason': failure_reason.value if failure_reason else None,
-                'completed': exit_step is None,
-                'event_trace': event_trace  # Include event trace
-            })
-            
-            exit_steps.append(exit_step if exit_step else "Completed")
-            if failure_reason:
-                failure_reasons.append(failure_reason.value)
-            else:
-                failure_reasons.append(None)
-        
-        # Aggregate results for this persona
-        exit_counter = Counter(exit_steps)
-        reason_counter = Counter([r for r in failure_reasons if r])
-        
-        if exit_counter:
-            dominant_exit = exit_counter.most_common(1)[0][0]
-            consistency = exit_counter.most_common(1)[0][1] / len(trajectories)
-        else:
-            dominant_exit = "Completed"
-            consistency = 1.0
-        
-        if reason_counter:
-            dominant_reason = reason_counter.most_common(1)[0][0]
-        else:
-            dominant_reason = None
-        
-        completed_count = sum(1 for t in trajectories if t['completed'])
-        
-        all_results.append({
-            'persona_name': persona['name'],
-            'persona_description': persona['description'],
-            'dominant_exit_step': dominant_exit,
-            'dominant_failure_reason': dominant_reason,
-            'consistency_score': consistency,
-            'variants_completed': completed_count,
-            'variants_total': len(trajectories),
-            'trajectories': trajectories,
-            'priors': priors,
-            'meta': persona['meta']
-        })
+            for result in shard_results
+        ]
     
     # Step 5: Build context graph from all event traces
     if verbose:
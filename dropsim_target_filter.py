@@ -9,11 +9,25 @@ from typing import Dict, List, Optional, Literal
 from dataclasses import dataclass
 import json
 
+import numpy as np
+import pandas as pd
+
 
 # ============================================================================
 # Target Group Schema
 # ============================================================================
 
+# TargetGroup field -> persona meta tag it filters on
+TARGET_META_TAGS = {
+    'sec': 'sec_band',
+    'urban_rural': 'urban_rural',
+    'age_bucket': 'age_bucket_label',
+    'digital_skill': 'digital_skill_band',
+    'risk_attitude': 'risk_attitude_label',
+    'intent': 'intent_label',
+}
+
+
 @dataclass
 class TargetGroup:
     """Target group filter criteria."""
@@ -52,6 +66,14 @@ class TargetGroup:
         if self.intent:
             result['intent'] = self.intent
         return result
+    
+    def active_filters(self) -> Dict[str, List[str]]:
+        """Meta tag -> allowed values, for the fields that are set."""
+        return {
+            tag: list(getattr(self, field))
+            for field, tag in TARGET_META_TAGS.items()
+            if getattr(self, field) is not None
+        }
 
 
 # ============================================================================
@@ -117,6 +139,30 @@ def persona_matches_target(
     return True
 
 
+def target_group_mask(
+    persona_meta: pd.DataFrame,
+    target: Optional[TargetGroup]
+) -> np.ndarray:
+    """
+    Vectorized persona_matches_target over a frame of meta tags.
+    
+    Args:
+        persona_meta: DataFrame with one meta tag column per active filter
+            (columns for inactive filters may be missing)
+        target: TargetGroup filter (None = no filter, match all)
+    
+    Returns:
+        Boolean array, True where the persona matches all specified filters
+    """
+    mask = np.ones(len(persona_meta), dtype=bool)
+    if target is None:
+        return mask
+    
+    for tag, allowed in target.active_filters().items():
+        mask &= persona_meta[tag].isin(allowed).to_numpy(dtype=bool)
+    return mask
+
+
 def load_target_group(filepath: str) -> TargetGroup:
     """Load target group from JSON file."""
     with open(filepath, 'r') as f:
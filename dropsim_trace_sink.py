@@ -0,0 +1,212 @@
+"""
+dropsim_trace_sink.py - Streaming Trajectory Sinks
+
+Without a sink, run_intent_aware_simulation keeps every trajectory (journey,
+decision traces, intent frame) in the 'trajectories' column until the run
+ends, so memory grows with personas x variants x steps. With a sink, the
+engine hands trajectories over in bounded batches (TRACE_SINK_BATCH_PERSONAS
+personas at a time) and drops them; the result DataFrame keeps only the
+per-persona summaries and a handle to the sink in
+result_df.attrs['trace_sink'].
+
+Every sink counts outcomes as trajectories pass through, so completion and
+drop-off metrics (TraceSink.metrics()) are available whatever the sink
+persists:
+- AggregatingTraceSink: counters only, nothing persisted
+- NDJSONTraceSink: one JSON trajectory per line
+- ParquetTraceSink: one row group per batch (pyarrow)
+
+Sinks are written from the parent process only (sharded runs ship each
+shard's trajectories back and the parent writes them in persona order), so
+they need not be picklable. The caller owns the sink: close it (or use it
+as a context manager) once the run is done.
+"""
+
+import json
+from collections import Counter
+from enum import Enum
+from typing import Any, Dict, Iterator, List
+
+
+# Personas simulated (and trajectories kept) between two sink writes
+TRACE_SINK_BATCH_PERSONAS = 256
+
+# Trajectory fields stored as columns by ParquetTraceSink; everything else
+# goes into its JSON 'payload' column
+PARQUET_COLUMNS = [
+    'persona_index', 'persona_id', 'variant', 'intent_id',
+    'exit_step', 'failure_reason', 'completed', 'steps_entered'
+]
+
+
+def _json_default(value: Any) -> Any:
+    """JSON fallback for decision traces, enums and numpy scalars."""
+    if hasattr(value, 'to_dict'):
+        return value.to_dict()
+    if isinstance(value, Enum):
+        return value.value
+    if hasattr(value, 'item'):
+        return value.item()
+    if isinstance(value, (set, frozenset)):
+        return sorted(value)
+    return str(value)
+
+
+def _steps_entered(trajectory: Dict) -> int:
+    if 'steps_entered' in trajectory:
+        return trajectory['steps_entered']
+    return len(trajectory.get('journey', []))
+
+
+class TraceSink:
+    """
+    Base sink: counts outcomes, persists nothing.
+
+    Subclasses persist trajectories in _write(); write() counts them first.
+    """
+
+    def __init__(self):
+        self.n_trajectories = 0
+        self.completed = 0
+        self.exit_counts: Counter = Counter()  # exit step -> drop-offs
+        self.depth_counts: Counter = Counter()  # steps entered -> trajectories
+        self.failure_reasons: Counter = Counter()
+
+    def write(self, trajectories: List[Dict]):
+        """Count and persist one batch of trajectories (each tagged with 'persona_index')."""
+        for trajectory in trajectories:
+            self.n_trajectories += 1
+            if trajectory['completed']:
+                self.completed += 1
+            else:
+                self.exit_counts[trajectory['exit_step']] += 1
+            self.depth_counts[_steps_entered(trajectory)] += 1
+            if trajectory.get('failure_reason'):
+                self.failure_reasons[trajectory['failure_reason']] += 1
+        self._write(trajectories)
+
+    def _write(self, trajectories: List[Dict]):
+        pass
+
+    def close(self):
+        """Flush and release any file the sink writes to."""
+
+    def __enter__(self) -> 'TraceSink':
+        return self
+
+    def __deepcopy__(self, memo) -> 'TraceSink':
+        # Shared, not copied: pandas deep-copies attrs on every derived frame,
+        # and file-backed sinks hold an open handle
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def metrics(self, product_steps: Dict) -> Dict:
+        """Same dict as extract_simulated_metrics_from_results over the written trajectories."""
+        step_names = list(product_steps.keys())
+        total = self.n_trajectories
+        # Trajectories entering step k: those that entered more than k steps
+        entered = [
+            sum(count for depth, count in self.depth_counts.items() if depth > k)
+            for k in range(len(step_names))
+        ]
+        dropoff_by_step = {
+            name: self.exit_counts.get(name, 0) / entered[k] if entered[k] > 0 else 0.0
+            for k, name in enumerate(step_names)
+        }
+        steps_completed = sum(depth * count for depth, count in self.depth_counts.items())
+        return {
+            'completion_rate': self.completed / total if total > 0 else 0.0,
+            'dropoff_by_step': dropoff_by_step,
+            'avg_steps_completed': steps_completed / total if total > 0 else 0.0,
+            'total_trajectories': total,
+            'completed_trajectories': self.completed
+        }
+
+
+class AggregatingTraceSink(TraceSink):
+    """In-memory aggregator: outcome counters only, trajectories are discarded."""
+
+
+class NDJSONTraceSink(TraceSink):
+    """Writes one JSON trajectory per line (decision traces as dicts)."""
+
+    def __init__(self, path: str):
+        super().__init__()
+        self.path = path
+        self._file = open(path, 'w')
+
+    def _write(self, trajectories: List[Dict]):
+        for trajectory in trajectories:
+            self._file.write(json.dumps(trajectory, default=_json_default))
+            self._file.write('\n')
+        self._file.flush()
+
+    def close(self):
+        if not self._file.closed:
+            self._file.close()
+
+    def iter_trajectories(self) -> Iterator[Dict]:
+        """Trajectories written so far, in write order."""
+        with open(self.path) as f:
+            for line in f:
+                yield json.loads(line)
+
+
+class ParquetTraceSink(TraceSink):
+    """
+    Writes each batch as one Parquet row group.
+
+    PARQUET_COLUMNS are real columns (so outcome queries read only them);
+    the rest of each trajectory is a JSON string in 'payload'.
+    """
+
+    def __init__(self, path: str):
+        import pyarrow as pa
+
+        super().__init__()
+        self.path = path
+        self.schema = pa.schema([
+            ('persona_index', pa.int64()),
+            ('persona_id', pa.string()),
+            ('variant', pa.string()),
+            ('intent_id', pa.string()),
+            ('exit_step', pa.string()),
+            ('failure_reason', pa.string()),
+            ('completed', pa.bool_()),
+            ('steps_entered', pa.int32()),
+            ('payload', pa.string())
+        ])
+        self._writer = None
+
+    def _write(self, trajectories: List[Dict]):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        if not trajectories:
+            return
+        if self._writer is None:
+            self._writer = pq.ParquetWriter(self.path, self.schema)
+        columns = {name: [t.get(name) for t in trajectories] for name in PARQUET_COLUMNS}
+        columns['steps_entered'] = [_steps_entered(t) for t in trajectories]
+        columns['payload'] = [
+            json.dumps({k: v for k, v in t.items() if k not in PARQUET_COLUMNS}, default=_json_default)
+            for t in trajectories
+        ]
+        self._writer.write_table(pa.table(columns, schema=self.schema))
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+    def iter_trajectories(self) -> Iterator[Dict]:
+        """Trajectories of a closed sink, one row group at a time."""
+        import pyarrow.parquet as pq
+
+        parquet_file = pq.ParquetFile(self.path)
+        for i in range(parquet_file.num_row_groups):
+            for row in parquet_file.read_row_group(i).to_pylist():
+                payload = json.loads(row.pop('payload'))
+                yield {**row, **payload}
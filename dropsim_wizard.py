@@ -26,6 +26,7 @@ except ImportError:
 from dropsim_visualization_data import build_step_level_series
 from dropsim_simulation_runner import run_simulation_with_database_personas
 from dropsim_aggregation_v2 import aggregate_simulation_results, format_aggregated_results
+from concurrent.futures import ThreadPoolExecutor
 import json
 import re
 
@@ -344,7 +345,9 @@ def consolidate_product_context(
     Deterministically merges URL, product_text, and screenshot_texts
     into one LLM-ready 'product_context' string with clear section headers.
     
-    Uses LLM to analyze Firecrawl content for better extraction.
+    Uses LLM to analyze Firecrawl content for better extraction. The
+    screenshot analysis is independent of the website fetch/analysis, so it
+    runs concurrently with it; section order is unchanged.
     
     Args:
         input: WizardInput object
@@ -356,63 +359,68 @@ def consolidate_product_context(
         Consolidated product context string
     """
     parts = []
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        screenshot_analysis = None
+        if input.screenshot_texts and llm_client:
+            screenshot_analysis = executor.submit(
+                analyze_screenshots_with_llm,
+                input.screenshot_texts,
+                llm_client,
+                verbose=verbose
+            )
     
-    # Product URL - fetch content if Firecrawl key provided
-    if input.product_url:
-        parts.append("## PRODUCT_URL")
-        parts.append(input.product_url)
-        parts.append("")
+        # Product URL - fetch content if Firecrawl key provided
+        if input.product_url:
+            parts.append("## PRODUCT_URL")
+            parts.append(input.product_url)
+            parts.append("")
         
-        # Fetch content from URL if Firecrawl key is available
-        if firecrawl_api_key:
-            try:
-                fetched_content = fetch_product_content_with_firecrawl(input.product_url, firecrawl_api_key)
-                if fetched_content and not fetched_content.startswith("Error"):
-                    # Analyze crawled content with LLM if client provided
-                    if llm_client:
-                        analyzed_content = analyze_crawled_content_with_llm(
-                            fetched_content,
-                            llm_client,
-                            verbose=verbose
-                        )
-                        parts.append("## PRODUCT_WEBSITE_ANALYSIS")
-                        parts.append("(LLM-analyzed content from Firecrawl crawl)")
-                        parts.append(analyzed_content)
-                        parts.append("")
-                        parts.append("## PRODUCT_WEBSITE_RAW_CONTENT")
-                        parts.append("(Original crawled content for reference)")
-                        parts.append(fetched_content[:2000])  # Include first 2000 chars as reference
-                        parts.append("")
-                    else:
-                        parts.append("## PRODUCT_WEBSITE_CONTENT")
-                        parts.append("(Content fetched from URL using Firecrawl)")
-                        parts.append(fetched_content)
-                        parts.append("")
-            except Exception as e:
-                # Continue without fetched content if there's an error
-                parts.append(f"## NOTE: Could not fetch content from URL ({str(e)})")
-                parts.append("")
-    
-    # Product text (main description)
-    if input.product_text:
-        parts.append("## PRODUCT_TEXT")
-        parts.append(input.product_text.strip())
-        parts.append("")
+            # Fetch content from URL if Firecrawl key is available
+            if firecrawl_api_key:
+                try:
+                    fetched_content = fetch_product_content_with_firecrawl(input.product_url, firecrawl_api_key)
+                    if fetched_content and not fetched_content.startswith("Error"):
+                        # Analyze crawled content with LLM if client provided
+                        if llm_client:
+                            analyzed_content = analyze_crawled_content_with_llm(
+                                fetched_content,
+                                llm_client,
+                                verbose=verbose
+                            )
+                            parts.append("## PRODUCT_WEBSITE_ANALYSIS")
+                            parts.append("(LLM-analyzed content from Firecrawl crawl)")
+                            parts.append(analyzed_content)
+                            parts.append("")
+                            parts.append("## PRODUCT_WEBSITE_RAW_CONTENT")
+                            parts.append("(Original crawled content for reference)")
+                            parts.append(fetched_content[:2000])  # Include first 2000 chars as reference
+                            parts.append("")
+                        else:
+                            parts.append("## PRODUCT_WEBSITE_CONTENT")
+                            parts.append("(Content fetched from URL using Firecrawl)")
+                            parts.append(fetched_content)
+                            parts.append("")
+                except Exception as e:
+                    # Continue without fetched content if there's an error
+                    parts.append(f"## NOTE: Could not fetch content from URL ({str(e)})")
+                    parts.append("")
     
-    # Screenshot texts (analyze with LLM if provided and LLM client available)
-    if input.screenshot_texts and llm_client:
-        # Analyze screenshots with LLM first
-        analyzed_screenshots = analyze_screenshots_with_llm(
-            input.screenshot_texts,
-            llm_client,
-            verbose=verbose
-        )
-        if analyzed_screenshots:
-            parts.append("## PRODUCT_SCREENSHOT_ANALYSIS")
-            parts.append("(LLM-analyzed flow from screenshots)")
-            parts.append(analyzed_screenshots)
+        # Product text (main description)
+        if input.product_text:
+            parts.append("## PRODUCT_TEXT")
+            parts.append(input.product_text.strip())
             parts.append("")
     
+        # Screenshot texts (analyze with LLM if provided and LLM client available)
+        if screenshot_analysis is not None:
+            # Screenshot analysis (started above, alongside the website fetch)
+            analyzed_screenshots = screenshot_analysis.result()
+            if analyzed_screenshots:
+                parts.append("## PRODUCT_SCREENSHOT_ANALYSIS")
+                parts.append("(LLM-analyzed flow from screenshots)")
+                parts.append(analyzed_screenshots)
+                parts.append("")
+    
     # Also include raw screenshot texts for reference
     if input.screenshot_texts:
         for i, screenshot_text in enumerate(input.screenshot_texts, 1):
@@ -993,8 +1001,7 @@ def run_fintech_wizard(
         
         # Add to context graph v2
         context_graph = ContextGraphV2()
-        for trace in decision_traces:
-            context_graph.add_decision_trace(trace)
+        context_graph.add_decision_traces(decision_traces)
         
         # Get graph delta (new nodes/edges)
         # Use timestamp from start of run if available, otherwise use 24 hours ago
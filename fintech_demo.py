@@ -28,6 +28,8 @@ from behavioral_aggregator import (
 )
 import pandas as pd
 
+from dropsim_outcome_matrix import OutcomeMatrix, attach_outcome_matrix
+
 
 def create_persona_dataframe(personas: List[Dict]) -> pd.DataFrame:
     """
@@ -217,6 +219,9 @@ def run_fintech_demo_simulation(
     # Merge results
     results_df = pd.DataFrame(all_results)
     final_df = pd.concat([df.reset_index(drop=True), results_df], axis=1)
+    attach_outcome_matrix(final_df, OutcomeMatrix.from_trajectories(
+        [r['trajectories'] for r in all_results], list(product_steps.keys())
+    ))
     
     if verbose:
         print(f"\n✅ Fintech demo simulation complete!")
@@ -14,12 +14,11 @@ This creates much richer, more realistic simulation outputs.
 
 import os
 import json
-import time
 import random
 from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass
 import pandas as pd
-from openai import OpenAI
+from dropsim_llm_client import LLMClient, ManagedLLMClient, OpenAILLMClient, create_llm_client
 
 # ============================================================================
 # CONFIGURATION
@@ -56,6 +55,18 @@ JOURNEY STEPS:
 KEY FRICTION: No direct apply = extra effort to actually get the card
 """
 
+# System message and request options for every simulation call
+SIMULATION_SYSTEM_PROMPT = "You are an expert in Indian consumer behavior and fintech adoption. Generate realistic, culturally-authentic simulations."
+SIMULATION_REQUEST = {
+    'system': SIMULATION_SYSTEM_PROMPT,
+    'response_format': {"type": "json_object"},
+    'temperature': 0.7,
+    'max_tokens': 1000
+}
+
+# Default concurrency for run_llm_simulation (requests in flight)
+DEFAULT_MAX_CONCURRENCY = 8
+
 # Refusal primitives
 REFUSAL_PRIMITIVES = """
 REFUSAL PRIMITIVES (choose exactly ONE that dominates, or "None" if engaged):
@@ -73,12 +84,21 @@ REFUSAL PRIMITIVES (choose exactly ONE that dominates, or "None" if engaged):
 # LLM CLIENT
 # ============================================================================
 
-def get_openai_client() -> OpenAI:
-    """Initialize OpenAI client."""
+def get_openai_client(
+    model: str = "gpt-4o-mini",
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+    requests_per_second: Optional[float] = None
+) -> LLMClient:
+    """Initialize OpenAI client (pooled, cached, rate-limited, retrying)."""
     api_key = os.environ.get("OPENAI_API_KEY")
     if not api_key:
         raise ValueError("OPENAI_API_KEY environment variable not set")
-    return OpenAI(api_key=api_key)
+    return create_llm_client(
+        api_key=api_key,
+        model=model,
+        max_concurrency=max_concurrency,
+        requests_per_second=requests_per_second
+    )
 
 
 # ============================================================================
@@ -193,7 +213,7 @@ Respond in this exact JSON format:
 # ============================================================================
 
 def simulate_persona_llm(
-    client: OpenAI,
+    client: LLMClient,
     row: pd.Series,
     derived: Dict,
     model: str = "gpt-4o-mini",
@@ -202,50 +222,39 @@ def simulate_persona_llm(
     """
     Simulate a single persona's journey using LLM.
     
+    Args:
+        client: An LLMClient (a raw openai.OpenAI client, or an LLMClient
+            without response validation, is wrapped in a ManagedLLMClient)
+    
     Returns:
         Dictionary with simulation results
     """
+    if not isinstance(client, LLMClient):
+        client = OpenAILLMClient(model=model, client=client)
+    if not isinstance(client, ManagedLLMClient):
+        client = ManagedLLMClient(client, max_retries=max_retries - 1)
+    
     persona_context = format_persona_context(row, derived)
     prompt = create_simulation_prompt(persona_context)
     
-    for attempt in range(max_retries):
-        try:
-            response = client.chat.completions.create(
-                model=model,
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are an expert in Indian consumer behavior and fintech adoption. Generate realistic, culturally-authentic simulations."
-                    },
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ],
-                response_format={"type": "json_object"},
-                temperature=0.7,
-                max_tokens=1000
-            )
-            
-            result = json.loads(response.choices[0].message.content)
-            return result
-            
-        except json.JSONDecodeError as e:
-            if attempt < max_retries - 1:
-                time.sleep(1)
-                continue
-            return {"error": f"JSON parse error: {e}"}
-            
-        except Exception as e:
-            if "rate_limit" in str(e).lower():
-                time.sleep(5)
-                continue
-            if attempt < max_retries - 1:
-                time.sleep(2)
-                continue
-            return {"error": str(e)}
-    
-    return {"error": "Max retries exceeded"}
+    try:
+        return json.loads(client.complete(prompt, validate=json.loads, model=model, **SIMULATION_REQUEST))
+    except json.JSONDecodeError as e:
+        return {"error": f"JSON parse error: {e}"}
+    except Exception as e:
+        return {"error": str(e)}
+
+
+def _parse_simulation_response(response) -> Dict:
+    """Parse one complete_many() slot (response text or exception) into a result dict."""
+    if isinstance(response, json.JSONDecodeError):
+        return {"error": f"JSON parse error: {response}"}
+    if isinstance(response, Exception):
+        return {"error": str(response)}
+    try:
+        return json.loads(response)
+    except json.JSONDecodeError as e:
+        return {"error": f"JSON parse error: {e}"}
 
 
 # ============================================================================
@@ -257,22 +266,32 @@ def run_llm_simulation(
     batch_size: int = 5,
     model: str = "gpt-4o-mini",
     verbose: bool = True,
-    sample_n: Optional[int] = None
+    sample_n: Optional[int] = None,
+    llm_client: Optional[LLMClient] = None,
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+    requests_per_second: Optional[float] = None
 ) -> pd.DataFrame:
     """
     Run LLM simulation on DataFrame.
     
+    All persona prompts are sent through one client concurrently
+    (max_concurrency in flight, optionally rate-limited); responses are
+    cached, so re-running the same personas makes no API calls.
+    
     Args:
         df: DataFrame with raw + derived features
-        batch_size: Process this many before sleeping (rate limit)
+        batch_size: Deprecated (ignored); use requests_per_second to rate limit
         model: OpenAI model to use
         verbose: Print progress
         sample_n: If set, only simulate this many personas (for testing)
+        llm_client: Client to use (default: get_openai_client())
+        max_concurrency: Requests in flight for the default client
+        requests_per_second: Rate limit for the default client
     
     Returns:
         DataFrame with LLM simulation results appended
     """
-    client = get_openai_client()
+    client = llm_client or get_openai_client(model, max_concurrency, requests_per_second)
     
     # Optionally sample
     if sample_n and sample_n < len(df):
@@ -282,7 +301,7 @@ def run_llm_simulation(
         print("🤖 Running LLM-Powered Journey Simulation")
         print(f"   Model: {model}")
         print(f"   Personas: {len(df)}")
-        print(f"   Batch size: {batch_size}")
+        print(f"   Concurrency: {getattr(client, 'max_concurrency', 1)}")
     
     # Derived feature columns
     derived_cols = [
@@ -299,15 +318,22 @@ def run_llm_simulation(
         'cc_relevance', 'cc_relevance_score'
     ]
     
+    prompts = []
+    for _, row in df.iterrows():
+        # Extract derived features
+        derived = {col: row[col] for col in derived_cols if col in row.index}
+        prompts.append(create_simulation_prompt(format_persona_context(row, derived)))
+    
+    # Run LLM simulation (concurrent; order preserved)
+    responses = client.complete_many(
+        prompts, validate=json.loads, return_exceptions=True, model=model, **SIMULATION_REQUEST
+    )
+    
     results = []
     errors = 0
     
-    for idx, row in df.iterrows():
-        # Extract derived features
-        derived = {col: row[col] for col in derived_cols if col in row.index}
-        
-        # Run LLM simulation
-        result = simulate_persona_llm(client, row, derived, model)
+    for idx, response in enumerate(responses):
+        result = _parse_simulation_response(response)
         
         if "error" in result:
             errors += 1
@@ -345,13 +371,6 @@ def run_llm_simulation(
             flat_result[f'llm_{step_key}_emotion'] = step_data.get('emotion', '')
         
         results.append(flat_result)
-        
-        if verbose and (idx + 1) % 10 == 0:
-            print(f"   Simulated {idx + 1}/{len(df)} personas")
-        
-        # Rate limiting
-        if (idx + 1) % batch_size == 0:
-            time.sleep(1)  # Pause between batches
     
     # Merge results
     results_df = pd.DataFrame(results)
@@ -16,17 +16,19 @@ Uses Hugging Face datasets library to load the full dataset directly.
 """
 
 import pandas as pd
+import numpy as np
 import glob
+import importlib.util
+import json
 import os
 import random
-from typing import Optional, List, Tuple
+from typing import Dict, Optional, List, Tuple
 import warnings
 
-try:
-    from datasets import load_dataset as hf_load_dataset
-    HF_AVAILABLE = True
-except ImportError:
-    HF_AVAILABLE = False
+# Only check that datasets is installed; importing it takes seconds, so
+# load_full_dataset imports it when it actually downloads
+HF_AVAILABLE = importlib.util.find_spec("datasets") is not None
+if not HF_AVAILABLE:
     warnings.warn(
         "Hugging Face datasets library not available. Install with: pip install datasets\n"
         "Falling back to local parquet file loading."
@@ -134,7 +136,7 @@ def load_full_dataset(
             
             # Load with progress tracking
             # The datasets library automatically shows download progress bars
-            from datasets import DownloadConfig
+            from datasets import DownloadConfig, load_dataset as hf_load_dataset
             from tqdm import tqdm
             
             # Configure download with progress tracking
@@ -289,13 +291,20 @@ def sample_personas(
     return sampled.reset_index(drop=True)
 
 
-def validate_dataset(df: pd.DataFrame) -> dict:
+def validate_dataset(df: pd.DataFrame, expected_columns: Optional[List[str]] = None) -> dict:
     """
     Validate dataset schema and data quality.
-    
+
+    Args:
+        df: Dataset (or sample) to validate
+        expected_columns: Columns that must be present (default EXPECTED_COLUMNS)
+
     Returns:
         Dictionary with validation results
     """
+    if expected_columns is None:
+        expected_columns = EXPECTED_COLUMNS
+
     validation = {
         "total_rows": len(df),
         "columns_present": list(df.columns),
@@ -306,7 +315,7 @@ def validate_dataset(df: pd.DataFrame) -> dict:
     }
     
     # Check for expected columns
-    for col in EXPECTED_COLUMNS:
+    for col in expected_columns:
         if col not in df.columns:
             validation["missing_columns"].append(col)
             validation["is_valid"] = False
@@ -329,6 +338,277 @@ def validate_dataset(df: pd.DataFrame) -> dict:
     return validation
 
 
+# ============================================================================
+# PERSISTENT PERSONA CACHE (memory-mapped Arrow)
+# ============================================================================
+#
+# The first load of a split is converted once into an uncompressed Arrow IPC
+# (Feather v2) file plus a JSON index of record-batch row offsets. Later
+# samples memory-map that file and read only the selected rows of the
+# requested columns; the open handle is reused for the life of the process.
+
+CACHE_DIR = "./nemotron_personas_india_data/cache"
+CACHE_BATCH_ROWS = 65536
+CACHE_FORMAT_VERSION = 1
+
+# Samples up to this fraction of the split are read row by row (zero-copy
+# slices); larger ones are gathered batch-wise
+SPARSE_TAKE_FRACTION = 0.125
+
+# Columns read by derive_features and the simulation engines
+SIMULATION_COLUMNS = [
+    'uuid',
+    'persona', 'professional_persona', 'sports_persona',
+    'arts_persona', 'travel_persona', 'culinary_persona',
+    'cultural_background', 'hobbies_and_interests', 'career_goals_and_ambitions',
+    'sex', 'age', 'marital_status', 'education_level', 'occupation',
+    'first_language', 'second_language', 'third_language',
+    'zone', 'state', 'district'
+]
+
+# Open stores, keyed by absolute cache file path
+_PERSONA_STORES: Dict[str, 'PersonaStore'] = {}
+
+
+def _cache_paths(cache_dir: str, language: str) -> Tuple[str, str]:
+    """(arrow file, index file) for a language split."""
+    return (
+        os.path.join(cache_dir, f"{language}.arrow"),
+        os.path.join(cache_dir, f"{language}.index.json")
+    )
+
+
+def _local_source_fingerprint(data_dir: str, language: str) -> List[List]:
+    """Name, size and mtime of the local parquet files (empty if there are none)."""
+    pattern = os.path.join(data_dir, f"{language}-*.parquet")
+    return [
+        [os.path.basename(path), os.path.getsize(path), os.path.getmtime(path)]
+        for path in sorted(glob.glob(pattern))
+    ]
+
+
+def _read_cache_index(index_path: str) -> Optional[dict]:
+    if not os.path.exists(index_path):
+        return None
+    try:
+        with open(index_path, 'r') as f:
+            index = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if index.get('format_version') != CACHE_FORMAT_VERSION:
+        return None
+    return index
+
+
+def build_persona_cache(
+    language: str = "en_IN",
+    data_dir: str = DATA_DIR,
+    cache_dir: str = CACHE_DIR,
+    use_huggingface: bool = True,
+    verbose: bool = True
+) -> str:
+    """
+    Convert a language split into the memory-mappable cache (one-time cost).
+
+    Loads the split with load_full_dataset(), writes it as an uncompressed
+    Arrow IPC file in CACHE_BATCH_ROWS-row record batches, and records the
+    batch row offsets and source fingerprint in a JSON index next to it.
+    Both files are written to temporary names and moved into place.
+
+    Returns:
+        Path of the Arrow file
+    """
+    import pyarrow as pa
+
+    arrow_path, index_path = _cache_paths(cache_dir, language)
+    os.makedirs(cache_dir, exist_ok=True)
+
+    full_df = load_full_dataset(data_dir, language, verbose=verbose, use_huggingface=use_huggingface)
+
+    if verbose:
+        print(f"💾 Building persona cache: {arrow_path}")
+
+    table = pa.Table.from_pandas(full_df, preserve_index=False)
+    del full_df
+
+    tmp_path = arrow_path + ".tmp"
+    with pa.OSFile(tmp_path, 'wb') as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table, max_chunksize=CACHE_BATCH_ROWS)
+
+    # Batch boundaries follow the table's chunks, so read them back
+    with pa.memory_map(tmp_path, 'r') as source:
+        reader = pa.ipc.open_file(source)
+        offsets = [0]
+        for i in range(reader.num_record_batches):
+            offsets.append(offsets[-1] + reader.get_batch(i).num_rows)
+
+    index = {
+        'format_version': CACHE_FORMAT_VERSION,
+        'language': language,
+        'num_rows': table.num_rows,
+        'columns': table.column_names,
+        'batch_offsets': offsets,
+        'source_files': _local_source_fingerprint(data_dir, language)
+    }
+    os.replace(tmp_path, arrow_path)
+    with open(index_path + ".tmp", 'w') as f:
+        json.dump(index, f)
+    os.replace(index_path + ".tmp", index_path)
+
+    if verbose:
+        size_mb = os.path.getsize(arrow_path) / (1024 * 1024)
+        print(f"✅ Cached {table.num_rows:,} personas in {len(offsets) - 1} batches ({size_mb:.1f} MB)")
+
+    return arrow_path
+
+
+class PersonaStore:
+    """
+    Read-only, memory-mapped view of a cached persona split.
+
+    Only the record batches holding requested rows are touched, and only
+    the requested columns are decoded, so sampling reads a few pages of the
+    file instead of the whole split.
+    """
+
+    def __init__(self, arrow_path: str, index: dict):
+        import pyarrow as pa
+
+        self.path = arrow_path
+        self.mtime = os.path.getmtime(arrow_path)
+        self._source = pa.memory_map(arrow_path, 'r')
+        self._reader = pa.ipc.open_file(self._source)
+        self.schema = self._reader.schema
+        self.num_rows = int(index['num_rows'])
+        self.columns = list(index['columns'])
+        self.batch_offsets = np.asarray(index['batch_offsets'], dtype=np.int64)
+
+    def is_current(self) -> bool:
+        """False once the cache file was rebuilt or removed."""
+        return os.path.exists(self.path) and os.path.getmtime(self.path) == self.mtime
+
+    def close(self):
+        self._source.close()
+
+    def take(self, row_indices, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """
+        Rows at the given positions (in the given order), projected to columns.
+
+        Args:
+            row_indices: Row positions in the split
+            columns: Columns to read (None = all columns)
+
+        Returns:
+            DataFrame with a fresh RangeIndex
+        """
+        import pyarrow as pa
+
+        rows = np.asarray(row_indices, dtype=np.int64)
+        if rows.size and (rows.min() < 0 or rows.max() >= self.num_rows):
+            raise IndexError(f"Row index out of range for {self.num_rows:,} cached personas")
+        if columns is not None:
+            missing = [col for col in columns if col not in self.columns]
+            if missing:
+                raise KeyError(f"Columns not in persona cache: {missing}")
+
+        schema = self.schema if columns is None else pa.schema([self.schema.field(col) for col in columns])
+        batch_ids = np.searchsorted(self.batch_offsets, rows, side='right') - 1
+        local_rows = rows - self.batch_offsets[batch_ids]
+
+        if len(rows) <= self.num_rows * SPARSE_TAKE_FRACTION:
+            # Sparse: one zero-copy slice per row, in the requested order, so
+            # only the pages holding those rows are read from the mapping
+            batches = {}
+            pieces = []
+            for batch_id, local_row in zip(batch_ids.tolist(), local_rows.tolist()):
+                batch = batches.get(batch_id)
+                if batch is None:
+                    batch = self._reader.get_batch(batch_id)
+                    if columns is not None:
+                        batch = batch.select(columns)
+                    batches[batch_id] = batch
+                pieces.append(batch.slice(local_row, 1))
+            return pa.Table.from_batches(pieces, schema=schema).to_pandas()
+
+        # Dense: gather per batch in row order, then restore the requested order
+        order = np.argsort(rows, kind='stable')
+        sorted_batches = batch_ids[order]
+        bounds = np.flatnonzero(np.diff(sorted_batches)) + 1
+        pieces = []
+        for start, stop in zip(np.r_[0, bounds], np.r_[bounds, len(order)]):
+            batch = self._reader.get_batch(int(sorted_batches[start]))
+            if columns is not None:
+                batch = batch.select(columns)
+            pieces.append(batch.take(pa.array(local_rows[order[start:stop]])))
+        table = pa.Table.from_batches(pieces, schema=schema)
+        inverse = np.empty_like(order)
+        inverse[order] = np.arange(len(order))
+        return table.take(pa.array(inverse)).to_pandas()
+
+    def sample(self, n: int, seed: int, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """Same rows, in the same order, as sample_personas(full_df, n, seed)."""
+        return self.take(sample_row_indices(self.num_rows, n, seed), columns)
+
+
+def sample_row_indices(num_rows: int, n: int, seed: int) -> np.ndarray:
+    """
+    Row positions drawn by DataFrame.sample(n=n, random_state=seed).
+
+    Keeps cached sampling reproducible with (and identical to) the
+    in-memory path.
+    """
+    n = min(n, num_rows)
+    return np.random.RandomState(seed).choice(num_rows, size=n, replace=False)
+
+
+def open_persona_store(
+    language: str = "en_IN",
+    data_dir: str = DATA_DIR,
+    cache_dir: str = CACHE_DIR,
+    use_huggingface: bool = True,
+    rebuild: bool = False,
+    verbose: bool = True
+) -> PersonaStore:
+    """
+    Return the process-wide store for a split, building the cache on first use.
+
+    The cache is rebuilt when it is missing, from an older format, or the
+    local parquet files it was built from have changed. An open store is
+    reused until its file changes on disk.
+    """
+    arrow_path, index_path = _cache_paths(cache_dir, language)
+    key = os.path.abspath(arrow_path)
+
+    store = _PERSONA_STORES.get(key)
+    if store is not None and not rebuild and store.is_current():
+        return store
+    if store is not None:
+        store.close()
+        del _PERSONA_STORES[key]
+
+    index = _read_cache_index(index_path)
+    stale = (
+        index is None
+        or not os.path.exists(arrow_path)
+        or index.get('source_files') != _local_source_fingerprint(data_dir, language)
+    )
+    if rebuild or stale:
+        build_persona_cache(language, data_dir, cache_dir, use_huggingface, verbose)
+        index = _read_cache_index(index_path)
+
+    store = PersonaStore(arrow_path, index)
+    _PERSONA_STORES[key] = store
+    return store
+
+
+def reset_persona_stores():
+    """Close all open persona stores (the cache files stay on disk)."""
+    for store in _PERSONA_STORES.values():
+        store.close()
+    _PERSONA_STORES.clear()
+
+
 # ============================================================================
 # HIGH-LEVEL API
 # ============================================================================
@@ -340,7 +620,10 @@ def load_and_sample(
     data_dir: str = DATA_DIR,
     validate: bool = True,
     verbose: bool = True,
-    use_huggingface: bool = True
+    use_huggingface: bool = True,
+    columns: Optional[List[str]] = None,
+    use_cache: bool = True,
+    cache_dir: str = CACHE_DIR
 ) -> Tuple[pd.DataFrame, dict]:
     """
     Main entry point: Load dataset and return a reproducible random sample.
@@ -354,6 +637,12 @@ def load_and_sample(
         data_dir: Path to data directory
         validate: Whether to run validation checks
         verbose: Print progress information
+        columns: Columns to return (None = all; SIMULATION_COLUMNS is enough
+            for derive_features and the engines)
+        use_cache: Sample from the memory-mapped persona cache (built on
+            first use) instead of loading the full split. Same rows either way;
+            with the cache, validation runs on the sample.
+        cache_dir: Directory of the persona cache
     
     Returns:
         Tuple of (sampled_dataframe, metadata_dict)
@@ -368,13 +657,29 @@ def load_and_sample(
         print("   Loading Nemotron-Personas-India Dataset")
         print("=" * 60)
     
-    # Load the full dataset
-    full_df = load_full_dataset(data_dir, language, verbose=verbose, use_huggingface=use_huggingface)
+    # Load the full dataset (or open the cached split)
+    if use_cache:
+        store = open_persona_store(language, data_dir, cache_dir, use_huggingface, verbose=verbose)
+        total_available = store.num_rows
+    else:
+        full_df = load_full_dataset(
+            data_dir, language, columns=columns, verbose=verbose, use_huggingface=use_huggingface
+        )
+        total_available = len(full_df)
+    
+    # Sample personas
+    if verbose:
+        print(f"\n🎲 Sampling {n:,} personas (seed={seed})...")
+    
+    if use_cache:
+        sampled_df = store.sample(n, seed, columns)
+    else:
+        sampled_df = sample_personas(full_df, n=n, seed=seed)
     
-    # Validate if requested
+    # Validate if requested (the cached path only has the sample in memory)
     validation_result = {}
     if validate:
-        validation_result = validate_dataset(full_df)
+        validation_result = validate_dataset(sampled_df if use_cache else full_df, expected_columns=columns)
         if verbose:
             if validation_result["is_valid"]:
                 print("✅ Dataset validation passed")
@@ -383,12 +688,6 @@ def load_and_sample(
                 if validation_result["missing_columns"]:
                     print(f"   Missing columns: {validation_result['missing_columns']}")
     
-    # Sample personas
-    if verbose:
-        print(f"\n🎲 Sampling {n:,} personas (seed={seed})...")
-    
-    sampled_df = sample_personas(full_df, n=n, seed=seed)
-    
     if verbose:
         print(f"✅ Sampled {len(sampled_df):,} personas")
         
@@ -406,7 +705,7 @@ def load_and_sample(
     
     # Build metadata
     metadata = {
-        "total_available": len(full_df),
+        "total_available": total_available,
         "sample_size": len(sampled_df),
         "random_seed": seed,
         "language": language,
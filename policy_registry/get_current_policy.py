@@ -4,54 +4,91 @@ get_current_policy.py - Get Current Policy Version
 Utility to get or create current policy version from system state.
 """
 
-from typing import Optional
+import os
+from typing import Dict, Optional, Tuple
 from policy_registry.policy_definition import create_policy_snapshot
 from policy_registry.policy_resolver import PolicyResolver
 
 
+DEFAULT_REGISTRY_DIR = "policy_registry/policies"
+
+# (registry dir, snapshot hash) -> (version, registry mtime when resolved)
+_POLICY_VERSION_CACHE: Dict[Tuple[str, str], Tuple[str, float]] = {}
+
+# One resolver per registry dir, so its in-memory hash index is reused
+_RESOLVERS: Dict[str, PolicyResolver] = {}
+
+
+def reset_policy_version_cache() -> None:
+    """Drop all memoized policy versions (e.g. after editing the registry by hand)."""
+    _POLICY_VERSION_CACHE.clear()
+    _RESOLVERS.clear()
+
+
+def _get_resolver(registry_dir: str) -> PolicyResolver:
+    key = os.path.abspath(registry_dir)
+    if key not in _RESOLVERS:
+        _RESOLVERS[key] = PolicyResolver(registry_dir)
+    return _RESOLVERS[key]
+
+
 def get_current_policy_version(
     calibrated_parameters: Optional[dict] = None,
     calibration_file: Optional[str] = None,
-    description: Optional[str] = None
+    description: Optional[str] = None,
+    registry_dir: str = DEFAULT_REGISTRY_DIR
 ) -> str:
     """
     Get or create current policy version from system state.
     
     This function:
-    1. Creates a policy snapshot from current system state
-    2. Checks if an identical policy already exists
-    3. Returns existing version if found, otherwise creates new one
+    1. Hashes a policy snapshot of the current system state (no disk access)
+    2. Returns the memoized version for that hash if the registry is unchanged
+    3. Otherwise looks the hash up in the registry's hash index
+    4. Creates and saves a new policy if no identical one exists
+    
+    The memo is invalidated when the registry's mtime changes, or
+    explicitly via reset_policy_version_cache().
     
     Args:
         calibrated_parameters: Optional calibrated parameters dict
         calibration_file: Optional calibration file path
         description: Optional description for new policy
+        registry_dir: Policy registry directory
     
     Returns:
         Policy version identifier (e.g., "v1_3f8a1b2c")
     """
-    resolver = PolicyResolver()
+    resolver = _get_resolver(registry_dir)
     
-    # Create snapshot of current policy
-    policy = create_policy_snapshot(
+    # Hash the current policy (identity excludes version and timestamps)
+    policy_hash = create_policy_snapshot(
         calibrated_parameters=calibrated_parameters,
         calibration_file=calibration_file,
-        description=description
-    )
+        description=description,
+        assign_version=False
+    ).compute_hash()
+    
+    cache_key = (os.path.abspath(registry_dir), policy_hash)
+    registry_mtime = resolver.registry_mtime()
+    cached = _POLICY_VERSION_CACHE.get(cache_key)
+    if cached is not None and cached[1] == registry_mtime:
+        return cached[0]
     
     # Check if identical policy exists (by hash)
-    policy_hash = policy.compute_hash()
+    version = resolver.find_version_by_hash(policy_hash)
     
-    # List all existing policies and check hashes
-    existing_versions = resolver.list_versions()
-    for version in existing_versions:
-        existing_policy = resolver.load_policy(version)
-        if existing_policy and existing_policy.compute_hash() == policy_hash:
-            # Identical policy exists, return existing version
-            return version
+    if version is None:
+        # No identical policy exists, save new one
+        policy = create_policy_snapshot(
+            calibrated_parameters=calibrated_parameters,
+            calibration_file=calibration_file,
+            description=description,
+            registry_dir=registry_dir
+        )
+        version = resolver.save_policy(policy)
     
-    # No identical policy exists, save new one
-    version = resolver.save_policy(policy)
+    _POLICY_VERSION_CACHE[cache_key] = (version, resolver.registry_mtime())
     return version
 
 
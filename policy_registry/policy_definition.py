@@ -108,12 +108,19 @@ def create_policy_snapshot(
     calibrated_parameters: Optional[Dict] = None,
     calibration_file: Optional[str] = None,
     description: Optional[str] = None,
-    author: Optional[str] = None
+    author: Optional[str] = None,
+    assign_version: bool = True,
+    registry_dir: Optional[str] = None
 ) -> PolicyDefinition:
     """
     Create a policy snapshot from current system state.
     
     This captures the current policy configuration as an immutable snapshot.
+    
+    Args:
+        assign_version: If False, skip numbering against the registry (no
+            disk access) and leave version empty; enough for compute_hash()
+        registry_dir: Registry used to number the version (default registry if None)
     """
     # Load parameter bounds if not provided
     if parameter_bounds is None:
@@ -143,13 +150,16 @@ def create_policy_snapshot(
         author=author
     )
     
+    if not assign_version:
+        return policy
+    
     # Compute version with hash
     hash_suffix = policy.compute_hash()
     
     # Determine version number (check existing policies)
     try:
         from policy_registry.policy_resolver import PolicyResolver
-        resolver = PolicyResolver()
+        resolver = PolicyResolver(registry_dir) if registry_dir else PolicyResolver()
         existing_versions = resolver.list_versions()
         if existing_versions:
             # Get highest version number
@@ -11,6 +11,11 @@ from typing import Dict, List, Optional
 from policy_registry.policy_definition import PolicyDefinition
 
 
+# Append-only hash -> version index, one JSON object per line.
+# (.jsonl so list_versions' "*.json" glob never mistakes it for a policy)
+HASH_INDEX_FILE = "hash_index.jsonl"
+
+
 class PolicyResolver:
     """
     Resolves policy versions to policy definitions.
@@ -27,6 +32,9 @@ class PolicyResolver:
         """
         self.registry_dir = Path(registry_dir)
         self.registry_dir.mkdir(parents=True, exist_ok=True)
+        self.index_file = self.registry_dir / HASH_INDEX_FILE
+        self._hash_index: Optional[Dict[str, str]] = None
+        self._hash_index_mtime: float = -1.0
     
     def save_policy(self, policy: PolicyDefinition) -> str:
         """
@@ -46,14 +54,104 @@ class PolicyResolver:
             # Policy already exists, return existing version
             return version
         
+        # Bring the index up to date before the new file bumps the directory mtime
+        self._load_hash_index()
+        
         # Save to file
         policy_file = self.registry_dir / f"{version}.json"
         
         with open(policy_file, 'w') as f:
             json.dump(policy.to_dict(), f, indent=2)
         
+        self._append_to_hash_index(policy.compute_hash(), version)
+        
         return version
     
+    # ------------------------------------------------------------------
+    # Hash index
+    # ------------------------------------------------------------------
+    
+    def find_version_by_hash(self, policy_hash: str) -> Optional[str]:
+        """
+        Find the registered version whose definition has this hash.
+        
+        O(1) lookup in the hash index; the registry is only scanned when
+        the index is missing or older than the registry directory.
+        
+        Args:
+            policy_hash: PolicyDefinition.compute_hash() value
+        
+        Returns:
+            Version identifier, or None if no such policy is registered
+        """
+        return self._load_hash_index().get(policy_hash)
+    
+    def registry_mtime(self) -> float:
+        """
+        Latest modification time of the registry (directory or index).
+        
+        Adding or removing a policy file changes the directory mtime;
+        save_policy also touches the index file.
+        """
+        mtime = self.registry_dir.stat().st_mtime
+        if self.index_file.exists():
+            mtime = max(mtime, self.index_file.stat().st_mtime)
+        return mtime
+    
+    def rebuild_hash_index(self) -> Dict[str, str]:
+        """
+        Rebuild the hash index by loading every policy in the registry.
+        
+        Returns:
+            Mapping of policy hash to version identifier
+        """
+        index = {}
+        for version in self.list_versions():
+            policy = self.load_policy(version)
+            if policy:
+                # Keep the first (lowest) version registered for a hash
+                index.setdefault(policy.compute_hash(), version)
+        
+        with open(self.index_file, 'w') as f:
+            for policy_hash, version in index.items():
+                f.write(json.dumps({'hash': policy_hash, 'version': version}) + "\n")
+        
+        self._hash_index = index
+        self._hash_index_mtime = self.index_file.stat().st_mtime
+        return index
+    
+    def _load_hash_index(self) -> Dict[str, str]:
+        """Load the hash index, rebuilding it when missing or stale."""
+        if not self.index_file.exists():
+            return self.rebuild_hash_index()
+        
+        index_mtime = self.index_file.stat().st_mtime
+        if self.registry_dir.stat().st_mtime > index_mtime:
+            # Policy files were added or removed without going through save_policy
+            return self.rebuild_hash_index()
+        
+        if self._hash_index is None or index_mtime != self._hash_index_mtime:
+            index = {}
+            with open(self.index_file, 'r') as f:
+                for line in f:
+                    line = line.strip()
+                    if line:
+                        entry = json.loads(line)
+                        index.setdefault(entry['hash'], entry['version'])
+            self._hash_index = index
+            self._hash_index_mtime = index_mtime
+        
+        return self._hash_index
+    
+    def _append_to_hash_index(self, policy_hash: str, version: str) -> None:
+        """Record a newly saved policy in the hash index (loaded by the caller)."""
+        # Always append (even for a duplicate hash) so the index stays newer
+        # than the directory; lookups keep the first version per hash
+        with open(self.index_file, 'a') as f:
+            f.write(json.dumps({'hash': policy_hash, 'version': version}) + "\n")
+        self._hash_index.setdefault(policy_hash, version)
+        self._hash_index_mtime = self.index_file.stat().st_mtime
+    
     def load_policy(self, version: str) -> Optional[PolicyDefinition]:
         """
         Load policy definition by version.
@@ -9,22 +9,16 @@ if str(_root) not in sys.path:
 Analyze Keeper screenshots using OpenAI Vision API and extract product flow.
 """
 
-import os
-import base64
-from openai import OpenAI
+from dropsim_screenshot_analysis import ScreenshotProduct, run_screenshot_analysis
 
-def encode_image(image_path):
-    """Encode image to base64."""
-    with open(image_path, "rb") as image_file:
-        return base64.b64encode(image_file.read()).decode('utf-8')
-
-def analyze_screenshot(image_path, api_key, screenshot_name):
-    """Analyze a single screenshot using GPT-4 Vision."""
-    client = OpenAI(api_key=api_key)
-    
-    base64_image = encode_image(image_path)
-    
-    prompt = """Analyze this screenshot from a fintech/product onboarding flow.
+PRODUCT = ScreenshotProduct(
+    name="keeper",
+    screenshot_dir="/Users/abhishekvyas/Desktop/inertia_labs/keeper_ss",
+    screenshot_names=[f"ss{i}" for i in range(1, 11)],
+    extensions=('.jpeg', '.jpg', '.png'),
+    output_file="keeper_screenshots_analyzed.txt",
+    screen_max_tokens=500,
+    screen_prompt="""Analyze this screenshot from a fintech/product onboarding flow.
 
 Extract:
 1. Step number (if visible, e.g., "Step 1 of 10", "Step 2 of 10")
@@ -35,72 +29,9 @@ Extract:
 6. Key UI elements and what the user needs to do
 
 Describe the screen in detail, focusing on what the user needs to do at this step and any cognitive/effort/risk factors."""
+)
 
-    response = client.chat.completions.create(
-        model="gpt-4o-mini",
-        messages=[
-            {
-                "role": "user",
-                "content": [
-                    {
-                        "type": "text",
-                        "text": prompt
-                    },
-                    {
-                        "type": "image_url",
-                        "image_url": {
-                            "url": f"data:image/jpeg;base64,{base64_image}"
-                        }
-                    }
-                ]
-            }
-        ],
-        max_tokens=500
-    )
-    
-    return response.choices[0].message.content
 
 if __name__ == "__main__":
-    import sys
-    
-    api_key = os.environ.get("OPENAI_API_KEY")
-    if not api_key:
-        print("Error: OPENAI_API_KEY not set")
+    if run_screenshot_analysis(PRODUCT) is None:
         sys.exit(1)
-    
-    # Screenshots to analyze (ss1 to ss10)
-    screenshots = [f"ss{i}" for i in range(1, 11)]
-    base_dir = "/Users/abhishekvyas/Desktop/inertia_labs/keeper_ss"
-    
-    print("🔍 Analyzing Keeper screenshots...\n")
-    
-    descriptions = []
-    for ss_name in screenshots:
-        # Try different extensions
-        image_path = None
-        for ext in [".jpeg", ".jpg", ".png"]:
-            path = os.path.join(base_dir, f"{ss_name}{ext}")
-            if os.path.exists(path):
-                image_path = path
-                break
-        
-        if not image_path:
-            print(f"⚠️  Warning: {ss_name} not found, skipping")
-            continue
-        
-        print(f"Analyzing {ss_name}...")
-        try:
-            description = analyze_screenshot(image_path, api_key, ss_name)
-            descriptions.append(f"Screenshot {ss_name}: {description}")
-            print(f"✅ {ss_name} analyzed\n")
-        except Exception as e:
-            print(f"❌ Error analyzing {ss_name}: {e}\n")
-    
-    # Write to file
-    output_file = "keeper_screenshots_analyzed.txt"
-    with open(output_file, "w") as f:
-        f.write("\n---\n".join(descriptions))
-    
-    print(f"✅ Saved descriptions to {output_file}")
-    print(f"\n📋 Total screenshots analyzed: {len(descriptions)}")
-
@@ -0,0 +1,58 @@
+"""
+Benchmark for trace-capture levels of the intent-aware engine.
+
+Runs run_intent_aware_simulation on N synthetic personas (default 300) at
+each capture level ('full', 'traces', 'summary', 'metrics') and reports
+trajectories per second and the speedup over 'full'. Completion rates are
+printed as well: they are identical at every level.
+
+Usage:
+    python scripts/benchmark_capture_levels.py [n_personas]
+"""
+import sys
+from pathlib import Path
+_root = Path(__file__).resolve().parent.parent
+if str(_root) not in sys.path:
+    sys.path.insert(0, str(_root))
+
+import time
+
+from behavioral_engine_intent_aware import (
+    CAPTURE_LEVELS,
+    INTENT_AWARE_VARIANTS,
+    run_intent_aware_simulation
+)
+from credigo_ss_steps_improved import CREDIGO_SS_11_STEPS
+from dropsim_intent_model import CREDIGO_GLOBAL_INTENT
+from scripts.benchmark_replication import make_personas
+
+
+def main():
+    n_personas = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    df = make_personas(n_personas)
+    n_traj = n_personas * len(INTENT_AWARE_VARIANTS)
+
+    print("=" * 80)
+    print(f"CAPTURE LEVEL BENCHMARK ({n_personas:,} personas, {n_traj:,} trajectories)")
+    print("=" * 80)
+    print()
+
+    # Warm the step table and prior caches so every level is timed alike
+    run_intent_aware_simulation(df, CREDIGO_SS_11_STEPS, fixed_intent=CREDIGO_GLOBAL_INTENT,
+                                verbose=False, capture="metrics")
+
+    timings = {}
+    for capture in reversed(CAPTURE_LEVELS):
+        start = time.perf_counter()
+        result_df = run_intent_aware_simulation(
+            df, CREDIGO_SS_11_STEPS, fixed_intent=CREDIGO_GLOBAL_INTENT,
+            verbose=False, seed=42, capture=capture
+        )
+        timings[capture] = time.perf_counter() - start
+        print(f"{capture:<8} {timings[capture]:7.2f}s  {n_traj / timings[capture]:9,.0f} traj/s  "
+              f"{timings['full'] / timings[capture]:5.1f}x  "
+              f"(completion {result_df['completion_rate'].mean():.4f})")
+
+
+if __name__ == "__main__":
+    main()
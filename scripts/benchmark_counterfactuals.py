@@ -0,0 +1,107 @@
+"""
+Benchmark for checkpointed and batched counterfactual replay.
+
+Simulates N synthetic personas (default 2000) through the Credigo flow with
+every state variant, then scores the sensitivity-map interventions
+(3 deltas x every step) against all traces three ways: full prefix replay
+per (trace, intervention) pair, scalar replay resuming from the baseline
+checkpoints, and the batched array path.
+
+Usage:
+    python scripts/benchmark_counterfactuals.py [n_personas]
+"""
+import sys
+from pathlib import Path
+_root = Path(__file__).resolve().parent.parent
+if str(_root) not in sys.path:
+    sys.path.insert(0, str(_root))
+
+import time
+import numpy as np
+
+from behavioral_engine import STATE_VARIANTS
+from credigo_ss_steps_improved import CREDIGO_SS_11_STEPS
+from dropsim_counterfactuals import (
+    build_counterfactual_baseline,
+    compute_sensitivity_map,
+    simulate_counterfactual,
+    simulate_counterfactual_batch
+)
+from dropsim_simulation_runner import simulate_compiled_persona
+
+PRIOR_RANGES = {
+    'CC': (0.2, 0.9), 'FR': (0.1, 0.8), 'RT': (0.1, 0.9), 'LAM': (1.0, 2.5), 'ET': (0.2, 0.9),
+    'TB': (0.2, 0.9), 'DR': (0.05, 0.3), 'CN': (0.2, 0.8), 'MS': (0.5, 1.5)
+}
+
+
+def make_population(n_personas, seed=0):
+    rng = np.random.default_rng(seed)
+    traces, priors_map, variant_map = [], {}, {}
+    for i in range(n_personas):
+        priors = {key: float(rng.uniform(low, high)) for key, (low, high) in PRIOR_RANGES.items()}
+        persona = {'name': f"persona_{i}", 'description': "", 'priors': priors, 'meta': {}}
+        result = simulate_compiled_persona(persona, CREDIGO_SS_11_STEPS, STATE_VARIANTS)
+        priors_map[persona['name']] = priors
+        variant_map[persona['name']] = result['trajectories'][0]['variant']
+        traces.extend(t['event_trace'] for t in result['trajectories'])
+    return traces, priors_map, variant_map
+
+
+def main():
+    n_personas = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    steps = CREDIGO_SS_11_STEPS
+
+    traces, priors_map, variant_map = make_population(n_personas)
+    interventions = [
+        {'type': 'step_modification', 'step_id': step_id, 'delta': {key: -0.1}}
+        for key in ('effort', 'risk', 'cognitive')
+        for step_id in steps
+    ]
+    n_reference = min(len(traces), 200)
+
+    print("=" * 80)
+    print(f"COUNTERFACTUAL BENCHMARK ({len(traces):,} traces x {len(interventions)} interventions)")
+    print("=" * 80)
+    print(f"Mean trace length: {np.mean([len(t.events) for t in traces]):.1f} events, "
+          f"completed: {np.mean([t.final_outcome == 'completed' for t in traces]):.1%}")
+    print()
+
+    # Reference: full prefix replay per pair (on a sample)
+    start = time.perf_counter()
+    reference = []
+    for trace in traces[:n_reference]:
+        priors = priors_map[trace.persona_id]
+        variant = variant_map[trace.persona_id]
+        reference.append([
+            simulate_counterfactual(trace, intervention, steps, priors, variant).outcome_changed
+            for intervention in interventions
+        ])
+    full_replay = (time.perf_counter() - start) / n_reference
+
+    start = time.perf_counter()
+    baseline = build_counterfactual_baseline(traces, steps, priors_map, variant_map)
+    build = time.perf_counter() - start
+
+    timings = {}
+    for batched in (False, True):
+        start = time.perf_counter()
+        batches = [simulate_counterfactual_batch(baseline, i, steps, batched=batched) for i in interventions]
+        timings[batched] = (time.perf_counter() - start) / len(traces)
+        changed = np.column_stack([b.outcome_changed for b in batches])
+        assert (changed[:n_reference] == np.array(reference)).all()
+
+    print(f"Baseline replay + checkpoints: {build:.2f}s ({build / len(traces) * 1e6:.0f} µs/trace)")
+    print(f"  full replay per pair:  {full_replay * 1e3:8.2f} ms/trace")
+    print(f"  checkpointed scalar:   {timings[False] * 1e3:8.2f} ms/trace  -> {full_replay / timings[False]:.1f}x")
+    print(f"  batched arrays:        {timings[True] * 1e3:8.2f} ms/trace  -> {full_replay / timings[True]:.1f}x")
+    print()
+
+    start = time.perf_counter()
+    sensitivity = compute_sensitivity_map(traces, steps, priors_map, variant_map, baseline=baseline)
+    print(f"compute_sensitivity_map over all {len(traces):,} traces: {time.perf_counter() - start:.2f}s")
+    print(f"  {sensitivity}")
+
+
+if __name__ == "__main__":
+    main()
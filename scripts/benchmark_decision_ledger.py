@@ -0,0 +1,87 @@
+"""
+Benchmark for decision ledger generation over a DecisionIndex.
+
+Simulates growing persona counts at capture='traces', turns the
+trajectories into DecisionSequences and times building the DecisionIndex,
+generate_decision_ledger and the decision-first queries on it. Time per
+trace should stay roughly flat as traces grow (the ledger is O(traces),
+not O(steps x traces)).
+
+Usage:
+    python scripts/benchmark_decision_ledger.py [max_personas]
+"""
+import sys
+from pathlib import Path
+_root = Path(__file__).resolve().parent.parent
+if str(_root) not in sys.path:
+    sys.path.insert(0, str(_root))
+
+import time
+
+from behavioral_engine_intent_aware import run_intent_aware_simulation
+from credigo_ss_steps_improved import CREDIGO_SS_11_STEPS
+from decision_graph import (
+    DecisionIndex,
+    query_acceptance_surface,
+    query_competing_explanations,
+    query_decision_boundaries
+)
+from decision_graph.decision_ledger import generate_decision_ledger
+from decision_graph.decision_trace import DecisionOutcome, DecisionSequence
+from dropsim_intent_model import CREDIGO_GLOBAL_INTENT
+from scripts.benchmark_replication import make_personas
+
+
+def make_sequences(n_personas: int):
+    result_df = run_intent_aware_simulation(
+        make_personas(n_personas), CREDIGO_SS_11_STEPS, fixed_intent=CREDIGO_GLOBAL_INTENT,
+        verbose=False, seed=42, capture="traces"
+    )
+    return [
+        DecisionSequence(
+            persona_id=t['persona_id'],
+            variant_name=t['variant'],
+            traces=t['decision_traces'],
+            final_outcome=DecisionOutcome.CONTINUE if t['completed'] else DecisionOutcome.DROP,
+            exit_step=None if t['completed'] else t['exit_step']
+        )
+        for trajectories in result_df['trajectories']
+        for t in trajectories
+    ]
+
+
+def main():
+    max_personas = int(sys.argv[1]) if len(sys.argv) > 1 else 800
+    sizes = [n for n in (100, 200, 400, 800, 1600, 3200) if n <= max_personas] or [max_personas]
+
+    print("=" * 80)
+    print("DECISION LEDGER BENCHMARK")
+    print("=" * 80)
+    print()
+    print(f"{'traces':>9}  {'index':>8}  {'ledger':>8}  {'queries':>8}  {'us/trace':>9}")
+
+    for n_personas in sizes:
+        sequences = make_sequences(n_personas)
+
+        start = time.perf_counter()
+        index = DecisionIndex(sequences)
+        index_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        generate_decision_ledger(index, CREDIGO_SS_11_STEPS)
+        ledger_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for step_id in CREDIGO_SS_11_STEPS:
+            query_decision_boundaries(index, step_id)
+        query_competing_explanations(index)
+        query_acceptance_surface(index, CREDIGO_SS_11_STEPS)
+        query_time = time.perf_counter() - start
+
+        total = index_time + ledger_time + query_time
+        print(f"{len(index):>9,}  {index_time:7.2f}s  {ledger_time:7.2f}s  {query_time:7.2f}s  "
+              f"{total / len(index) * 1e6:9.1f}")
+
+
+if __name__ == "__main__":
+    main()
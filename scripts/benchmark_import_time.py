@@ -0,0 +1,82 @@
+"""
+Benchmark for entry-point cold start.
+
+Times each entry point in a fresh interpreter (median of N runs, default
+5) and lists the most expensive imports of the slowest one from
+`python -X importtime`.
+
+Usage:
+    python scripts/benchmark_import_time.py [runs]
+"""
+import sys
+from pathlib import Path
+_root = Path(__file__).resolve().parent.parent
+if str(_root) not in sys.path:
+    sys.path.insert(0, str(_root))
+
+import statistics
+import subprocess
+import time
+
+ENTRY_POINTS = {
+    'python (baseline)': ["-c", "pass"],
+    'dropsim_cli --help': ["dropsim_cli.py", "--help"],
+    'dropsim_cli simulate-lite': [
+        "dropsim_cli.py", "simulate-lite", "--lite-scenario-file", "examples/fintech_lite_onboarding.json",
+        "--no-cache"
+    ],
+    'import simulation_pipeline': ["-c", "import simulation_pipeline"],
+    'import dropsim_llm_client': ["-c", "import dropsim_llm_client"],
+    'import dropsim_api': ["-c", "import dropsim_api"],
+    'run_simulation.py --help': ["scripts/run_simulation.py", "--help"],
+    'run_behavioral_simulation.py --help': ["scripts/run_behavioral_simulation.py", "--help"],
+    'run_llm_simulation.py --help': ["scripts/run_llm_simulation.py", "--help"],
+}
+
+
+def run(args, importtime=False):
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, *(["-X", "importtime"] if importtime else []), *args],
+        cwd=str(_root), capture_output=True, text=True
+    )
+    elapsed = time.perf_counter() - start
+    if result.returncode != 0:
+        raise RuntimeError(f"{' '.join(args)} failed:\n{result.stderr[-2000:]}")
+    return elapsed, result.stderr
+
+
+def top_imports(stderr, n=12):
+    """(cumulative microseconds, module) for the n most expensive imports up to two levels deep."""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        if cumulative.strip().isdigit() and depth <= 1:
+            rows.append((int(cumulative), "  " * depth + name.strip()))
+    return sorted(rows, reverse=True)[:n]
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+
+    print("=" * 80)
+    print(f"COLD START BENCHMARK (median of {runs} fresh interpreters)")
+    print("=" * 80)
+
+    medians = {}
+    for label, args in ENTRY_POINTS.items():
+        run(args)  # warm the OS file cache
+        medians[label] = statistics.median(run(args)[0] for _ in range(runs))
+        print(f"  {label:<38} {medians[label] * 1e3:8.1f} ms")
+
+    slowest = max((label for label in medians if label != 'python (baseline)'), key=medians.get)
+    print(f"\nMost expensive imports for '{slowest}':")
+    for cumulative, name in top_imports(run(ENTRY_POINTS[slowest], importtime=True)[1]):
+        print(f"  {cumulative / 1e3:8.1f} ms  {name}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Benchmark for the managed LLM client.
+
+Runs N persona prompts (default 1000) against a fake client with fixed
+per-call latency (default 50 ms): serially, through ManagedLLMClient at a
+few concurrency levels, and again from the response cache. Finally fills
+a fresh cache block by block with zero-latency calls: time per block
+should stay flat as the cache grows (puts do not rescan the cache).
+
+Usage:
+    python scripts/benchmark_llm_client.py [n_prompts] [latency_ms]
+"""
+import sys
+from pathlib import Path
+_root = Path(__file__).resolve().parent.parent
+if str(_root) not in sys.path:
+    sys.path.insert(0, str(_root))
+
+import tempfile
+import time
+
+from dropsim_llm_client import FakeLLMClient, ManagedLLMClient
+from dropsim_result_cache import ResultCache
+
+
+def timed(fn):
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def main():
+    n_prompts = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    latency = (float(sys.argv[2]) if len(sys.argv) > 2 else 50.0) / 1e3
+    prompts = [f"persona {i}" for i in range(n_prompts)]
+    fake = FakeLLMClient('{"final_intent": 50}', latency=latency)
+
+    print("=" * 80)
+    print(f"LLM CLIENT BENCHMARK ({n_prompts} prompts, {latency * 1e3:.0f} ms per call)")
+    print("=" * 80)
+
+    timings = {}
+    # Serial cost is latency-bound; measure a slice and extrapolate
+    sample = prompts[:max(1, n_prompts // 20)]
+    timings['serial (est.)'] = timed(lambda: [fake.complete(p) for p in sample]) * n_prompts / len(sample)
+
+    for concurrency in (8, 32, 64):
+        client = ManagedLLMClient(fake, max_concurrency=concurrency)
+        timings[f'concurrency {concurrency}'] = timed(lambda: client.complete_many(prompts))
+
+    cache = ResultCache(tempfile.mkdtemp(prefix="dropsim_llm_cache_"))
+    client = ManagedLLMClient(fake, cache=cache, max_concurrency=64)
+    client.complete_many(prompts)
+    rerun = ManagedLLMClient(fake, cache=ResultCache(cache.cache_dir), max_concurrency=64)
+    timings['re-run (cached)'] = timed(lambda: rerun.complete_many(prompts))
+    assert rerun.stats.api_calls == 0
+
+    serial = timings['serial (est.)']
+    for label, seconds in timings.items():
+        print(f"  {label:<18} {seconds:8.2f} s  -> {serial / seconds:8.1f}x")
+
+    print()
+    print("Cache growth (zero-latency calls, first-run writes per block):")
+    instant = FakeLLMClient('{"final_intent": 50}', latency=0.0)
+    growing = ManagedLLMClient(instant, cache=ResultCache(tempfile.mkdtemp(prefix="dropsim_llm_cache_")),
+                               max_concurrency=8)
+    for block in range(4):
+        block_prompts = [f"{prompt} / block {block}" for prompt in prompts]
+        seconds = timed(lambda: growing.complete_many(block_prompts))
+        print(f"  entries {block * n_prompts:>7,} -> {(block + 1) * n_prompts:>7,}  {seconds:8.2f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Benchmark for outcome-matrix metric extraction.
+
+Builds N synthetic trajectories (default 1,000,000) over the 11 Credigo
+steps, then times extract_simulated_metrics_from_results and per-step
+failure tallies three ways: walking the 'trajectories' column (the old
+aggregators), building an OutcomeMatrix from it (results without an
+attached matrix), and reading an attached matrix (engine output).
+
+Usage:
+    python scripts/benchmark_outcome_matrix.py [n_trajectories]
+"""
+import sys
+from pathlib import Path
+_root = Path(__file__).resolve().parent.parent
+if str(_root) not in sys.path:
+    sys.path.insert(0, str(_root))
+
+import time
+from collections import Counter
+
+import numpy as np
+import pandas as pd
+
+from calibration.loss_functions import extract_simulated_metrics_from_results
+from credigo_ss_steps_improved import CREDIGO_SS_11_STEPS
+from dropsim_outcome_matrix import OutcomeMatrix, attach_outcome_matrix, get_outcome_matrix
+
+N_VARIANTS = 7
+REASONS = ['System 2 fatigue', 'Loss aversion', 'Multi-factor failure', None]
+
+
+def make_result_df(n_trajectories: int) -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    step_names = list(CREDIGO_SS_11_STEPS.keys())
+    exits = rng.integers(0, len(step_names) + 1, n_trajectories).tolist()
+    reasons = rng.integers(0, len(REASONS), n_trajectories).tolist()
+    trajectories = [
+        {
+            'exit_step': step_names[k] if k < len(step_names) else 'Completed',
+            'failure_reason': REASONS[r] if k < len(step_names) else None,
+            'steps_entered': min(k + 1, len(step_names))
+        }
+        for k, r in zip(exits, reasons)
+    ]
+    return pd.DataFrame({
+        'trajectories': [trajectories[i:i + N_VARIANTS] for i in range(0, n_trajectories, N_VARIANTS)]
+    })
+
+
+def walk_trajectories(result_df, step_names):
+    """The per-trajectory walk the aggregators used to do."""
+    failures = {step: [0, Counter()] for step in step_names}
+    entered = dict.fromkeys(step_names, 0)
+    for _, row in result_df.iterrows():
+        for traj in row['trajectories']:
+            for step in step_names[:traj['steps_entered']]:
+                entered[step] += 1
+            if traj['exit_step'] in failures:
+                failures[traj['exit_step']][0] += 1
+                if traj['failure_reason']:
+                    failures[traj['exit_step']][1][traj['failure_reason']] += 1
+    return failures, entered
+
+
+def timed(fn):
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def main():
+    n_trajectories = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    step_names = list(CREDIGO_SS_11_STEPS.keys())
+    result_df = make_result_df(n_trajectories)
+
+    print("=" * 80)
+    print(f"OUTCOME MATRIX BENCHMARK ({n_trajectories:,} trajectories, {len(step_names)} steps)")
+    print("=" * 80)
+    print()
+
+    walk = timed(lambda: walk_trajectories(result_df, step_names))
+    print(f"trajectory walk (iterrows)       {walk:7.2f}s")
+
+    build = timed(lambda: get_outcome_matrix(result_df, step_names))
+    print(f"build matrix from trajectories   {build:7.2f}s")
+
+    attach_outcome_matrix(result_df, OutcomeMatrix.from_trajectories(result_df['trajectories'], step_names))
+
+    def attached():
+        extract_simulated_metrics_from_results(result_df, CREDIGO_SS_11_STEPS)
+        get_outcome_matrix(result_df, step_names).failures_by_step()
+    extract = timed(attached)
+    print(f"metrics + failures from matrix   {extract:7.3f}s  ({walk / extract:,.0f}x faster than the walk)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""
+Benchmark for indexed PrecedentGraph queries and parent-event lookup.
+
+Builds a precedent graph from N synthetic decision events (default 1M),
+then times query_precedents and query_what_usually_works through the index
+against walking every node, and record_event's parent lookup through the
+event_id dict against a scan of the event history.
+
+Usage:
+    python scripts/benchmark_precedent_graph.py [n_events]
+"""
+import sys
+from pathlib import Path
+_root = Path(__file__).resolve().parent.parent
+if str(_root) not in sys.path:
+    sys.path.insert(0, str(_root))
+
+import time
+import numpy as np
+
+from decision_continuity import BeliefState, ContinuityEngine, DecisionEvent, DecisionEventType, PrecedentGraph
+
+STEPS = [f"step_{i}" for i in range(11)]
+EVENT_TYPES = [DecisionEventType.CONTINUATION, DecisionEventType.DROP, DecisionEventType.VALUE_REALIZED]
+FACTORS = [['trust'], ['trust', 'value'], ['effort']]
+
+
+def make_events(n, seed=0, n_entities=1000):
+    """Events whose beliefs sit on a 0.1 grid around 0.5 (so signatures repeat)."""
+    rng = np.random.default_rng(seed)
+    beliefs = np.clip(np.round(rng.normal(0.5, 0.1, size=(n, 2, 6)), 1), 0.0, 1.0)
+    steps = rng.integers(len(STEPS), size=n)
+    types = rng.integers(len(EVENT_TYPES), size=n)
+    factors = rng.integers(len(FACTORS), size=n)
+    confidence = rng.random(n)
+    for i in range(n):
+        yield DecisionEvent(
+            event_id=f"evt_{i}", entity_id=f"user_{i % n_entities}", entity_type="user",
+            step_id=STEPS[steps[i]], step_index=int(steps[i]), event_type=EVENT_TYPES[types[i]],
+            belief_state_before=BeliefState(*beliefs[i, 0].tolist(), timestamp=""),
+            belief_state_after=BeliefState(*beliefs[i, 1].tolist(), timestamp=""),
+            action_considered="continue", action_taken="continue" if types[i] != 1 else "drop",
+            alternatives_rejected=[], confidence_level=float(confidence[i]),
+            outcome_observed="continued" if types[i] == 0 else None,
+            context={'dominant_factors': FACTORS[factors[i]]},
+            parent_event_id=f"evt_{i - n_entities}" if i >= n_entities else None,
+            timestamp="",
+        )
+
+
+def scan_what_usually_works(graph, step_id):
+    """query_what_usually_works by walking every node (the pre-index implementation)."""
+    results = []
+    for node in graph.nodes.values():
+        if step_id and node.signature.step_id != step_id:
+            continue
+        for action, dist in node.action_distributions.items():
+            if dist.success_rate > 0.5:
+                results.append({
+                    'action': action,
+                    'success_rate': dist.success_rate,
+                    'total_occurrences': dist.total_occurrences,
+                    'average_confidence': dist.average_confidence,
+                    'step_id': node.signature.step_id,
+                    'condition_signature': node.signature.to_dict()
+                })
+    results.sort(key=lambda x: x['success_rate'], reverse=True)
+    return results
+
+
+def time_calls(fn, queries):
+    start = time.perf_counter()
+    results = [fn(*q) for q in queries]
+    return (time.perf_counter() - start) / len(queries), results
+
+
+def main():
+    n_events = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    n_engine_events = min(n_events, 100_000)
+
+    print("=" * 80)
+    print(f"PRECEDENT GRAPH BENCHMARK ({n_events:,} events)")
+    print("=" * 80)
+    print()
+
+    graph = PrecedentGraph()
+    start = time.perf_counter()
+    for event in make_events(n_events):
+        graph.add_event(event)
+    build = time.perf_counter() - start
+    print(f"Built graph: {len(graph.nodes):,} nodes in {build:.1f}s ({build / n_events * 1e6:.1f} µs/event)")
+
+    rng = np.random.default_rng(1)
+    queries = [
+        (STEPS[rng.integers(len(STEPS))], *np.round(rng.normal(0.5, 0.1, 5), 1).tolist(),
+         {'trust', 'value'}, None)
+        for _ in range(2000)
+    ]
+    indexed, indexed_results = time_calls(graph.query_precedents, queries)
+    scanned, scanned_results = time_calls(graph._scan_precedents, queries[:20])
+    assert indexed_results[:20] == scanned_results
+    print()
+    print("query_precedents")
+    print(f"  index: {indexed * 1e6:10.1f} µs/query ({np.mean([len(r) for r in indexed_results]):.1f} matches)")
+    print(f"  scan:  {scanned * 1e6:10.1f} µs/query  -> {scanned / indexed:,.0f}x")
+
+    step_queries = [("", STEPS[i % len(STEPS)]) for i in range(50)]
+    indexed, results = time_calls(graph.query_what_usually_works, step_queries)
+    scanned, scanned_results = time_calls(lambda _, step_id: scan_what_usually_works(graph, step_id), step_queries[:5])
+    assert results[:5] == scanned_results
+    print()
+    print("query_what_usually_works (per step)")
+    print(f"  index: {indexed * 1e3:10.2f} ms/query ({np.mean([len(r) for r in results]):,.0f} results)")
+    print(f"  scan:  {scanned * 1e3:10.2f} ms/query  -> {scanned / indexed:,.1f}x")
+
+    print()
+    engine = ContinuityEngine()
+    start = time.perf_counter()
+    for event in make_events(n_engine_events, seed=2):
+        engine.record_event(event)
+    recording = time.perf_counter() - start
+    history = engine.event_history
+    parents = [e.parent_event_id for e in history[-200:]]
+    start = time.perf_counter()
+    for parent_id in parents:
+        next((e for e in history if e.event_id == parent_id), None)
+    scan_lookup = (time.perf_counter() - start) / len(parents)
+    print(f"ContinuityEngine.record_event ({n_engine_events:,} events with parents)")
+    print(f"  recording:           {recording / n_engine_events * 1e6:8.1f} µs/event")
+    print(f"  history-scan lookup: {scan_lookup * 1e6:8.1f} µs/event at this history length")
+
+
+if __name__ == "__main__":
+    main()
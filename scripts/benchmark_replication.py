@@ -0,0 +1,90 @@
+"""
+Benchmark for common-random-numbers replication in confidence estimation.
+
+Times R full reruns of the batch engine (one per seed, as
+run_stochastic_simulations does) against one run_replicated_simulations
+call with R replicates on N synthetic personas (defaults: 2000 personas,
+50 replicates), and an early-stopped replication with a CI half-width
+target.
+
+Usage:
+    python scripts/benchmark_replication.py [n_personas] [n_replicates]
+"""
+import sys
+from pathlib import Path
+_root = Path(__file__).resolve().parent.parent
+if str(_root) not in sys.path:
+    sys.path.insert(0, str(_root))
+
+import time
+import numpy as np
+import pandas as pd
+
+from behavioral_engine_batch import run_intent_aware_simulation_batch
+from calibration.confidence_estimation import ci_half_width, run_replicated_simulations
+from credigo_ss_steps_improved import CREDIGO_SS_11_STEPS
+from dropsim_intent_model import CREDIGO_GLOBAL_INTENT
+
+
+def make_personas(n, seed=0):
+    """Synthetic personas with the raw and derived columns the engines read."""
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'occupation': rng.choice(['Software Engineer', 'Farmer', 'School Teacher', 'Clerk', 'Sales Manager'], n),
+        'education_level': rng.choice(['Graduate & above', 'Higher Secondary', 'Primary'], n),
+        'age': rng.integers(18, 70, n),
+        'urban_rural': rng.choice(['Metro', 'Urban', 'Semi-Urban', 'Rural'], n),
+        'regional_cluster': rng.choice(['East', 'North', 'West', 'South'], n),
+        'digital_literacy_score': rng.integers(0, 11, n),
+        'aspirational_score': rng.integers(0, 11, n),
+        'english_score': rng.integers(0, 11, n),
+        'openness_score': rng.integers(0, 11, n),
+        'generation_bucket': rng.choice(['Gen Z', 'Young Millennial', 'Gen X'], n)
+    })
+
+
+def main():
+    n_personas = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    n_replicates = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+    n_reruns = min(n_replicates, 5)
+    df = make_personas(n_personas)
+    steps = CREDIGO_SS_11_STEPS
+
+    print("=" * 80)
+    print(f"REPLICATION BENCHMARK ({n_personas:,} personas, {n_personas * 7:,} trajectories)")
+    print("=" * 80)
+    print()
+
+    start = time.perf_counter()
+    rerun_rates = [
+        run_intent_aware_simulation_batch(
+            df, steps, fixed_intent=CREDIGO_GLOBAL_INTENT, verbose=False, seed=42 + i
+        )['completion_rate'].mean()
+        for i in range(n_reruns)
+    ]
+    per_run = (time.perf_counter() - start) / n_reruns
+
+    start = time.perf_counter()
+    replicated = run_replicated_simulations(
+        df, steps, fixed_intent=CREDIGO_GLOBAL_INTENT, n_replicates=n_replicates
+    )
+    crn = time.perf_counter() - start
+
+    start = time.perf_counter()
+    stopped = run_replicated_simulations(
+        df, steps, fixed_intent=CREDIGO_GLOBAL_INTENT, n_replicates=1000, target_half_width=0.002
+    )
+    early = time.perf_counter() - start
+
+    print(f"Reruns:  {per_run:.2f}s per run -> {per_run * n_replicates:.1f}s for {n_replicates} "
+          f"(mean completion {np.mean(rerun_rates):.4f}, {n_reruns} timed)")
+    print(f"CRN:     {crn:.2f}s for {replicated.n_replicates} replicates "
+          f"({crn / per_run:.2f} runs' worth) -> {per_run * n_replicates / crn:.0f}x")
+    print(f"         mean completion {replicated.completion_rates.mean():.4f} "
+          f"± {ci_half_width(replicated.completion_rates):.4f} (95% CI)")
+    print(f"Early stop at half-width 0.002: {stopped.n_replicates} replicates in {early:.2f}s "
+          f"(half-width {stopped.half_width:.4f})")
+
+
+if __name__ == "__main__":
+    main()
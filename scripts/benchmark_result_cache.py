@@ -0,0 +1,86 @@
+"""
+Benchmark for the content-addressed scenario result cache.
+
+Runs the default fintech scenario (personas repeated to N, default 200)
+through the API job path three ways: cold (simulated), from a fresh
+process's disk tier, and from the in-process memory tier.
+
+Usage:
+    python scripts/benchmark_result_cache.py [n_personas]
+"""
+import sys
+from pathlib import Path
+_root = Path(__file__).resolve().parent.parent
+if str(_root) not in sys.path:
+    sys.path.insert(0, str(_root))
+
+import tempfile
+import time
+
+from dropsim_api import SimulationJobManager
+from dropsim_result_cache import ResultCache
+from fintech_presets import get_default_fintech_scenario
+
+STEP_FIELDS = [
+    'cognitive_demand', 'effort_demand', 'risk_signal', 'irreversibility', 'delay_to_value',
+    'explicit_value', 'reassurance_signal', 'authority_signal'
+]
+
+
+def make_scenario(n_personas):
+    personas, _, steps = get_default_fintech_scenario()
+    return {
+        'scenario_name': "cache_benchmark",
+        'personas': [
+            {'name': f"{p['name']}_{i}", 'description': p['description'], 'raw_fields': p['raw_fields']}
+            for i in range(n_personas)
+            for p in [personas[i % len(personas)]]
+        ],
+        'steps': [
+            {'name': name, 'description': step.get('description'), **{f: step[f] for f in STEP_FIELDS}}
+            for name, step in steps.items()
+        ]
+    }
+
+
+def timed_job(manager, scenario):
+    start = time.perf_counter()
+    job = manager.submit(scenario, include_traces=True)
+    job.future.result()
+    return time.perf_counter() - start, job
+
+
+def main():
+    n_personas = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    scenario = make_scenario(n_personas)
+    cache_dir = tempfile.mkdtemp(prefix="dropsim_result_cache_")
+
+    print("=" * 80)
+    print(f"RESULT CACHE BENCHMARK ({n_personas} personas x 7 variants, traces included)")
+    print("=" * 80)
+
+    timings = {}
+    cache = ResultCache(cache_dir)
+    manager = SimulationJobManager(max_workers=1, executor="thread", cache=cache)
+    timings['cold (simulate)'], job = timed_job(manager, scenario)
+    timings['memory tier'], _ = timed_job(manager, scenario)
+    manager.shutdown()
+
+    # A new cache object has an empty memory tier: served from disk
+    fresh = ResultCache(cache_dir)
+    manager = SimulationJobManager(max_workers=1, executor="thread", cache=fresh)
+    timings['disk tier'], cached_job = timed_job(manager, scenario)
+    assert cached_job.cached and cached_job.future.result() == job.future.result()
+    manager.shutdown()
+
+    cold = timings['cold (simulate)']
+    for label, seconds in timings.items():
+        print(f"  {label:<16} {seconds * 1e3:9.1f} ms  -> {cold / seconds:8.1f}x")
+    print()
+    print(f"Memory tier stats: {cache.stats.to_dict()}")
+    print(f"Disk tier stats:   {fresh.stats.to_dict()}")
+    print(f"Disk usage: {fresh.disk_usage() / 1e6:.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Benchmark for the Shapley attribution backends.
+
+Compares the enumerative reference (two decision-function calls per
+marginal contribution) against the batched exact backend and the
+permutation-sampling backend on random decisions.
+
+Usage:
+    python scripts/benchmark_shapley_attribution.py [n_decisions]
+"""
+import sys
+from pathlib import Path
+_root = Path(__file__).resolve().parent.parent
+if str(_root) not in sys.path:
+    sys.path.insert(0, str(_root))
+
+import time
+import numpy as np
+
+from decision_attribution.attribution_model import FEATURE_NAMES, LocalDecisionFunction
+from decision_attribution.shap_attributor import (
+    _enumerate_shapley_values,
+    compute_shapley_values_batch,
+    get_baseline_features
+)
+
+
+def main():
+    n_decisions = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    n_reference = min(n_decisions, 20)
+    rng = np.random.default_rng(0)
+
+    X = rng.uniform(0, 1, size=(n_decisions, len(FEATURE_NAMES)))
+    step_index = rng.integers(0, 11, size=n_decisions)
+    alignment = rng.uniform(0, 1, size=n_decisions)
+    B = np.array([
+        [get_baseline_features(int(s), 11)[name] for name in FEATURE_NAMES]
+        for s in step_index
+    ])
+
+    print("=" * 80)
+    print(f"SHAPLEY ATTRIBUTION BENCHMARK ({n_decisions} decisions, {len(FEATURE_NAMES)} features)")
+    print("=" * 80)
+    print()
+
+    # Reference: enumerate every coalition for every feature
+    func = LocalDecisionFunction()
+    start = time.perf_counter()
+    reference = []
+    for i in range(n_reference):
+        values = _enumerate_shapley_values(
+            func,
+            dict(zip(FEATURE_NAMES, X[i])),
+            dict(zip(FEATURE_NAMES, B[i])),
+            int(step_index[i]), 11, float(alignment[i])
+        )
+        reference.append([values[name] for name in FEATURE_NAMES])
+    reference_per_decision = (time.perf_counter() - start) / n_reference
+    reference = np.array(reference)
+
+    start = time.perf_counter()
+    exact = compute_shapley_values_batch(X, B, step_index, 11, alignment)
+    exact_per_decision = (time.perf_counter() - start) / n_decisions
+
+    start = time.perf_counter()
+    sampled, stderr = compute_shapley_values_batch(
+        X, B, step_index, 11, alignment,
+        method="permutation", tolerance=0.01, seed=0, return_stderr=True
+    )
+    sampled_per_decision = (time.perf_counter() - start) / n_decisions
+
+    print(f"{'backend':<28}{'ms / decision':>16}{'speedup':>12}")
+    print(f"{'enumerative (reference)':<28}{reference_per_decision * 1000:>16.3f}{1.0:>11.1f}x")
+    print(f"{'exact (batched)':<28}{exact_per_decision * 1000:>16.3f}"
+          f"{reference_per_decision / exact_per_decision:>11.1f}x")
+    print(f"{'permutation (tol=0.01)':<28}{sampled_per_decision * 1000:>16.3f}"
+          f"{reference_per_decision / sampled_per_decision:>11.1f}x")
+    print()
+    print(f"Exact vs reference max |diff|:       {np.abs(exact[:n_reference] - reference).max():.2e}")
+    print(f"Permutation vs exact max |diff|:     {np.abs(sampled - exact).max():.2e}")
+    print(f"Permutation max 1.96 * stderr:       {1.96 * stderr.max():.2e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Benchmark for streaming trace sinks.
+
+Runs run_intent_aware_simulation at capture='traces' on growing persona
+counts, each in a fresh subprocess, once keeping trajectories in memory and
+once streaming them to an NDJSONTraceSink, and reports peak RSS. With the
+sink, peak memory should stay roughly flat as the persona count grows.
+
+Usage:
+    python scripts/benchmark_trace_sink.py [max_personas]
+"""
+import sys
+from pathlib import Path
+_root = Path(__file__).resolve().parent.parent
+if str(_root) not in sys.path:
+    sys.path.insert(0, str(_root))
+
+import os
+import subprocess
+import tempfile
+import time
+
+
+def run_once(n_personas: int, mode: str):
+    """Simulate in this process and print '<peak RSS MB> <seconds>'."""
+    import resource
+
+    from behavioral_engine_intent_aware import run_intent_aware_simulation
+    from credigo_ss_steps_improved import CREDIGO_SS_11_STEPS
+    from dropsim_intent_model import CREDIGO_GLOBAL_INTENT
+    from dropsim_trace_sink import NDJSONTraceSink
+    from scripts.benchmark_replication import make_personas
+
+    df = make_personas(n_personas)
+    kwargs = dict(fixed_intent=CREDIGO_GLOBAL_INTENT, verbose=False, seed=42, capture="traces")
+    start = time.perf_counter()
+    if mode == "sink":
+        with tempfile.TemporaryDirectory() as tmp:
+            with NDJSONTraceSink(os.path.join(tmp, "traces.ndjson")) as sink:
+                run_intent_aware_simulation(df, CREDIGO_SS_11_STEPS, trace_sink=sink, **kwargs)
+    else:
+        run_intent_aware_simulation(df, CREDIGO_SS_11_STEPS, **kwargs)
+    elapsed = time.perf_counter() - start
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024  # KiB on Linux
+    print(f"{peak_mb:.1f} {elapsed:.2f}")
+
+
+def main():
+    max_personas = int(sys.argv[1]) if len(sys.argv) > 1 else 4000
+    sizes = [n for n in (500, 1000, 2000, 4000, 8000, 16000) if n <= max_personas] or [max_personas]
+
+    print("=" * 80)
+    print("TRACE SINK MEMORY BENCHMARK (capture='traces', peak RSS per run)")
+    print("=" * 80)
+    print()
+    print(f"{'personas':>9}  {'in-memory':>18}  {'NDJSON sink':>18}")
+
+    for n_personas in sizes:
+        cells = []
+        for mode in ("memory", "sink"):
+            output = subprocess.run(
+                [sys.executable, __file__, "--run", str(n_personas), mode],
+                check=True, capture_output=True, text=True
+            ).stdout.split()
+            cells.append(f"{float(output[0]):8.0f} MB {float(output[1]):6.1f}s")
+        print(f"{n_personas:>9,}  {cells[0]:>18}  {cells[1]:>18}")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) == 4 and sys.argv[1] == "--run":
+        run_once(int(sys.argv[2]), sys.argv[3])
+    else:
+        main()
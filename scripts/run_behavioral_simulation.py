@@ -14,21 +14,6 @@ This answers "WHY they dropped at step t" before "WHO".
 """
 
 import argparse
-from load_dataset import load_and_sample
-from derive_features import derive_all_features
-from behavioral_engine import run_behavioral_simulation, PRODUCT_STEPS
-from behavioral_aggregator import (
-    format_failure_mode_report,
-    generate_full_report,
-    print_persona_state_trace,
-    export_persona_traces_json
-)
-from fintech_presets import get_default_fintech_scenario, FINTECH_ONBOARDING_STEPS
-from fintech_demo import (
-    run_fintech_demo_simulation,
-    print_fintech_trace,
-    export_fintech_json
-)
 
 
 def main():
@@ -63,6 +48,23 @@ Examples:
     
     args = parser.parse_args()
     
+    # Engine imports are deferred until the arguments parse (keeps --help fast)
+    from load_dataset import load_and_sample
+    from derive_features import derive_all_features
+    from behavioral_engine import run_behavioral_simulation, PRODUCT_STEPS
+    from behavioral_aggregator import (
+        format_failure_mode_report,
+        generate_full_report,
+        print_persona_state_trace,
+        export_persona_traces_json
+    )
+    from fintech_presets import get_default_fintech_scenario, FINTECH_ONBOARDING_STEPS
+    from fintech_demo import (
+        run_fintech_demo_simulation,
+        print_fintech_trace,
+        export_fintech_json
+    )
+    
     # ============================================================================
     # FINTECH DEMO MODE
     # ============================================================================
@@ -24,10 +24,6 @@ import os
 import time
 from datetime import datetime
 
-from load_dataset import load_and_sample
-from derive_features import derive_all_features
-from llm_simulator import run_llm_simulation
-
 
 def aggregate_llm_results(df):
     """Aggregate and display LLM simulation results."""
@@ -128,6 +124,11 @@ def main():
     
     args = parser.parse_args()
     
+    # Engine imports are deferred until the arguments parse (keeps --help fast)
+    from load_dataset import load_and_sample
+    from derive_features import derive_all_features
+    from llm_simulator import run_llm_simulation
+    
     # Check API key
     if not os.environ.get("OPENAI_API_KEY"):
         print("❌ Error: OPENAI_API_KEY not set")
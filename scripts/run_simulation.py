@@ -33,12 +33,6 @@ import sys
 import time
 from datetime import datetime
 
-# Import our modules
-from load_dataset import load_and_sample
-from derive_features import derive_all_features
-from journey_simulator import run_journey_simulation, JOURNEY_STEPS
-from aggregator import aggregate_and_report
-
 
 def main():
     """Main simulation pipeline."""
@@ -66,6 +60,12 @@ Examples:
     
     args = parser.parse_args()
     
+    # Engine imports are deferred until the arguments parse (keeps --help fast)
+    from load_dataset import load_and_sample
+    from derive_features import derive_all_features
+    from journey_simulator import run_journey_simulation, JOURNEY_STEPS
+    from aggregator import aggregate_and_report
+    
     verbose = not args.quiet
     
     # Header
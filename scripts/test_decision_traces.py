@@ -94,8 +94,7 @@ def main():
     context_graph = ContextGraphV2()
     
     # Add traces to graph
-    for trace in traces[:5]:  # First 5 traces
-        context_graph.add_decision_trace(trace)
+    context_graph.add_decision_traces(traces[:5])  # First 5 traces
     
     print(f"Graph nodes: {len(context_graph.nodes)}")
     print(f"Graph edges: {len(context_graph.edges)}")
@@ -15,19 +15,38 @@ Usage:
 """
 
 import json
-import numpy as np
-from typing import Dict, List, Optional, Literal
+from typing import Any, Dict, List, Optional, Literal
 from dataclasses import dataclass, asdict
 from datetime import datetime
 from pathlib import Path
 import warnings
 
+from dropsim_result_cache import file_digest, get_result_cache, scenario_cache_key
+
 # ============================================================================
 # CANONICAL ENGINE SELECTION
 # ============================================================================
 
 CANONICAL_ENGINE = "behavioral_engine_intent_aware"
 
+# Modules whose source determines pipeline stages 2-6 (result cache keys);
+# the local modules they import are fingerprinted with them
+PIPELINE_ENGINE_MODULES = (
+    "simulation_pipeline",
+    "behavioral_engine_intent_aware",
+    "behavioral_engine_batch",
+    "behavioral_engine_improved",
+    "behavioral_engine",
+    "dropsim_prior_cache",
+    "dropsim_intent_model",
+    "entry_model",
+    "dropsim_intent_analysis",
+    "calibration.evaluator",
+    "calibration.confidence_estimation",
+    "calibration.loss_functions",
+    "dropsim_outcome_matrix"
+)
+
 # Deprecated engines - should not be used directly
 DEPRECATED_ENGINES = [
     "behavioral_engine",
@@ -67,7 +86,7 @@ class PipelineResult:
     drift: Optional[Dict]
     final_metrics: Dict
     # NEW: Decision-first data
-    decision_traces: Optional[List[Dict]] = None  # List of DecisionTrace dicts
+    decision_traces: Optional[Any] = None  # DecisionTraceTable (or list of DecisionTrace dicts)
     context_graph_summary: Optional[Dict] = None  # Context graph summary
     model_version: str = "v1.0"
     execution_mode: str = "production"
@@ -94,6 +113,9 @@ class PipelineResult:
                 return {k: convert_numpy_types(v) for k, v in obj.items()}
             elif isinstance(obj, list):
                 return [convert_numpy_types(item) for item in obj]
+            elif hasattr(obj, 'to_dicts'):
+                # DecisionTraceTable
+                return convert_numpy_types(obj.to_dicts())
             else:
                 return obj
         
@@ -135,7 +157,10 @@ def run_simulation(
     seed: int = 42,
     calibration_file: Optional[str] = None,
     baseline_file: Optional[str] = None,
-    verbose: bool = True
+    verbose: bool = True,
+    vectorized: bool = False,
+    use_cache: bool = True,
+    capture: str = "full"
 ) -> PipelineResult:
     """
     Canonical simulation pipeline - THE ONLY WAY TO RUN SIMULATIONS.
@@ -149,6 +174,16 @@ def run_simulation(
         calibration_file: Path to calibration summary JSON (optional)
         baseline_file: Path to baseline JSON for drift monitoring (optional)
         verbose: Print progress
+        vectorized: Use the vectorized batch engine (aggregate metrics only,
+            distribution- not trajectory-identical; no decision traces /
+            context graph)
+        use_cache: Reuse stages 2-6 of an identical earlier run (same personas,
+            product, mode, seed, calibration file and engine code) from the
+            result cache; drift monitoring always runs
+        capture: Engine capture level ("metrics", "summary", "traces",
+            "full"). Funnel metrics and drift monitoring work at every
+            level; intent analysis and the context graph need "traces" or
+            "full"
     
     Returns:
         PipelineResult with all outputs
@@ -180,6 +215,115 @@ def run_simulation(
         print(f"   ✓ Loaded {len(df)} personas")
         print(f"   ✓ Loaded {len(product_steps)} product steps")
     
+    # ========================================================================
+    # STAGES 2-6 (reused from the result cache for identical runs)
+    # ========================================================================
+    cache = get_result_cache() if use_cache else None
+    cache_key = None
+    stages = None
+    if cache is not None:
+        cache_key = _pipeline_cache_key(
+            df, product_steps, product_config, mode, seed, calibration_file, vectorized, capture
+        )
+        stages = cache.get(cache_key)
+        if stages is not None and verbose:
+            print("\n[2-6/7] ♻️  Reusing cached results of an identical run")
+            print(f"   ✓ Completion rate: {stages['final_metrics']['completion_rate']:.2%}")
+            print(f"   ✓ Total conversion: {stages['final_metrics']['total_conversion']:.2%}")
+    
+    if stages is None:
+        stages = _run_simulation_stages(
+            df, derived, product_steps, product_config, mode, seed,
+            calibration_file, verbose, vectorized, capture
+        )
+        if cache_key is not None:
+            cache.put(cache_key, stages)
+    
+    entry_result = stages['entry_result']
+    entry_probability = stages['entry_probability']
+    behavioral_result = stages['behavioral_result']
+    calibration_data = stages['calibration_data']
+    final_metrics = stages['final_metrics']
+    evaluation_data = stages['evaluation_data']
+    
+    # ========================================================================
+    # STAGE 7: Run Drift Monitoring (production only)
+    # ========================================================================
+    drift_data = None
+    if mode == "production":
+        if verbose:
+            print("\n[7/7] Running drift monitoring...")
+        
+        drift_data = _run_drift_monitoring(
+            entry_probability, behavioral_result, calibration_data,
+            baseline_file, product_config, verbose
+        )
+        
+        if verbose:
+            if drift_data:
+                status = drift_data.get('overall_status', 'unknown')
+                print(f"   ✓ Drift status: {status}")
+            else:
+                print(f"   ℹ️  No baseline found (skipping drift check)")
+    else:
+        if verbose:
+            print("\n[7/7] Skipping drift monitoring (not production mode)")
+    
+    # ========================================================================
+    # Build Unified Output (NOW DECISION-FIRST)
+    # ========================================================================
+    result = PipelineResult(
+        entry=entry_result,
+        behavioral=behavioral_result,
+        intent=behavioral_result.get('intent_analysis', {}),
+        calibration=calibration_data,
+        evaluation=evaluation_data,
+        drift=drift_data,
+        final_metrics=final_metrics,
+        # NEW: Decision-first data
+        decision_traces=behavioral_result.get('decision_traces'),
+        context_graph_summary=behavioral_result.get('context_graph_summary'),
+        model_version="v1.0",
+        execution_mode=mode,
+        timestamp=datetime.now().isoformat()
+    )
+    
+    if verbose:
+        print("\n" + "=" * 80)
+        print("PIPELINE COMPLETE")
+        print("=" * 80)
+        print(f"Mode: {mode}")
+        print(f"Entry rate: {final_metrics['entry_rate']:.2%}")
+        print(f"Completion rate: {final_metrics['completion_rate']:.2%}")
+        print(f"Total conversion: {final_metrics['total_conversion']:.2%}")
+        if drift_data:
+            print(f"Drift status: {drift_data.get('overall_status', 'unknown')}")
+        print("=" * 80)
+    
+    return result
+
+
+# ============================================================================
+# PIPELINE STAGE IMPLEMENTATIONS
+# ============================================================================
+
+def _run_simulation_stages(
+    df, derived, product_steps: Dict,
+    product_config: str,
+    mode: ExecutionMode,
+    seed: int,
+    calibration_file: Optional[str],
+    verbose: bool,
+    vectorized: bool,
+    capture: str = "full"
+) -> Dict:
+    """
+    Pipeline stages 2-6: entry model, behavioral engine, calibration,
+    funnel metrics and evaluation.
+    
+    Deterministic in its inputs (and the engine code), so run_simulation
+    caches the returned dict.
+    """
     # ========================================================================
     # STAGE 2: Run Entry Model
     # ========================================================================
@@ -199,7 +343,8 @@ def run_simulation(
         print(f"\n[3/7] Running behavioral engine ({CANONICAL_ENGINE})...")
     
     behavioral_result = _run_canonical_engine(
-        df, derived, product_steps, entry_probability, seed, verbose, product_config
+        df, derived, product_steps, entry_probability, seed, verbose, product_config,
+        vectorized=vectorized, capture=capture
     )
     
     completion_rate = behavioral_result.get('completion_rate', 0.0)
@@ -225,7 +370,8 @@ def run_simulation(
             # Re-run behavioral engine with calibrated parameters
             behavioral_result = _run_canonical_engine(
                 df, derived, product_steps, entry_probability, seed, verbose,
-                product_config, parameters=calibration_data.get('calibrated_parameters')
+                product_config, parameters=calibration_data.get('calibrated_parameters'),
+                vectorized=vectorized, capture=capture
             )
             completion_rate = behavioral_result.get('completion_rate', 0.0)
             total_conversion = entry_probability * completion_rate
@@ -272,66 +418,43 @@ def run_simulation(
         if verbose:
             print("\n[6/7] Skipping evaluation (research mode)")
     
-    # ========================================================================
-    # STAGE 7: Run Drift Monitoring (production only)
-    # ========================================================================
-    drift_data = None
-    if mode == "production":
-        if verbose:
-            print("\n[7/7] Running drift monitoring...")
-        
-        drift_data = _run_drift_monitoring(
-            entry_probability, behavioral_result, calibration_data,
-            baseline_file, product_config, verbose
-        )
-        
-        if verbose:
-            if drift_data:
-                status = drift_data.get('overall_status', 'unknown')
-                print(f"   ✓ Drift status: {status}")
-            else:
-                print(f"   ℹ️  No baseline found (skipping drift check)")
-    else:
-        if verbose:
-            print("\n[7/7] Skipping drift monitoring (not production mode)")
-    
-    # ========================================================================
-    # Build Unified Output (NOW DECISION-FIRST)
-    # ========================================================================
-    result = PipelineResult(
-        entry=entry_result,
-        behavioral=behavioral_result,
-        intent=behavioral_result.get('intent_analysis', {}),
-        calibration=calibration_data,
-        evaluation=evaluation_data,
-        drift=drift_data,
-        final_metrics=final_metrics,
-        # NEW: Decision-first data
-        decision_traces=behavioral_result.get('decision_traces'),
-        context_graph_summary=behavioral_result.get('context_graph_summary'),
-        model_version="v1.0",
-        execution_mode=mode,
-        timestamp=datetime.now().isoformat()
-    )
-    
-    if verbose:
-        print("\n" + "=" * 80)
-        print("PIPELINE COMPLETE")
-        print("=" * 80)
-        print(f"Mode: {mode}")
-        print(f"Entry rate: {final_metrics['entry_rate']:.2%}")
-        print(f"Completion rate: {final_metrics['completion_rate']:.2%}")
-        print(f"Total conversion: {final_metrics['total_conversion']:.2%}")
-        if drift_data:
-            print(f"Drift status: {drift_data.get('overall_status', 'unknown')}")
-        print("=" * 80)
-    
-    return result
+    return {
+        'entry_result': entry_result,
+        'entry_probability': entry_probability,
+        'behavioral_result': behavioral_result,
+        'calibration_data': calibration_data,
+        'final_metrics': final_metrics,
+        'evaluation_data': evaluation_data
+    }
 
 
-# ============================================================================
-# PIPELINE STAGE IMPLEMENTATIONS
-# ============================================================================
+def _pipeline_cache_key(
+    df, product_steps: Dict,
+    product_config: str,
+    mode: ExecutionMode,
+    seed: int,
+    calibration_file: Optional[str],
+    vectorized: bool,
+    capture: str = "full"
+) -> Optional[str]:
+    """Result cache key for stages 2-6, or None if the inputs cannot be hashed."""
+    calibration_path = _resolve_calibration_path(calibration_file, product_config)
+    try:
+        return scenario_cache_key(
+            "pipeline_stages",
+            product_steps,
+            df,
+            seed=seed,
+            engine_modules=PIPELINE_ENGINE_MODULES,
+            product_config=product_config,
+            mode=mode,
+            vectorized=vectorized,
+            capture=capture,
+            calibration=file_digest(calibration_path) if mode in ["evaluation", "production"] else None
+        )
+    except TypeError:
+        return None
+
 
 def _get_fixed_intent_for_product(product_config: str):
     """
@@ -458,37 +581,52 @@ def _run_canonical_engine(
     seed: int,
     verbose: bool,
     product_config: str = "credigo",
-    parameters: Optional[Dict] = None
+    parameters: Optional[Dict] = None,
+    vectorized: bool = False,
+    capture: str = "full"
 ) -> Dict:
-    """Run canonical behavioral engine (ONLY behavioral_engine_intent_aware)."""
+    """
+    Run canonical behavioral engine (ONLY behavioral_engine_intent_aware).
+    
+    With vectorized=True the same model runs through the batch engine, which
+    returns the same DataFrame shape but captures no decision traces. It
+    draws from a single Generator, so aggregate metrics match the scalar
+    engine in distribution, not trajectory for trajectory.
+    Intent analysis and the context graph are only built at the "traces"
+    and "full" capture levels.
+    """
+    from behavioral_engine_intent_aware import TRACE_CAPTURE_LEVELS
+    with_traces = capture in TRACE_CAPTURE_LEVELS
+
     # ENFORCE: Only canonical engine allowed
     if CANONICAL_ENGINE != "behavioral_engine_intent_aware":
         raise RuntimeError(f"Canonical engine mismatch: {CANONICAL_ENGINE}")
     
-    from behavioral_engine_intent_aware import run_intent_aware_simulation
+    if vectorized:
+        from behavioral_engine_batch import run_intent_aware_simulation_batch as run_intent_aware_simulation
+        # One Generator for all draws: legacy replay builds a RandomState per
+        # trajectory and would dominate the batch engine's runtime
+        engine_kwargs = {'capture': capture, 'rng_mode': "generator"}
+    else:
+        from behavioral_engine_intent_aware import run_intent_aware_simulation
+        engine_kwargs = {'capture': capture, 'trace_table': with_traces}
     
     # Use fixed global intent for consistency (can be customized per product)
     fixed_intent = _get_fixed_intent_for_product(product_config)
     
-    # Apply calibrated parameters if provided
+    # Apply calibrated parameters if provided (passed explicitly, nothing is patched)
     if parameters:
-        from calibration.calibrator import inject_parameters_into_engine
-        with inject_parameters_into_engine(parameters, 'behavioral_engine_intent_aware'):
-            result_df = run_intent_aware_simulation(
-                df,
-                product_steps=product_steps,
-                fixed_intent=fixed_intent,
-                verbose=False,
-                seed=seed
-            )
-    else:
-        result_df = run_intent_aware_simulation(
-            df,
-            product_steps=product_steps,
-            fixed_intent=fixed_intent,
-            verbose=False,
-            seed=seed
-        )
+        from behavioral_engine_improved import EngineParameters
+        engine_kwargs['parameters'] = EngineParameters.from_dict(parameters)
+    
+    result_df = run_intent_aware_simulation(
+        df,
+        product_steps=product_steps,
+        fixed_intent=fixed_intent,
+        verbose=False,
+        seed=seed,
+        **engine_kwargs
+    )
     
     # Extract metrics
     from calibration.loss_functions import extract_simulated_metrics_from_results
@@ -497,80 +635,70 @@ def _run_canonical_engine(
     
     # Get intent analysis
     intent_analysis = {}
-    try:
-        from dropsim_intent_analysis import generate_intent_analysis
-        intent_analysis = generate_intent_analysis(result_df, product_steps)
-        # Convert to dict if needed
-        if hasattr(intent_analysis, 'to_dict'):
-            intent_analysis = intent_analysis.to_dict()
-    except:
-        pass
+    if with_traces:
+        try:
+            from dropsim_intent_analysis import generate_intent_analysis
+            intent_analysis = generate_intent_analysis(result_df, product_steps)
+            # Convert to dict if needed
+            if hasattr(intent_analysis, 'to_dict'):
+                intent_analysis = intent_analysis.to_dict()
+        except:
+            pass
     
     # NEW: Build decision sequences and context graph from traces
-    decision_traces_all = []
+    decision_traces_all = None
     decision_sequences = []
     context_graph_summary = None
     
-    try:
-        from decision_graph.decision_trace import DecisionSequence, DecisionOutcome, DecisionTrace
-        from decision_graph.context_graph import build_context_graph_from_traces, ContextGraphSummary
-        
-        # Collect traces from trajectories (they're stored in 'trajectories' column)
-        if 'trajectories' in result_df.columns:
-            for idx, row in result_df.iterrows():
-                trajectories = row.get('trajectories', [])
-                
-                # Each trajectory has decision_traces and other info
-                for traj in trajectories:
-                    traces = traj.get('decision_traces', [])
-                    persona_id = traj.get('persona_id', f"persona_{idx}")
-                    variant_name = traj.get('variant', 'default')
-                    
-                    if traces:
-                        # Convert DecisionTrace objects to dicts if needed
-                        trace_dicts = []
-                        for trace in traces:
-                            if hasattr(trace, 'to_dict'):
-                                trace_dict = trace.to_dict()
-                                trace_dicts.append(trace_dict)
-                                decision_traces_all.append(trace_dict)
-                            elif isinstance(trace, dict):
-                                trace_dicts.append(trace)
-                                decision_traces_all.append(trace)
-                        
-                        # Convert back to DecisionTrace objects for sequence building
-                        trace_objects = [DecisionTrace.from_dict(td) for td in trace_dicts]
-                        
-                        # Determine final outcome
-                        final_outcome = DecisionOutcome.CONTINUE if traj.get('completed', False) else DecisionOutcome.DROP
-                        exit_step = traj.get('exit_step', None)
+    if with_traces:
+        try:
+            from decision_graph.decision_trace import DecisionSequence, DecisionOutcome
+            from decision_graph.context_graph import build_context_graph_from_traces, ContextGraphSummary
+            
+            # Columnar trace table (scalar engine with trace_table=True); each
+            # trajectory's 'decision_traces' is a zero-copy slice of it
+            decision_traces_all = result_df.attrs.get('decision_trace_table')
+            
+            # Collect traces from trajectories (they're stored in 'trajectories' column)
+            if 'trajectories' in result_df.columns:
+                for idx, trajectories in enumerate(result_df['trajectories']):
+                    # Each trajectory has decision_traces and other info
+                    for traj in trajectories:
+                        traces = traj.get('decision_traces', [])
+                        persona_id = traj.get('persona_id', f"persona_{idx}")
+                        variant_name = traj.get('variant', 'default')
                         
-                        # Build sequence
-                        sequence = DecisionSequence(
-                            persona_id=persona_id,
-                            variant_name=variant_name,
-                            traces=trace_objects,
-                            final_outcome=final_outcome,
-                            exit_step=exit_step
-                        )
-                        decision_sequences.append(sequence)
-        
-        # Build context graph from sequences
-        if decision_sequences:
-            context_graph = build_context_graph_from_traces(decision_sequences, product_steps)
-            context_graph_summary = ContextGraphSummary(
-                dominant_failure_paths=context_graph.dominant_failure_paths,
-                persona_step_rejection_map=context_graph.persona_step_rejection_map,
-                repeated_precedents=context_graph.repeated_precedents,
-                total_nodes=len(context_graph.nodes),
-                total_edges=len(context_graph.edges)
-            ).to_dict()
-    except Exception as e:
-        if verbose:
-            print(f"   ⚠️  Warning: Could not build context graph: {e}")
-            import traceback
-            traceback.print_exc()
-        # Continue without graph
+                        if len(traces):
+                            # Determine final outcome
+                            final_outcome = DecisionOutcome.CONTINUE if traj.get('completed', False) else DecisionOutcome.DROP
+                            exit_step = traj.get('exit_step', None)
+                            
+                            # Build sequence (table slices iterate as trace views)
+                            sequence = DecisionSequence(
+                                persona_id=persona_id,
+                                variant_name=variant_name,
+                                traces=traces,
+                                final_outcome=final_outcome,
+                                exit_step=exit_step
+                            )
+                            decision_sequences.append(sequence)
+            
+            # Build context graph from sequences
+            if decision_sequences:
+                context_graph = build_context_graph_from_traces(decision_sequences, product_steps)
+                context_graph_summary = ContextGraphSummary(
+                    dominant_failure_paths=context_graph.dominant_failure_paths,
+                    persona_step_rejection_map=context_graph.persona_step_rejection_map,
+                    repeated_precedents=context_graph.repeated_precedents,
+                    total_nodes=len(context_graph.nodes),
+                    total_edges=len(context_graph.edges)
+                ).to_dict()
+        except Exception as e:
+            if verbose:
+                print(f"   ⚠️  Warning: Could not build context graph: {e}")
+                import traceback
+                traceback.print_exc()
+            # Continue without graph
     
     return {
         'completion_rate': metrics.get('completion_rate', 0.0),
@@ -580,29 +708,33 @@ def _run_canonical_engine(
         'intent_analysis': intent_analysis,
         'result_dataframe': None,  # Don't include full DF in output
         # NEW: Decision-first data
-        'decision_traces': decision_traces_all if decision_traces_all else None,
+        'decision_traces': decision_traces_all if decision_traces_all else None,  # DecisionTraceTable
         'context_graph_summary': context_graph_summary
     }
 
 
+def _resolve_calibration_path(calibration_file: Optional[str], product_config: str) -> Optional[str]:
+    """The given calibration file, else the product's default one, if it exists."""
+    if calibration_file and Path(calibration_file).exists():
+        return calibration_file
+    # Try default location
+    default_path = f'{product_config}_calibration_summary.json'
+    if Path(default_path).exists():
+        return default_path
+    return None
+
+
 def _apply_calibration(
     calibration_file: Optional[str],
     product_config: str,
     verbose: bool
 ) -> Optional[Dict]:
     """Apply calibrated parameters if available."""
-    # Try to find calibration file
-    if calibration_file and Path(calibration_file).exists():
-        calib_path = calibration_file
-    else:
-        # Try default location
-        default_path = f'{product_config}_calibration_summary.json'
-        if Path(default_path).exists():
-            calib_path = default_path
-        else:
-            if verbose:
-                print(f"   ℹ️  No calibration file found (using defaults)")
-            return None
+    calib_path = _resolve_calibration_path(calibration_file, product_config)
+    if calib_path is None:
+        if verbose:
+            print(f"   ℹ️  No calibration file found (using defaults)")
+        return None
     
     try:
         with open(calib_path, 'r') as f:
@@ -648,9 +780,10 @@ def _run_evaluation(
         fixed_intent = _get_fixed_intent_for_product(product_config)
         
         def simulation_fn(df, seed):
+            # Evaluation only reads completion and drop-off counts
             return run_intent_aware_simulation(
                 df, product_steps=product_steps, fixed_intent=fixed_intent,
-                verbose=False, seed=seed
+                verbose=False, seed=seed, capture="metrics"
             )
         
         evaluation_report = evaluate_model(
@@ -0,0 +1,150 @@
+"""
+tests/conftest.py - Shared fixtures
+
+Synthetic persona frames so engine tests run without the Nemotron dataset.
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+_root = Path(__file__).resolve().parent.parent
+if str(_root) not in sys.path:
+    sys.path.insert(0, str(_root))
+
+
+# Intent mix for engine tests that exercise per-trajectory intent sampling
+MIXED_INTENTS = {'compare_options': 0.4, 'quick_decision': 0.3, 'learn_basics': 0.3}
+
+
+def make_persona_df(n: int = 12, seed: int = 0):
+    """Build a small persona DataFrame with raw and derived feature columns."""
+    import numpy as np
+    import pandas as pd
+
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'uuid': [f"persona-{i}" for i in range(n)],
+        'occupation': rng.choice(['Software Engineer', 'Farmer', 'School Teacher', 'Clerk', 'Sales Manager'], n),
+        'education_level': rng.choice(['Graduate & above', 'Higher Secondary', 'Primary'], n),
+        'marital_status': rng.choice(['Married', 'Never Married'], n),
+        'age': rng.integers(18, 70, n),
+        'sex': rng.choice(['Male', 'Female'], n),
+        'urban_rural': rng.choice(['Metro', 'Urban', 'Semi-Urban', 'Rural'], n),
+        'regional_cluster': rng.choice(['East', 'North', 'West', 'South'], n),
+        'digital_literacy_score': rng.integers(0, 11, n),
+        'aspirational_score': rng.integers(0, 11, n),
+        'english_score': rng.integers(0, 11, n),
+        'openness_score': rng.integers(0, 11, n),
+        'generation_bucket': rng.choice(['Gen Z', 'Young Millennial', 'Gen X'], n)
+    })
+
+
+def make_raw_persona_df(n: int = 400, seed: int = 0):
+    """Raw persona fields drawn from the derive_features rule vocabularies, with NaNs mixed in."""
+    import numpy as np
+    import pandas as pd
+
+    import derive_features as df_module
+
+    rng = np.random.default_rng(seed)
+    words = (df_module.HIGH_ASPIRATION_KEYWORDS + df_module.STABILITY_KEYWORDS
+             + df_module.DEBT_AVERSION_KEYWORDS + df_module.HOBBY_KEYWORDS
+             + ['the', 'and', 'village', 'student', 'startups', 'Wealthy', 'own', 'business'])
+
+    def text(max_words):
+        return [' '.join(rng.choice(words, rng.integers(0, max_words))) for _ in range(n)]
+
+    def pick(values):
+        out = rng.choice(np.array(values, dtype=object), n)
+        out[rng.random(n) < 0.05] = np.nan
+        return out
+
+    occupations = (df_module.DIGITAL_NATIVE_OCCUPATIONS + df_module.TRADITIONAL_OCCUPATIONS
+                   + df_module.ASPIRATIONAL_OCCUPATIONS + ['Student', 'Homemaker', 'IT support'])
+    return pd.DataFrame({
+        'age': rng.integers(18, 80, n),
+        'district': pick(df_module.TIER1_METRO_DISTRICTS + df_module.TIER2_URBAN_DISTRICTS
+                         + ['Rampur', 'Hazaribagh', 'Municipal Ward', 'Anantnagar', 'Kotdwara']),
+        'state': pick(list(df_module.STATE_TO_REGION) + ['Unknown']),
+        'zone': pick(['Northern', 'Southern', 'Eastern', 'Western', 'North Eastern', 'Central', 'Other']),
+        'first_language': pick(['Hindi', 'English', 'Tamil', 'Bengali', '']),
+        'second_language': pick(['English', 'Hindi', 'None']),
+        'third_language': pick(['English', 'Marathi', '']),
+        'education_level': pick(['Graduate & above', 'Post-Graduate', 'Higher Secondary', 'Secondary',
+                                 'Primary', 'Diploma', 'Professional degree', '10th pass', '12th pass']),
+        'occupation': pick([occ.title() for occ in occupations]),
+        'marital_status': pick(['Married', 'Never Married', 'Unmarried', 'Widowed']),
+        'career_goals_and_ambitions': text(12),
+        'cultural_background': text(8),
+        'persona': text(10),
+        'professional_persona': text(10),
+        'hobbies_and_interests': text(8),
+        'sports_persona': text(15),
+        'arts_persona': text(15),
+        'travel_persona': text(15),
+        'culinary_persona': text(15),
+    })
+
+
+def make_events(n, seed=0, n_entities=3):
+    """n DecisionEvents over n_entities users, each chained to that user's previous event."""
+    import numpy as np
+
+    from decision_continuity import BeliefState, DecisionEvent, DecisionEventType
+
+    rng = np.random.default_rng(seed)
+    types = [DecisionEventType.CONTINUATION, DecisionEventType.DROP, DecisionEventType.VALUE_REALIZED]
+
+    def belief():
+        return BeliefState(*[round(float(v), 2) for v in rng.random(6)])
+
+    events = []
+    for i in range(n):
+        entity = f"user_{i % n_entities}"
+        parent = events[i - n_entities].event_id if i >= n_entities else None
+        events.append(DecisionEvent(
+            event_id=f"evt_{i}", entity_id=entity, entity_type="user",
+            step_id=f"step_{rng.integers(4)}", step_index=int(rng.integers(4)),
+            event_type=types[rng.integers(len(types))],
+            belief_state_before=belief(), belief_state_after=belief(),
+            action_considered="continue", action_taken=str(rng.choice(["continue", "drop"])),
+            alternatives_rejected=["drop"], confidence_level=float(rng.random()),
+            context={'dominant_factors': ['trust']}, parent_event_id=parent,
+            timestamp=f"2025-01-01T00:00:{i:06d}",
+        ))
+    return events
+
+
+@pytest.fixture
+def persona_df():
+    return make_persona_df()
+
+
+@pytest.fixture
+def persona_factory():
+    return make_persona_df
+
+
+@pytest.fixture(scope="session")
+def raw_persona_factory():
+    return make_raw_persona_df
+
+
+@pytest.fixture
+def event_factory():
+    return make_events
+
+
+@pytest.fixture
+def product_steps():
+    from credigo_ss_steps_improved import CREDIGO_SS_11_STEPS
+    return CREDIGO_SS_11_STEPS
+
+
+@pytest.fixture
+def no_attribution(monkeypatch):
+    """Skip Shapley attribution in the scalar engine (it does not touch the RNG)."""
+    import decision_attribution.shap_attributor as shap_attributor
+    monkeypatch.setattr(shap_attributor, 'compute_decision_attributions_batch', lambda requests, **kwargs: [])
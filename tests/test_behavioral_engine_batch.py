@@ -0,0 +1,76 @@
+"""
+tests/test_behavioral_engine_batch.py - Parity tests for the vectorized batch engine
+"""
+
+import pytest
+
+from behavioral_engine_intent_aware import run_intent_aware_simulation
+from behavioral_engine_batch import run_intent_aware_simulation_batch
+from calibration.loss_functions import extract_simulated_metrics_from_results
+from dropsim_intent_model import CREDIGO_GLOBAL_INTENT
+
+from conftest import MIXED_INTENTS
+
+
+def _outcomes(result_df):
+    return [
+        (t['exit_step'], t['failure_reason'], t['intent_id'], len(t['intent_mismatches']))
+        for trajectories in result_df['trajectories']
+        for t in trajectories
+    ]
+
+
+@pytest.mark.usefixtures("no_attribution")
+class TestBatchParity:
+    """Batch engine must reproduce the scalar engine for a fixed seed."""
+
+    @pytest.mark.parametrize("intent_kwargs", [
+        {'fixed_intent': CREDIGO_GLOBAL_INTENT},
+        {'intent_distribution': MIXED_INTENTS}
+    ])
+    def test_trajectory_outcomes_match(self, persona_df, product_steps, intent_kwargs):
+        """Legacy RNG mode matches exit step, failure reason and intent per trajectory."""
+        scalar = run_intent_aware_simulation(persona_df, product_steps, verbose=False, seed=7, **intent_kwargs)
+        batch = run_intent_aware_simulation_batch(persona_df, product_steps, verbose=False, seed=7, **intent_kwargs)
+
+        assert list(batch.columns) == list(scalar.columns)
+        assert _outcomes(batch) == _outcomes(scalar)
+
+    def test_journey_state_matches(self, persona_df, product_steps):
+        """Per-step state and probabilities are identical to the scalar path."""
+        scalar = run_intent_aware_simulation(persona_df, product_steps, fixed_intent=CREDIGO_GLOBAL_INTENT, verbose=False, seed=3)
+        batch = run_intent_aware_simulation_batch(persona_df, product_steps, fixed_intent=CREDIGO_GLOBAL_INTENT, verbose=False, seed=3)
+
+        for s_trajs, b_trajs in zip(scalar['trajectories'], batch['trajectories']):
+            for s_traj, b_traj in zip(s_trajs, b_trajs):
+                assert s_traj['final_state'] == b_traj['final_state']
+                for s_step, b_step in zip(s_traj['journey'], b_traj['journey']):
+                    assert s_step['continuation_probability'] == b_step['continuation_probability']
+                    assert s_step['costs'] == b_step['costs']
+
+    def test_aggregate_metrics_match(self, persona_df, product_steps):
+        """Completion and drop-off distributions agree."""
+        scalar = run_intent_aware_simulation(persona_df, product_steps, fixed_intent=CREDIGO_GLOBAL_INTENT, verbose=False, seed=11)
+        batch = run_intent_aware_simulation_batch(persona_df, product_steps, fixed_intent=CREDIGO_GLOBAL_INTENT, verbose=False, seed=11)
+
+        assert extract_simulated_metrics_from_results(batch, product_steps) == \
+            extract_simulated_metrics_from_results(scalar, product_steps)
+
+
+class TestBatchEngine:
+    """Batch-only behaviour."""
+
+    def test_generator_rng_mode(self, persona_factory, product_steps):
+        """Generator RNG mode is reproducible and lands near the legacy completion rate."""
+        df = persona_factory(n=200, seed=1)
+
+        first = run_intent_aware_simulation_batch(df, product_steps, fixed_intent=CREDIGO_GLOBAL_INTENT, verbose=False, rng_mode="generator")
+        second = run_intent_aware_simulation_batch(df, product_steps, fixed_intent=CREDIGO_GLOBAL_INTENT, verbose=False, rng_mode="generator")
+        legacy = run_intent_aware_simulation_batch(df, product_steps, fixed_intent=CREDIGO_GLOBAL_INTENT, verbose=False)
+
+        assert _outcomes(first) == _outcomes(second)
+        assert abs(first['completion_rate'].mean() - legacy['completion_rate'].mean()) < 0.05
+
+    def test_unknown_rng_mode(self, persona_df, product_steps):
+        with pytest.raises(ValueError):
+            run_intent_aware_simulation_batch(persona_df, product_steps, fixed_intent=CREDIGO_GLOBAL_INTENT, verbose=False, rng_mode="bogus")
@@ -0,0 +1,77 @@
+"""
+tests/test_capture_levels.py - Trace-capture levels of the intent-aware engines
+"""
+
+import pytest
+
+from behavioral_engine_batch import run_intent_aware_simulation_batch
+from behavioral_engine_intent_aware import CAPTURE_LEVELS, run_intent_aware_simulation
+from calibration.loss_functions import extract_simulated_metrics_from_results, with_metrics_capture
+from dropsim_intent_model import CREDIGO_GLOBAL_INTENT
+
+from conftest import MIXED_INTENTS
+
+
+def _trajectories(result_df):
+    return [t for row in result_df['trajectories'] for t in row]
+
+
+@pytest.mark.parametrize("run", [run_intent_aware_simulation, run_intent_aware_simulation_batch])
+class TestCaptureLevels:
+    """Lighter levels drop bookkeeping but never change outcomes."""
+
+    def test_outcomes_identical_at_every_level(self, persona_df, product_steps, run, no_attribution):
+        results = {
+            capture: run(persona_df, product_steps, intent_distribution=MIXED_INTENTS,
+                         verbose=False, seed=11, capture=capture)
+            for capture in CAPTURE_LEVELS
+        }
+        full = _trajectories(results['full'])
+        for capture, result_df in results.items():
+            trajectories = _trajectories(result_df)
+            assert [t['exit_step'] for t in trajectories] == [t['exit_step'] for t in full]
+            assert [t['intent_id'] for t in trajectories] == [t['intent_id'] for t in full]
+            assert extract_simulated_metrics_from_results(result_df, product_steps) == \
+                extract_simulated_metrics_from_results(results['full'], product_steps)
+
+        summary = _trajectories(results['summary'])
+        assert [t['failure_reason'] for t in summary] == [t['failure_reason'] for t in full]
+        assert [t['final_state'] for t in summary] == [t['final_state'] for t in full]
+
+    def test_light_levels_skip_bookkeeping(self, persona_df, product_steps, run):
+        metrics = _trajectories(run(persona_df, product_steps, fixed_intent=CREDIGO_GLOBAL_INTENT,
+                                    verbose=False, capture="metrics"))
+        assert all('journey' not in t and 'final_state' not in t and t['failure_reason'] is None for t in metrics)
+        assert all(t['steps_entered'] >= 1 for t in metrics)
+
+        summary = _trajectories(run(persona_df, product_steps, fixed_intent=CREDIGO_GLOBAL_INTENT,
+                                    verbose=False, capture="summary"))
+        assert all('journey' not in t and 'decision_traces' not in t and 'final_state' in t for t in summary)
+
+    def test_unknown_level_rejected(self, persona_df, product_steps, run):
+        with pytest.raises(ValueError):
+            run(persona_df, product_steps, fixed_intent=CREDIGO_GLOBAL_INTENT, verbose=False, capture="all")
+
+
+def test_traces_level_skips_attribution(persona_df, product_steps, monkeypatch):
+    import decision_attribution.shap_attributor as shap_attributor
+
+    def fail(*args, **kwargs):
+        raise AssertionError("attribution computed below capture='full'")
+    monkeypatch.setattr(shap_attributor, 'compute_decision_attributions_batch', fail)
+
+    result_df = run_intent_aware_simulation(persona_df, product_steps, fixed_intent=CREDIGO_GLOBAL_INTENT,
+                                            verbose=False, capture="traces")
+    traces = [trace for t in _trajectories(result_df) for trace in t['decision_traces']]
+    assert traces and all(trace.attribution is None for trace in traces)
+
+    with pytest.raises(ValueError):
+        run_intent_aware_simulation(persona_df, product_steps, fixed_intent=CREDIGO_GLOBAL_INTENT,
+                                    verbose=False, capture="summary", trace_table=True)
+
+
+def test_with_metrics_capture():
+    args = {'seed': 1}
+    assert with_metrics_capture(run_intent_aware_simulation, args) == {'seed': 1, 'capture': 'metrics'}
+    assert with_metrics_capture(run_intent_aware_simulation, {'capture': 'full'}) == {'capture': 'full'}
+    assert with_metrics_capture(lambda df, seed: None, args) is args
@@ -0,0 +1,116 @@
+"""
+tests/test_context_graph_v2.py - SQLite-backed ContextGraphV2 storage and indexed queries
+"""
+
+import json
+import sqlite3
+
+import pytest
+
+from dropsim_context_graph_v2 import ContextGraphV2
+from dropsim_decision_traces import DecisionTrace
+
+
+def make_traces(n):
+    return [
+        DecisionTrace(
+            decision_id=f"d{i}", timestamp=f"2025-01-01T00:00:{i:02d}", actor_type="system",
+            context_snapshot={'step_id': f"step_{i % 3}", 'drop_rate': i / 10},
+            options_considered=[], chosen_action={'action_type': ['fix', 'ship'][i % 2]},
+            rationale=f"because {i}", constraints=[], confidence=0.5 + i / 100,
+            precedent_ids=[f"d{j}" for j in range(max(0, i - 2), i)] + ["missing"],
+        )
+        for i in range(n)
+    ]
+
+
+@pytest.fixture
+def graph(tmp_path):
+    graph = ContextGraphV2(str(tmp_path / "graph.db"))
+    graph.add_decision_traces(make_traces(8))
+    yield graph
+    graph.close()
+
+
+class TestContextGraphV2Store:
+    """Queries answer from the adjacency / type / timestamp indexes."""
+
+    def test_neighbor_queries(self, graph):
+        assert graph.get_precedents_for("d5") == ["d3", "d4"]
+        assert graph.get_precedents_for("d0") == []
+        assert graph.get_decisions_influenced_by("state_d2") == ["decision_d2"]
+        # 8 decisions, 8 states, 3 step entities
+        assert len(graph.nodes) == 19
+        assert len(graph.edges) == 8 + 13 + 8
+
+    def test_query_similar_decisions(self, graph):
+        similar = graph.query_similar_decisions({}, "ship")
+        assert [d['decision_id'] for d in similar] == ["d1", "d3", "d5", "d7"]
+        assert similar[1]['context'] == {'step_id': "step_0", 'drop_rate': 0.3}
+        assert similar[1]['rationale'] == "because 3"
+
+    def test_graph_delta_uses_timestamps(self, graph):
+        everything = graph.get_graph_delta("")
+        assert len(everything['nodes']) == len(graph.nodes)
+        assert len(everything['edges']) == len(graph.edges)
+
+        cutoff = max(item['timestamp'] for item in everything['nodes'] + everything['edges'])
+        graph.add_node("policy_1", "policy", {'rule': 'x'})
+        delta = graph.get_graph_delta(cutoff)
+        assert [n['node_id'] for n in delta['nodes']] == ["policy_1"]
+        assert delta['edges'] == []
+
+    def test_readded_node_keeps_position(self, graph):
+        order = list(graph.nodes)
+        graph.add_node("decision_d0", "decision", {'decision_id': "d0", 'chosen_action': {'action_type': 'ship'}})
+        assert list(graph.nodes) == order
+        assert graph.nodes["decision_d0"].properties['chosen_action'] == {'action_type': 'ship'}
+        assert [d['decision_id'] for d in graph.query_similar_decisions({}, "ship")][0] == "d0"
+
+    def test_index_plans(self, graph):
+        def plan(sql, *args):
+            return " ".join(row[-1] for row in graph._conn.execute("EXPLAIN QUERY PLAN " + sql, args))
+
+        assert "idx_edges_to" in plan("SELECT from_node FROM edges WHERE to_node = ? AND edge_type = ? ORDER BY seq", "a", "b")
+        assert "idx_edges_from" in plan("SELECT to_node FROM edges WHERE from_node = ? AND edge_type = ? ORDER BY seq", "a", "b")
+        assert "idx_nodes_type" in plan("SELECT node_id FROM nodes WHERE node_type = ? ORDER BY seq", "decision")
+        assert "idx_edges_timestamp" in plan("SELECT edge_id FROM edges WHERE timestamp > ?", "2025")
+
+
+class TestContextGraphV2Persistence:
+    """Inserts are committed in batches and survive reopening."""
+
+    def test_batched_commits(self, tmp_path):
+        path = str(tmp_path / "graph.db")
+        graph = ContextGraphV2(path, batch_size=10)
+        reader = sqlite3.connect(path)
+
+        def committed():
+            return reader.execute("SELECT COUNT(*) FROM nodes").fetchone()[0]
+
+        for i in range(9):
+            graph.add_node(f"n{i}", "entity", {})
+        assert committed() == 0
+        graph.add_node("n9", "entity", {})
+        assert committed() == 10
+
+        with graph.batch():
+            for i in range(10, 35):
+                graph.add_node(f"n{i}", "entity", {})
+            assert committed() == 10
+        assert committed() == 35
+        graph.close()
+
+    def test_reopen_and_legacy_import(self, tmp_path):
+        graph = ContextGraphV2(str(tmp_path / "graph.db"))
+        graph.add_decision_traces(make_traces(4))
+        expected = graph.get_graph_delta("")
+        graph.close()
+        assert ContextGraphV2(str(tmp_path / "graph.db")).get_graph_delta("") == expected
+
+        legacy = {'nodes': expected['nodes'], 'edges': expected['edges'], 'last_updated': "2025"}
+        (tmp_path / "old.json").write_text(json.dumps(legacy, indent=2))
+        imported = ContextGraphV2(str(tmp_path / "old.json"))
+        assert imported.store_path.endswith("old.db")
+        assert imported.get_graph_delta("") == expected
+        assert imported.get_precedents_for("d3") == ["d1", "d2"]
@@ -0,0 +1,117 @@
+"""
+tests/test_continuity_log.py - ContinuityEngine write-ahead log, snapshots and replay
+"""
+
+import json
+import shutil
+
+import decision_continuity.continuity_engine as continuity_engine
+from decision_continuity import ContinuityEngine
+
+
+def _state(engine):
+    """Engine state without the wall-clock fields ContinuityState stamps on update."""
+    states = {}
+    for key, state in engine.continuity_states.items():
+        data = state.to_dict()
+        data.pop('first_seen')
+        data.pop('last_updated')
+        states[key] = data
+    return {
+        'states': states,
+        'graph': engine.precedent_graph.to_dict(),
+        'history': [e.to_dict() for e in engine.event_history],
+    }
+
+
+def _record(engine, events):
+    for event in events:
+        engine.record_event(event)
+
+
+class TestContinuityEventLog:
+    """Reloading an engine replays exactly what was recorded."""
+
+    def test_reload_replays_log(self, event_factory, tmp_path):
+        events = event_factory(120)
+        memory = ContinuityEngine()
+        _record(memory, events)
+
+        with ContinuityEngine(str(tmp_path), flush_every=32) as engine:
+            _record(engine, events)
+        assert not (tmp_path / continuity_engine.SNAPSHOT_FILE).exists()
+        assert len((tmp_path / continuity_engine.EVENT_LOG_FILE).read_text().splitlines()) == 120
+
+        assert _state(ContinuityEngine(str(tmp_path))) == _state(memory)
+
+    def test_snapshots_compact_the_log(self, event_factory, tmp_path, monkeypatch):
+        writes = []
+        save_state = ContinuityEngine._save_state
+        monkeypatch.setattr(ContinuityEngine, '_save_state', lambda self: writes.append(1) or save_state(self))
+
+        events = event_factory(400, seed=1)
+        memory = ContinuityEngine()
+        _record(memory, events)
+
+        engine = ContinuityEngine(str(tmp_path), flush_every=10, snapshot_every=50)
+        _record(engine, events[:250])
+        engine.close()
+        # Snapshots at 50, 100, 200: each waits for the log to match the snapshot
+        assert len(writes) == 3
+        assert json.loads((tmp_path / continuity_engine.SNAPSHOT_FILE).read_text())['last_seq'] == 200
+
+        reopened = ContinuityEngine(str(tmp_path), flush_every=10, snapshot_every=50)
+        _record(reopened, events[250:])
+        reopened.close()
+        assert _state(ContinuityEngine(str(tmp_path))) == _state(memory)
+
+    def test_log_records_covered_by_snapshot_are_skipped(self, event_factory, tmp_path):
+        events = event_factory(60, seed=2)
+        engine = ContinuityEngine(str(tmp_path), flush_every=1, snapshot_every=10 ** 6)
+        _record(engine, events[:40])
+        stale_log = tmp_path / "stale.jsonl"
+        shutil.copy(tmp_path / continuity_engine.EVENT_LOG_FILE, stale_log)
+
+        # Crash after the snapshot was written but before the log was dropped
+        engine.snapshot()
+        shutil.copy(stale_log, tmp_path / continuity_engine.EVENT_LOG_FILE)
+        reopened = ContinuityEngine(str(tmp_path), flush_every=1)
+        _record(reopened, events[40:])
+
+        memory = ContinuityEngine()
+        _record(memory, events)
+        assert _state(ContinuityEngine(str(tmp_path))) == _state(memory)
+
+    def test_torn_tail_is_dropped(self, event_factory, tmp_path):
+        events = event_factory(20, seed=3)
+        engine = ContinuityEngine(str(tmp_path), flush_every=1)
+        _record(engine, events[:10])
+        with open(tmp_path / continuity_engine.EVENT_LOG_FILE, 'a') as f:
+            f.write('{"event": {"event_id": "evt_1')
+
+        reopened = ContinuityEngine(str(tmp_path), flush_every=1)
+        assert len(reopened.event_history) == 10
+        _record(reopened, events[10:])
+
+        memory = ContinuityEngine()
+        _record(memory, events)
+        assert _state(ContinuityEngine(str(tmp_path))) == _state(memory)
+
+    def test_loads_legacy_files(self, event_factory, tmp_path):
+        events = event_factory(15, seed=4)
+        memory = ContinuityEngine()
+        _record(memory, events)
+        (tmp_path / "continuity_states.json").write_text(json.dumps(
+            {key: state.to_dict() for key, state in memory.continuity_states.items()}
+        ))
+        (tmp_path / "precedent_graph.json").write_text(json.dumps(memory.precedent_graph.to_dict()))
+        (tmp_path / "event_history.json").write_text(json.dumps([e.to_dict() for e in events]))
+
+        assert _state(ContinuityEngine(str(tmp_path))) == _state(memory)
+
+    def test_unflushed_events_written_on_garbage_collection(self, event_factory, tmp_path):
+        engine = ContinuityEngine(str(tmp_path), flush_every=1000)
+        _record(engine, event_factory(5, seed=5))
+        assert not (tmp_path / continuity_engine.EVENT_LOG_FILE).exists()
+        del engine
+        assert len(ContinuityEngine(str(tmp_path)).event_history) == 5
@@ -0,0 +1,199 @@
+"""
+tests/test_counterfactual_replay.py - Checkpointed and batched counterfactuals vs. full prefix replay
+"""
+
+import copy
+
+import numpy as np
+import pytest
+
+import dropsim_counterfactuals as cf
+from behavioral_engine import STATE_VARIANTS
+from credigo_ss_steps_improved import CREDIGO_SS_11_STEPS
+from dropsim_context_graph import EventTrace
+from dropsim_simulation_runner import convert_persona_to_compiled_priors, simulate_compiled_persona
+
+
+@pytest.fixture(scope="module")
+def population(raw_persona_factory):
+    """Traces whose replay diverges from the recording, plus malformed ones."""
+    rng = np.random.default_rng(0)
+    traces, priors_map, variant_map = [], {}, {}
+    for _, row in raw_persona_factory(24, seed=1).iterrows():
+        result = simulate_compiled_persona(convert_persona_to_compiled_priors(row), CREDIGO_SS_11_STEPS, STATE_VARIANTS)
+        # Perturbed priors: counterfactual replays drop earlier / later than the recorded trace
+        priors = {key: float(value) for key, value in result['priors'].items()}
+        for key in ('MS', 'TB', 'ET', 'LAM'):
+            priors[key] *= float(rng.uniform(0.6, 1.6))
+        name = result['persona_name']
+        priors_map[name] = priors
+        variant_map[name] = list(STATE_VARIANTS)[rng.integers(len(STATE_VARIANTS))]
+        traces.extend(t['event_trace'] for t in result['trajectories'])
+
+    for trace in traces[::5]:
+        # An event for a step the product no longer has
+        trace.events = [copy.copy(e) for e in trace.events]
+        trace.events[0].step_id = "retired_step"
+    traces.append(EventTrace("no_events", "fresh_motivated", [], "completed"))
+    traces.append(EventTrace("bad_variant", "x", traces[1].events, traces[1].final_outcome))
+    priors_map["bad_variant"] = priors_map[traces[1].persona_id]
+    variant_map["bad_variant"] = "no_such_variant"
+    traces.append(EventTrace("unpriced", "x", traces[2].events, traces[2].final_outcome))
+    priors_map["unpriced"] = {'CC': 0.5}
+    return traces, priors_map, variant_map
+
+
+def _interventions():
+    step_ids = list(CREDIGO_SS_11_STEPS) + ["retired_step", "missing_step"]
+    interventions = [
+        {'type': 'step_modification', 'step_id': step_id, 'delta': delta}
+        for step_id in step_ids
+        for delta in ({'effort': -0.2}, {'risk': -0.15, 'effort': -0.1}, {'value': 0.3, 'reassurance': 0.2})
+    ]
+    interventions.append({'type': 'persona_adjustment', 'field': 'perceived_risk', 'delta': -0.3})
+    return interventions
+
+
+def _full_replay(trace, intervention, priors, variant):
+    try:
+        return cf.simulate_counterfactual(trace, intervention, CREDIGO_SS_11_STEPS, priors, variant).to_dict()
+    except Exception:
+        return None
+
+
+def _rank_by_pairs(traces, priors_map, variant_map, candidates, top_n):
+    """The per-(trace, intervention) loop rank_interventions_by_impact replaced."""
+    impact = {}
+    for trace in traces:
+        priors = priors_map.get(trace.persona_id, {})
+        if not priors:
+            continue
+        for intervention in candidates:
+            result = _full_replay(trace, intervention, priors, variant_map.get(trace.persona_id, "fresh_motivated"))
+            if result is None:
+                continue
+            entry = impact.setdefault(str(intervention), {
+                'intervention': intervention, 'outcome_changes': 0, 'total_effect_size': 0.0,
+                'total_sensitivity': 0.0, 'count': 0, 'examples': []
+            })
+            entry['count'] += 1
+            entry['outcome_changes'] += result['outcome_changed']
+            entry['total_effect_size'] += cf.EFFECT_SIZE_SCORES[result['effect_size']]
+            entry['total_sensitivity'] += cf.SENSITIVITY_SCORES[result['sensitivity']]
+            if len(entry['examples']) < 3:
+                entry['examples'].append(result)
+    for entry in impact.values():
+        entry['avg_effect_size'] = entry['total_effect_size'] / entry['count']
+        entry['avg_sensitivity'] = entry['total_sensitivity'] / entry['count']
+        entry['outcome_change_rate'] = entry['outcome_changes'] / entry['count']
+    ranked = sorted(impact.values(), reverse=True,
+                    key=lambda x: (x['outcome_change_rate'], x['avg_effect_size'], x['avg_sensitivity']))
+    return ranked[:top_n]
+
+
+class TestReplayCheckpoints:
+    """Resuming from a checkpoint equals replaying the prefix from initialize_state."""
+
+    def test_checkpointed_matches_full_replay(self, population):
+        traces, priors_map, variant_map = population
+        for trace in traces[:-3]:
+            priors, variant = priors_map[trace.persona_id], variant_map[trace.persona_id]
+            checkpoints = cf.build_replay_checkpoints(trace, CREDIGO_SS_11_STEPS, priors, variant)
+            assert len(checkpoints.states) == (checkpoints.drop_index + 1 if checkpoints.drop_index is not None
+                                               else len(trace.events))
+            for intervention in _interventions():
+                resumed = cf.simulate_counterfactual(
+                    trace, intervention, CREDIGO_SS_11_STEPS, priors, variant, checkpoints=checkpoints
+                )
+                assert resumed.to_dict() == _full_replay(trace, intervention, priors, variant)
+
+    def test_unmodified_replay_reproduces_recording(self, population):
+        traces, priors_map, variant_map = population
+        persona = traces[1].persona_id
+        result = simulate_compiled_persona(
+            {'name': persona, 'description': "", 'priors': priors_map[persona], 'meta': {}},
+            CREDIGO_SS_11_STEPS, STATE_VARIANTS
+        )
+        for trajectory in result['trajectories']:
+            trace = trajectory['event_trace']
+            checkpoints = cf.build_replay_checkpoints(trace, CREDIGO_SS_11_STEPS, priors_map[persona], trace.variant_id)
+            for event, state in zip(trace.events, checkpoints.states):
+                assert event.state_before == vars(state)
+            assert (checkpoints.drop_index is not None) == (trace.final_outcome == "dropped")
+
+
+class TestBatchedCounterfactuals:
+    """Array evaluation across traces equals per-trace simulate_counterfactual."""
+
+    @pytest.mark.parametrize("batched", [True, False])
+    def test_batch_matches_per_trace(self, population, batched):
+        traces, priors_map, variant_map = population
+        baseline = cf.build_counterfactual_baseline(traces, CREDIGO_SS_11_STEPS, priors_map, variant_map)
+        assert len(baseline.traces) == len(traces) - 1  # "no_events" has no priors
+        for intervention in _interventions():
+            batch = cf.simulate_counterfactual_batch(baseline, intervention, CREDIGO_SS_11_STEPS, batched=batched)
+            results = {int(row): batch.result(k).to_dict() for k, row in enumerate(batch.rows)}
+            for row, trace in enumerate(baseline.traces):
+                assert results.get(row) == _full_replay(
+                    trace, intervention, baseline.priors[row], baseline.variant_names[row]
+                )
+
+    def test_malformed_delta_falls_back_to_scalar(self, population):
+        traces, priors_map, variant_map = population
+        baseline = cf.build_counterfactual_baseline(traces, CREDIGO_SS_11_STEPS, priors_map, variant_map)
+        intervention = {'type': 'step_modification', 'step_id': list(CREDIGO_SS_11_STEPS)[3], 'delta': {'effort': "x"}}
+        batch = cf.simulate_counterfactual_batch(baseline, intervention, CREDIGO_SS_11_STEPS)
+        # Only traces that never reach the step (delta never applied) have a result
+        assert list(batch.rows) == list(cf.simulate_counterfactual_batch(
+            baseline, intervention, CREDIGO_SS_11_STEPS, batched=False
+        ).rows)
+        assert 0 < len(batch.rows) < len(baseline.traces)
+
+
+class TestInterventionAnalysis:
+    """Rankings, sensitivity and robustness from the batched path."""
+
+    @pytest.mark.parametrize("batched", [True, False])
+    def test_rank_matches_pairwise_loop(self, population, batched):
+        traces, priors_map, variant_map = population
+        candidates = _interventions()
+        candidates.insert(5, dict(candidates[1]))  # Duplicates count once per occurrence
+        expected = _rank_by_pairs(traces, priors_map, variant_map, candidates, top_n=50)
+        assert cf.rank_interventions_by_impact(
+            traces, CREDIGO_SS_11_STEPS, priors_map, variant_map, candidates, top_n=50, batched=batched
+        ) == expected
+
+    def test_sensitivity_map_scores_every_trace(self, population):
+        traces, priors_map, variant_map = population
+        assert len(traces) > 100
+        changes = {'effort': 0, 'risk': 0, 'cognitive': 0}
+        total = 0
+        for key in changes:
+            for step_id in CREDIGO_SS_11_STEPS:
+                intervention = {'type': 'step_modification', 'step_id': step_id, 'delta': {key: -0.1}}
+                for trace in traces:
+                    priors = priors_map.get(trace.persona_id, {})
+                    result = priors and _full_replay(trace, intervention, priors, variant_map.get(trace.persona_id, "fresh_motivated"))
+                    if result:
+                        total += 1
+                        changes[key] += result['outcome_changed']
+
+        sensitivity = cf.compute_sensitivity_map(traces, CREDIGO_SS_11_STEPS, priors_map, variant_map)
+        for key, count in changes.items():
+            assert sensitivity[f'{key}_sensitivity'] == count / (total / 3)
+
+    def test_analysis_shares_one_baseline(self, population, monkeypatch):
+        traces, priors_map, variant_map = population
+        fragile = [{'step_id': step_id} for step_id in list(CREDIGO_SS_11_STEPS)[:4]]
+        scalar = cf.analyze_top_interventions(traces, CREDIGO_SS_11_STEPS, priors_map, variant_map, fragile, batched=False)
+
+        builds = []
+        build = cf.build_counterfactual_baseline
+        monkeypatch.setattr(cf, 'build_counterfactual_baseline', lambda *args: builds.append(1) or build(*args))
+        batched = cf.analyze_top_interventions(traces, CREDIGO_SS_11_STEPS, priors_map, variant_map, fragile)
+        assert batched == scalar
+        assert len(builds) == 1
+        # Robustness still samples the first 50 traces
+        assert batched['robustness_score'] == cf.compute_robustness_score(
+            traces[:50], CREDIGO_SS_11_STEPS, priors_map, variant_map, batched=False
+        )
@@ -0,0 +1,90 @@
+"""
+tests/test_decision_index.py - Grouped trace index behind the ledger and decision-first queries
+"""
+
+import random
+
+import pytest
+
+from behavioral_engine_intent_aware import run_intent_aware_simulation
+from decision_graph import DecisionIndex, query_competing_explanations, query_decision_boundaries
+from decision_graph.decision_index import mean_pairwise_jaccard_distance
+from decision_graph.decision_ledger import generate_decision_ledger
+from decision_graph.decision_trace import DecisionOutcome, DecisionSequence
+from decision_graph.graph_queries import _derive_persona_class
+
+from conftest import MIXED_INTENTS
+
+
+@pytest.fixture
+def sequences(persona_factory, product_steps, no_attribution):
+    result_df = run_intent_aware_simulation(
+        persona_factory(30), product_steps, verbose=False, seed=9, capture="traces",
+        intent_distribution=MIXED_INTENTS
+    )
+    return [
+        DecisionSequence(
+            persona_id=t['persona_id'],
+            variant_name=t['variant'],
+            traces=t['decision_traces'],
+            final_outcome=DecisionOutcome.CONTINUE if t['completed'] else DecisionOutcome.DROP,
+            exit_step=None if t['completed'] else t['exit_step']
+        )
+        for trajectories in result_df['trajectories']
+        for t in trajectories
+    ]
+
+
+class TestDecisionIndex:
+    """One pass groups every trace exactly as a per-trace scan would."""
+
+    def test_groups_match_per_trace_scan(self, sequences, product_steps):
+        index = DecisionIndex(sequences)
+        traces = [trace for sequence in sequences for trace in sequence.traces]
+        assert index.traces == traces
+        assert index.persona_classes == [_derive_persona_class(t) for t in traces]
+
+        for step_id in product_steps:
+            expected_classes = list(dict.fromkeys(
+                _derive_persona_class(t) for t in traces if t.step_id == step_id
+            ))
+            assert index.classes_at(step_id) == expected_classes
+            for persona_class in expected_classes:
+                for outcome in DecisionOutcome:
+                    assert index.traces_at(index.group(step_id, persona_class, outcome)) == [
+                        t for t in traces
+                        if t.step_id == step_id and t.decision == outcome and _derive_persona_class(t) == persona_class
+                    ]
+
+    def test_ledger_and_queries_accept_index(self, sequences, product_steps):
+        index = DecisionIndex(sequences)
+        from_list = generate_decision_ledger(sequences, product_steps)
+        from_index = generate_decision_ledger(index, product_steps)
+        from_list.pop('generated_timestamp')
+        from_index.pop('generated_timestamp')
+        assert from_list == from_index
+        assert from_list['decision_boundaries'] or from_list['non_binding_observations_excluded']
+
+        step_id = next(iter(product_steps))
+        assert query_decision_boundaries(sequences, step_id) == query_decision_boundaries(index, step_id)
+        assert sum(b.accepted_count + b.rejected_count for b in query_decision_boundaries(index, step_id)) == \
+            len(index.at_step(step_id))
+        assert query_competing_explanations(index, primary_factor="unknown_factor") == []
+
+
+def test_jaccard_from_set_counts_matches_pairwise():
+    rng = random.Random(3)
+    factors = ['a', 'b', 'c', 'd']
+    sets = [frozenset(rng.sample(factors, rng.randint(0, 3))) for _ in range(60)]
+
+    distances = [
+        1.0 - len(x & y) / len(x | y)
+        for i, x in enumerate(sets) for y in sets[i + 1:]
+        if x | y
+    ]
+    counts = {}
+    for s in sets:
+        key = tuple(sorted(s))
+        counts[key] = counts.get(key, 0) + 1
+    assert mean_pairwise_jaccard_distance(counts) == pytest.approx(sum(distances) / len(distances))
+    assert mean_pairwise_jaccard_distance({(): 5}) == 0.0
@@ -0,0 +1,59 @@
+"""
+tests/test_derive_features.py - Column-wise feature derivation vs. the row-wise rules
+"""
+
+import pandas as pd
+import pytest
+
+import derive_features as df_module
+from derive_features import derive_all_features, derive_feature_frame, derive_features_for_row
+
+
+def _row_wise(df: pd.DataFrame) -> pd.DataFrame:
+    return pd.DataFrame([derive_features_for_row(row) for _, row in df.iterrows()])
+
+
+class TestVectorizedParity:
+    """derive_feature_frame must reproduce the row-wise derive_* rules exactly."""
+
+    @pytest.mark.parametrize("seed", [0, 1, 2])
+    def test_matches_row_wise(self, raw_persona_factory, seed):
+        df = raw_persona_factory(seed=seed)
+        pd.testing.assert_frame_equal(derive_feature_frame(df), _row_wise(df))
+
+    def test_derive_all_features_modes_agree(self, raw_persona_factory):
+        df = raw_persona_factory(150, seed=3)
+        df.index = df.index + 1000
+        pd.testing.assert_frame_equal(
+            derive_all_features(df, verbose=False),
+            derive_all_features(df, verbose=False, vectorized=False),
+        )
+
+    def test_keywords_spanning_fields(self):
+        # 'own' ends one field and 'business' starts the next: the row-wise
+        # rules join the fields with spaces, so 'own business' is matched
+        df = pd.DataFrame({
+            'age': [30, 30],
+            'career_goals_and_ambitions': ['grow my own', 'grow my own'],
+            'persona': ['business ventures', 'ventures'],
+            'occupation': ['Shopkeeper', 'Shopkeeper'],
+        })
+        frame = derive_feature_frame(df)
+        pd.testing.assert_frame_equal(frame, _row_wise(df))
+        assert frame['aspirational_score'].iloc[0] > frame['aspirational_score'].iloc[1]
+
+    def test_missing_columns_and_float_ages(self):
+        df = pd.DataFrame({'age': [23.9, 61.0, 44.5], 'occupation': ['Software Developer', None, 'Farmer']})
+        pd.testing.assert_frame_equal(derive_feature_frame(df), _row_wise(df))
+
+
+class TestKeywordSet:
+    """Token bitmasks count overlapping keywords like the substring loop."""
+
+    def test_counts_overlapping_keywords(self):
+        keywords = ['success', 'successful', 'art', 'start', 'own business', 'start']
+        keyword_set = df_module._KeywordSet(keywords)
+        texts = pd.Series(['successful startup', 'my own business', 'art', '', 'smart own  business'], dtype=object)
+        (masks,) = df_module._token_masks(texts, [keyword_set])
+        expected = [sum(1 for kw in keywords if kw in t) for t in texts]
+        assert list(keyword_set.count(masks, texts)) == expected
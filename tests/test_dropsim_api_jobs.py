@@ -0,0 +1,187 @@
+"""
+tests/test_dropsim_api_jobs.py - Worker-pool offload, job API and NDJSON traces
+"""
+
+import json
+import os
+import threading
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+import dropsim_api
+from dropsim_api import JobQueueFull, SimulationJobManager
+from fintech_presets import get_default_fintech_scenario
+
+
+STEP_FIELDS = [
+    'cognitive_demand', 'effort_demand', 'risk_signal', 'irreversibility', 'delay_to_value',
+    'explicit_value', 'reassurance_signal', 'authority_signal'
+]
+
+
+def _scenario(n_personas=2):
+    personas, _, steps = get_default_fintech_scenario()
+    return {
+        'scenario_name': "jobs_test",
+        'personas': [
+            {'name': p['name'], 'description': p['description'], 'raw_fields': p['raw_fields']}
+            for p in personas[:n_personas]
+        ],
+        'steps': [
+            {'name': name, 'description': step.get('description'), **{f: step[f] for f in STEP_FIELDS}}
+            for name, step in steps.items()
+        ]
+    }
+
+
+def _wait(client, job_id, timeout=30.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        payload = client.get(f"/jobs/{job_id}").json()
+        if payload['status'] in ("done", "failed"):
+            return payload
+        time.sleep(0.02)
+    raise AssertionError(f"job {job_id} did not finish")
+
+
+@pytest.fixture
+def manager(monkeypatch):
+    """One thread worker and no pending slots, installed as the app's manager."""
+    manager = SimulationJobManager(max_workers=1, max_pending=0, executor="thread")
+    monkeypatch.setattr(dropsim_api, "_job_manager", manager)
+    yield manager
+    manager.shutdown()
+    dropsim_api._job_manager = None
+
+
+@pytest.fixture
+def blocked(monkeypatch):
+    """Make scenario jobs wait until the event is set."""
+    release = threading.Event()
+    run = dropsim_api.run_scenario_job
+
+    def blocking_job(scenario, trace_path=None):
+        release.wait(10)
+        return run(scenario, trace_path)
+
+    monkeypatch.setattr(dropsim_api, "run_scenario_job", blocking_job)
+    yield release
+    release.set()
+
+
+class TestSimulate:
+    """/simulate runs on the pool and keeps its response shape."""
+
+    def test_summary(self, manager):
+        client = TestClient(dropsim_api.app)
+        response = client.post("/simulate", json=_scenario())
+        summary = response.json()['scenario_summary']
+        assert response.status_code == 200
+        assert summary['total_trajectories'] == 2 * 7
+        assert [p['persona_name'] for p in summary['persona_summaries']] == [
+            p['name'] for p in _scenario()['personas']
+        ]
+        failures = sum(s['failures'] for s in summary['step_summaries'])
+        assert failures + summary['completed_trajectories'] == summary['total_trajectories']
+        assert not manager._jobs
+
+    def test_traces_stream_as_ndjson(self, manager):
+        client = TestClient(dropsim_api.app)
+        response = client.post("/simulate?include_traces=true", json=_scenario())
+        lines = [json.loads(line) for line in response.text.splitlines()]
+        assert response.headers['content-type'].startswith(dropsim_api.NDJSON_MEDIA_TYPE)
+        assert lines[0]['scenario_summary']['total_trajectories'] == 14
+        assert len(lines) == 1 + 14
+        assert {'persona_name', 'variant', 'exit_step', 'failure_reason', 'journey'} == set(lines[1])
+
+    def test_process_pool(self, monkeypatch):
+        manager = SimulationJobManager(max_workers=1, executor="process")
+        monkeypatch.setattr(dropsim_api, "_job_manager", manager)
+        try:
+            job = manager.submit(_scenario(1))
+            assert job.future.result(timeout=60)['total_trajectories'] == 7
+        finally:
+            manager.shutdown()
+
+
+class TestJobs:
+    """POST /jobs, GET /jobs/{id} and backpressure."""
+
+    def test_job_round_trip(self, manager):
+        client = TestClient(dropsim_api.app)
+        submitted = client.post("/jobs?include_traces=true", json=_scenario())
+        assert submitted.status_code == 202
+        status = _wait(client, submitted.json()['job_id'])
+        assert status['status'] == "done"
+        assert status['scenario_summary']['scenario_name'] == "jobs_test"
+
+        traces = client.get(status['traces_url']).text.splitlines()
+        assert json.loads(traces[0]) == {'scenario_summary': status['scenario_summary']}
+        assert len(traces) == 1 + 14
+        assert client.get("/jobs/unknown").status_code == 404
+
+    def test_event_loop_stays_responsive(self, manager, blocked):
+        client = TestClient(dropsim_api.app)
+        job_id = client.post("/jobs", json=_scenario()).json()['job_id']
+        assert client.get("/health").status_code == 200
+        assert client.get(f"/jobs/{job_id}").json()['status'] in ("queued", "running")
+        assert client.get(f"/jobs/{job_id}/traces").status_code == 404
+
+        blocked.set()
+        assert _wait(client, job_id)['status'] == "done"
+
+    def test_backpressure(self, manager, blocked):
+        client = TestClient(dropsim_api.app)
+        assert client.post("/jobs", json=_scenario()).status_code == 202
+        rejected = client.post("/jobs", json=_scenario())
+        assert rejected.status_code == 503
+        assert rejected.headers['retry-after'] == str(dropsim_api.RETRY_AFTER_SECONDS)
+        with pytest.raises(JobQueueFull):
+            manager.submit(_scenario())
+
+        blocked.set()
+        manager._jobs[next(iter(manager._jobs))].future.result(timeout=30)
+        assert client.post("/jobs", json=_scenario()).status_code == 202
+
+    def test_failed_job(self, manager, monkeypatch):
+        def failing_job(scenario, trace_path=None):
+            raise ValueError("bad scenario")
+
+        monkeypatch.setattr(dropsim_api, "run_scenario_job", failing_job)
+        client = TestClient(dropsim_api.app)
+        status = _wait(client, client.post("/jobs", json=_scenario()).json()['job_id'])
+        assert status['status'] == "failed" and status['error'] == "bad scenario"
+        assert client.post("/simulate", json=_scenario()).status_code == 500
+
+    def test_cancelled_job(self, monkeypatch, blocked):
+        manager = SimulationJobManager(max_workers=1, max_pending=1, executor="thread")
+        monkeypatch.setattr(dropsim_api, "_job_manager", manager)
+        try:
+            client = TestClient(dropsim_api.app)
+            client.post("/jobs", json=_scenario())
+            queued = client.post("/jobs", json=_scenario()).json()['job_id']
+            assert manager.get(queued).future.cancel()
+            response = client.get(f"/jobs/{queued}")
+            assert response.status_code == 200 and response.json()['status'] == "cancelled"
+            assert client.get(f"/jobs/{queued}/traces").status_code == 404
+        finally:
+            blocked.set()
+            manager.shutdown()
+
+    def test_streamed_jobs_are_not_evicted(self, monkeypatch):
+        manager = SimulationJobManager(max_workers=1, executor="thread", max_retained=1)
+        monkeypatch.setattr(dropsim_api, "_job_manager", manager)
+        try:
+            held = manager.submit(_scenario(1), include_traces=True, hold=True)
+            held.future.result(timeout=30)
+            manager.submit(_scenario(1), include_traces=True).future.result(timeout=30)
+            manager.submit(_scenario(1))
+            assert manager.get(held.job_id) is held and os.path.exists(held.trace_path)
+
+            manager.close_stream(held)
+            manager.submit(_scenario(1))
+            assert manager.get(held.job_id) is None and not os.path.exists(held.trace_path)
+        finally:
+            manager.shutdown()
@@ -0,0 +1,165 @@
+"""
+tests/test_engine_parameters.py - Explicit engine parameters and parallel calibration
+"""
+
+import warnings
+
+import numpy as np
+import pytest
+
+from behavioral_engine_batch import run_intent_aware_simulation_batch
+from behavioral_engine_improved import EngineParameters, run_behavioral_simulation_improved
+from behavioral_engine_intent_aware import run_intent_aware_simulation
+from calibration.calibrator import (
+    CalibrationConfig,
+    calibrate_parameters,
+    inject_parameters_into_engine,
+    run_simulation_with_parameters
+)
+from calibration.optimizer import grid_search_optimize, random_search_optimize
+from calibration.parameter_space import get_default_parameters
+from calibration.real_world_calibration import ObservedFunnelData, calibrate_to_real_data
+from dropsim_intent_model import CREDIGO_GLOBAL_INTENT
+
+from conftest import MIXED_INTENTS
+
+
+LOW_PERSISTENCE = {
+    'BASE_COMPLETION_RATE': 0.2,
+    'PERSISTENCE_BONUS_START': 0.0,
+    'PERSISTENCE_BONUS_RATE': 0.05,
+    'INTENT_PENALTY_WEIGHT': 0.12,
+    'VALUE_SENSITIVITY': 0.5
+}
+
+
+def quadratic_loss(parameters):
+    """Deterministic, picklable stand-in for a simulation loss."""
+    return (parameters['BASE_COMPLETION_RATE'] - 0.4) ** 2 + (parameters['PERSISTENCE_BONUS_RATE'] - 0.1) ** 2
+
+
+def _exit_steps(result_df):
+    return [t['exit_step'] for trajectories in result_df['trajectories'] for t in trajectories]
+
+
+def _probabilities(result_df):
+    return [
+        [j['continuation_probability'] for j in t['journey']]
+        for trajectories in result_df['trajectories']
+        for t in trajectories
+    ]
+
+
+class TestEngineParameters:
+    """Parameters are explicit, immutable and reach every engine."""
+
+    def test_defaults_match_parameter_space(self):
+        assert EngineParameters.from_dict(get_default_parameters()) == EngineParameters()
+        assert EngineParameters.from_dict(None) == EngineParameters()
+
+    def test_from_dict_ignores_unknown_keys(self):
+        parameters = EngineParameters.from_dict({'BASE_COMPLETION_RATE': 0.5, 'ENTRY_PROBABILITY_SCALE': 2.0})
+        assert parameters.base_completion_rate == 0.5
+        assert parameters.to_dict()['PERSISTENCE_BONUS_START'] == 0.18
+
+    def test_frozen(self):
+        with pytest.raises(Exception):
+            EngineParameters().base_completion_rate = 0.1
+
+    def test_intent_aware_path_uses_parameters(self, persona_df, product_steps, no_attribution):
+        kwargs = dict(fixed_intent=CREDIGO_GLOBAL_INTENT, verbose=False)
+        default = run_intent_aware_simulation(persona_df, product_steps, **kwargs)
+        explicit = run_intent_aware_simulation(persona_df, product_steps, parameters=EngineParameters(), **kwargs)
+        low = run_intent_aware_simulation(
+            persona_df, product_steps, parameters=EngineParameters.from_dict(LOW_PERSISTENCE), **kwargs
+        )
+        assert _probabilities(default) == _probabilities(explicit)
+        assert low['completion_rate'].mean() < default['completion_rate'].mean()
+
+    def test_batch_engine_matches_scalar_with_parameters(self, persona_df, product_steps, no_attribution):
+        parameters = EngineParameters.from_dict(LOW_PERSISTENCE)
+        scalar = run_intent_aware_simulation(
+            persona_df, product_steps, intent_distribution=MIXED_INTENTS, verbose=False, parameters=parameters
+        )
+        batch = run_intent_aware_simulation_batch(
+            persona_df, product_steps, intent_distribution=MIXED_INTENTS, verbose=False, parameters=parameters
+        )
+        assert _exit_steps(scalar) == _exit_steps(batch)
+        assert np.allclose(sum(_probabilities(scalar), []), sum(_probabilities(batch), []))
+
+    def test_deprecated_injection_matches_explicit(self, persona_df, product_steps, no_attribution):
+        kwargs = dict(fixed_intent=CREDIGO_GLOBAL_INTENT, verbose=False)
+        explicit = run_intent_aware_simulation(
+            persona_df, product_steps, parameters=EngineParameters.from_dict(LOW_PERSISTENCE), **kwargs
+        )
+        with pytest.warns(DeprecationWarning):
+            patch = inject_parameters_into_engine(LOW_PERSISTENCE, 'behavioral_engine_intent_aware')
+        with patch:
+            patched = run_intent_aware_simulation(persona_df, product_steps, **kwargs)
+        restored = run_intent_aware_simulation(persona_df, product_steps, **kwargs)
+        assert _probabilities(patched) == _probabilities(explicit)
+        assert _probabilities(restored) != _probabilities(explicit)
+
+    def test_run_with_parameters_passes_them_explicitly(self, persona_df, product_steps):
+        args = {'df': persona_df, 'verbose': False, 'product_steps': product_steps, 'seed': 42}
+        with warnings.catch_warnings():
+            warnings.simplefilter('error', DeprecationWarning)
+            result = run_simulation_with_parameters(LOW_PERSISTENCE, run_behavioral_simulation_improved, args)
+        expected = run_behavioral_simulation_improved(parameters=EngineParameters.from_dict(LOW_PERSISTENCE), **args)
+        assert _exit_steps(result) == _exit_steps(expected)
+
+
+class TestParallelCalibration:
+    """Seeded parallel calibration returns the serial result."""
+
+    @pytest.mark.parametrize("n_workers, batch_size", [(2, None), (1, 7), (3, 5)])
+    def test_random_search(self, n_workers, batch_size):
+        kwargs = dict(max_iterations=30, early_stopping_patience=6, tolerance=1e-4, verbose=False)
+        serial = random_search_optimize(quadratic_loss, rng=np.random.default_rng(3), **kwargs)
+        parallel = random_search_optimize(
+            quadratic_loss, rng=np.random.default_rng(3), n_workers=n_workers, batch_size=batch_size, **kwargs
+        )
+        assert parallel.history == serial.history
+        assert parallel.best_parameters == serial.best_parameters
+        assert parallel.convergence_reason == serial.convergence_reason
+
+    def test_grid_search(self):
+        serial = grid_search_optimize(quadratic_loss, grid_size=3, verbose=False)
+        parallel = grid_search_optimize(quadratic_loss, grid_size=3, verbose=False, n_workers=2)
+        assert parallel.best_loss == serial.best_loss
+        assert [h['loss'] for h in parallel.history] == [h['loss'] for h in serial.history]
+
+    def test_calibrate_parameters(self, persona_factory, product_steps):
+        args = {'df': persona_factory(4), 'verbose': False, 'product_steps': product_steps, 'seed': 42}
+        observed = {
+            'completion_rate': 0.5,
+            'dropoff_by_step': {name: 0.05 for name in product_steps},
+            'avg_steps_completed': 6.0
+        }
+        results = [
+            calibrate_parameters(
+                run_behavioral_simulation_improved, args, observed, product_steps,
+                config=CalibrationConfig(max_iterations=4, verbose=False, n_workers=n_workers)
+            )
+            for n_workers in (1, 2)
+        ]
+        assert results[0].calibrated_parameters == results[1].calibrated_parameters
+        assert results[0].optimization_history == results[1].optimization_history
+
+    def test_calibrate_to_real_data(self, persona_factory, product_steps):
+        args = {'df': persona_factory(3), 'verbose': False, 'product_steps': product_steps, 'seed': 42}
+        names = list(product_steps)
+        observed = ObservedFunnelData(
+            entry_count=1000,
+            step_completions={name: 1000 - 60 * i for i, name in enumerate(names)},
+            total_completions=1000 - 60 * len(names)
+        )
+        results = [
+            calibrate_to_real_data(
+                observed, run_behavioral_simulation_improved, args, product_steps,
+                max_iterations=1, verbose=False, n_workers=n_workers
+            )
+            for n_workers in (1, 2)
+        ]
+        assert results[0][0] == results[1][0]
+        assert results[0][2].optimization_history == results[1][2].optimization_history
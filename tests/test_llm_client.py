@@ -0,0 +1,194 @@
+"""
+tests/test_llm_client.py - Cached, concurrent, rate-limited LLM client layer
+"""
+
+import json
+import time
+
+import pandas as pd
+import pytest
+
+import llm_simulator
+from dropsim_llm_client import (
+    FakeLLMClient,
+    LLMRetryableError,
+    ManagedLLMClient,
+    OpenAILLMClient,
+    TokenBucket,
+    is_retryable_error
+)
+from dropsim_llm_ingestion import LLMClient as IngestionLLMClient
+from dropsim_llm_ingestion import OpenAILLMClient as IngestionOpenAILLMClient
+from dropsim_result_cache import ResultCache
+from dropsim_wizard import WizardInput, consolidate_product_context
+
+
+SIMULATION_RESPONSE = json.dumps({
+    'final_intent': 62,
+    'completed_funnel': True,
+    'exit_step': "Post-Results",
+    'dominant_refusal': "None",
+    'vivid_quote': {'think': "Looks useful", 'say': "Let me try"},
+    'conversion_probability': 0.4,
+    'segment_suggestion': "Curious",
+    'journey': [{'step': "Landing Page", 'intent': 70, 'emotion': "curious"}]
+})
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class TestManagedLLMClient:
+    """Caching, concurrency, rate limiting and retries."""
+
+    def test_cache_hits_survive_restart(self, tmp_path):
+        fake = FakeLLMClient(lambda prompt, **params: prompt.upper())
+        client = ManagedLLMClient(fake, cache=ResultCache(str(tmp_path)))
+        assert client.complete("hi", temperature=0.1) == "HI"
+        assert client.complete("hi", temperature=0.1) == "HI"
+        client.complete("hi", temperature=0.7)
+        assert len(fake.calls) == 2 and client.stats.cache_hits == 1
+
+        restarted = ManagedLLMClient(fake, cache=ResultCache(str(tmp_path)))
+        assert restarted.complete_many(["hi", "hi"], temperature=0.1) == ["HI", "HI"]
+        assert len(fake.calls) == 2
+
+        # A different model is a different key
+        other = ManagedLLMClient(FakeLLMClient("x", model="other"), cache=ResultCache(str(tmp_path)))
+        assert other.complete("hi", temperature=0.1) == "x"
+
+    def test_complete_many_is_concurrency_bound(self):
+        fake = FakeLLMClient(lambda prompt, **params: prompt, latency=0.05)
+        client = ManagedLLMClient(fake, max_concurrency=4)
+        prompts = [f"p{i}" for i in range(12)]
+        start = time.perf_counter()
+        assert client.complete_many(prompts) == prompts
+        elapsed = time.perf_counter() - start
+        assert fake.max_in_flight == 4
+        assert elapsed < 12 * 0.05 * 0.6
+
+    def test_transient_errors_retry_with_jitter(self):
+        clock = FakeClock()
+        fake = FakeLLMClient("ok", fail_first=2)
+        client = ManagedLLMClient(fake, max_retries=3, backoff_base=1.0, seed=0, sleep=clock.sleep)
+        assert client.complete("p") == "ok"
+        assert client.stats.retries == 2 and len(fake.calls) == 3
+        assert 0 <= clock.sleeps[0] <= 1.0 and 0 <= clock.sleeps[1] <= 2.0
+
+        exhausted = ManagedLLMClient(FakeLLMClient("ok", fail_first=5), max_retries=1, sleep=clock.sleep)
+        with pytest.raises(LLMRetryableError):
+            exhausted.complete("p")
+        assert exhausted.stats.failures == 1
+
+    def test_permanent_errors_and_invalid_responses(self, tmp_path):
+        def bad_request(prompt, **params):
+            raise ValueError("invalid api key")
+
+        fake = FakeLLMClient(bad_request)
+        client = ManagedLLMClient(fake, sleep=lambda s: None)
+        results = client.complete_many(["a", "b"], return_exceptions=True)
+        assert all(isinstance(r, ValueError) for r in results) and len(fake.calls) == 2
+
+        responses = iter(["not json", '{"ok": 1}'])
+        flaky = FakeLLMClient(lambda prompt, **params: next(responses))
+        client = ManagedLLMClient(flaky, cache=ResultCache(str(tmp_path)), sleep=lambda s: None)
+        assert client.complete("p", validate=json.loads) == '{"ok": 1}'
+        assert client.complete("p", validate=json.loads) == '{"ok": 1}'
+        assert len(flaky.calls) == 2
+
+    def test_retryable_error_detection(self):
+        class RateLimitError(Exception):
+            pass
+
+        try:
+            try:
+                raise RateLimitError("429")
+            except RateLimitError as e:
+                raise ValueError("OpenAI API call failed") from e
+        except ValueError as wrapped:
+            assert is_retryable_error(wrapped)
+        assert not is_retryable_error(ValueError("bad request"))
+
+    def test_token_bucket(self):
+        clock = FakeClock()
+        bucket = TokenBucket(rate=2.0, capacity=2, clock=clock, sleep=clock.sleep)
+        for _ in range(6):
+            bucket.acquire()
+        # Two banked tokens, then one every half second
+        assert clock.now == pytest.approx(2.0)
+
+
+class TestLLMCallers:
+    """Ingestion re-exports, the LLM simulator and the wizard use the shared client."""
+
+    def test_ingestion_reexports(self):
+        assert IngestionLLMClient is llm_simulator.LLMClient
+        assert IngestionOpenAILLMClient is OpenAILLMClient
+
+    def test_openai_client_is_created_once(self, monkeypatch):
+        openai = pytest.importorskip("openai")
+        created = []
+
+        class Completions:
+            def create(self, **request):
+                message = type("Message", (), {'content': request['model']})
+                return type("Response", (), {'choices': [type("Choice", (), {'message': message})]})
+
+        class FakeOpenAI:
+            def __init__(self, api_key=None):
+                created.append(api_key)
+                self.chat = type("Chat", (), {'completions': Completions()})
+
+        monkeypatch.setattr(openai, "OpenAI", FakeOpenAI)
+        client = OpenAILLMClient(api_key="k", model="m")
+        assert [client.complete("a"), client.complete("b", model="n")] == ["m", "n"]
+        assert created == ["k"]
+
+    def test_run_llm_simulation(self, tmp_path):
+        df = pd.DataFrame({
+            'age': [25, 31, 40], 'sex': ["F", "M", "F"], 'state': ["KA", "MH", "DL"],
+            'occupation': ["engineer", "designer", "teacher"], 'digital_literacy': ["high", "high", "low"]
+        })
+        fake = FakeLLMClient(SIMULATION_RESPONSE, latency=0.01)
+        client = ManagedLLMClient(fake, cache=ResultCache(str(tmp_path)), max_concurrency=3)
+        result = llm_simulator.run_llm_simulation(df, verbose=False, llm_client=client)
+        assert len(result) == 3 and (result['llm_final_intent'] == 62).all()
+        assert (result['llm_landing_page_intent'] == 70).all()
+        assert fake.calls[0][1]['response_format'] == {"type": "json_object"}
+
+        calls = len(fake.calls)
+        again = llm_simulator.run_llm_simulation(df, verbose=False, llm_client=client)
+        assert len(fake.calls) == calls
+        pd.testing.assert_frame_equal(result, again)
+
+        failing = ManagedLLMClient(FakeLLMClient("not json"), max_retries=0)
+        fallback = llm_simulator.run_llm_simulation(df, verbose=False, llm_client=failing)
+        assert (fallback['llm_final_intent'] == 30).all()
+
+    def test_simulate_persona_llm_with_plain_client(self):
+        row = pd.Series({'age': 25, 'sex': "F", 'state': "KA", 'occupation': "engineer"})
+        fake = FakeLLMClient(SIMULATION_RESPONSE)
+        result = llm_simulator.simulate_persona_llm(fake, row, {'digital_literacy': "high"})
+        assert result['final_intent'] == 62
+        assert 'validate' not in fake.calls[0][1]
+
+    def test_wizard_context_order(self):
+        fake = FakeLLMClient(lambda prompt, **params: "ANALYSIS")
+        context = consolidate_product_context(
+            WizardInput(product_text="A card app", screenshot_texts=["Step 1"], persona_notes="Students"),
+            llm_client=fake
+        )
+        sections = [line for line in context.splitlines() if line.startswith("## ")]
+        assert sections == [
+            "## PRODUCT_TEXT", "## PRODUCT_SCREENSHOT_ANALYSIS", "## SCREENSHOT_1_RAW", "## PERSONA_NOTES"
+        ]
@@ -0,0 +1,95 @@
+"""
+tests/test_outcome_matrix.py - Outcome matrix metrics match a trajectory walk
+"""
+
+import copy
+from collections import Counter
+
+import pytest
+
+from behavioral_engine import aggregate_failure_modes, run_behavioral_simulation
+from behavioral_engine_batch import run_intent_aware_simulation_batch
+from behavioral_engine_intent_aware import run_intent_aware_simulation
+from calibration.loss_functions import extract_simulated_metrics_from_results
+from dropsim_outcome_matrix import OutcomeMatrix, get_outcome_matrix
+
+from conftest import MIXED_INTENTS
+
+
+def _walk_failures(result_df, step_names):
+    failures = {step: (0, Counter()) for step in step_names}
+    for trajectories in result_df['trajectories']:
+        for traj in trajectories:
+            if traj['exit_step'] in failures:
+                count, reasons = failures[traj['exit_step']]
+                if traj['failure_reason']:
+                    reasons[traj['failure_reason']] += 1
+                failures[traj['exit_step']] = (count + 1, reasons)
+    return failures
+
+
+@pytest.mark.usefixtures("no_attribution")
+@pytest.mark.parametrize("run", [run_intent_aware_simulation, run_intent_aware_simulation_batch])
+def test_attached_matrix_matches_trajectories(persona_df, product_steps, run):
+    result_df = run(persona_df, product_steps, intent_distribution=MIXED_INTENTS, verbose=False, seed=2)
+    step_names = list(product_steps.keys())
+    matrix = result_df.attrs['outcome_matrix']
+    assert len(matrix) == sum(len(t) for t in result_df['trajectories'])
+    assert get_outcome_matrix(result_df, step_names) is matrix
+
+    rebuilt = OutcomeMatrix.from_trajectories(result_df['trajectories'], step_names)
+    assert rebuilt.metrics() == matrix.metrics()
+
+    failures = matrix.failures_by_step()
+    expected = _walk_failures(result_df, step_names)
+    assert failures == expected
+    # Same tie order as the walk
+    assert [failures[s][1].most_common() for s in step_names] == \
+        [expected[s][1].most_common() for s in step_names]
+
+
+def test_metrics_without_journeys_match_journey_walk():
+    step_names = ['a', 'b', 'c']
+    journeys = [
+        {'exit_step': 'b', 'failure_reason': 'x', 'journey': [{'step': 'a'}, {'step': 'b'}]},
+        {'exit_step': 'Completed', 'failure_reason': None, 'journey': [{'step': s} for s in step_names]},
+        {'exit_step': 'a', 'failure_reason': None, 'journey': [{'step': 'a'}]},
+    ]
+    light = [{k: v for k, v in t.items() if k != 'journey'} for t in journeys]
+    for t, entered in zip(light, (2, 3, 1)):
+        t['steps_entered'] = entered
+
+    metrics = OutcomeMatrix.from_trajectories([journeys], step_names).metrics()
+    assert metrics == OutcomeMatrix.from_trajectories([light], step_names).metrics()
+    assert metrics['dropoff_by_step'] == {'a': 1 / 3, 'b': 1 / 2, 'c': 0.0}
+    assert metrics['avg_steps_completed'] == 2.0
+
+
+@pytest.mark.usefixtures("no_attribution")
+def test_stale_matrix_is_not_used(persona_df, product_steps):
+    result_df = run_intent_aware_simulation(persona_df, product_steps, intent_distribution=MIXED_INTENTS,
+                                            verbose=False, seed=4)
+    assert copy.deepcopy(result_df.attrs['outcome_matrix']) is result_df.attrs['outcome_matrix']
+
+    subset = result_df.iloc[:5]
+    assert subset.attrs.get('outcome_matrix') is not None
+    assert extract_simulated_metrics_from_results(subset, product_steps)['total_trajectories'] == \
+        sum(len(t) for t in subset['trajectories'])
+
+    # Same length, different rows: reordered, then relabelled to the original index
+    for shuffled in (result_df.iloc[::-1], result_df.iloc[::-1].reset_index(drop=True)):
+        expected = OutcomeMatrix.from_trajectories(shuffled['trajectories'], list(product_steps.keys()))
+        rebuilt = get_outcome_matrix(shuffled, list(product_steps.keys()))
+        assert rebuilt is not result_df.attrs['outcome_matrix']
+        assert rebuilt.persona_index.tolist() == expected.persona_index.tolist()
+        assert rebuilt.failure_code.tolist() == expected.failure_code.tolist()
+    assert get_outcome_matrix(result_df, list(product_steps.keys())) is result_df.attrs['outcome_matrix']
+
+
+def test_aggregate_failure_modes_uses_given_steps(persona_df, product_steps):
+    result_df = run_behavioral_simulation(persona_df, verbose=False, product_steps=product_steps)
+    summary = aggregate_failure_modes(result_df, product_steps)
+    assert summary['Step'].tolist() == list(product_steps.keys())
+    assert summary['Total Failures'].sum() == sum(
+        1 for trajectories in result_df['trajectories'] for t in trajectories if t['exit_step'] != 'Completed'
+    )
@@ -0,0 +1,115 @@
+"""
+tests/test_persona_cache.py - Memory-mapped persona cache vs. full in-memory loading
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import load_dataset
+from load_dataset import (
+    SIMULATION_COLUMNS,
+    load_and_sample,
+    open_persona_store,
+    reset_persona_stores,
+)
+
+
+def _write_split(data_dir, n_files=3, rows_per_file=900, seed=0):
+    rng = np.random.default_rng(seed)
+    os.makedirs(data_dir, exist_ok=True)
+    for i in range(n_files):
+        n = rows_per_file
+        frame = pd.DataFrame({
+            column: [f"{column}-{i}-{j}-{rng.integers(1000)}" for j in range(n)]
+            for column in load_dataset.EXPECTED_COLUMNS if column != 'age'
+        })
+        frame['age'] = rng.integers(18, 80, n)
+        frame['skills_and_expertise_list'] = [list(rng.choice(['a', 'b', 'c'], 2)) for _ in range(n)]
+        frame.to_parquet(os.path.join(data_dir, f"en_IN-{i:05d}.parquet"))
+
+
+@pytest.fixture
+def split_dirs(tmp_path, monkeypatch):
+    pytest.importorskip("pyarrow")
+    data_dir = str(tmp_path / "data")
+    cache_dir = str(tmp_path / "cache")
+    _write_split(data_dir)
+    # Small record batches so samples span several of them
+    monkeypatch.setattr(load_dataset, 'CACHE_BATCH_ROWS', 250)
+    reset_persona_stores()
+    yield data_dir, cache_dir
+    reset_persona_stores()
+
+
+def _sample(data_dir, cache_dir, use_cache, **kwargs):
+    df, meta = load_and_sample(
+        data_dir=data_dir, cache_dir=cache_dir, use_cache=use_cache,
+        use_huggingface=False, verbose=False, **kwargs
+    )
+    return df, meta
+
+
+class TestPersonaCache:
+    """Cached sampling returns the same personas as the in-memory path."""
+
+    @pytest.mark.parametrize("columns", [None, SIMULATION_COLUMNS])
+    @pytest.mark.parametrize("n", [300, 2000])  # sparse (row slices) and dense (batch take) reads
+    def test_same_rows_as_full_load(self, split_dirs, columns, n):
+        data_dir, cache_dir = split_dirs
+        cached, cached_meta = _sample(data_dir, cache_dir, True, n=n, seed=7, columns=columns)
+        full, full_meta = _sample(data_dir, cache_dir, False, n=n, seed=7, columns=columns)
+
+        pd.testing.assert_frame_equal(cached.drop(columns=['skills_and_expertise_list'], errors='ignore'),
+                                      full.drop(columns=['skills_and_expertise_list'], errors='ignore'))
+        assert cached_meta['total_available'] == full_meta['total_available'] == 2700
+        assert list(cached.columns) == list(columns or full.columns)
+
+    def test_store_is_reused(self, split_dirs, monkeypatch):
+        data_dir, cache_dir = split_dirs
+        _sample(data_dir, cache_dir, True, n=10, seed=1)
+        store = open_persona_store(data_dir=data_dir, cache_dir=cache_dir, use_huggingface=False, verbose=False)
+
+        def fail(*args, **kwargs):
+            raise AssertionError("full dataset reloaded")
+
+        monkeypatch.setattr(load_dataset, 'load_full_dataset', fail)
+        for seed in range(5):
+            _sample(data_dir, cache_dir, True, n=50, seed=seed, columns=['uuid', 'age'])
+        assert open_persona_store(data_dir=data_dir, cache_dir=cache_dir, verbose=False) is store
+
+        # A new process (no open handle) reuses the files on disk
+        reset_persona_stores()
+        _sample(data_dir, cache_dir, True, n=50, seed=3)
+
+    def test_take_preserves_order_across_batches(self, split_dirs):
+        data_dir, cache_dir = split_dirs
+        store = open_persona_store(data_dir=data_dir, cache_dir=cache_dir, use_huggingface=False, verbose=False)
+        full = pd.concat(
+            [pd.read_parquet(os.path.join(data_dir, f)) for f in sorted(os.listdir(data_dir))],
+            ignore_index=True
+        )
+        rows = [2699, 0, 1300, 251, 249, 1300]
+        taken = store.take(rows, columns=['uuid', 'age'])
+        assert taken['uuid'].tolist() == full['uuid'].iloc[rows].tolist()
+        assert taken['age'].tolist() == full['age'].iloc[rows].tolist()
+        assert len(store.batch_offsets) - 1 > 3
+
+        with pytest.raises(IndexError):
+            store.take([2700])
+        with pytest.raises(KeyError):
+            store.take([0], columns=['not_a_column'])
+
+    def test_changed_source_rebuilds(self, split_dirs):
+        data_dir, cache_dir = split_dirs
+        before, _ = _sample(data_dir, cache_dir, True, n=20, seed=2, columns=['uuid'])
+
+        _write_split(data_dir, n_files=2, rows_per_file=500, seed=9)
+        os.remove(os.path.join(data_dir, "en_IN-00002.parquet"))
+        reset_persona_stores()
+
+        after, meta = _sample(data_dir, cache_dir, True, n=20, seed=2, columns=['uuid'])
+        assert meta['total_available'] == 1000
+        assert after['uuid'].tolist() != before['uuid'].tolist()
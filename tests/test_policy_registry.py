@@ -0,0 +1,135 @@
+"""
+tests/test_policy_registry.py - Policy hash index and memoized version lookup
+"""
+
+import json
+import os
+import time
+
+import pytest
+
+from policy_registry.get_current_policy import (
+    get_current_policy_version,
+    reset_policy_version_cache,
+)
+from policy_registry.policy_definition import create_policy_snapshot
+from policy_registry.policy_resolver import HASH_INDEX_FILE, PolicyResolver
+
+
+@pytest.fixture
+def registry_dir(tmp_path):
+    reset_policy_version_cache()
+    yield str(tmp_path / "policies")
+    reset_policy_version_cache()
+
+
+def _count_loads(monkeypatch):
+    calls = {'n': 0}
+    original = PolicyResolver.load_policy
+
+    def counting(self, version):
+        calls['n'] += 1
+        return original(self, version)
+
+    monkeypatch.setattr(PolicyResolver, 'load_policy', counting)
+    return calls
+
+
+class TestPolicyResolverIndex:
+    """Hash -> version lookups go through the index file."""
+
+    def test_save_appends_to_index(self, registry_dir):
+        resolver = PolicyResolver(registry_dir)
+        policy = create_policy_snapshot(registry_dir=registry_dir)
+        version = resolver.save_policy(policy)
+
+        assert resolver.find_version_by_hash(policy.compute_hash()) == version
+        with open(os.path.join(registry_dir, HASH_INDEX_FILE)) as f:
+            entries = [json.loads(line) for line in f]
+        assert {'hash': policy.compute_hash(), 'version': version} in entries
+        # The index is not mistaken for a policy file
+        assert resolver.list_versions() == [version]
+
+    def test_lookup_does_not_load_policies(self, registry_dir, monkeypatch):
+        resolver = PolicyResolver(registry_dir)
+        policy = create_policy_snapshot(registry_dir=registry_dir)
+        version = resolver.save_policy(policy)
+
+        calls = _count_loads(monkeypatch)
+        assert PolicyResolver(registry_dir).find_version_by_hash(policy.compute_hash()) == version
+        assert calls['n'] == 0
+
+    def test_missing_index_is_rebuilt(self, registry_dir):
+        resolver = PolicyResolver(registry_dir)
+        policy = create_policy_snapshot(registry_dir=registry_dir)
+        version = resolver.save_policy(policy)
+        os.remove(os.path.join(registry_dir, HASH_INDEX_FILE))
+
+        assert PolicyResolver(registry_dir).find_version_by_hash(policy.compute_hash()) == version
+        assert os.path.exists(os.path.join(registry_dir, HASH_INDEX_FILE))
+
+
+class TestCurrentPolicyVersionCache:
+    """get_current_policy_version is memoized on the snapshot hash."""
+
+    def test_repeated_calls_hit_cache(self, registry_dir, monkeypatch):
+        version = get_current_policy_version(registry_dir=registry_dir)
+
+        calls = _count_loads(monkeypatch)
+        for _ in range(100):
+            assert get_current_policy_version(registry_dir=registry_dir) == version
+        assert calls['n'] == 0
+
+    def test_different_parameters_get_different_versions(self, registry_dir):
+        base = get_current_policy_version(registry_dir=registry_dir)
+        calibrated = get_current_policy_version(
+            calibrated_parameters={'BASE_COMPLETION_RATE': 0.65}, registry_dir=registry_dir
+        )
+        assert base != calibrated
+        assert get_current_policy_version(registry_dir=registry_dir) == base
+
+    def test_registry_change_invalidates(self, registry_dir):
+        version = get_current_policy_version(registry_dir=registry_dir)
+
+        # Remove the policy behind the cache's back; the directory mtime moves on
+        time.sleep(0.01)
+        os.remove(os.path.join(registry_dir, f"{version}.json"))
+        os.utime(registry_dir, None)
+
+        assert get_current_policy_version(registry_dir=registry_dir) == version
+        assert os.path.exists(os.path.join(registry_dir, f"{version}.json"))
+
+    def test_explicit_reset(self, registry_dir, monkeypatch):
+        get_current_policy_version(registry_dir=registry_dir)
+        reset_policy_version_cache()
+        os.remove(os.path.join(registry_dir, HASH_INDEX_FILE))
+
+        calls = _count_loads(monkeypatch)
+        get_current_policy_version(registry_dir=registry_dir)
+        assert calls['n'] == 1  # index rebuilt from the single policy
+
+
+@pytest.mark.usefixtures("no_attribution")
+def test_simulation_resolves_policy_once(persona_factory, product_steps, monkeypatch):
+    import behavioral_engine_intent_aware as engine
+    from dropsim_intent_model import CREDIGO_GLOBAL_INTENT
+
+    calls = {'n': 0}
+
+    def fake_resolve():
+        calls['n'] += 1
+        return "v7_testhash"
+
+    monkeypatch.setattr(engine, 'resolve_policy_version', fake_resolve)
+    result = engine.run_intent_aware_simulation(
+        persona_factory(3), product_steps, fixed_intent=CREDIGO_GLOBAL_INTENT, verbose=False
+    )
+
+    traces = [
+        trace
+        for trajectories in result['trajectories']
+        for t in trajectories
+        for trace in t['decision_traces']
+    ]
+    assert calls['n'] == 1
+    assert traces and all(trace.policy_version == "v7_testhash" for trace in traces)
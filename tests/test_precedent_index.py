@@ -0,0 +1,140 @@
+"""
+tests/test_precedent_index.py - Indexed PrecedentGraph queries vs. full node scans
+"""
+
+import numpy as np
+import pytest
+
+from decision_continuity import ContinuityEngine, DecisionEventType, PrecedentGraph
+from decision_continuity.precedent_graph import ConditionSignature, PrecedentNode
+
+
+def _quantized_events(event_factory, n, seed):
+    """Events on a coarse belief grid, so signatures repeat and queries hit them."""
+    events = event_factory(n, seed=seed)
+    for i, event in enumerate(events):
+        for belief in (event.belief_state_before, event.belief_state_after):
+            for name in ('trust_level', 'value_perception', 'commitment_level', 'risk_perception', 'intent_strength'):
+                setattr(belief, name, round(getattr(belief, name) * 4) / 4)
+        event.context = {'dominant_factors': [['trust'], ['trust', 'value'], []][i % 3]}
+        event.outcome_observed = ['continue', 'drop', None][i % 3]
+    return events
+
+
+def _scan_what_usually_works(graph, step_id=None):
+    """The node walk query_what_usually_works replaced."""
+    results = []
+    for node in graph.nodes.values():
+        if step_id and node.signature.step_id != step_id:
+            continue
+        for action, dist in node.action_distributions.items():
+            if dist.success_rate > 0.5:
+                results.append({
+                    'action': action,
+                    'success_rate': dist.success_rate,
+                    'total_occurrences': dist.total_occurrences,
+                    'average_confidence': dist.average_confidence,
+                    'step_id': node.signature.step_id,
+                    'condition_signature': node.signature.to_dict()
+                })
+    results.sort(key=lambda x: x['success_rate'], reverse=True)
+    return results
+
+
+@pytest.fixture
+def graph(event_factory):
+    graph = PrecedentGraph()
+    for event in _quantized_events(event_factory, 600, seed=0):
+        graph.add_event(event)
+    # Signatures with real ranges, including ones too wide to bucket
+    for i, (low, high) in enumerate([(0.2, 0.3), (0.0, 1.0), (0.5, 0.5), (0.45, 0.75)]):
+        signature = ConditionSignature(
+            step_id="step_1", trust_range=(low, high), value_range=(0.0, 1.0),
+            commitment_range=(low, high), risk_range=(0.0, 1.0), intent_range=(low, high),
+            dominant_factors={'trust'}
+        )
+        graph.nodes[f"range_{i}"] = PrecedentNode(signature=signature, signature_hash=f"range_{i}", total_events=i)
+    graph.rebuild_index()
+    return graph
+
+
+class TestPrecedentIndex:
+    """Index-backed queries return exactly what scanning every node returns."""
+
+    def test_query_precedents_matches_scan(self, graph):
+        rng = np.random.default_rng(1)
+        grid = [0.0, 0.25, 0.5, 0.75, 1.0, 0.3, 0.2, 0.05]
+        factor_sets = [{'trust'}, {'trust', 'value'}, set()]
+        for _ in range(400):
+            query = dict(
+                step_id=f"step_{rng.integers(4)}",
+                trust=float(rng.choice(grid)), value=float(rng.choice(grid)),
+                commitment=float(rng.choice(grid)), risk=float(rng.choice(grid)),
+                intent=float(rng.choice(grid)), factors=factor_sets[rng.integers(3)],
+                action=[None, 'continue'][rng.integers(2)],
+            )
+            assert graph.query_precedents(**query) == graph._scan_precedents(**query)
+
+        hits = sum(bool(graph.query_precedents("step_1", t, 0.5, t, 0.5, t, {'trust'}))
+                   for t in grid)
+        assert hits > 0
+
+    def test_query_with_nan_only_scans_unbucketed(self, graph):
+        query = dict(step_id="step_1", trust=float('nan'), value=0.5, commitment=0.5,
+                     risk=0.5, intent=0.5, factors={'trust'})
+        assert graph.query_precedents(**query) == graph._scan_precedents(**query) == []
+
+    @pytest.mark.parametrize("step_id", [None, "step_0", "step_3", "missing"])
+    def test_what_usually_works_matches_scan(self, graph, step_id):
+        assert graph.query_what_usually_works("any", step_id) == _scan_what_usually_works(graph, step_id)
+
+    def test_success_index_follows_updates(self, event_factory):
+        graph = PrecedentGraph()
+        events = _quantized_events(event_factory, 3, seed=2)
+        first = events[0]
+        first.event_type = DecisionEventType.CONTINUATION
+        first.outcome_observed = 'continue'
+        graph.add_event(first)
+        assert len(graph.query_what_usually_works("any")) == 1
+
+        # Same signature, same action: a non-continue outcome halves the success rate
+        second = event_factory(1)[0]
+        second.step_id = first.step_id
+        second.belief_state_before = first.belief_state_before
+        second.context = first.context
+        second.action_taken = first.action_taken
+        second.event_type = DecisionEventType.VALUE_REALIZED
+        second.outcome_observed = 'drop'
+        graph.add_event(second)
+        assert graph.query_what_usually_works("any") == _scan_what_usually_works(graph) == []
+
+    def test_from_dict_rebuilds_index(self, graph):
+        loaded = PrecedentGraph.from_dict(graph.to_dict())
+        assert loaded.query_what_usually_works("any") == graph.query_what_usually_works("any")
+        assert loaded.query_precedents("step_1", 0.25, 0.5, 0.25, 0.5, 0.25, {'trust'}) == \
+            graph._scan_precedents("step_1", 0.25, 0.5, 0.25, 0.5, 0.25, {'trust'})
+
+
+class TestParentLookup:
+    """record_event resolves parents through the event_id dict."""
+
+    def test_edges_follow_parents(self, event_factory):
+        engine = ContinuityEngine()
+        events = event_factory(30, seed=3)
+        for event in events:
+            engine.record_event(event)
+        assert sum(edge.transition_count for edge in engine.precedent_graph.edges.values()) == 27
+
+    def test_duplicate_event_ids_resolve_to_first(self, event_factory):
+        engine = ContinuityEngine()
+        first, duplicate, child = event_factory(3, seed=4, n_entities=1)
+        duplicate.event_id = first.event_id
+        child.parent_event_id = first.event_id
+        for event in (first, duplicate, child):
+            engine.record_event(event)
+
+        reference = PrecedentGraph()
+        reference.add_event(first)
+        reference.add_event(duplicate, first)
+        reference.add_event(child, first)
+        assert set(engine.precedent_graph.edges) == set(reference.edges)
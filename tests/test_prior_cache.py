@@ -0,0 +1,91 @@
+"""
+tests/test_prior_cache.py - Per-persona prior and modifier cache
+"""
+
+import numpy as np
+import pytest
+
+import dropsim_prior_cache
+from behavioral_engine_intent_aware import DERIVED_FEATURE_COLUMNS, run_intent_aware_simulation
+from dropsim_prior_cache import (
+    MODIFIER_KEYS,
+    PRIOR_KEYS,
+    PersonaPriorCache,
+    compile_persona_priors,
+    set_prior_cache
+)
+
+
+@pytest.fixture
+def prior_cache():
+    """A fresh memory-only cache installed as the process-wide default."""
+    cache = PersonaPriorCache(cache_dir=None)
+    previous = set_prior_cache(cache)
+    yield cache
+    set_prior_cache(previous)
+
+
+def _uncached(df):
+    rows = []
+    for _, row in df.iterrows():
+        derived = {col: row[col] for col in DERIVED_FEATURE_COLUMNS if col in row.index}
+        rows.append(compile_persona_priors(row, derived))
+    return rows
+
+
+class TestPersonaPriorCache:
+    """Cached priors equal freshly compiled ones, and are compiled once."""
+
+    def test_matches_uncached_compilation(self, prior_cache, persona_df):
+        compiled = prior_cache.compile(persona_df)
+        assert compiled.priors.shape == (len(persona_df), len(PRIOR_KEYS))
+        assert compiled.modifiers.shape == (len(persona_df), len(MODIFIER_KEYS))
+        for i, (priors, modifiers) in enumerate(_uncached(persona_df)):
+            assert compiled.row(i) == (priors, modifiers)
+
+    def test_second_compile_is_all_hits(self, prior_cache, persona_df, monkeypatch):
+        first = prior_cache.compile(persona_df)
+        assert prior_cache.stats.misses == len(persona_df)
+
+        def fail(*args, **kwargs):
+            raise AssertionError("cached persona recompiled")
+        monkeypatch.setattr(dropsim_prior_cache, 'normalize_persona_inputs', fail)
+
+        again = prior_cache.compile(persona_df.iloc[::-1])
+        assert prior_cache.stats.hits == len(persona_df)
+        np.testing.assert_array_equal(again.priors, first.priors[::-1])
+
+    def test_changed_inputs_miss_despite_same_uuid(self, prior_cache, persona_factory):
+        prior_cache.compile(persona_factory(seed=0))
+        other = persona_factory(seed=1)
+        compiled = prior_cache.compile(other)
+        assert prior_cache.stats.hits == 0
+        assert compiled.row(0) == _uncached(other.iloc[:1])[0]
+
+    def test_parquet_tier_survives_new_process(self, tmp_path, persona_df, monkeypatch):
+        pytest.importorskip("pyarrow")
+        first = PersonaPriorCache(cache_dir=str(tmp_path)).compile(persona_df)
+
+        fresh = PersonaPriorCache(cache_dir=str(tmp_path))
+        monkeypatch.setattr(dropsim_prior_cache, 'normalize_persona_inputs', None)
+        again = fresh.compile(persona_df)
+        assert fresh.stats.disk_loads == 1 and fresh.stats.misses == 0
+        np.testing.assert_array_equal(again.priors, first.priors)
+        np.testing.assert_array_equal(again.modifiers, first.modifiers)
+
+    def test_model_version_change_invalidates(self, prior_cache, persona_df, monkeypatch):
+        prior_cache.compile(persona_df)
+        monkeypatch.setattr(dropsim_prior_cache, 'prior_model_version', lambda: "edited")
+        prior_cache.compile(persona_df)
+        assert prior_cache.stats.hits == 0
+
+
+@pytest.mark.usefixtures("no_attribution")
+def test_simulation_compiles_each_persona_once(prior_cache, persona_df, product_steps):
+    first = run_intent_aware_simulation(persona_df, product_steps, verbose=False, seed=3)
+    assert prior_cache.stats.misses == len(persona_df)
+
+    second = run_intent_aware_simulation(persona_df, product_steps, verbose=False, seed=3)
+    assert prior_cache.stats.misses == len(persona_df)
+    assert prior_cache.stats.hits == len(persona_df)
+    assert first['dominant_exit_step'].tolist() == second['dominant_exit_step'].tolist()
@@ -0,0 +1,154 @@
+"""
+tests/test_replication.py - Common-random-numbers replication for confidence estimation
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from behavioral_engine_batch import _draw_random_streams, continuation_table_batch
+from behavioral_engine_improved import EngineParameters, run_behavioral_simulation_improved
+from behavioral_engine_intent_aware import run_intent_aware_simulation
+from calibration.confidence_estimation import (
+    estimate_confidence_intervals,
+    estimate_step_level_confidence,
+    replicate_exit_indices,
+    run_replicated_simulations,
+    run_stochastic_simulations
+)
+from calibration.loss_functions import extract_simulated_metrics_from_results
+from dropsim_intent_model import CANONICAL_INTENTS, CREDIGO_GLOBAL_INTENT
+
+from conftest import MIXED_INTENTS
+
+
+PARAMETERS = EngineParameters(base_completion_rate=0.3, persistence_bonus_start=0.05)
+
+
+def _exit_names(exits, product_steps):
+    names = list(product_steps)
+    return [names[e] if e < len(names) else "Completed" for e in exits]
+
+
+def _legacy_seeds(df, seed=42):
+    return np.array([seed + idx * 10000 + v * 1000 for idx in df.index for v in range(7)])
+
+
+class TestContinuationTable:
+    """The table plus an engine's own draws reproduces that engine's run."""
+
+    @pytest.mark.parametrize("intent_distribution", [None, MIXED_INTENTS])
+    def test_intent_aware_engine(self, persona_df, product_steps, no_attribution, intent_distribution):
+        if intent_distribution is None:
+            kwargs, frames, probs = {'fixed_intent': CREDIGO_GLOBAL_INTENT}, [CREDIGO_GLOBAL_INTENT], None
+        else:
+            kwargs = {'intent_distribution': intent_distribution}
+            frames = [CANONICAL_INTENTS[i] for i in intent_distribution]
+            probs = list(intent_distribution.values())
+        result = run_intent_aware_simulation(persona_df, product_steps, verbose=False, parameters=PARAMETERS, **kwargs)
+
+        table = continuation_table_batch(persona_df, product_steps, frames, PARAMETERS)
+        choice, noise, uniforms = _draw_random_streams(_legacy_seeds(persona_df), len(product_steps), probs, "legacy", 42)
+        if choice is None:
+            choice = np.zeros(table.shape[1], dtype=int)
+        exits = replicate_exit_indices(table, choice[None], noise[None], uniforms[None], 0.35)[0]
+
+        expected = [t['exit_step'] for trajectories in result['trajectories'] for t in trajectories]
+        assert _exit_names(exits, product_steps) == expected
+
+    def test_improved_engine(self, persona_df, product_steps):
+        result = run_behavioral_simulation_improved(
+            persona_df, verbose=False, product_steps=product_steps, parameters=PARAMETERS
+        )
+        table = continuation_table_batch(persona_df, product_steps, None, PARAMETERS)
+        # The improved engine reseeds before every step: one (noise, uniform) pair per trajectory
+        draws = []
+        for seed in _legacy_seeds(persona_df):
+            stream = np.random.RandomState(seed)
+            draws.append((stream.normal(0, 0.15), stream.random()))
+        noise, uniforms = (np.array(column)[None, :, None] for column in zip(*draws))
+        exits = replicate_exit_indices(table, np.zeros((1, table.shape[1]), dtype=int), noise, uniforms, 0.05)[0]
+
+        expected = [t['exit_step'] for trajectories in result['trajectories'] for t in trajectories]
+        assert _exit_names(exits, product_steps) == expected
+
+
+class TestReplication:
+    """Replicate streams, metrics and early stopping."""
+
+    def test_common_random_numbers(self, persona_df, product_steps):
+        kwargs = dict(fixed_intent=CREDIGO_GLOBAL_INTENT, n_replicates=12, block_size=5)
+        first = run_replicated_simulations(persona_df, product_steps, **kwargs)
+        again = run_replicated_simulations(persona_df, product_steps, block_size=12, **{
+            k: v for k, v in kwargs.items() if k != 'block_size'
+        })
+        low = run_replicated_simulations(persona_df, product_steps, parameters=PARAMETERS, **kwargs)
+        assert (first.completion_rates == again.completion_rates).all()
+        # Same draws, lower floor: no replicate can complete more often
+        assert (low.completion_rates <= first.completion_rates).all()
+
+    def test_dropoff_rates_match_metric_extraction(self, persona_df, product_steps):
+        replicated = run_replicated_simulations(
+            persona_df, product_steps, fixed_intent=CREDIGO_GLOBAL_INTENT, n_replicates=1
+        )
+        table = continuation_table_batch(persona_df, product_steps, [CREDIGO_GLOBAL_INTENT])
+        rng = np.random.default_rng([42, 0])
+        noise = rng.normal(0, 0.08, size=table.shape[1:])
+        uniforms = rng.random(table.shape[1:])
+        exits = replicate_exit_indices(
+            table, np.zeros((1, table.shape[1]), dtype=int), noise[None], uniforms[None], 0.35
+        )[0]
+        names = _exit_names(exits, product_steps)
+        step_names = list(product_steps)
+        trajectories = [{
+            'exit_step': name,
+            'journey': [{'step': s} for s in step_names[:step_names.index(name) + 1 if name in step_names else None]]
+        } for name in names]
+        metrics = extract_simulated_metrics_from_results(
+            pd.DataFrame({'trajectories': [trajectories]}), product_steps
+        )
+        assert replicated.completion_rates[0] == metrics['completion_rate']
+        assert replicated.dropoff_rates[0].tolist() == [metrics['dropoff_by_step'][s] for s in step_names]
+
+    def test_early_stopping(self, persona_df, product_steps):
+        full = run_replicated_simulations(
+            persona_df, product_steps, fixed_intent=CREDIGO_GLOBAL_INTENT, n_replicates=200
+        )
+        stopped = run_replicated_simulations(
+            persona_df, product_steps, fixed_intent=CREDIGO_GLOBAL_INTENT, n_replicates=200,
+            target_half_width=0.05, block_size=5
+        )
+        assert stopped.stopped_early and stopped.half_width <= 0.05
+        assert stopped.n_replicates < 200 and stopped.n_replicates % 5 == 0
+        assert (stopped.completion_rates == full.completion_rates[:stopped.n_replicates]).all()
+
+
+class TestConfidenceModes:
+    """replication='crn' through the existing confidence-estimation API."""
+
+    def test_crn_agrees_with_reruns(self, persona_df, product_steps):
+        args = {'df': persona_df, 'verbose': False, 'product_steps': product_steps, 'seed': 42}
+        rerun = run_stochastic_simulations(run_behavioral_simulation_improved, args, n_simulations=8, verbose=False)
+        crn = run_stochastic_simulations(
+            run_behavioral_simulation_improved, args, n_simulations=200, verbose=False, replication="crn"
+        )
+        assert len(crn) == 200
+        assert abs(np.mean(crn) - np.mean(rerun)) < 4 * np.std(crn) / np.sqrt(8) + 1e-9
+
+    def test_estimates(self, persona_df, product_steps):
+        args = {'df': persona_df, 'product_steps': product_steps, 'fixed_intent': CREDIGO_GLOBAL_INTENT}
+        overall = estimate_confidence_intervals(
+            run_intent_aware_simulation, args, n_simulations=30, verbose=False, replication="crn"
+        )
+        steps = estimate_step_level_confidence(
+            run_intent_aware_simulation, args, product_steps, n_simulations=30, verbose=False, replication="crn"
+        )
+        assert overall.n_simulations == 30 and overall.p10 <= overall.p50 <= overall.p90
+        assert list(steps) == list(product_steps)
+        assert all(estimate.n_simulations == 30 for estimate in steps.values())
+
+    def test_crn_rejects_unknown_simulation_function(self, persona_df, product_steps):
+        with pytest.raises(ValueError):
+            run_stochastic_simulations(lambda **kwargs: None, {'df': persona_df}, replication="crn")
+        with pytest.raises(ValueError):
+            run_stochastic_simulations(run_behavioral_simulation_improved, {'df': persona_df}, replication="bootstrap")
@@ -0,0 +1,202 @@
+"""
+tests/test_result_cache.py - Content-addressed simulation result cache
+"""
+
+import os
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+from fastapi.testclient import TestClient
+
+import dropsim_api
+import simulation_pipeline
+from dropsim_result_cache import (
+    ResultCache,
+    canonical_hash,
+    code_fingerprint,
+    scenario_cache_key,
+    set_result_cache
+)
+from fintech_presets import get_default_fintech_scenario
+
+
+@pytest.fixture
+def result_cache(tmp_path):
+    """A fresh disk-backed cache installed as the process-wide default."""
+    cache = ResultCache(str(tmp_path / "results"))
+    previous = set_result_cache(cache)
+    yield cache
+    set_result_cache(previous)
+
+
+def _api_scenario(name="cache_test"):
+    personas, _, steps = get_default_fintech_scenario()
+    fields = ['cognitive_demand', 'effort_demand', 'risk_signal', 'irreversibility', 'delay_to_value',
+              'explicit_value', 'reassurance_signal', 'authority_signal']
+    return {
+        'scenario_name': name,
+        'personas': [{'name': p['name'], 'description': p['description'], 'raw_fields': p['raw_fields']}
+                     for p in personas[:2]],
+        'steps': [{'name': n, 'description': s.get('description'), **{f: s[f] for f in fields}}
+                  for n, s in steps.items()]
+    }
+
+
+class TestCanonicalHash:
+    """Equal inputs hash equally, different inputs do not."""
+
+    def test_dict_order_and_float_precision(self):
+        assert canonical_hash({'a': 1, 'b': [0.1, 2]}) == canonical_hash({'b': [0.1, 2], 'a': 1})
+        assert canonical_hash({'a': 0.1}) != canonical_hash({'a': 0.1 + 1e-12})
+        assert canonical_hash({'a': 1}) != canonical_hash({'a': True})
+        assert canonical_hash(np.float64(0.5)) == canonical_hash(0.5)
+
+    def test_dataframes(self, persona_df):
+        assert canonical_hash(persona_df) == canonical_hash(persona_df.copy())
+        changed = persona_df.copy()
+        changed.loc[0, 'age'] += 1
+        assert canonical_hash(persona_df) != canonical_hash(changed)
+        with_lists = pd.DataFrame({'skills': [['a', 'b'], ['c']]})
+        assert canonical_hash(with_lists) != canonical_hash(pd.DataFrame({'skills': [['a'], ['c']]}))
+
+    def test_uncacheable_inputs_raise(self):
+        with pytest.raises(TypeError):
+            canonical_hash(object())
+
+    def test_code_fingerprint_tracks_source(self, tmp_path, monkeypatch):
+        module = tmp_path / "cache_fingerprint_probe.py"
+        module.write_text("X = 1\n")
+        monkeypatch.syspath_prepend(str(tmp_path))
+        before = code_fingerprint(["cache_fingerprint_probe"])
+        assert code_fingerprint(["cache_fingerprint_probe"]) == before
+        module.write_text("X = 22\n")
+        assert code_fingerprint(["cache_fingerprint_probe"]) != before
+        key = scenario_cache_key("kind", {}, [], engine_modules=["cache_fingerprint_probe"])
+        assert key != scenario_cache_key("other", {}, [], engine_modules=["cache_fingerprint_probe"])
+
+    def test_code_fingerprint_follows_local_imports(self, tmp_path, monkeypatch):
+        package = tmp_path / "fingerprint_pkg"
+        package.mkdir()
+        (package / "__init__.py").write_text("")
+        (package / "helper.py").write_text("RATE = 1\n")
+        (package / "engine.py").write_text("import json\n\ndef run():\n    from .helper import RATE\n    return RATE\n")
+        (tmp_path / "fingerprint_entry.py").write_text("from fingerprint_pkg import engine\n")
+        monkeypatch.syspath_prepend(str(tmp_path))
+
+        before = code_fingerprint(["fingerprint_entry"])
+        assert code_fingerprint(["fingerprint_entry"], follow_imports=False) != before
+        (package / "helper.py").write_text("RATE = 2\n")
+        assert code_fingerprint(["fingerprint_entry"]) != before
+
+
+class TestResultCache:
+    """Tiers, isolation, eviction and side files."""
+
+    def test_memory_then_disk_hits(self, tmp_path):
+        cache = ResultCache(str(tmp_path))
+        assert cache.get("k1") is None
+        cache.put("k1", {'rate': 0.5})
+        assert cache.get("k1") == {'rate': 0.5}
+
+        reopened = ResultCache(str(tmp_path))
+        assert reopened.get("k1") == {'rate': 0.5}
+        assert reopened.get("k1") == {'rate': 0.5}
+        assert (cache.stats.misses, cache.stats.memory_hits) == (1, 1)
+        assert (reopened.stats.disk_hits, reopened.stats.memory_hits) == (1, 1)
+        assert reopened.stats.hit_rate == 1.0
+
+    def test_values_are_not_shared(self, tmp_path):
+        cache = ResultCache(str(tmp_path))
+        cache.put("k", {'steps': [1, 2]})
+        cache.get("k")['steps'].append(3)
+        assert cache.get("k") == {'steps': [1, 2]}
+
+    def test_disk_lru_eviction(self, tmp_path):
+        cache = ResultCache(str(tmp_path), max_bytes=2500, memory_bytes=0)
+        payload = b"x" * 1000
+        cache.put("a", payload)
+        cache.put("b", payload)
+        past = time.time() - 60
+        os.utime(tmp_path / "b.pkl", (past, past))
+        os.utime(tmp_path / "a.pkl", (past + 1, past + 1))
+        cache.get("b")  # most recently used
+        cache.put("c", payload)
+        assert cache.get("a") is None
+        assert cache.get("b") == payload and cache.get("c") == payload
+        assert cache.stats.evictions == 1 and cache.disk_usage() <= 2500
+
+    def test_puts_do_not_rescan_the_directory(self, tmp_path, monkeypatch):
+        ResultCache(str(tmp_path), memory_bytes=0).put("old", b"x" * 1000)
+        cache = ResultCache(str(tmp_path), max_bytes=3500, memory_bytes=0)
+        listings = []
+        listdir = os.listdir
+        monkeypatch.setattr(os, 'listdir', lambda path: listings.append(path) or listdir(path))
+
+        for i in range(10):
+            cache.put(f"k{i}", b"x" * 1000)
+        assert len(listings) == 1
+        assert cache.get("old") is None and cache.get("k9") == b"x" * 1000
+        assert cache.disk_usage() <= 3500 and cache.stats.evictions == 8
+        cache.discard("k9")
+        assert not (tmp_path / "k9.pkl").exists() and len(listings) == 1
+
+    def test_side_files_and_corrupt_entries(self, tmp_path):
+        source = tmp_path / "traces.ndjson"
+        source.write_text('{"a": 1}\n')
+        cache = ResultCache(str(tmp_path / "cache"), memory_bytes=0)
+        cache.put("k", {'summary': 1}, files={'traces.ndjson': str(source)})
+        assert open(cache.get_file("k", 'traces.ndjson')).read() == '{"a": 1}\n'
+        assert source.exists()
+
+        (tmp_path / "cache" / "k.pkl").write_bytes(b"not a pickle")
+        assert cache.get("k") is None and cache.stats.errors == 1
+        assert cache.get_file("k", 'traces.ndjson') is None
+
+
+class TestCachedCallers:
+    """API, CLI and pipeline serve repeat scenarios from the cache."""
+
+    def test_api_jobs(self, tmp_path):
+        cache = ResultCache(str(tmp_path))
+        manager = dropsim_api.SimulationJobManager(max_workers=1, executor="thread", cache=cache)
+        previous, dropsim_api._job_manager = dropsim_api._job_manager, manager
+        try:
+            client = TestClient(dropsim_api.app)
+            first = client.post("/simulate?include_traces=true", json=_api_scenario()).text
+            job_id = client.post("/jobs?include_traces=true", json=_api_scenario("renamed")).json()['job_id']
+            status = client.get(f"/jobs/{job_id}").json()
+            assert status['status'] == "done" and status['cached']
+            assert status['scenario_summary']['scenario_name'] == "renamed"
+
+            again = client.post("/simulate?include_traces=true", json=_api_scenario()).text
+            assert again == first
+            assert client.get(status['traces_url']).text.splitlines()[1:] == first.splitlines()[1:]
+
+            stats = client.get("/cache/stats").json()
+            assert stats['enabled'] and stats['hits'] == 2 and stats['misses'] == 0 and stats['writes'] == 1
+        finally:
+            manager.shutdown()
+            dropsim_api._job_manager = previous
+
+    def test_cli_scenario(self, result_cache):
+        run_scenario_simulation = pytest.importorskip("dropsim_cli", exc_type=ImportError).run_scenario_simulation
+        scenario = _api_scenario()
+        first = run_scenario_simulation(scenario, verbose=False)
+        second = run_scenario_simulation(scenario, verbose=False)
+        assert result_cache.stats.hits == 1 and result_cache.stats.writes == 1
+        pd.testing.assert_frame_equal(first['result_df'], second['result_df'])
+        run_scenario_simulation(scenario, verbose=False, use_cache=False)
+        assert result_cache.stats.hits == 1
+
+    def test_pipeline(self, result_cache, persona_df, monkeypatch):
+        monkeypatch.setattr(simulation_pipeline, "_load_persona_data", lambda n, seed, source: (persona_df, {}))
+        kwargs = dict(mode="research", n_personas=len(persona_df), verbose=False)
+        first = simulation_pipeline.run_simulation("credigo", **kwargs)
+        second = simulation_pipeline.run_simulation("credigo", **kwargs)
+        other_seed = simulation_pipeline.run_simulation("credigo", seed=7, **kwargs)
+        assert (result_cache.stats.hits, result_cache.stats.misses) == (1, 2)
+        assert second.final_metrics == first.final_metrics
+        assert len(second.decision_traces) == len(first.decision_traces)
+        assert other_seed.final_metrics != first.final_metrics
@@ -0,0 +1,122 @@
+"""
+tests/test_screenshot_analysis.py - Deduped, cached, concurrent screenshot analysis
+"""
+
+import base64
+import json
+
+import pytest
+
+from dropsim_llm_client import FakeLLMClient
+from dropsim_result_cache import ResultCache
+from dropsim_screenshot_analysis import (
+    ScreenshotProduct,
+    analyze_screenshots,
+    run_screenshot_analysis
+)
+
+
+def describe(prompt, images=None, **params):
+    """Fake vision model: names the image it was sent; steps are JSON."""
+    if images:
+        return "screen " + base64.b64decode(images[0].split(",", 1)[1]).decode()
+    return json.dumps({line: {'description': line} for line in prompt.splitlines() if line.startswith("screen ")})
+
+
+@pytest.fixture
+def screenshots(tmp_path):
+    folder = tmp_path / "shots"
+    folder.mkdir()
+    for name, content in [("1.png", "a"), ("2.png", "b"), ("3.png", "a"), ("notes.txt", "x")]:
+        (folder / name).write_text(content)
+    return folder
+
+
+def _product(screenshots, tmp_path, **overrides):
+    fields = dict(
+        name="Test",
+        screenshot_dir=str(screenshots),
+        extensions=('.png',),
+        screen_prompt="Describe",
+        steps_prompt="{n_screenshots} screens:\n{screenshots_text}",
+        output_file=str(tmp_path / "test_steps.py"),
+        output_variable="TEST_STEPS",
+        output_docstring=["Test Flow", "{n_steps}-step onboarding flow"]
+    )
+    fields.update(overrides)
+    return ScreenshotProduct(**fields)
+
+
+class TestAnalyzeScreenshots:
+    """Dedupe, caching, resume and concurrency."""
+
+    def test_duplicates_analyzed_once_and_cached(self, screenshots, tmp_path):
+        paths = [str(screenshots / f) for f in ("1.png", "2.png", "3.png")]
+        fake = FakeLLMClient(describe)
+        cache = ResultCache(str(tmp_path / "cache"))
+        analyses = analyze_screenshots(paths, "Describe", fake, cache=cache)
+        assert [a.description for a in analyses] == ["screen a", "screen b", "screen a"]
+        assert len(fake.calls) == 2 and not any(a.cached for a in analyses)
+
+        again = analyze_screenshots(paths, "Describe", fake, cache=ResultCache(str(tmp_path / "cache")))
+        assert len(fake.calls) == 2 and all(a.cached for a in again)
+
+        analyze_screenshots(paths, "Describe differently", fake, cache=cache)
+        assert len(fake.calls) == 4
+
+    def test_interrupted_run_resumes(self, screenshots, tmp_path):
+        paths = [str(screenshots / f) for f in ("1.png", "2.png")]
+
+        def fail_on_b(prompt, images=None, **params):
+            if images[0].endswith(base64.b64encode(b"b").decode()):
+                raise ConnectionError("network down")
+            return describe(prompt, images)
+
+        cache = ResultCache(str(tmp_path / "cache"))
+        first = analyze_screenshots(paths, "Describe", FakeLLMClient(fail_on_b), cache=cache)
+        assert first[0].description == "screen a" and first[1].error == "network down"
+
+        fake = FakeLLMClient(describe)
+        second = analyze_screenshots(paths, "Describe", fake, cache=cache)
+        assert [a.description for a in second] == ["screen a", "screen b"]
+        assert len(fake.calls) == 1 and second[0].cached
+
+    def test_concurrency(self, tmp_path):
+        paths = []
+        for i in range(8):
+            path = tmp_path / f"{i}.png"
+            path.write_text(str(i))
+            paths.append(str(path))
+        fake = FakeLLMClient(describe, latency=0.05)
+        analyze_screenshots(paths, "Describe", fake, max_concurrency=4)
+        assert fake.max_in_flight == 4
+
+
+class TestRunScreenshotAnalysis:
+    """Product configs produce the same outputs the scripts used to write."""
+
+    def test_steps_module(self, screenshots, tmp_path):
+        product = _product(screenshots, tmp_path)
+        fake = FakeLLMClient(describe)
+        cache = ResultCache(str(tmp_path / "cache"))
+        steps = run_screenshot_analysis(product, client=fake, cache=cache, verbose=False)
+        assert list(steps) == ["screen a", "screen b"]
+        assert "3 screens:" in fake.calls[-1][0]
+        assert fake.calls[-1][1]['response_format'] == {"type": "json_object"}
+
+        namespace = {}
+        exec((tmp_path / "test_steps.py").read_text(), namespace)
+        assert namespace['TEST_STEPS'] == steps
+        assert "2-step onboarding flow" in namespace['__doc__']
+
+        calls = len(fake.calls)
+        assert run_screenshot_analysis(product, client=fake, cache=cache, verbose=False) == steps
+        assert len(fake.calls) == calls
+
+    def test_descriptions_file(self, screenshots, tmp_path):
+        product = _product(
+            screenshots, tmp_path, steps_prompt=None, screenshot_names=["2", "missing", "1"],
+            output_file=str(tmp_path / "analyzed.txt")
+        )
+        run_screenshot_analysis(product, client=FakeLLMClient(describe), use_cache=False, verbose=False)
+        assert (tmp_path / "analyzed.txt").read_text() == "Screenshot 2: screen b\n---\nScreenshot 1: screen a"
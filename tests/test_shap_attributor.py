@@ -0,0 +1,137 @@
+"""
+tests/test_shap_attributor.py - Batched Shapley backend vs. the enumerative definition
+"""
+
+import numpy as np
+import pytest
+
+from decision_attribution.attribution_model import FEATURE_NAMES, LocalDecisionFunction
+from decision_attribution.shap_attributor import (
+    _enumerate_shapley_values,
+    compute_decision_attribution,
+    compute_decision_attributions_batch,
+    compute_shapley_values,
+    compute_shapley_values_batch,
+    get_baseline_features,
+)
+
+
+def _random_decisions(n, seed=0):
+    rng = np.random.default_rng(seed)
+    decisions = []
+    for _ in range(n):
+        step_index = int(rng.integers(0, 11))
+        decisions.append({
+            'features': {name: float(rng.uniform(0, 1)) for name in FEATURE_NAMES},
+            'step_index': step_index,
+            'total_steps': 11,
+            'intent_alignment': float(rng.uniform(0, 1)),
+            'modifiers': {
+                'base_persistence': float(rng.uniform(0.8, 1.2)),
+                'value_sensitivity': float(rng.uniform(0.5, 1.5)),
+                'fatigue_resilience': float(rng.uniform(0.5, 1.5)),
+                'risk_tolerance_mult': 1.0,
+            },
+        })
+    return decisions
+
+
+class TestExactShapley:
+    """Exact mode must reproduce the enumerative Shapley values."""
+
+    def test_probability_batch_matches_scalar(self):
+        for d in _random_decisions(50, seed=1):
+            func = LocalDecisionFunction(d['modifiers'])
+            X = np.array([[d['features'][name] for name in FEATURE_NAMES]])
+            scalar = func.compute_probability(d['features'], d['step_index'], 11, d['intent_alignment'])
+            batch = func.compute_probability_batch(X, d['step_index'], 11, d['intent_alignment'])[0]
+            assert scalar == batch
+
+    def test_exact_matches_enumeration(self):
+        for d in _random_decisions(25, seed=2):
+            func = LocalDecisionFunction(d['modifiers'])
+            baseline = get_baseline_features(d['step_index'], 11)
+            args = (func, d['features'], baseline, d['step_index'], 11, d['intent_alignment'])
+            expected = _enumerate_shapley_values(*args)
+            actual = compute_shapley_values(*args)
+            for name in FEATURE_NAMES:
+                assert actual[name] == pytest.approx(expected[name], abs=1e-9)
+                # Features that never move the probability stay exactly zero
+                assert (actual[name] == 0.0) == (expected[name] == 0.0)
+
+    def test_batch_matches_single_decisions(self):
+        decisions = _random_decisions(40, seed=3)
+        X = np.array([[d['features'][n] for n in FEATURE_NAMES] for d in decisions])
+        B = np.array([[get_baseline_features(d['step_index'], 11)[n] for n in FEATURE_NAMES] for d in decisions])
+        batch = compute_shapley_values_batch(
+            X, B,
+            [d['step_index'] for d in decisions], 11,
+            [d['intent_alignment'] for d in decisions],
+            modifiers=[d['modifiers'] for d in decisions],
+        )
+        for row, d in zip(batch, decisions):
+            single = compute_shapley_values(
+                LocalDecisionFunction(d['modifiers']), d['features'],
+                get_baseline_features(d['step_index'], 11), d['step_index'], 11, d['intent_alignment'],
+            )
+            np.testing.assert_allclose(row, [single[n] for n in FEATURE_NAMES], atol=1e-12)
+
+    def test_attributions_batch_matches_single(self):
+        requests = []
+        for i, d in enumerate(_random_decisions(10, seed=4)):
+            f = d['features']
+            requests.append({
+                'cognitive_state': {k: f[k] for k in (
+                    'cognitive_energy', 'effort_tolerance', 'risk_tolerance',
+                    'trust_baseline', 'value_expectation')},
+                'step_forces': {k: f[k] for k in ('step_effort', 'step_risk', 'step_value', 'step_trust')},
+                'intent_info': {k: f[k] for k in ('intent_strength', 'intent_mismatch')},
+                'step_id': f"step_{d['step_index']}",
+                'step_index': d['step_index'],
+                'total_steps': 11,
+                'decision': "DROP" if i % 2 else "CONTINUE",
+                'final_probability': 0.5,
+                'modifiers': d['modifiers'],
+                'intent_alignment': d['intent_alignment'],
+            })
+        batch = compute_decision_attributions_batch(requests)
+        for request, attribution in zip(requests, batch):
+            single = compute_decision_attribution(**request)
+            assert attribution.baseline_probability == single.baseline_probability
+            assert attribution.shap_values_raw.keys() == single.shap_values_raw.keys()
+            for force, value in single.shap_values_raw.items():
+                assert attribution.shap_values_raw[force] == pytest.approx(value, abs=1e-12)
+
+    def test_unknown_method_rejected(self):
+        with pytest.raises(ValueError):
+            compute_shapley_values_batch(np.zeros((1, 11)), np.zeros(11), 0, 11, method="kernel")
+
+
+class TestPermutationShapley:
+    """Permutation sampling converges to the exact values within its error bound."""
+
+    def test_estimate_within_bound(self):
+        decisions = _random_decisions(8, seed=5)
+        X = np.array([[d['features'][n] for n in FEATURE_NAMES] for d in decisions])
+        B = np.array([[get_baseline_features(d['step_index'], 11)[n] for n in FEATURE_NAMES] for d in decisions])
+        kwargs = dict(
+            step_index=[d['step_index'] for d in decisions],
+            total_steps=11,
+            intent_alignment=[d['intent_alignment'] for d in decisions],
+            modifiers=[d['modifiers'] for d in decisions],
+        )
+        exact = compute_shapley_values_batch(X, B, **kwargs)
+        estimate, stderr = compute_shapley_values_batch(
+            X, B, **kwargs, method="permutation", tolerance=0.005,
+            max_permutations=50000, seed=0, return_stderr=True,
+        )
+        assert (1.96 * stderr).max() <= 0.005
+        # Generous multiple of the bound so the test is not flaky
+        assert np.abs(estimate - exact).max() <= 0.02
+
+    def test_seeded_sampling_is_reproducible(self):
+        X = np.full((2, 11), 0.3)
+        B = np.full(11, 0.5)
+        first = compute_shapley_values_batch(X, B, 4, 11, method="permutation", seed=7, max_permutations=128)
+        second = compute_shapley_values_batch(X, B, 4, 11, method="permutation", seed=7, max_permutations=128)
+        np.testing.assert_array_equal(first, second)
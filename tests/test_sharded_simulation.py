@@ -0,0 +1,87 @@
+"""
+tests/test_sharded_simulation.py - Sharded runs must match a 1-worker run exactly
+"""
+
+import pytest
+
+from behavioral_engine_intent_aware import run_intent_aware_simulation, trajectory_rng
+from dropsim_intent_model import CREDIGO_GLOBAL_INTENT
+from dropsim_sharding import split_into_shards
+
+from conftest import MIXED_INTENTS
+
+
+def _trajectory_fingerprint(result_df):
+    return [
+        (
+            t['persona_id'], t['intent_id'], t['exit_step'], t['failure_reason'],
+            [(j['step'], j['continuation_probability'], j['cognitive_energy']) for j in t['journey']],
+            [(d.step_id, d.decision.value, d.policy_version) for d in t['decision_traces']],
+        )
+        for trajectories in result_df['trajectories']
+        for t in trajectories
+    ]
+
+
+class TestSharding:
+    """Shard boundaries and per-trajectory random streams."""
+
+    def test_split_covers_range_in_order(self):
+        shards = split_into_shards(10, 4)
+        assert [list(range(10))[s] for s in shards] == [[0, 1, 2], [3, 4, 5], [6, 7], [8, 9]]
+        assert split_into_shards(2, 8) == [slice(0, 1), slice(1, 2)]
+
+    def test_trajectory_streams_are_independent_of_order(self):
+        first = trajectory_rng(42, 3, 2, "generator").random(5)
+        trajectory_rng(42, 0, 0, "generator").random(100)
+        assert (trajectory_rng(42, 3, 2, "generator").random(5) == first).all()
+
+    def test_unknown_rng_mode_rejected(self):
+        with pytest.raises(ValueError):
+            trajectory_rng(42, 0, 0, "global")
+
+
+@pytest.mark.parametrize("rng_mode", ["legacy", "generator"])
+@pytest.mark.parametrize("intent_kwargs", [
+    {'fixed_intent': CREDIGO_GLOBAL_INTENT},
+    {'intent_distribution': MIXED_INTENTS},
+])
+def test_worker_count_does_not_change_results(persona_factory, product_steps, rng_mode, intent_kwargs):
+    df = persona_factory(9)
+    serial = run_intent_aware_simulation(
+        df, product_steps, verbose=False, rng_mode=rng_mode, n_workers=1, **intent_kwargs
+    )
+    sharded = run_intent_aware_simulation(
+        df, product_steps, verbose=False, rng_mode=rng_mode, n_workers=3, **intent_kwargs
+    )
+    assert _trajectory_fingerprint(serial) == _trajectory_fingerprint(sharded)
+    assert list(serial['completion_rate']) == list(sharded['completion_rate'])
+
+
+def test_database_runner_shards_match_serial(persona_factory, product_steps):
+    from behavioral_engine import STATE_VARIANTS
+    from dropsim_sharding import map_shards
+    from dropsim_simulation_runner import _simulate_compiled_personas, convert_persona_to_compiled_priors
+
+    personas = [convert_persona_to_compiled_priors(row) for _, row in persona_factory(8).iterrows()]
+    serial = _simulate_compiled_personas(personas, product_steps, STATE_VARIANTS)
+    sharded = [
+        row
+        for shard in map_shards(
+            _simulate_compiled_personas,
+            [personas[s] for s in split_into_shards(len(personas), 3)],
+            3,
+            product_steps=product_steps,
+            state_variants=STATE_VARIANTS,
+        )
+        for row in shard
+    ]
+
+    def key(rows):
+        return [
+            (r['persona_name'], [(t['exit_step'], [j['cognitive_energy'] for j in t['journey']])
+                                 for t in r['trajectories']])
+            for r in rows
+        ]
+
+    assert key(serial) == key(sharded)
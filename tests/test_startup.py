@@ -0,0 +1,69 @@
+"""
+tests/test_startup.py - Cold-start budget for the CLI and library entry points
+"""
+
+import os
+import subprocess
+import sys
+import time
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+LITE_SCENARIO = os.path.join(ROOT, "examples", "fintech_lite_onboarding.json")
+
+# Wall-clock budgets for a fresh interpreter (generous: several times the
+# measured cost, so only a regression such as an eager heavy import trips them)
+HELP_BUDGET_SECONDS = 1.0
+SIMULATE_LITE_BUDGET_SECONDS = 6.0
+
+ENGINE_MODULES = {"pandas", "numpy"}
+LLM_AND_CALIBRATION_MODULES = {
+    "openai", "datasets", "firecrawl", "dropsim_llm_client", "dropsim_llm_ingestion",
+    "dropsim_wizard", "dropsim_calibration"
+}
+
+
+def run_cold(*args, cwd=None):
+    """Run python -X importtime args in a fresh interpreter; (seconds, imported module names, result)."""
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", *args],
+        cwd=cwd or ROOT, capture_output=True, text=True, timeout=120
+    )
+    elapsed = time.perf_counter() - start
+    modules = {
+        line.rsplit("|", 1)[1].strip().split(".")[0]
+        for line in result.stderr.splitlines() if line.startswith("import time:")
+    }
+    return elapsed, modules, result
+
+
+class TestCLIStartup:
+    """dropsim_cli only loads what the chosen command needs."""
+
+    def test_help(self):
+        elapsed, modules, result = run_cold("dropsim_cli.py", "--help")
+        assert result.returncode == 0 and "simulate-lite" in result.stdout
+        assert not modules & (ENGINE_MODULES | LLM_AND_CALIBRATION_MODULES)
+        assert elapsed < HELP_BUDGET_SECONDS
+
+    def test_simulate_lite(self, tmp_path):
+        elapsed, modules, result = run_cold(
+            os.path.join(ROOT, "dropsim_cli.py"), "simulate-lite", "--lite-scenario-file", LITE_SCENARIO, "--no-cache",
+            cwd=str(tmp_path)
+        )
+        assert result.returncode == 0, result.stderr[-2000:]
+        assert "SIMULATION COMPLETE" in result.stdout
+        assert not modules & LLM_AND_CALIBRATION_MODULES
+        assert elapsed < SIMULATE_LITE_BUDGET_SECONDS
+
+
+class TestLibraryImports:
+    """Entry-point modules defer pandas/numpy to the functions that need them."""
+
+    @pytest.mark.parametrize("module", ["simulation_pipeline", "dropsim_llm_client", "dropsim_result_cache"])
+    def test_import_is_light(self, module):
+        _, modules, result = run_cold("-c", f"import {module}")
+        assert result.returncode == 0, result.stderr[-2000:]
+        assert not modules & ENGINE_MODULES
@@ -0,0 +1,84 @@
+"""
+tests/test_step_table.py - Precompiled step/intent table for the intent-aware engine
+"""
+
+import copy
+
+import numpy as np
+import pytest
+
+import behavioral_engine_batch
+import behavioral_engine_intent_aware
+import dropsim_intent_model
+from behavioral_engine_intent_aware import (
+    compile_step_intent_table,
+    run_intent_aware_simulation
+)
+from behavioral_engine_batch import run_intent_aware_simulation_batch
+from dropsim_intent_model import CANONICAL_INTENTS, CREDIGO_GLOBAL_INTENT, identify_intent_mismatch
+
+from conftest import MIXED_INTENTS
+
+
+def _frames(intent_distribution):
+    return [CANONICAL_INTENTS[intent_id] for intent_id in intent_distribution]
+
+
+class TestCompileStepIntentTable:
+    """The table holds exactly what the per-step functions compute."""
+
+    def test_matches_identify_intent_mismatch(self, product_steps):
+        frames = _frames(MIXED_INTENTS)
+        table = compile_step_intent_table(product_steps, frames)
+        assert table.step_names == tuple(product_steps)
+        assert table.alignment.shape == (len(frames), len(product_steps))
+
+        for i, frame in enumerate(frames):
+            for k, step_def in enumerate(product_steps.values()):
+                analysis = identify_intent_mismatch(step_def, frame, k, len(product_steps), "System 2 fatigue")
+                assert table.alignment[i, k] == analysis['alignment_score']
+                assert table.is_mismatch[i, k] == analysis['is_intent_mismatch']
+                assert table.mismatch_score[i, k] == analysis['mismatch_score']
+                assert table.mismatch_types[i][k] == analysis['mismatch_type']
+                assert table.explanations[i][k] == analysis['explanation']
+
+        step_def = next(iter(product_steps.values()))
+        assert table.step_forces[0]['step_effort'] == step_def.get('effort_demand', 0.0)
+        assert table.demands['risk_signal'][0] == step_def.get('risk_signal', 0.0)
+
+    def test_arrays_are_read_only(self, product_steps):
+        table = compile_step_intent_table(product_steps, [CREDIGO_GLOBAL_INTENT])
+        with pytest.raises(ValueError):
+            table.alignment[0, 0] = 1.0
+        with pytest.raises(ValueError):
+            table.intent_index('not_an_intent')
+
+    def test_memoized_on_content(self, product_steps):
+        frames = _frames(MIXED_INTENTS)
+        table = compile_step_intent_table(product_steps, frames)
+        assert compile_step_intent_table(copy.deepcopy(product_steps), frames) is table
+
+        edited = copy.deepcopy(product_steps)
+        next(iter(edited.values()))['effort_demand'] = 0.99
+        assert compile_step_intent_table(edited, frames).key != table.key
+        assert compile_step_intent_table(product_steps, frames[:1]).key != table.key
+
+
+@pytest.mark.usefixtures("no_attribution")
+class TestEngineUsesTable:
+    """Trajectories index into the table instead of re-analyzing each step."""
+
+    @pytest.mark.parametrize("run", [run_intent_aware_simulation, run_intent_aware_simulation_batch])
+    def test_no_per_step_analysis(self, persona_df, product_steps, monkeypatch, run):
+        compile_step_intent_table(product_steps, _frames(MIXED_INTENTS))
+
+        def fail(*args, **kwargs):
+            raise AssertionError("per-step intent analysis outside the compile phase")
+        for module in (behavioral_engine_intent_aware, behavioral_engine_batch, dropsim_intent_model):
+            monkeypatch.setattr(module, 'compute_intent_alignment_score', fail)
+        monkeypatch.setattr(behavioral_engine_intent_aware, 'identify_intent_mismatch', fail)
+
+        result_df = run(persona_df, product_steps, intent_distribution=MIXED_INTENTS, verbose=False, seed=7)
+        trajectories = [t for row in result_df['trajectories'] for t in row]
+        assert len(trajectories) == len(persona_df) * 7
+        assert all(isinstance(step['intent_alignment'], (float, np.floating)) for t in trajectories for step in t['journey'])
@@ -0,0 +1,104 @@
+"""
+tests/test_target_filter.py - Vectorized target-group pre-filter vs. compiled persona meta
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import load_dataset
+from derive_features import derive_feature_frame, derive_feature_subset, FEATURE_SOURCE_COLUMNS
+from dropsim_simulation_runner import (
+    convert_persona_to_compiled_priors,
+    derive_persona_meta_frame,
+    select_target_group_rows,
+)
+from dropsim_target_filter import TargetGroup, persona_matches_target, target_group_mask
+
+
+TARGETS = [
+    TargetGroup(sec=["high", "mid"]),
+    TargetGroup(urban_rural=["metro"], age_bucket=["young", "middle"]),
+    TargetGroup(digital_skill=["high"], intent=["medium", "high"]),
+    TargetGroup(risk_attitude=["balanced"], sec=["low"]),
+    TargetGroup(intent=[]),
+]
+
+
+def _scalar_meta(df):
+    return pd.DataFrame([convert_persona_to_compiled_priors(row)['meta'] for _, row in df.iterrows()])
+
+
+class TestPersonaMetaFrame:
+    """Meta tags derived column-wise equal the tags of compiled personas."""
+
+    @pytest.mark.parametrize("seed", [0, 1])
+    def test_matches_compiled_meta(self, raw_persona_factory, seed):
+        df = raw_persona_factory(300, seed=seed)
+        expected = _scalar_meta(df)
+        pd.testing.assert_frame_equal(derive_persona_meta_frame(df), expected[list(expected.columns)])
+
+    def test_feature_subset_matches_frame(self, raw_persona_factory):
+        df = raw_persona_factory(300, seed=4)
+        features = list(FEATURE_SOURCE_COLUMNS)
+        pd.testing.assert_frame_equal(derive_feature_subset(df, features), derive_feature_frame(df)[features])
+        # Only the source columns are needed
+        columns = FEATURE_SOURCE_COLUMNS['aspirational_score']
+        pd.testing.assert_frame_equal(
+            derive_feature_subset(df[columns], ['aspirational_score']),
+            derive_feature_frame(df)[['aspirational_score']],
+        )
+        with pytest.raises(ValueError):
+            derive_feature_subset(df, ['trust_score'])
+
+    @pytest.mark.parametrize("target", TARGETS)
+    def test_mask_matches_persona_matches_target(self, raw_persona_factory, target):
+        meta = _scalar_meta(raw_persona_factory(200, seed=5))
+        expected = [persona_matches_target(tags, target) for tags in meta.to_dict('records')]
+        assert list(target_group_mask(meta, target)) == expected
+        assert target_group_mask(meta, None).all()
+
+
+@pytest.fixture
+def persona_store(tmp_path, monkeypatch, raw_persona_factory):
+    pytest.importorskip("pyarrow")
+    data_dir = str(tmp_path / "data")
+    os.makedirs(data_dir)
+    df = raw_persona_factory(3000, seed=6)
+    df.insert(0, 'uuid', [f"p-{i}" for i in range(len(df))])
+    df.to_parquet(os.path.join(data_dir, "en_IN-00000.parquet"))
+    monkeypatch.setattr(load_dataset, 'CACHE_BATCH_ROWS', 500)
+    load_dataset.reset_persona_stores()
+    yield load_dataset.open_persona_store(
+        data_dir=data_dir, cache_dir=str(tmp_path / "cache"), use_huggingface=False, verbose=False
+    ), df
+    load_dataset.reset_persona_stores()
+
+
+class TestSelectTargetGroupRows:
+    """One scan in draw order replaces the resampling loop."""
+
+    def test_keeps_sample_matches_then_tops_up(self, persona_store):
+        store, df = persona_store
+        target = TargetGroup(urban_rural=["metro", "tier2"], age_bucket=["young"])
+        rows = select_target_group_rows(store, target, n_personas=200, min_matched=150, seed=3, batch_rows=100)
+
+        order = load_dataset.sample_row_indices(len(df), len(df), 3)
+        matches = order[target_group_mask(_scalar_meta(df.iloc[order]), target)]
+        in_sample = np.isin(matches, order[:200])
+        assert in_sample.sum() < 150
+        assert list(rows) == list(matches[:150])
+        assert len(set(rows)) == len(rows)
+
+    def test_sample_with_enough_matches_is_kept_whole(self, persona_store):
+        store, df = persona_store
+        target = TargetGroup(risk_attitude=["balanced"])
+        rows = select_target_group_rows(store, target, n_personas=400, min_matched=100, seed=8)
+        assert list(rows) == list(load_dataset.sample_row_indices(len(df), 400, 8))
+
+    def test_runs_out_of_rows(self, persona_store):
+        store, df = persona_store
+        rows = select_target_group_rows(store, TargetGroup(sec=[]), n_personas=50, min_matched=10, seed=0)
+        assert len(rows) == 0
@@ -0,0 +1,83 @@
+"""
+tests/test_trace_sink.py - Streaming trajectories to trace sinks
+"""
+
+import pytest
+
+import dropsim_trace_sink
+from behavioral_engine_intent_aware import run_intent_aware_simulation
+from calibration.loss_functions import extract_simulated_metrics_from_results
+from dropsim_intent_model import CREDIGO_GLOBAL_INTENT
+from dropsim_trace_sink import AggregatingTraceSink, NDJSONTraceSink
+
+from conftest import MIXED_INTENTS
+
+
+def _trajectories(result_df):
+    return [t for row in result_df['trajectories'] for t in row]
+
+
+@pytest.fixture
+def small_batches(monkeypatch):
+    """Force several sink writes on a 12-persona frame."""
+    monkeypatch.setattr(dropsim_trace_sink, 'TRACE_SINK_BATCH_PERSONAS', 5)
+
+
+@pytest.mark.usefixtures("no_attribution", "small_batches")
+class TestTraceSink:
+    """Sinks receive every trajectory; summaries and metrics are unchanged."""
+
+    def test_metrics_match_in_memory_run(self, persona_df, product_steps):
+        kwargs = dict(intent_distribution=MIXED_INTENTS, verbose=False, seed=5)
+        in_memory = run_intent_aware_simulation(persona_df, product_steps, **kwargs)
+
+        sink = AggregatingTraceSink()
+        streamed = run_intent_aware_simulation(persona_df, product_steps, trace_sink=sink, **kwargs)
+
+        assert 'trajectories' not in streamed.columns
+        assert streamed.attrs['trace_sink'] is sink
+        assert streamed['completion_rate'].tolist() == in_memory['completion_rate'].tolist()
+        assert streamed['dominant_exit_step'].tolist() == in_memory['dominant_exit_step'].tolist()
+        assert extract_simulated_metrics_from_results(streamed, product_steps) == \
+            extract_simulated_metrics_from_results(in_memory, product_steps)
+
+    @pytest.mark.parametrize("n_workers", [1, 2])
+    def test_ndjson_round_trip_in_persona_order(self, tmp_path, persona_df, product_steps, n_workers):
+        kwargs = dict(fixed_intent=CREDIGO_GLOBAL_INTENT, verbose=False, seed=5, capture="traces")
+        expected = _trajectories(run_intent_aware_simulation(persona_df, product_steps, **kwargs))
+
+        with NDJSONTraceSink(str(tmp_path / "traces.ndjson")) as sink:
+            run_intent_aware_simulation(persona_df, product_steps, trace_sink=sink, n_workers=n_workers, **kwargs)
+        written = list(sink.iter_trajectories())
+
+        n_variants = len(expected) // len(persona_df)
+        assert [t['persona_index'] for t in written] == \
+            [i for i in range(len(persona_df)) for _ in range(n_variants)]
+        assert [(t['persona_id'], t['variant'], t['exit_step']) for t in written] == \
+            [(t['persona_id'], t['variant'], t['exit_step']) for t in expected]
+        assert [len(t['decision_traces']) for t in written] == [len(t['decision_traces']) for t in expected]
+
+    def test_traced_result_can_be_sliced_and_copied(self, tmp_path, persona_df, product_steps):
+        with NDJSONTraceSink(str(tmp_path / "traces.ndjson")) as sink:
+            result_df = run_intent_aware_simulation(persona_df, product_steps, fixed_intent=CREDIGO_GLOBAL_INTENT,
+                                                    verbose=False, capture="traces", trace_sink=sink)
+            for derived in (result_df.head(), result_df.copy(), result_df[result_df['completion_rate'] >= 0]):
+                assert derived.attrs['trace_sink'] is sink
+
+    def test_parquet_round_trip(self, tmp_path, persona_df, product_steps):
+        pytest.importorskip("pyarrow")
+        from dropsim_trace_sink import ParquetTraceSink
+
+        kwargs = dict(fixed_intent=CREDIGO_GLOBAL_INTENT, verbose=False, seed=5, capture="summary")
+        expected = _trajectories(run_intent_aware_simulation(persona_df, product_steps, **kwargs))
+
+        with ParquetTraceSink(str(tmp_path / "traces.parquet")) as sink:
+            run_intent_aware_simulation(persona_df, product_steps, trace_sink=sink, **kwargs)
+        written = list(sink.iter_trajectories())
+        assert [(t['persona_id'], t['exit_step'], t['final_state']) for t in written] == \
+            [(t['persona_id'], t['exit_step'], t['final_state']) for t in expected]
+
+    def test_trace_table_and_sink_are_exclusive(self, persona_df, product_steps):
+        with pytest.raises(ValueError):
+            run_intent_aware_simulation(persona_df, product_steps, fixed_intent=CREDIGO_GLOBAL_INTENT,
+                                        verbose=False, trace_table=True, trace_sink=AggregatingTraceSink())
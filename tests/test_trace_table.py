@@ -0,0 +1,135 @@
+"""
+tests/test_trace_table.py - Columnar DecisionTraceTable vs. DecisionTrace objects
+"""
+
+import copy
+import json
+
+import numpy as np
+import pytest
+
+from behavioral_engine_intent_aware import run_intent_aware_simulation
+from decision_graph.context_graph import build_context_graph_from_traces
+from decision_graph.decision_trace import DecisionOutcome, DecisionSequence
+from decision_graph.trace_table import DecisionTraceTable
+from dropsim_intent_model import CREDIGO_GLOBAL_INTENT
+
+
+@pytest.fixture
+def engine_traces(persona_factory, product_steps):
+    result = run_intent_aware_simulation(
+        persona_factory(6), product_steps, fixed_intent=CREDIGO_GLOBAL_INTENT, verbose=False
+    )
+    return [trace for trajectories in result['trajectories'] for t in trajectories for trace in t['decision_traces']]
+
+
+def _without_timestamps(trace_dict):
+    trace_dict = dict(trace_dict)
+    trace_dict.pop('timestamp')
+    if 'attribution' in trace_dict:
+        trace_dict['attribution'] = {k: v for k, v in trace_dict['attribution'].items() if k != 'timestamp'}
+    return trace_dict
+
+
+class TestDecisionTraceTable:
+    """Round trips through the table must not change any trace."""
+
+    def test_round_trip(self, engine_traces):
+        table = DecisionTraceTable.from_traces(engine_traces)
+        assert len(table) == len(engine_traces)
+        assert table.to_dicts() == [t.to_dict() for t in engine_traces]
+
+    def test_row_view_attributes(self, engine_traces):
+        table = DecisionTraceTable.from_traces(engine_traces)
+        for trace, view in zip(engine_traces, table):
+            assert view.step_id == trace.step_id
+            assert view.decision is trace.decision
+            assert view.cognitive_state_snapshot == trace.cognitive_state_snapshot
+            assert view.intent == trace.intent
+            assert view.dominant_factors == trace.dominant_factors
+            assert view.attribution.dominant_forces == trace.attribution.dominant_forces
+
+    def test_encoded_columns(self, engine_traces):
+        table = DecisionTraceTable.from_traces(engine_traces)
+        assert table.codes['step_id'].dtype == np.int32
+        assert len(table.dictionaries['step_id']) <= 11
+        assert list(table.column('step_id')) == [t.step_id for t in engine_traces]
+        drop_code = table.columns['decision'] == 1
+        assert drop_code.sum() == sum(t.decision == DecisionOutcome.DROP for t in engine_traces)
+
+    def test_slice_take_concat(self, engine_traces):
+        table = DecisionTraceTable.from_traces(engine_traces)
+        dicts = [t.to_dict() for t in engine_traces]
+
+        window = table[5:20]
+        assert np.shares_memory(window.columns['energy'], table.columns['energy'])
+        assert window.to_dicts() == dicts[5:20]
+        assert table.take([3, 1, 30]).to_dicts() == [dicts[i] for i in (3, 1, 30)]
+        assert DecisionTraceTable.concat([table[10:], table[:10]]).to_dicts() == dicts[10:] + dicts[:10]
+        assert copy.deepcopy(table) is table
+
+    def test_parquet_round_trip(self, engine_traces, tmp_path):
+        pq = pytest.importorskip("pyarrow.parquet")
+        table = DecisionTraceTable.from_traces(engine_traces)
+        path = table[7:].to_parquet(str(tmp_path / "traces.parquet"))
+        loaded = DecisionTraceTable.read_parquet(path)
+        assert loaded.to_dicts() == table[7:].to_dicts()
+
+        schema = pq.read_schema(path)
+        assert str(schema.field('step_id').type).startswith('dictionary')
+
+
+class TestEngineTraceTable:
+    """Engine trace_table mode yields the same traces as the object mode."""
+
+    def test_engine_table_matches_objects(self, persona_factory, product_steps):
+        kwargs = dict(fixed_intent=CREDIGO_GLOBAL_INTENT, verbose=False)
+        objects = run_intent_aware_simulation(persona_factory(5), product_steps, **kwargs)
+        columnar = run_intent_aware_simulation(persona_factory(5), product_steps, trace_table=True, **kwargs)
+
+        table = columnar.attrs['decision_trace_table']
+        expected = [
+            [_without_timestamps(trace.to_dict()) for trace in t['decision_traces']]
+            for trajectories in objects['trajectories'] for t in trajectories
+        ]
+        actual = [
+            [_without_timestamps(view.to_dict()) for view in t['decision_traces']]
+            for trajectories in columnar['trajectories'] for t in trajectories
+        ]
+        assert actual == expected
+        assert len(table) == sum(len(traces) for traces in expected)
+
+    def test_context_graph_from_views(self, persona_factory, product_steps):
+        kwargs = dict(fixed_intent=CREDIGO_GLOBAL_INTENT, verbose=False)
+        objects = run_intent_aware_simulation(persona_factory(5), product_steps, **kwargs)
+        columnar = run_intent_aware_simulation(persona_factory(5), product_steps, trace_table=True, **kwargs)
+
+        def sequences(result_df):
+            return [
+                DecisionSequence(
+                    persona_id=t['persona_id'], variant_name=t['variant'], traces=t['decision_traces'],
+                    final_outcome=DecisionOutcome.CONTINUE if t['completed'] else DecisionOutcome.DROP,
+                    exit_step=t['exit_step'],
+                )
+                for trajectories in result_df['trajectories'] for t in trajectories
+            ]
+
+        graph_objects = build_context_graph_from_traces(sequences(objects), product_steps)
+        graph_views = build_context_graph_from_traces(sequences(columnar), product_steps)
+        assert graph_views.dominant_failure_paths == graph_objects.dominant_failure_paths
+        assert graph_views.persona_step_rejection_map == graph_objects.persona_step_rejection_map
+        assert set(graph_views.nodes) == set(graph_objects.nodes)
+
+    def test_pipeline_output_serializes(self, persona_factory, product_steps):
+        import simulation_pipeline
+
+        behavioral = simulation_pipeline._run_canonical_engine(
+            persona_factory(4), None, product_steps, 0.5, 42, False
+        )
+        assert isinstance(behavioral['decision_traces'], DecisionTraceTable)
+        result = simulation_pipeline.PipelineResult(
+            entry={}, behavioral=behavioral, intent={}, calibration=None, evaluation=None,
+            drift=None, final_metrics={}, decision_traces=behavioral['decision_traces'],
+        )
+        exported = json.loads(json.dumps(result.to_dict()))
+        assert len(exported['decision_traces']) == len(behavioral['decision_traces'])